@@ -0,0 +1,229 @@
+import hashlib
+import sqlite3
+import zlib
+from pathlib import Path
+
+
+class BlobStore:
+    '''
+    A content-addressed store for long literal strings, like the input
+    texts and syntaxes TextNets store with node type '_literal_csv'.
+    Each text is stored once under a handle derived from its SHA-256
+    digest, so storing the same text again returns the same handle
+    without storing another copy.
+
+    Parameters
+    ----------
+    directory : str, path object, or None, default None
+        If None, texts are kept in memory. Otherwise each text is
+        written to its own file in the directory and only read when it
+        is requested, so TextNets that share a directory share their
+        texts.
+
+    compress : bool, default False
+        If True, texts are compressed with zlib when they are stored.
+        Texts stored without compression can be read by stores that
+        compress and vice versa.
+
+    database : str, path object, or None, default None
+        Path of a SQLite database written by textnet_to_sqlite. Texts
+        in its blobs table are read one at a time when they are
+        requested. The database isn't changed: texts stored later are
+        kept in memory. Can't be given with directory.
+    '''
+
+    handle_prefix = 'blob:sha256:'
+
+    def __init__(self, directory=None, compress=False, database=None):
+
+        if (directory is not None) and (database is not None):
+            raise ValueError('Give a directory or a database, not both')
+
+        self.compress = compress
+        self.database = None
+        self.directory = None
+
+        if directory is None:
+            self._blobs = {}
+
+            if database is not None:
+                self.database = Path(database)
+
+        else:
+            self.directory = Path(directory)
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _query(self, statement, parameters=()):
+        '''
+        Run a query on the database of the store with a read-only
+        connection and return the rows.
+        '''
+        uri = self.database.resolve().as_uri() + '?mode=ro'
+        con = sqlite3.connect(uri, uri=True)
+
+        try:
+            return con.execute(statement, parameters).fetchall()
+
+        finally:
+            con.close()
+
+    def __contains__(self, handle):
+
+        if not (
+            isinstance(handle, str)
+            and handle.startswith(self.handle_prefix)
+        ):
+            return False
+
+        if self.directory is not None:
+            return any(p.exists() for p in self._paths(handle).values())
+
+        if handle in self._blobs:
+            return True
+
+        if self.database is not None:
+            return bool(self._query(
+                'SELECT 1 FROM blobs WHERE handle = ?',
+                (handle,)
+            ))
+
+        return False
+
+    def __iter__(self):
+
+        if self.directory is not None:
+            return iter(sorted(
+                self.handle_prefix + p.stem for p in self.directory.iterdir()
+                if p.suffix in ['.txt', '.zlib']
+            ))
+
+        handles = list(self._blobs.keys())
+
+        if self.database is not None:
+            stored = self._query('SELECT handle FROM blobs ORDER BY rowid')
+            stored = [row[0] for row in stored]
+            in_database = set(stored)
+            handles = stored + [h for h in handles if h not in in_database]
+
+        return iter(handles)
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    @classmethod
+    def handle(cls, text):
+        '''
+        Get the handle of a text without storing it.
+        '''
+        digest = hashlib.sha256(text.encode('utf8')).hexdigest()
+        return cls.handle_prefix + digest
+
+    def _paths(self, handle):
+        digest = handle[len(self.handle_prefix):]
+        return {
+            True: self.directory / (digest + '.zlib'),
+            False: self.directory / (digest + '.txt')
+        }
+
+    def _get_raw(self, handle):
+        '''
+        Get a tuple (compressed, bytes) with the data stored for a
+        handle, or None if the handle isn't stored.
+        '''
+
+        if not (
+            isinstance(handle, str)
+            and handle.startswith(self.handle_prefix)
+        ):
+            return None
+
+        if self.directory is not None:
+
+            # Read the file instead of checking that it exists first,
+            # so a text is read with one filesystem call
+            for compressed, path in self._paths(handle).items():
+                try:
+                    return compressed, path.read_bytes()
+                except FileNotFoundError:
+                    continue
+
+            return None
+
+        if handle in self._blobs:
+            return self._blobs[handle]
+
+        if self.database is not None:
+            rows = self._query(
+                'SELECT compressed, data FROM blobs WHERE handle = ?',
+                (handle,)
+            )
+            if rows:
+                compressed, data = rows[0]
+                return bool(compressed), data
+
+        return None
+
+    def _put_raw(self, handle, compressed, data):
+
+        if self.directory is None:
+            self._blobs[handle] = (compressed, data)
+
+        else:
+            # Write next to the final path and move the file into place
+            # so a reader never sees a partly written text
+            path = self._paths(handle)[compressed]
+            temporary = path.with_name(path.name + '.tmp')
+            temporary.write_bytes(data)
+            temporary.replace(path)
+
+    def _reads_database(self, path):
+        '''
+        True if the store reads texts from the database at path.
+        '''
+        return (
+            (self.database is not None)
+            and Path(path).exists()
+            and self.database.exists()
+            and self.database.samefile(path)
+        )
+
+    def put(self, text):
+        '''
+        Store a text and return its handle.
+        '''
+
+        handle = self.handle(text)
+
+        if handle not in self:
+            data = text.encode('utf8')
+            if self.compress:
+                data = zlib.compress(data)
+            self._put_raw(handle, self.compress, data)
+
+        return handle
+
+    def get(self, handle):
+        '''
+        Get the text stored under a handle.
+        '''
+
+        raw = self._get_raw(handle)
+
+        if raw is None:
+            raise KeyError('No text stored under {}'.format(handle))
+
+        compressed, data = raw
+        if compressed:
+            data = zlib.decompress(data)
+
+        return data.decode('utf8')
+
+    def update(self, other):
+        '''
+        Store every text of another BlobStore that isn't stored in this
+        one. Texts are copied as they are stored in the other store.
+        '''
+
+        for handle in other:
+            if handle not in self:
+                self._put_raw(handle, *other._get_raw(handle))
@@ -1,6 +1,18 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
 import bibliograph as bg
+import bisect
+import contextlib
+import csv
+import hashlib
+import io
+import mmap
+import os
 import pandas as pd
-import tempfile
+import re
+import sys
+import tracemalloc
 from pathlib import Path
 
 
@@ -67,102 +79,253 @@ def _create_id_map(domain, drop_na=True, **kwargs):
     return id_map
 
 
-def _strip_csv_comments(column, pattern):
-    # make the whole column string valued
-    column = column.fillna('')
-    # split off the comments and return the non-comment part
-    column = column.str.split(pat=pattern, expand=True)
-    return column[0]
+def _strip_line_comment(line, comment_char, unescaped_comment_regex):
+    '''
+    Strip the comment from one line of csv-formatted shorthand text
+    that contains an unescaped comment character.
+
+    Cells to the right of the first cell with an unescaped comment
+    character were created by commas in the comment, so they're
+    emptied unless they have unescaped comment characters of their
+    own. Every remaining cell is cut off at its first comment
+    character. If nothing is left, the line is replaced by a single
+    delimiter so that it is still read as a (null) csv row.
+    '''
+    line_end = line[len(line.rstrip('\r\n')):]
 
+    cells = next(csv.reader([line.rstrip('\r\n')], skipinitialspace=True))
 
-def _replace_escaped_comment_chars(column, comment_char, pattern):
+    stripped = []
+    commented_out = False
+    for cell in cells:
 
-    return column.replace(
-        to_replace=pattern,
-        value=comment_char,
-        regex=True
-    )
+        has_comment = unescaped_comment_regex.search(cell) is not None
 
+        if commented_out and not has_comment:
+            stripped.append('')
+        else:
+            stripped.append(cell.split(comment_char)[0])
 
-def _expand_shorthand_items(
-    group,
-    entry_syntax,
-    entry_prefix_id_map,
-    item_label_id_map
-):
-    '''
-    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
+        commented_out = commented_out or has_comment
+
+    if not any(stripped):
+        return ',' + line_end
 
-    Takes parsed shorthand entries grouped by entry prefix and item
-    label, checks if the entry syntax has a list delimiter for this
-    item, and splits the string on the delimiter if it exists.
+    line = io.StringIO()
+    csv.writer(line, lineterminator='').writerow(stripped)
+
+    return line.getvalue() + line_end
+
+
+def _normalize_skiprows(skiprows):
+    '''
+    Check a value of skiprows and return it as None, an int, or a sorted
+    list of the indexes of skipped lines. Callables, which
+    pandas.read_csv also accepts, are rejected because skiprows is
+    stored with each input as a python literal so the input can be
+    parsed again when it's refreshed.
     '''
 
-    # The group name is a tuple (entry_prefix_id, item_label_id)
-    if pd.isna(group.name[1]):
-        # If the item label ID is NA then this group is entry
-        # strings rather than items parsed out of entries
-        return group
+    if (skiprows is None) or pd.api.types.is_integer(skiprows):
+        return skiprows
 
-    else:
-        # Get the item label ID
-        item_label_id = group.name[1]
+    if pd.api.types.is_list_like(skiprows) and not callable(skiprows):
+        rows = list(skiprows)
+        if all(pd.api.types.is_integer(row) for row in rows):
+            return sorted({int(row) for row in rows})
 
-    # Locate this item label ID in item_label_id_map and get the string
-    # value for the item label out of the map index
-    item_label = item_label_id_map.loc[
-        item_label_id_map == item_label_id
-    ]
-    item_label = item_label.index.drop_duplicates()
-    if len(item_label) > 1:
-        raise ValueError('item label ID not unique')
-    else:
-        item_label = item_label[0]
+    raise TypeError(
+        'skiprows must be None, an int, or a list-like of line indexes'
+    )
 
-    if pd.isna(item_label):
-        # If nulls were accounted for in the label ID map and the label
-        # we just recovered is null, then this group is the entry
-        # strings rather than items parsed out of the entries
-        return group
 
-    # Get the string value for the entry prefix out of the map index
-    entry_prefix = entry_prefix_id_map.loc[
-        entry_prefix_id_map == group.name[0]
-    ]
-    entry_prefix = entry_prefix.index[0]
+def _skipped_line_test(skiprows):
+    '''
+    Get a function that takes the index of a line of input and returns
+    True if pandas.read_csv(skiprows=skiprows) skips the line. skiprows
+    can be anything _normalize_skiprows accepts.
+    '''
 
-    # If this prefix is not in the entry syntax then we assume this
-    # group is self-descriptive and items shouldn't be expanded
-    if entry_prefix not in entry_syntax['entry_prefix'].array:
-        return group
+    skiprows = _normalize_skiprows(skiprows)
 
-    # Locate the row for this item in the entry syntax and get the
-    # list delimiter
-    item_syntax = entry_syntax.query('entry_prefix == @entry_prefix') \
-                              .query('item_label == @item_label') \
-                              .squeeze()
-    delimiter = item_syntax['list_delimiter']
+    if skiprows is None:
+        return lambda i: False
 
-    if pd.notna(delimiter):
-        # If there is a delimiter, split this group's strings in place
-        group.loc[:, 'string'] = group['string'].str.split(delimiter)
-        return group
+    if isinstance(skiprows, list):
+        return set(skiprows).__contains__
 
-    else:
-        # If there is no delimiter, return the group
-        return group
+    return lambda i: i < skiprows
 
 
-def _normalize_shorthand(shnd_input, comment_char, fill_cols, drop_na):
+def _normalize_shorthand_lines(lines, skiprows, comment_char):
     '''
-    Fill or drop missing values in shorthand input and parse comments.
-    Comments have to be parsed in this function rather than using
-    pd.read_csv(comment=comment_char, escapechar='\') because there may
+    Take an iterable of lines of csv-formatted shorthand text and yield
+    the same number of lines with comments stripped and escaped comment
+    characters replaced by bare comment characters. Each line is scanned
+    once before csv tokenization.
+
+    Comments have to be parsed here rather than using
+    pd.read_csv(comment=comment_char, escapechar='\\') because there may
     be escaped characters in entries that should be parsed separately.
     Using read_csv with an escape character removes the escape character
     anywhere in the file, so the non-comment character escapes would be
     lost.
 
+    Lines read_csv skips before the header (see _skipped_line_test),
+    blank lines before it, and the header itself are yielded unchanged.
+    '''
+    escaped_comment_char = '\\' + comment_char
+    unescaped_comment_regex = re.compile(
+        r'(?<!\\)' + re.escape(comment_char)
+    )
+
+    lines = iter(lines)
+    is_skipped = _skipped_line_test(skiprows)
+
+    # Skipped lines and the header are not shorthand entries
+    for i, line in enumerate(lines):
+        yield line
+
+        if (not is_skipped(i)) and line.strip():
+            break
+
+    for line in lines:
+
+        if comment_char not in line:
+            yield line
+
+        elif unescaped_comment_regex.search(line) is None:
+            yield line.replace(escaped_comment_char, comment_char)
+
+        else:
+            yield _strip_line_comment(
+                line,
+                comment_char,
+                unescaped_comment_regex
+            )
+
+
+class _LineReader:
+    '''
+    Minimal read-only text buffer that concatenates lines generated by
+    an iterable so pandas.read_csv can tokenize them as they're
+    generated.
+    '''
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self._buffer = ''
+
+    def __iter__(self):
+        return iter(self.read().splitlines(keepends=True))
+
+    def read(self, size=-1):
+        parts = [self._buffer]
+        length = len(self._buffer)
+
+        for line in self._lines:
+            parts.append(line)
+            length += len(line)
+
+            if (size is not None) and (0 <= size <= length):
+                break
+
+        text = ''.join(parts)
+
+        if (size is None) or (size < 0):
+            self._buffer = ''
+            return text
+
+        self._buffer = text[size:]
+
+        return text[:size]
+
+
+class _ShorthandInput:
+    '''
+    The text of a shorthand input, read once and shared by the csv
+    parser and the literal string stored for the input.
+
+    Files are memory mapped and decoded without an intermediate copy,
+    buffers are read to the end. The SHA-256 digest of the raw input is
+    computed from the same bytes, so the provenance of a file input is
+    recorded without reading it again. Line endings are normalized to
+    '\\n' as they would be by open() in text mode, so the stored text
+    parses to the same rows as the text that was parsed.
+
+    Shorthand.parse_text accepts an instance in place of a path or
+    buffer.
+
+    Attributes
+    ----------
+    text : str
+        Decoded input text.
+
+    sha256 : str
+        Hex digest of the input bytes. Text buffers are encoded with
+        the input encoding before hashing.
+    '''
+
+    def __init__(self, filepath_or_buffer, encoding='utf8'):
+
+        if 'read' in dir(filepath_or_buffer):
+            data = filepath_or_buffer.read()
+
+            if isinstance(data, str):
+                text = data
+                data = data.encode(encoding)
+            else:
+                text = str(data, encoding)
+
+            self.sha256 = hashlib.sha256(data).hexdigest()
+
+        else:
+            with open(filepath_or_buffer, 'rb') as f:
+
+                # Empty files can't be memory mapped
+                if os.fstat(f.fileno()).st_size == 0:
+                    text = ''
+                    self.sha256 = hashlib.sha256(b'').hexdigest()
+
+                else:
+                    with mmap.mmap(
+                        f.fileno(),
+                        0,
+                        access=mmap.ACCESS_READ
+                    ) as data:
+                        self.sha256 = hashlib.sha256(data).hexdigest()
+                        text = str(data, encoding)
+
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+        self.text = text
+
+    def lines(self):
+        '''
+        Yield the lines of the input text with their line endings. Lines
+        are sliced from the text as they're read, so the text isn't
+        copied into a buffer.
+        '''
+        text = self.text
+        start = 0
+
+        while start < len(text):
+            end = text.find('\n', start) + 1 or len(text)
+            yield text[start:end]
+            start = end
+
+
+def _normalize_shorthand(
+    shnd_input,
+    fill_cols,
+    drop_na,
+    fill_values=None
+):
+    '''
+    Fill or drop missing values in shorthand input. Comments must
+    already have been stripped by _normalize_shorthand_lines.
+
     The input file must have a header and the first four labels of the
     header must be (in any order and any character case):
         [left_entry, right_entry, link_tags_or_override, reference]
@@ -172,13 +335,6 @@ def _normalize_shorthand(shnd_input, comment_char, fill_cols, drop_na):
     shnd_input : pandas.DataFrame
         Unparsed shorthand data
 
-    skiprows : int
-        Number of lines to skip at the beginning of the input file.
-
-    comment_char : str
-        Character indicating the rest of a line should be skipped. Must
-        be a single character.
-
     fill_cols : scalar or non-string iterable, default 'left_entry'
         Label(s) of columns that will be forward filled.
 
@@ -186,6 +342,12 @@ def _normalize_shorthand(shnd_input, comment_char, fill_cols, drop_na):
         Column labels. Rows will be dropped if they have null values in
         columns these columns.
 
+    fill_values : dict or None, default None
+        THIS ARGUMENT IS MUTATED. Map from labels in fill_cols to values
+        used to fill null values at the start of the input, which is
+        required when the input is one chunk of a larger file. The last
+        forward filled value in each column is stored in the dict.
+
     Returns
     -------
     pandas.DataFrame
@@ -215,50 +377,23 @@ def _normalize_shorthand(shnd_input, comment_char, fill_cols, drop_na):
             '>>> (ignoring case and list order)'
         )
 
-    # If the comment character is a regex metacharacter, escape it
-    comment_char = bg.util.escape_regex_metachars(comment_char)
-    # Regular expressions to match bare and escaped comment characters
-    unescaped_comment_regex = r"(?<!\\)[{}]".format(comment_char)
-    escaped_comment_regex = fr"(\\{comment_char})"
+    shnd_input = bg.util.set_string_dtype(shnd_input)
 
-    # Find cells where comments start
-    has_comment = shnd_input.apply(
-        lambda x:
-        x.str.contains(unescaped_comment_regex) if x.notna().any() else False
-    )
-    has_comment = has_comment.fillna(False)
-
-    # Set cells to the right of cells with comments to False because
-    # they were created by commas in comments
-    commented_out = has_comment.where(has_comment).ffill(axis=1).fillna(False)
-    commented_out = commented_out ^ has_comment
-
-    shnd_input = bg.util.set_string_dtype(shnd_input.mask(commented_out))
-
-    # Mask off cells to the right of cells with comments in them
-    shnd_input = shnd_input.mask(commented_out)
-
-    # Split cells where comments start and take the uncommented part
-    has_comment = has_comment.any(axis=1)
-    shnd_input.loc[has_comment, :] = shnd_input.loc[has_comment].apply(
-        _strip_csv_comments,
-        args=(comment_char,)
-    )
-
-    # Drop rows that began with comments
-    shnd_input = shnd_input.mask(shnd_input == '')
+    # Drop rows that were empty or began with comments
     shnd_input = shnd_input.dropna(how='all')
-    shnd_input = shnd_input.replace('', pd.NA)
-
-    # Replace escaped comment characters with bare comment characters
-    shnd_input = shnd_input.apply(
-        _replace_escaped_comment_chars,
-        args=(comment_char, escaped_comment_regex)
-    )
 
     # Optionally forward fill missing values
     for column in fill_cols:
-        shnd_input.loc[:, column] = shnd_input.loc[:, column].ffill()
+        filled = shnd_input.loc[:, column].ffill()
+
+        if fill_values is not None:
+            # Carry values over from a previous chunk of input
+            if column in fill_values:
+                filled = filled.fillna(fill_values[column])
+            if not filled.empty and pd.notna(filled.iloc[-1]):
+                fill_values[column] = filled.iloc[-1]
+
+        shnd_input.loc[:, column] = filled
 
     # Optionally drop lines missing values
     shnd_input = shnd_input.dropna(subset=drop_na)
@@ -266,22 +401,22 @@ def _normalize_shorthand(shnd_input, comment_char, fill_cols, drop_na):
     return shnd_input
 
 
-def _get_item_link_source_IDs(group):
+def _get_item_link_source_IDs(data, by):
     '''
-    Take a group of items that all have the same csv row and column
-    index, meaning they were exploded out of a single entry, and return
-    the string ID for the entry they were exploded from.
+    Take parsed data whose items were exploded out of entries
+    identified by the columns in `by` and return the string ID for the
+    entry each item was exploded from, aligned with the rows of data.
 
     If the entry syntax indicated that there are no links between a
     group of item strings and the entry string that contained them,
-    return null values
+    return null values for that group.
     '''
-    link_type_is_na = group['link_type_id'].isna()
+    link_type_is_na = data['link_type_id'].isna()
 
-    # If all the link types are NA then there are no links between items
-    # inside this entry and the entry string itself
-    if link_type_is_na.all():
-        return pd.Series([pd.NA]*len(group), index=group.index)
+    # If all the link types in a group are NA then there are no links
+    # between items inside this entry and the entry string itself
+    has_links = (~link_type_is_na).groupby([data[c] for c in by])
+    has_links = has_links.transform('any').to_numpy()
 
     # If any link types are not null then return the string_id of the
     # entry the items were exploded from
@@ -291,9 +426,14 @@ def _get_item_link_source_IDs(group):
     # here is the entry string itself. If that syntax validation
     # requirement is relaxed in the future for some reason, this code
     # will break.
-    else:
-        entry_string_id = group.loc[link_type_is_na, 'string_id'].squeeze()
-        return pd.Series([entry_string_id]*len(group), index=group.index)
+    entry_string_ids = data.loc[link_type_is_na, by + ['string_id']]
+    entry_string_ids = entry_string_ids.drop_duplicates(subset=by)
+
+    source_ids = data[by].merge(entry_string_ids, on=by, how='left')
+    source_ids = source_ids['string_id'].where(has_links, pd.NA)
+    source_ids.index = data.index.copy()
+
+    return source_ids
 
 
 def _get_entry_prefix_ids(
@@ -364,125 +504,126 @@ def _get_entry_prefix_ids(
     return entry_prefixes
 
 
-def _get_link_component_string_ids(
-        prefix_pairs,
-        shnd_data,
-        link_syntax,
-        component_prefix,
-        subset,
-        columns=None,
-        prefix_string_id=True
-):
+def _compile_link_join_plans(link_syntax):
     '''
-    Links have three string components: source, target, and
-    reference. This function locates the data for one
-    component in the link syntax and merges the position
-    code for that component with a dataframe of entry prefix
-    pairs to get all data required to locate the string ID
-    for each link component.
+    Compile a parsed link syntax into join plans for the two ways
+    sources and targets can be matched: one-to-one (no list mode or
+    '1:1') and by lists ('1:m', 'm:1', or 'm:m').
+
+    Each plan is keyed by (left_entry_prefix_id, right_entry_prefix_id)
+    and has the csv column ('l' or 'r') and item label for the source,
+    target, and reference of every link between a pair of entry
+    prefixes, so the parsed data only has to be merged with each plan
+    once.
 
     Parameters
     ----------
+    link_syntax : pandas.DataFrame
+        Link syntax generated by syntax_parsing.parse_link_syntax
 
-    link_syntax: pandas.DataFrame
-        data defining links between pairs of shorthand entries
-
-    component_prefix: str
-        One of ['src_', 'tgt_', 'ref_']
+    Returns
+    -------
+    dict
+        Map from 'one_to_one' and 'list' to DataFrames
+    '''
+    plan_columns = [
+        'left_entry_prefix_id',
+        'right_entry_prefix_id',
+        'link_type_id'
+    ]
+    plan_columns += [
+        component_prefix + suffix
+        for component_prefix in ['src_', 'tgt_', 'ref_']
+        for suffix in ['csv_col', 'item_label']
+    ]
 
-    subset : pandas.Series
-        A row indexer to subset the link syntax.
+    link_has_no_list = link_syntax['list_mode'].isna()
+    link_is_one_to_one = (link_syntax['list_mode'] == '1:1')
+    link_has_list = link_syntax['list_mode'].isin(['1:m', 'm:1', 'm:m'])
 
-    include_link_id : bool, default False
-        If True, select link type IDs from the mutable data
+    return {
+        'one_to_one': link_syntax.loc[
+            link_has_no_list | link_is_one_to_one,
+            plan_columns
+        ],
+        'list': link_syntax.loc[link_has_list, plan_columns]
+    }
 
-    columns : list-like or None, default None
-        Columns to include in the returned dataframe. If None,
-        return all columns.
 
-    prefix_string_id : bool, default True
-        Optionally add the component prefix to the string ID
-        column label before returning.
+def _join_link_components(plan, prefix_pairs, shnd_data):
     '''
+    Links have three string components: source, target, and
+    reference. This function merges pairs of entry prefixes with a
+    link join plan to locate the csv row, csv column, and item label
+    of every component of every link in the plan, then merges the
+    locations with the parsed data to get string IDs for all three
+    components at once.
 
-    link_syntax_selection = link_syntax.loc[subset]
+    Parameters
+    ----------
+    plan : pandas.DataFrame
+        One of the join plans generated by _compile_link_join_plans
 
-    columns_for_this_component = [
-        'left_entry_prefix_id',
-        'right_entry_prefix_id',
-        component_prefix + 'csv_col',
-        component_prefix + 'item_label',
-        'link_type_id'
-    ]
+    prefix_pairs : pandas.DataFrame
+        Entry prefix IDs and string csv indexes for the left and right
+        entries on each line of input
 
-    # The reference position code could be null if the reference
-    # string should be the input file, so drop any rows in the
-    # link syntax that have no value for the current position
-    # code
-    component_csv_col = component_prefix + 'csv_col'
-    link_syntax_selection = link_syntax_selection.dropna(
-        subset=component_csv_col
-    )
+    shnd_data : pandas.DataFrame
+        Parsed shorthand data with string IDs
 
-    # Merge the prefix pairs with the link syntax to get csv
-    # rows and item labels for every link between entries
-    link_component = prefix_pairs.merge(
-        link_syntax_selection[columns_for_this_component],
+    Returns
+    -------
+    dict
+        Map from component prefixes ('src_', 'tgt_', 'ref_') to
+        DataFrames with columns ['link_id', 'entry_csv_row',
+        'link_type_id', 'item_list_position', 'string_id']. Components
+        with the same link_id were generated by the same row of the
+        link syntax for the same line of input.
+    '''
+    joined = prefix_pairs.merge(
+        plan,
         on=['left_entry_prefix_id', 'right_entry_prefix_id']
     )
 
-    # Locate rows for which the link syntax says this component
-    # (source, target, or reference) is in the left csv column
-    is_L = (link_component[component_prefix + 'csv_col'] == 'l')
-    # Extract the csv rows and columns that locate the string
-    # value in the parsed data
-    left_indexes = link_component[['L_str_csv_row', 'L_str_csv_col']]
-    left_indexes = left_indexes.loc[is_L]
-    left_indexes.columns = ['csv_row', 'csv_col']
-
-    # Locate rows for which the link syntax says this component
-    # (source, target, or reference) is in the right csv column
-    is_R = (link_component[component_prefix + 'csv_col'] == 'r')
-    # Extract the csv rows and columns that locate the string
-    # value in the parsed data
-    right_indexes = link_component[['R_str_csv_row', 'R_str_csv_col']]
-    right_indexes = right_indexes.loc[is_R]
-    right_indexes.columns = ['csv_row', 'csv_col']
-
-    # Combine the csv indexes above into a single dataframe and
-    # overwrite the csv rows and columns defined by the link
-    # syntax with indexes that locate string values in the
-    # parsed data
-    link_component[['csv_row', 'csv_col']] = pd.concat(
-        [left_indexes, right_indexes]
-    )
-    link_component = link_component.sort_index()
-
-    # Drop all the information required to sort out which column
-    # the string values came from
-    link_component = link_component.drop(
-        ['left_entry_prefix_id',
-         'right_entry_prefix_id',
-         'L_str_csv_row',
-         'L_str_csv_col',
-         'R_str_csv_row',
-         'R_str_csv_col',
-         component_csv_col],
-        axis='columns'
-    )
+    components = []
+    for component_prefix in ['src_', 'tgt_', 'ref_']:
+
+        # The reference position code could be null if the reference
+        # string should be the input file, so skip links that have no
+        # value for the current position code
+        component_csv_col = joined[component_prefix + 'csv_col']
+
+        # Locate rows for which the link syntax says this component
+        # (source, target, or reference) is in the left or right csv
+        # column and take the csv indexes that locate the string value
+        # in the parsed data from that side
+        is_L = (component_csv_col == 'l')
+        is_R = (component_csv_col == 'r')
+
+        csv_row = joined['R_str_csv_row'].where(is_R)
+        csv_row = joined['L_str_csv_row'].where(is_L, csv_row)
+        csv_col = joined['R_str_csv_col'].where(is_R)
+        csv_col = joined['L_str_csv_col'].where(is_L, csv_col)
+
+        component = pd.DataFrame({
+            'component': component_prefix,
+            'link_id': joined.index,
+            'entry_csv_row': joined['entry_csv_row'],
+            'link_type_id': joined['link_type_id'],
+            'csv_row': csv_row,
+            'csv_col': csv_col,
+            'item_label_id': joined[component_prefix + 'item_label']
+        })
 
-    # Rename the item label column so we can merge the link
-    # component with the parsed data and recover the string IDs
-    link_component = link_component.rename(
-        columns={component_prefix + 'item_label': 'item_label_id'}
-    )
+        components.append(component.loc[component_csv_col.notna()])
 
-    # The link component dataframe now contains the three pieces
-    # of information we need to locate string IDs in the mutated
-    # input data: csv row, csv column, and item label. We select
-    # those columns from the mutable data along with the item
-    # list positions so links can be tagged with positions in
-    # ordered lists.
+    components = pd.concat(components, ignore_index=True)
+
+    # The components now contain the three pieces of information we
+    # need to locate string IDs in the parsed data: csv row, csv
+    # column, and item label. We select those columns from the data
+    # along with the item list positions so links can be tagged with
+    # positions in ordered lists.
     data_columns = [
         'csv_row',
         'csv_col',
@@ -491,28 +632,102 @@ def _get_link_component_string_ids(
         'string_id'
     ]
 
-    link_component = link_component.merge(
+    components = components.merge(
         shnd_data[data_columns],
         on=['csv_row', 'csv_col', 'item_label_id'],
         how='left'
     )
+    components = components.drop(
+        ['csv_row', 'csv_col', 'item_label_id'],
+        axis='columns'
+    )
 
-    # Optionally clean up the output
+    return {
+        component_prefix: (
+            components.loc[components['component'] == component_prefix]
+                      .drop('component', axis='columns')
+                      .reset_index(drop=True)
+        )
+        for component_prefix in ['src_', 'tgt_', 'ref_']
+    }
 
-    if columns is not None:
-        link_component = link_component[columns]
 
-    if prefix_string_id and ('string_id' in columns):
-        if isinstance(link_component, pd.DataFrame):
-            link_component = link_component.rename(
-                columns={'string_id': component_prefix + 'string_id'}
-            )
-        else:
-            link_component = link_component.rename(
-                component_prefix + 'string_id'
-            )
+def _get_links_from_join_plan(
+    plan,
+    prefix_pairs,
+    shnd_data,
+    pair_list_positions
+):
+    '''
+    Generate links between strings in parsed shorthand data from one of
+    the join plans generated by _compile_link_join_plans.
+
+    Sources, targets, and references generated by the same row of the
+    link syntax for the same line of input are merged with each other.
+    If pair_list_positions is True, sources and targets that are both
+    elements of lists are only linked if they have the same position in
+    their lists. Otherwise every source is linked to every target.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Has columns ['src_string_id', 'tgt_string_id',
+        'ref_string_id', 'link_type_id', 'entry_csv_row',
+        'item_list_position']
+    '''
+    components = _join_link_components(plan, prefix_pairs, shnd_data)
+
+    sources = components['src_'][[
+        'link_id',
+        'entry_csv_row',
+        'link_type_id',
+        'item_list_position',
+        'string_id'
+    ]]
+    targets = components['tgt_'][[
+        'link_id',
+        'item_list_position',
+        'string_id'
+    ]]
+    references = components['ref_'][['link_id', 'string_id']]
+
+    links = sources.merge(
+        targets,
+        on='link_id',
+        suffixes=('_src', '')
+    )
+
+    if pair_list_positions:
+        src_position = links['item_list_position_src']
+        tgt_position = links['item_list_position']
+        is_paired = (
+            src_position.isna()
+            | tgt_position.isna()
+            | (src_position == tgt_position)
+        )
+        links = links.loc[is_paired.fillna(False).to_numpy(dtype=bool)]
+
+    links = links.merge(
+        references,
+        on='link_id',
+        how='left',
+        suffixes=('', '_ref')
+    )
+
+    links = links.rename(columns={
+        'string_id_src': 'src_string_id',
+        'string_id': 'tgt_string_id',
+        'string_id_ref': 'ref_string_id'
+    })
 
-    return link_component
+    return links[[
+        'src_string_id',
+        'tgt_string_id',
+        'ref_string_id',
+        'link_type_id',
+        'entry_csv_row',
+        'item_list_position'
+    ]].drop_duplicates()
 
 
 def _copy_cross_duplicates(L_prefixes, R_prefixes):
@@ -550,21 +765,1347 @@ def _copy_cross_duplicates(L_prefixes, R_prefixes):
         'right_entry_prefix_id'
     ] = cross_dplcts
 
-    # copy values from right to left
-    to_copy = R_prefixes[R_subset].drop_duplicates()
-    to_fill = L_prefixes.loc[L_missing_pfix, L_subset]
+    # copy values from right to left
+    to_copy = R_prefixes[R_subset].drop_duplicates()
+    to_fill = L_prefixes.loc[L_missing_pfix, L_subset]
+
+    cross_dplcts = to_copy.merge(
+        to_fill,
+        on=['string_csv_row', 'string_csv_col'],
+        how='right'
+    )
+    cross_dplcts = cross_dplcts['right_entry_prefix_id'].array
+
+    L_prefixes.loc[
+        L_missing_pfix,
+        'left_entry_prefix_id'
+    ] = cross_dplcts
+
+
+def _join_columns(data, separator):
+    '''
+    Join the string value of every column in each row of a dataframe
+    with a separator. Equivalent to
+
+        data.apply(lambda x: separator.join(map(str, x)), axis=1)
+
+    but concatenates whole columns at once instead of calling a
+    python function for every row.
+    '''
+
+    if len(data.columns) == 0:
+        return pd.Series('', index=data.index, dtype=object)
+
+    # astype(str) calls str on each value, like map(str, x) above
+    columns = [data.iloc[:, i].astype(str) for i in range(len(data.columns))]
+
+    joined = columns[0]
+    for column in columns[1:]:
+        joined = joined + separator + column
+
+    return joined
+
+
+def _read_shorthand(
+    filepath_or_buffer,
+    skiprows,
+    comment_char,
+    fill_cols,
+    drop_na,
+    encoding,
+    chunksize=None,
+    scan_lines=None
+):
+    '''
+    Read csv-formatted shorthand text, strip comments from each line
+    with _normalize_shorthand_lines as it's read, and normalize the
+    tokenized text with _normalize_shorthand.
+
+    If chunksize is None, yield a single DataFrame for the whole input.
+    Otherwise yield normalized chunks of at most chunksize csv rows.
+    Values in fill_cols are forward filled across chunk boundaries and
+    chunks that contain no entries after normalization are skipped. The
+    index of every chunk is the csv row of each line of input.
+
+    If scan_lines is not None, it is called with an iterable of the raw
+    lines of input and must return an iterable of the same lines. This
+    lets callers inspect lines before comments are stripped.
+    '''
+
+    # Unsupported values of skiprows are rejected before any input is
+    # read
+    skiprows = _normalize_skiprows(skiprows)
+
+    # Read every column as strings so that chunks in which a column
+    # happens to hold only numbers are treated like any other chunk
+    read_csv_kwargs = {
+        'dtype': str,
+        'skiprows': skiprows,
+        'skipinitialspace': True,
+        'chunksize': chunksize
+    }
+
+    # Forward filled values are carried from one chunk to the next
+    fill_values = {}
+
+    # Inputs that were already read are split into lines, buffers are
+    # read as they are, anything else is opened as a file
+    if isinstance(filepath_or_buffer, _ShorthandInput):
+        source = contextlib.nullcontext(filepath_or_buffer.lines())
+    elif 'read' in dir(filepath_or_buffer):
+        source = contextlib.nullcontext(filepath_or_buffer)
+    else:
+        source = open(filepath_or_buffer, 'r', encoding=encoding, newline='')
+
+    with source as f:
+
+        lines = f if scan_lines is None else scan_lines(f)
+        lines = _normalize_shorthand_lines(lines, skiprows, comment_char)
+
+        reader = pd.read_csv(_LineReader(lines), **read_csv_kwargs)
+
+        if chunksize is None:
+            yield _normalize_shorthand(reader, fill_cols, drop_na)
+            return
+
+        with reader:
+            for chunk in reader:
+
+                chunk = _normalize_shorthand(
+                    chunk,
+                    fill_cols,
+                    drop_na,
+                    fill_values
+                )
+
+                if not chunk.empty:
+                    yield chunk
+
+
+def _diff_shorthand_rows(old, new):
+    '''
+    Compare two normalized shorthand inputs row by row.
+
+    Rows are compared by value after forward filling, so a row whose
+    text didn't change but whose filled values did is treated as
+    changed. Repeated rows are matched one for one.
+
+    Returns
+    -------
+    tuple
+        (rows in old but not in new, rows in new but not in old, rows
+        in both). The last element is a subset of new.
+    '''
+    old = old.reindex(columns=new.columns)
+
+    def row_keys(data):
+        # Number repeated rows so each copy has its own key
+        keys = pd.util.hash_pandas_object(data, index=False)
+        occurrence = keys.groupby(keys, sort=False).cumcount()
+        return pd.util.hash_pandas_object(
+            pd.DataFrame({'key': keys.array, 'occurrence': occurrence.array}),
+            index=False
+        ).set_axis(data.index)
+
+    old_keys = row_keys(old)
+    new_keys = row_keys(new)
+
+    new_row_was_in_old = new_keys.isin(old_keys)
+
+    removed = old.loc[~old_keys.isin(new_keys)]
+    added = new.loc[~new_row_was_in_old]
+    kept = new.loc[new_row_was_in_old]
+
+    return removed, added, kept
+
+
+class _UnlocalizedEdit(Exception):
+    '''
+    Raised when the rows changed by an edit of shorthand text can't be
+    found without reading the whole text.
+    '''
+
+
+def _count_common_lines(a, b, block_size=4096):
+    '''
+    Count the lines at the start of two lists of lines that are the same
+    in both. Lines are compared a block at a time, so unchanged text is
+    compared without a Python loop over its lines.
+    '''
+    length = min(len(a), len(b))
+    count = 0
+
+    while count < length:
+        stop = min(count + block_size, length)
+
+        if a[count:stop] != b[count:stop]:
+            while a[count] == b[count]:
+                count += 1
+            return count
+
+        count = stop
+
+    return count
+
+
+class _ShorthandLines:
+    '''
+    The lines of one version of csv-formatted shorthand text, with the
+    header and the values quoted across lines located so that ranges of
+    lines can be read without reading the rest of the text.
+
+    Raises _UnlocalizedEdit if skiprows isn't an int, if the header
+    isn't before line header_limit, or if comments could change where a
+    quoted value ends. Comments are stripped one line at a time before
+    the csv tokenizer reads the lines (see _lint_shorthand_lines).
+
+    Parameters
+    ----------
+    text : str
+        The shorthand text.
+
+    lines : list
+        text split at newline characters.
+
+    skiprows : int
+        Number of lines before the header.
+
+    comment_char : str
+        Character that starts comments.
+
+    fill_col : str or None
+        Label of the column that is forward filled, or None if no
+        column is forward filled.
+
+    header_limit : int
+        Index of the first line that can't be the header.
+    '''
+
+    def __init__(
+        self,
+        text,
+        lines,
+        skiprows,
+        comment_char,
+        fill_col,
+        header_limit
+    ):
+
+        if not isinstance(skiprows, int):
+            raise _UnlocalizedEdit('skiprows is not an int')
+
+        self.text = text
+        self.lines = lines
+        self.comment_char = comment_char
+        self.fill_col = fill_col
+        self._comment_regex = re.compile(r'(?<!\\)' + re.escape(comment_char))
+
+        # Find the header the way _normalize_shorthand_lines finds it
+        header = skiprows
+        while (header < len(lines)) and not lines[header].strip():
+            header += 1
+
+        if header >= header_limit:
+            raise _UnlocalizedEdit('The header or skipped lines changed')
+
+        self.header = header
+
+        self.line_starts = [0]
+        self.line_starts.extend(accumulate(len(line) + 1 for line in lines))
+
+        self._spans = self._quoted_spans()
+        self._span_starts = [first for first, last in self._spans]
+
+    def _has_comment(self, line):
+        return (
+            (self.comment_char in line)
+            and (self._comment_regex.search(line) is not None)
+        )
+
+    def _quoted_spans(self):
+        '''
+        Get a list of (first line, last line) pairs locating values that
+        are quoted across more than one line. Only lines with quote
+        characters are scanned.
+        '''
+        spans = []
+        lines = self.lines
+
+        pos = self.text.find('"', self.line_starts[self.header + 1])
+
+        while pos >= 0:
+
+            first = bisect.bisect_right(self.line_starts, pos) - 1
+            in_quote = _ends_in_quote(lines[first], False)
+
+            if self._has_comment(lines[first]):
+                stripped = _strip_line_comment(
+                    lines[first],
+                    self.comment_char,
+                    self._comment_regex
+                )
+                if _ends_in_quote(stripped, False) != in_quote:
+                    raise _UnlocalizedEdit('A comment contains a quote')
+
+            last = first
+
+            while in_quote:
+                last += 1
+
+                if (last == len(lines)) or self._has_comment(lines[last]):
+                    raise _UnlocalizedEdit('A quoted value is not closed')
+
+                in_quote = _ends_in_quote(lines[last], True)
+
+            if last > first:
+                spans.append((first, last))
+
+            pos = self.text.find('"', self.line_starts[last + 1])
+
+        return spans
+
+    def _overlaps_quoted_value(self, start, stop):
+        '''
+        True if any of lines[start:stop] is part of a value quoted across
+        lines. Spans don't overlap, so only the last one that begins
+        before stop can reach start.
+        '''
+        i = bisect.bisect_left(self._span_starts, stop) - 1
+        return (i >= 0) and (self._spans[i][1] >= start)
+
+    def starts_in_quoted_value(self, i):
+        '''
+        True if line i continues a value quoted on an earlier line.
+        '''
+        j = bisect.bisect_left(self._span_starts, i) - 1
+        return (j >= 0) and (self._spans[j][1] >= i)
+
+    def read_line_rows(self, start, stop):
+        '''
+        Read lines[start:stop] under the header with one row for every
+        line, blank lines included. The lines can't be part of values
+        quoted across lines.
+        '''
+        if self._overlaps_quoted_value(start, stop):
+            raise _UnlocalizedEdit('Lines are part of a quoted value')
+
+        lines = [self.lines[self.header]] + self.lines[start:stop]
+        lines = _normalize_shorthand_lines(
+            (line + '\n' for line in lines),
+            0,
+            self.comment_char
+        )
+
+        return pd.read_csv(
+            _LineReader(lines),
+            dtype=str,
+            skipinitialspace=True,
+            skip_blank_lines=False
+        )
+
+    def block_start(self, start, stop, last=False):
+        '''
+        Get the index of the first line in lines[start:stop] with a value
+        in the forward filled column, which starts a block of rows that
+        share the value, or the last such line if last is True. Lines
+        are read in growing batches from the end that is searched first.
+        Returns None if none of the lines starts a block.
+        '''
+        batch = 16
+
+        while start < stop:
+
+            if last:
+                lo, hi = max(start, stop - batch), stop
+            else:
+                lo, hi = start, min(stop, start + batch)
+
+            rows = self.read_line_rows(lo, hi)
+            starts = rows.index[rows[self.fill_col].notna().array]
+
+            if not starts.empty:
+                return lo + int(starts[-1] if last else starts[0])
+
+            if last:
+                stop = lo
+            else:
+                start = hi
+
+            batch *= 4
+
+        return None
+
+    def block_of_line(self, i, start, stop):
+        '''
+        Get the (start, stop) line indexes of the block of rows that
+        contains line i within lines[start:stop]. start must not be in
+        the middle of a block.
+        '''
+        if self.fill_col is None:
+            if self._overlaps_quoted_value(i, i + 1):
+                raise _UnlocalizedEdit('Line is part of a quoted value')
+            return i, i + 1
+
+        block_start = self.block_start(start, i + 1, last=True)
+        block_stop = self.block_start(i + 1, stop)
+
+        return (
+            start if block_start is None else block_start,
+            stop if block_stop is None else block_stop
+        )
+
+    def find_entries(self, candidates, ranges, read, max_reads=64):
+        '''
+        Get the candidate entry strings that are entries in rows of the
+        lines in ranges, a list of (start, stop) line indexes that begin
+        blocks of rows.
+
+        The text is searched for each candidate and the block of rows
+        around each match is read with read, which takes a list of lines
+        and returns normalized shorthand rows. Raises _UnlocalizedEdit
+        if a candidate matches more than max_reads blocks in which it
+        isn't an entry.
+        '''
+        columns = ['left_entry', 'right_entry', 'reference']
+
+        # Quote characters in entries are doubled in the text and a
+        # quote can end a quoted part of an entry anywhere, so the
+        # longest part of an entry without quotes is searched for with
+        # optional quotes between its characters. Comment characters
+        # in entries are escaped in the text.
+        separators = re.compile('["{}]'.format(re.escape(self.comment_char)))
+
+        found = set()
+        read_blocks = set()
+
+        for entry in candidates:
+
+            if entry in found:
+                continue
+
+            needle = max(separators.split(entry), key=len)
+            if not needle:
+                raise _UnlocalizedEdit('An entry has no searchable text')
+
+            needle = re.compile('"?'.join(map(re.escape, needle)))
+
+            reads = 0
+
+            for start, stop in ranges:
+
+                end = self.line_starts[stop]
+                match = needle.search(self.text, self.line_starts[start], end)
+
+                while (match is not None) and (entry not in found):
+
+                    line = bisect.bisect_right(self.line_starts, match.start())
+                    line -= 1
+                    block = self.block_of_line(line, start, stop)
+
+                    if block not in read_blocks:
+                        read_blocks.add(block)
+
+                        reads += 1
+                        if reads > max_reads:
+                            raise _UnlocalizedEdit('Too many matches')
+
+                        rows = read(self.lines[block[0]:block[1]])
+                        found.update(rows[columns].stack().dropna())
+
+                    match = needle.search(
+                        self.text,
+                        self.line_starts[block[1]],
+                        end
+                    )
+
+        return found
+
+
+def _diff_shorthand_edit(
+    old_text,
+    new_text,
+    skiprows,
+    comment_char,
+    fill_cols,
+    drop_na,
+    encoding
+):
+    '''
+    Get the rows of shorthand text removed and added by an edit by
+    reading only the lines around the edit.
+
+    Lines at the start and end of the text that didn't change are
+    skipped, and the changed lines are widened to whole blocks of rows
+    that share a forward filled value. Rows in the widened lines of each
+    version are compared with _diff_shorthand_rows. Entries of removed
+    or added rows are searched for in the unchanged lines to find the
+    ones that are also parsed from unchanged rows.
+
+    Raises _UnlocalizedEdit if the changed rows can't be found this way.
+
+    Returns
+    -------
+    tuple
+        (rows in old but not in new, rows in new but not in old, entry
+        strings of unchanged rows in either version of the text)
+    '''
+    if len(fill_cols) > 1:
+        raise _UnlocalizedEdit('More than one column is forward filled')
+
+    fill_col = fill_cols[0] if fill_cols else None
+
+    old_lines = old_text.split('\n')
+    new_lines = new_text.split('\n')
+
+    start = _count_common_lines(old_lines, new_lines)
+    end = _count_common_lines(old_lines[start:][::-1], new_lines[start:][::-1])
+    old_stop = len(old_lines) - end
+    new_stop = len(new_lines) - end
+
+    new = _ShorthandLines(
+        new_text,
+        new_lines,
+        skiprows,
+        comment_char,
+        fill_col,
+        start
+    )
+    header = new_lines[new.header]
+
+    if new.starts_in_quoted_value(start):
+        raise _UnlocalizedEdit('The edit starts in a quoted value')
+    if new.starts_in_quoted_value(new_stop):
+        raise _UnlocalizedEdit('The edit ends in a quoted value')
+
+    # Quoted values in the old lines must be closed before the
+    # unchanged lines that follow them
+    old_window = old_lines[start:old_stop]
+    _ShorthandLines(
+        '\n'.join([header] + old_window),
+        [header] + old_window,
+        0,
+        comment_char,
+        fill_col,
+        1
+    )
+
+    # Rows are forward filled from the start of their block, so the
+    # blocks that contain changed lines are read in full
+    if fill_col is not None:
+        block_start = new.block_start(new.header + 1, start, last=True)
+        start = new.header + 1 if block_start is None else block_start
+
+        block_stop = new.block_start(new_stop, len(new_lines))
+        block_stop = len(new_lines) if block_stop is None else block_stop
+        old_stop += block_stop - new_stop
+        new_stop = block_stop
+
+    def read(lines):
+        return next(_read_shorthand(
+            io.StringIO('\n'.join([header] + lines)),
+            0,
+            comment_char,
+            fill_cols,
+            drop_na,
+            encoding
+        ))
+
+    removed, added, kept = _diff_shorthand_rows(
+        read(old_lines[start:old_stop]),
+        read(new_lines[start:new_stop])
+    )
+
+    columns = ['left_entry', 'right_entry', 'reference']
+    seen_entries = set(kept[columns].stack().dropna())
+
+    candidates = pd.concat([removed[columns], added[columns]])
+    candidates = set(candidates.stack().dropna()) - seen_entries
+
+    seen_entries.update(new.find_entries(
+        candidates,
+        [(new.header + 1, start), (new_stop, len(new_lines))],
+        read
+    ))
+
+    return removed, added, frozenset(seen_entries)
+
+
+def _diff_shorthand_texts(
+    old_text,
+    new_text,
+    skiprows,
+    comment_char,
+    fill_cols,
+    drop_na,
+    encoding
+):
+    '''
+    Get the rows of shorthand text removed and added by an edit.
+
+    The lines around the edit are read with _diff_shorthand_edit if
+    possible. Otherwise both versions of the text are normalized and
+    compared row by row.
+
+    Returns
+    -------
+    tuple
+        (rows in old but not in new, rows in new but not in old, entry
+        strings of unchanged rows)
+    '''
+    try:
+        return _diff_shorthand_edit(
+            old_text,
+            new_text,
+            skiprows,
+            comment_char,
+            fill_cols,
+            drop_na,
+            encoding
+        )
+
+    except (_UnlocalizedEdit, pd.errors.ParserError):
+        pass
+
+    old, new = [
+        next(_read_shorthand(
+            io.StringIO(text),
+            skiprows,
+            comment_char,
+            fill_cols,
+            drop_na,
+            encoding
+        ))
+        for text in [old_text, new_text]
+    ]
+
+    removed, added, kept = _diff_shorthand_rows(old, new)
+
+    seen_entries = kept[['left_entry', 'right_entry', 'reference']]
+    seen_entries = frozenset(seen_entries.stack().dropna())
+
+    return removed, added, seen_entries
+
+
+def _split_rows(chunks, num_blocks):
+    '''
+    Split each DataFrame generated by chunks into num_blocks blocks of
+    consecutive rows with approximately equal lengths.
+    '''
+    for data in chunks:
+
+        block_size = -(-len(data) // num_blocks)
+
+        for start in range(0, len(data), block_size):
+            yield data.iloc[start:start + block_size]
+
+
+def _chunk_entries(data):
+    '''
+    Get the set of entry strings in a normalized shorthand chunk.
+    '''
+    entries = data[['left_entry', 'right_entry', 'reference']]
+    return set(entries.stack().dropna())
+
+
+def _pair_with_seen_entries(chunks):
+    '''
+    Take an iterable of normalized shorthand chunks and yield each chunk
+    along with a set of its entry strings that were in earlier chunks.
+    Only entries of the chunk itself are paired with it, so the sets
+    sent to worker processes grow with the chunks, not with the input.
+    '''
+    seen_entries = set()
+
+    for data in chunks:
+
+        entries = _chunk_entries(data)
+
+        yield data, frozenset(seen_entries & entries)
+
+        seen_entries.update(entries)
+
+
+def _parse_in_processes(parse, chunks, args, workers):
+    '''
+    Call parse(data, *args, seen_entries) for each pair of values
+    generated by chunks in a pool of worker processes. Results are
+    yielded in the same order as the chunks. No more than two chunks
+    per worker are held in memory at one time.
+    '''
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        pending = deque()
+
+        for data, seen_entries in chunks:
+
+            pending.append(executor.submit(parse, data, *args, seen_entries))
+
+            if len(pending) >= 2*workers:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+# Rows per batch when malformed rows are quarantined and no chunksize
+# is given. Only batches that fail are bisected, so this bounds the
+# number of rows parsed again for each malformed row.
+_QUARANTINE_BATCH_SIZE = 10000
+
+# Rows parsed to measure the memory used per row when parsing within a
+# memory budget
+_MEMORY_SAMPLE_ROWS = 1000
+
+_MEMORY_UNITS = {
+    '': 1,
+    'B': 1,
+    'K': 2**10,
+    'KB': 2**10,
+    'M': 2**20,
+    'MB': 2**20,
+    'G': 2**30,
+    'GB': 2**30
+}
+
+
+def _parse_memory_size(size):
+    '''
+    Convert a number of bytes or a string like "512MB" or "2G" to an
+    integer number of bytes.
+    '''
+    if isinstance(size, str):
+
+        match = re.fullmatch(r'\s*([0-9]*\.?[0-9]+)\s*([A-Za-z]*)\s*', size)
+
+        if (match is None) or (match.group(2).upper() not in _MEMORY_UNITS):
+            raise ValueError(
+                'Could not read a memory size from "{}"'.format(size)
+            )
+
+        size = float(match.group(1)) * _MEMORY_UNITS[match.group(2).upper()]
+
+    size = int(size)
+
+    if size < 1:
+        raise ValueError('memory_budget must be a positive number of bytes')
+
+    return size
+
+
+def _resident_set_size():
+    '''
+    Get the resident set size of this process in bytes, or a missing
+    value if it can't be read on this platform.
+    '''
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return pd.NA
+
+
+def _peak_resident_set_size():
+    '''
+    Get the peak resident set size of this process in bytes, or a
+    missing value if it can't be read on this platform.
+    '''
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])*1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except (ImportError, OSError):
+        return pd.NA
+
+    return peak if sys.platform == 'darwin' else peak*1024
+
+
+def _reset_peak_resident_set_size():
+    '''
+    Reset the peak resident set size of this process to its current
+    resident set size where the platform allows it. Elsewhere the peak
+    keeps growing for the life of the process.
+    '''
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+@contextlib.contextmanager
+def _traced_memory(trace=True):
+    '''
+    Trace memory allocations with tracemalloc inside the context if
+    trace is True. Tracing that was started before the context is left
+    running when the context exits.
+    '''
+
+    started = trace and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+
+    try:
+        yield
+
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+class _MemoryReport:
+    '''
+    Records the memory used by this process in each stage of reading
+    an input. Each sample closes the stage it names: the interval since
+    the previous sample is counted as part of that stage. A stage can be
+    sampled many times and the report keeps the largest values.
+
+    rss is the resident set size of the process when the stage was
+    sampled. peak_rss is the peak resident set size of the process
+    during the stage. Both are read from the operating system, so
+    sampling is cheap enough to do around every chunk. On Linux the
+    peak is reset after each sample, so each stage has its own peak.
+    Elsewhere peak_rss is the peak of the process up to the sample.
+    '''
+
+    def __init__(self, report=None):
+
+        self.stages = {}
+
+        # A new report measures the first stage from when it's made. A
+        # report continued from an earlier one measures the next stage
+        # from the last sample of the earlier report.
+        if report is None:
+            _reset_peak_resident_set_size()
+
+        else:
+            for row in report.itertuples(index=False):
+                self.stages[row.stage] = (row.rss, row.peak_rss)
+
+    def sample(self, stage):
+
+        rss = _resident_set_size()
+        peak_rss = _peak_resident_set_size()
+        _reset_peak_resident_set_size()
+
+        if stage in self.stages:
+            rss, peak_rss = pd.DataFrame(
+                [(rss, peak_rss), self.stages[stage]],
+                dtype=pd.Int64Dtype()
+            ).max()
+
+        self.stages[stage] = (rss, peak_rss)
+
+    def to_frame(self):
+
+        return pd.DataFrame(
+            [(stage, *usage) for stage, usage in self.stages.items()],
+            columns=['stage', 'rss', 'peak_rss']
+        ).astype({'rss': pd.Int64Dtype(), 'peak_rss': pd.Int64Dtype()})
+
+
+def _parse_bytes_per_row(parse, rows):
+    '''
+    Measure the memory allocated by parse(rows) at its peak, per row of
+    input. parse is passed a copy of rows.
+    '''
+
+    with _traced_memory():
+
+        rows = rows.copy()
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+
+        parse(rows)
+        peak = tracemalloc.get_traced_memory()[1]
+
+    return (peak - start)/len(rows)
+
+
+def _empty_parse_errors(big_id_dtype=pd.Int32Dtype()):
+    '''
+    Create an empty table of rows that were excluded from parsing.
+    '''
+    return pd.DataFrame({
+        'csv_row': pd.Series(dtype=big_id_dtype),
+        'csv_col': pd.Series(dtype=pd.StringDtype()),
+        'string': pd.Series(dtype=pd.StringDtype()),
+        'error_type': pd.Series(dtype=pd.StringDtype()),
+        'message': pd.Series(dtype=pd.StringDtype())
+    })
+
+
+def _parse_quarantining_errors(parse, data, big_id_dtype=pd.Int32Dtype()):
+    '''
+    Call parse(data) and, if it raises an exception, bisect the rows of
+    data until the rows that can't be parsed on their own are found.
+    Those rows are excluded and parse is called once more for the rest.
+
+    The column of each excluded row is located by parsing the row again
+    with one value at a time replaced by a missing value. If no single
+    value is to blame, csv_col is missing.
+
+    Parameters
+    ----------
+    parse : callable
+        Takes a DataFrame of rows and returns a parsed result. parse is
+        always passed a copy of the rows, so it may mutate its argument.
+
+    data : pandas.DataFrame
+        Rows to parse. The index is reported as the csv row of each
+        excluded row.
+
+    Returns
+    -------
+    tuple
+        (result of parsing the remaining rows or None if every row was
+        excluded, DataFrame of excluded rows with columns csv_row,
+        csv_col, string, error_type, and message)
+    '''
+    try:
+        return parse(data.copy()), _empty_parse_errors(big_id_dtype)
+
+    except Exception as error:
+        first_error = error
+
+    failures = []
+
+    # Blocks are split until a failing block has one row. Blocks that
+    # parse are not split further.
+    pending = [(data, first_error)]
+
+    while pending:
+
+        rows, error = pending.pop()
+
+        if error is None:
+            try:
+                parse(rows.copy())
+                continue
+
+            except Exception as e:
+                error = e
+
+        if len(rows) == 1:
+            failures.append((rows, error))
+            continue
+
+        half = len(rows)//2
+        pending.append((rows.iloc[half:], None))
+        pending.append((rows.iloc[:half], None))
+
+    errors = []
+
+    for row, error in failures:
+
+        csv_col = pd.NA
+
+        for column in row.columns[row.iloc[0].notna().array]:
+
+            masked = row.copy()
+            masked[column] = pd.NA
+
+            try:
+                parse(masked)
+
+            except Exception:
+                continue
+
+            csv_col = column
+            break
+
+        errors.append({
+            'csv_row': row.index[0],
+            'csv_col': csv_col,
+            'string': pd.NA if pd.isna(csv_col) else str(row.iloc[0][csv_col]),
+            'error_type': type(error).__name__,
+            'message': str(error)
+        })
+
+    errors = pd.DataFrame(errors, columns=_empty_parse_errors().columns)
+    errors = errors.astype(_empty_parse_errors(big_id_dtype).dtypes)
+
+    failed_rows = errors['csv_row'].array
+    data = data.loc[~data.index.isin(failed_rows)]
+
+    # Errors that only happen when rows are parsed together can't be
+    # isolated, so they are raised
+    if data.empty:
+        return None, errors
+
+    return parse(data.copy()), errors
+
+
+def _parse_chunks_quarantining(parse, chunks, args, errors, big_id_dtype):
+    '''
+    Call parse(data, *args, seen_entries) for each normalized chunk of
+    shorthand, excluding rows that can't be parsed (see
+    _parse_quarantining_errors). Tables of excluded rows are appended to
+    the errors list. Only entries in rows that were parsed are passed
+    to later chunks as seen entries.
+    '''
+    seen_entries = set()
+
+    for data in chunks:
+
+        chunk_seen_entries = frozenset(seen_entries & _chunk_entries(data))
+
+        parsed, chunk_errors = _parse_quarantining_errors(
+            lambda rows: parse(rows, *args, chunk_seen_entries),
+            data,
+            big_id_dtype
+        )
+        errors.append(chunk_errors)
+
+        if parsed is None:
+            continue
+
+        data = data.loc[~data.index.isin(chunk_errors['csv_row'].array)]
+        seen_entries.update(_chunk_entries(data))
+
+        yield parsed
+
+
+def _ends_in_quote(line, in_quote):
+    '''
+    Scan one line of csv text the way the csv tokenizer reads it and
+    return True if the line ends inside a quoted value. in_quote is True
+    if the line starts inside a quoted value from an earlier line.
+    '''
+    i = 0
+    field_start = not in_quote
+
+    while i < len(line):
+
+        if in_quote:
+            j = line.find('"', i)
+
+            if j < 0:
+                return True
+
+            # Doubled quotes are escaped quotes within the value
+            if line.startswith('"', j + 1):
+                i = j + 2
+            else:
+                in_quote = False
+                field_start = False
+                i = j + 1
+
+        else:
+            # Quotes only start a quoted value at the beginning of a
+            # value, after any initial space
+            if field_start:
+                k = len(line) - len(line[i:].lstrip(' '))
+
+                if line.startswith('"', k):
+                    in_quote = True
+                    i = k + 1
+                    continue
+
+            j = line.find(',', i)
+
+            if j < 0:
+                return False
+
+            i = j + 1
+            field_start = True
+
+    return in_quote
+
+
+def _lint_shorthand_lines(lines, skiprows, comment_char, problems):
+    '''
+    Yield raw lines of csv-formatted shorthand text unchanged while
+    checking that quoted values are closed and that comments aren't
+    inside values that span more than one line. Comments are stripped
+    one line at a time, so a comment on such a line can remove the
+    quote that closes the value.
+
+    Problems are appended to the problems list as tuples of (csv_row,
+    csv_col, string, error_type, message). csv rows are counted the way
+    pandas.read_csv counts them, leaving out blank lines and lines that
+    skiprows skips (see _skipped_line_test).
+    '''
+    unescaped_comment_regex = re.compile(
+        r'(?<!\\)' + re.escape(comment_char)
+    )
+
+    lines = enumerate(lines)
+    is_skipped = _skipped_line_test(skiprows)
+
+    # Skipped lines and the header are read like
+    # _normalize_shorthand_lines reads them
+    for i, line in lines:
+        yield line
+
+        if (not is_skipped(i)) and line.strip():
+            break
+
+    csv_row = -1
+    in_quote = False
+
+    for i, line in lines:
+        yield line
+
+        starts_in_quote = in_quote
+
+        if not in_quote:
+            if is_skipped(i) or (not line.strip()):
+                continue
+
+            csv_row += 1
+            quote_row = csv_row
+
+        if in_quote or ('"' in line):
+            in_quote = _ends_in_quote(line, in_quote)
+
+        if (
+            (starts_in_quote or in_quote)
+            and (comment_char in line)
+            and (unescaped_comment_regex.search(line) is not None)
+        ):
+            problems.append((
+                csv_row,
+                pd.NA,
+                line.rstrip('\r\n'),
+                'comment',
+                'Comment in a quoted value that spans lines. Escape the '
+                'comment character or close the quote on the same line.'
+            ))
+
+    if in_quote:
+        problems.append((
+            quote_row,
+            pd.NA,
+            pd.NA,
+            'quote',
+            'Quoted value is never closed'
+        ))
+
+
+def _locate_carried_values(data, fill_cols, previous_row=None):
+    '''
+    Locate values in fill_cols that repeat the value on the row above
+    them, which is where forward filling carries a value down. A value
+    written out again on the next row is indistinguishable from a
+    carried one. previous_row holds the fill_cols values of the last
+    row before data, if data continues an earlier chunk.
+
+    Returns
+    -------
+    pandas.MultiIndex
+        The (csv_row, csv_col) location of each carried value
+    '''
+    filled = data.reindex(columns=fill_cols)
+
+    if previous_row is not None:
+        filled = pd.concat([previous_row.to_frame().T, filled])
+
+    carried = (filled == filled.shift()).iloc[len(filled) - len(data):]
+    carried = carried.stack()
+
+    return carried.loc[carried].index
+
+
+def _lint_shorthand_entries(
+    data,
+    compiled_syntax,
+    default_entry_prefix,
+    s_d_delimiter,
+    link_prefix_pairs,
+    carried=None
+):
+    '''
+    Check normalized shorthand data against an entry syntax and a set of
+    link syntax prefix pairs without parsing entries into items.
+
+    Values at the locations in carried were forward filled from the row
+    above and are not reported again. Problems with any other value are
+    reported at every row and column the value was written in.
+
+    Returns
+    -------
+    list
+        Tuples of (csv_row, csv_col, string, error_type, message)
+    '''
+    item_separator = compiled_syntax.item_separator
+    problems = []
+
+    # Values that were written in the input rather than carried down
+    # by forward filling
+    written = data.stack().dropna()
+    if carried is not None:
+        written = written.loc[~written.index.isin(carried)]
+
+    # Values that end in an escape character escape nothing. Only
+    # values ending in a backslash are matched against the pattern.
+    values = written.str.rstrip()
+    values = values.loc[values.str.endswith('\\')]
+    dangling_escape = values.str.contains(r'(?<!\\)(?:\\\\)*\\$')
+
+    for (csv_row, csv_col), value in values.loc[dangling_escape].items():
+        problems.append((
+            csv_row,
+            csv_col,
+            value,
+            'escape',
+            'Value ends with an escape character that escapes nothing'
+        ))
+
+    all_entries = data[['left_entry', 'right_entry', 'reference']]
+    all_entries = all_entries.stack().dropna()
+
+    if all_entries.empty:
+        return problems
+
+    # Forward filled entries are repeated on many rows, so each distinct
+    # entry is checked once. Its problems are collected as (location,
+    # error_type, message) and reported below at every location the
+    # entry was written in.
+    distinct_entries = all_entries.drop_duplicates()
+    entries = distinct_entries.str.strip()
+    entry_problems = []
+
+    # Split off tags and locate entry prefixes the way
+    # bg.entry_parsing.parse_entries does
+    strings = entries.str.split(
+        compiled_syntax.tag_sep_regex,
+        n=1,
+        regex=True
+    ).str[0]
+    prefixes = strings.str.extract(compiled_syntax.prefixes_regex)[0]
+    prefix_lengths = (prefixes + item_separator).str.len().fillna(0)
+    prefixes = prefixes.fillna(default_entry_prefix)
+
+    is_s_d = prefixes == compiled_syntax.regex_item_separator
+
+    # Strip trailing separators and prefixes and count bare separators
+    # to count the items in each entry
+    strings = strings.str.rstrip(item_separator)
+    bodies = pd.concat([
+        group.str.slice(length)
+        for length, group in strings.groupby(prefix_lengths.astype(int))
+    ]).loc[strings.index]
+
+    separator_pattern = compiled_syntax.unknown_prefix_tokenizer
+    separator_pattern = separator_pattern.item_separator_regex.pattern
+    item_counts = bodies.str.count(separator_pattern) + 1
+
+    # _EntryTokenizer can't split entries whose first item after the
+    # prefix is empty. They have self-descriptive syntax that isn't
+    # implemented, so the parser raises NotImplementedError for them.
+    first_items = bodies.str.split(separator_pattern, n=1, regex=True).str[0]
+    unparseable = first_items == ''
+
+    for idx in unparseable.loc[unparseable].index:
+        entry_problems.append((
+            idx,
+            'self_descriptive',
+            'Entry begins with an item separator, and self-descriptive '
+            'syntax is not yet implemented'
+        ))
+
+    max_items = prefixes.map({
+        prefix: tokenizer.num_items
+        for prefix, tokenizer in compiled_syntax.tokenizers.items()
+    })
+    too_many_items = ~is_s_d & ~unparseable & (item_counts > max_items)
+
+    for idx in too_many_items.loc[too_many_items].index:
+        entry_problems.append((
+            idx,
+            'item_count',
+            'Entry has {} items but the entry syntax for prefix "{}" has {}'
+            .format(
+                item_counts.loc[idx],
+                prefixes.loc[idx],
+                int(max_items.loc[idx])
+            )
+        ))
+
+    # The first item in a self-descriptive entry is its node type, which
+    # can't be an entry prefix in the syntax. Every other item has a
+    # link type, node type, and string separated by delimiters.
+    s_d_items = bodies.loc[is_s_d & ~unparseable].str.split(
+        separator_pattern,
+        regex=True
+    )
 
-    cross_dplcts = to_copy.merge(
-        to_fill,
-        on=['string_csv_row', 'string_csv_col'],
-        how='right'
+    for idx, items in s_d_items.items():
+
+        if items[0] in compiled_syntax.tokenizers:
+            entry_problems.append((
+                idx,
+                'entry_prefix',
+                'Self-descriptive entry uses the entry prefix "{}" as its '
+                'node type'.format(items[0])
+            ))
+
+        if any(item.count(s_d_delimiter) != 2 for item in items[1:]):
+            entry_problems.append((
+                idx,
+                'self_descriptive',
+                'Self-descriptive items must have exactly two "{}" '
+                'delimiters'.format(s_d_delimiter)
+            ))
+
+    # Report each problem at every location its entry was written in
+    written_entries = written.reindex(all_entries.index).dropna()
+    problem_entries = distinct_entries.loc[
+        [idx for idx, _, _ in entry_problems]
+    ]
+    written_entries = written_entries.loc[
+        written_entries.isin(problem_entries)
+    ]
+    locations = {}
+    for location, entry in written_entries.items():
+        locations.setdefault(entry, []).append(location)
+
+    for idx, error_type, message in entry_problems:
+        for csv_row, csv_col in locations.get(distinct_entries.loc[idx], []):
+            problems.append((
+                csv_row,
+                csv_col,
+                entries.loc[idx],
+                error_type,
+                message
+            ))
+
+    if link_prefix_pairs is None:
+        return problems
+
+    # Rows with a left and right entry are linked by the link syntax
+    # rules for their pair of entry prefixes
+    prefixes = pd.Series(
+        prefixes.mask(is_s_d | unparseable).array,
+        index=distinct_entries.array
     )
-    cross_dplcts = cross_dplcts['right_entry_prefix_id'].array
+    pairs = all_entries.map(prefixes).unstack()
+    pairs = pairs.reindex(columns=['left_entry', 'right_entry']).dropna()
+    pair_in_syntax = [
+        pair in link_prefix_pairs
+        for pair in zip(pairs['left_entry'], pairs['right_entry'])
+    ]
+    pairs = pairs.loc[[not in_syntax for in_syntax in pair_in_syntax]]
 
-    L_prefixes.loc[
-        L_missing_pfix,
-        'left_entry_prefix_id'
-    ] = cross_dplcts
+    for csv_row, (left, right) in pairs.iterrows():
+        problems.append((
+            csv_row,
+            'right_entry',
+            all_entries.loc[(csv_row, 'right_entry')].strip(),
+            'link_syntax',
+            'The link syntax has no links from entry prefix "{}" to entry '
+            'prefix "{}"'.format(left, right)
+        ))
+
+    return problems
 
 
 class Shorthand:
@@ -591,7 +2132,7 @@ class Shorthand:
                 self.entry_syntax = f.read()
 
         # Validate the entry syntax
-        entry_syntax = bg.syntax_parsing.validate_entry_syntax(
+        bg.syntax_parsing.validate_entry_syntax(
             self.entry_syntax,
             case_sensitive=syntax_case_sensitive,
             allow_redundant_items=allow_redundant_items
@@ -613,15 +2154,53 @@ class Shorthand:
 
             # Validate the link syntax to raise any errors now without
             # storing the validated data
-            bg.syntax_parsing._validate_link_syntax(
+            bg.syntax_parsing.validate_link_syntax(
                 self.link_syntax,
-                entry_syntax,
+                self.entry_syntax,
                 case_sensitive=self.syntax_case_sensitive
             )
 
+    def _compile_entry_syntax(self, item_separator):
+        '''
+        Validate the entry syntax and compile it for the given item
+        separator. Compiled syntaxes are stored on the Shorthand
+        instance so they're only built once.
+
+        Returns
+        -------
+        bg.entry_parsing.CompiledEntrySyntax
+        '''
+        key = (
+            self.entry_syntax,
+            self.syntax_case_sensitive,
+            self.allow_redundant_items,
+            item_separator
+        )
+
+        try:
+            compiled_syntaxes = self._compiled_entry_syntaxes
+        except AttributeError:
+            compiled_syntaxes = {}
+            self._compiled_entry_syntaxes = compiled_syntaxes
+
+        if key not in compiled_syntaxes:
+
+            entry_syntax = bg.syntax_parsing.validate_entry_syntax(
+                self.entry_syntax,
+                case_sensitive=self.syntax_case_sensitive,
+                allow_redundant_items=self.allow_redundant_items
+            )
+
+            compiled_syntaxes[key] = bg.entry_parsing.CompiledEntrySyntax(
+                entry_syntax,
+                item_separator
+            )
+
+        return compiled_syntaxes[key]
+
     def _apply_syntax(
         self,
-        filepath_or_buffer,
+        data,
         item_separator,
         default_entry_prefix,
         space_char,
@@ -629,42 +2208,23 @@ class Shorthand:
         na_node_type,
         input_string,
         input_node_type,
-        skiprows,
-        comment_char,
-        fill_cols,
-        drop_na,
         big_id_dtype,
         small_id_dtype,
         list_position_base,
         s_d_delimiter,
-        encoding
+        entry_cache=None,
+        seen_entries=None
     ):
         '''
-        Takes a file-like object and parses it according to the
+        Takes normalized shorthand data and parses it according to the
         definitions in Shorthand.entry_syntax and Shorthand.link_syntax.
 
 
         Parameters
         ----------
-        filepath_or_buffer : str, path object, or file-like object
-            A path or file-like object that returns csv-formatted text.
-            "Path" is broadly defined and includes URLs. See
-            pandas.read_csv documentation for details.
-
-        skiprows : list-like, int or callable
-            If int, number of lines to skip at the beginning of the
-            input file. If list-like, 0-indexed set of line numbers to
-            skip. See pandas.read_csv documentation for details.
-
-        comment_char : str
-            Indicates the remainder of a line should not be parsed.
-
-        fill_cols : scalar or non-string iterable
-            Label(s) of columns in the input file to forward fill.
-
-        drop_na : scalar or non-string iterable
-            Column labels. Rows will be dropped if they have null values
-            in these columns.
+        data : pandas.DataFrame
+            Shorthand input generated by _normalize_shorthand. The
+            index must be the csv row of each line of input.
 
         big_id_dtype : type
             dtype for large pandas.Series of integer ID values.
@@ -676,6 +2236,17 @@ class Shorthand:
             Index value to be assigned to first element in items with
             list delimiters.
 
+        entry_cache : bg.entry_parsing.EntryParseCache or None
+            An on-disk cache of expanded entries. If not None, only
+            entries that aren't in the cache are split into items.
+
+        seen_entries : set or None, default None
+            Entry strings parsed from earlier chunks of the same input.
+            Entries in this set are parsed so links between entries can
+            be generated, but links between the entries and their
+            items, tags, or the input text are not created again. Only
+            entries of this chunk need to be in the set.
+
         Returns
         -------
         dict
@@ -704,24 +2275,6 @@ class Shorthand:
             'item_labels': pandas.Series with dtype str. Index type is
                 small_id_dtype.
         '''
-        data = pd.read_csv(
-            filepath_or_buffer,
-            skiprows=skiprows,
-            skipinitialspace=True,
-            encoding=encoding
-        )
-
-        # see bg.util.set_string_dtype docstring for comment on new
-        # pandas string dtype
-        # shnd_input = bg.util.set_string_dtype(shnd_input)
-
-        data = _normalize_shorthand(
-            data,
-            comment_char,
-            fill_cols,
-            drop_na
-        )
-
         # Get any metadata for links between entries
         has_link_metadata = data['link_tags_or_override'].notna()
         link_metadata = data.loc[has_link_metadata, 'link_tags_or_override']
@@ -799,6 +2352,7 @@ class Shorthand:
             # columns of the distinct string value for each duplicate
             # string
             dplct_entries = dplct_entries.map(distinct_string_map)
+            del distinct_string_map
             dplct_entries = pd.DataFrame(
                 tuple(dplct_entries.array),
                 columns=['string_csv_row', 'string_csv_col'],
@@ -833,6 +2387,11 @@ class Shorthand:
                 'string_csv_col'
             ])
 
+        # Locate entries that were parsed from earlier chunks of input
+        if seen_entries is not None:
+            entry_was_seen = data.isin(seen_entries)
+            entry_was_seen = entry_was_seen.loc[entry_was_seen].index
+
         # Remove clearspace around the entry strings
         data = data.str.strip()
 
@@ -841,21 +2400,19 @@ class Shorthand:
         *********************************************'''
 
         # Read the entry syntax
-        entry_syntax = bg.syntax_parsing.validate_entry_syntax(
-            self.entry_syntax,
-            case_sensitive=self.syntax_case_sensitive,
-            allow_redundant_items=self.allow_redundant_items
-        )
+        compiled_syntax = self._compile_entry_syntax(item_separator)
+        entry_syntax = compiled_syntax.entry_syntax
 
         # Parse entries in the input text
         data = bg.entry_parsing.parse_entries(
             data,
-            entry_syntax,
+            compiled_syntax,
             item_separator,
             default_entry_prefix,
             space_char,
             na_string_values,
-            s_d_delimiter
+            s_d_delimiter,
+            entry_cache
         )
         data = data.reset_index()
         data = data.rename(
@@ -866,6 +2423,13 @@ class Shorthand:
                 'level_3': 'item_label'
             }
         )
+        # Downcast the csv indexes as soon as they are columns so the
+        # copies of data made below are smaller
+        data = data.astype({
+            'csv_row': big_id_dtype,
+            'csv_col': pd.UInt8Dtype()
+        })
+
         # replace missing entry prefixes with default value
         prefix_isna = data['entry_prefix'].isna()
         data.loc[prefix_isna, 'entry_prefix'] = default_entry_prefix
@@ -875,52 +2439,6 @@ class Shorthand:
         null_strings = data['string'].isin(na_string_values)
         data.loc[null_strings, 'node_type'] = na_node_type
 
-        dtypes = {
-            'csv_row': big_id_dtype,
-            'csv_col': pd.UInt8Dtype(),
-            'entry_prefix': pd.StringDtype(),
-            'item_label': pd.StringDtype(),
-            'string': pd.StringDtype(),
-            'node_type': pd.StringDtype(),
-            'link_type': pd.StringDtype(),
-            'node_tags': pd.StringDtype()
-        }
-
-        data = data.astype(dtypes)
-        data.index = data.index.astype(big_id_dtype)
-
-        '''******************************************************
-        data is currently a DataFrame with these columns:
-            ['csv_row', 'csv_col', 'entry_prefix', 'item_label',
-             'string', 'node_type', 'link_type', 'node_tags']
-        ******************************************************'''
-
-        # Map string-valued entry prefixes to integer IDs
-        entry_prefix_id_map = _create_id_map(
-            data['entry_prefix'],
-            dtype=small_id_dtype
-        )
-        # Replace entry prefixes in the mutable data with integer IDs
-        data['entry_prefix'] = data['entry_prefix'].map(
-            entry_prefix_id_map
-        )
-        data = data.rename(
-            columns={'entry_prefix': 'entry_prefix_id'}
-        )
-
-        # Map string-valued item labels to integer IDs
-        item_label_id_map = _create_id_map(
-            data['item_label'],
-            dtype=small_id_dtype
-        )
-        # Replace item labels in the mutable data with integer IDs
-        data['item_label'] = data['item_label'].map(
-            item_label_id_map
-        )
-        data = data.rename(
-            columns={'item_label': 'item_label_id'}
-        )
-
         # These link types are required to complete linking operations
         # later
         '''
@@ -929,73 +2447,86 @@ class Shorthand:
         '''
         link_types = pd.Series(['entry', 'tagged'])
 
-        # Map string-valued link types to integer IDs
-        link_types = _create_id_map(
-            pd.concat([link_types, data['link_type']]),
-            dtype=small_id_dtype
-        )
-        # Replace link types in the mutable data with integer IDs
-        data['link_type'] = data['link_type'].map(
-            link_types
-        )
-        data = data.rename(
-            columns={'link_type': 'link_type_id'}
-        )
+        label_domains = {
+            'entry_prefix': pd.Series(data['entry_prefix'].unique()),
+            'item_label': pd.Series(data['item_label'].unique()),
+            'link_type': pd.concat([
+                link_types,
+                pd.Series(data['link_type'].unique())
+            ])
+        }
+
+        # Replace entry prefixes, item labels, and link types with
+        # small integer IDs before converting the other columns, so the
+        # labels are never copied into string-valued columns
+        label_id_maps = {}
+
+        for label, domain in label_domains.items():
+
+            # Map string-valued labels to integer IDs
+            label_id_maps[label] = _create_id_map(
+                domain.astype(pd.StringDtype()),
+                dtype=small_id_dtype
+            )
+            # Replace labels in the mutable data with integer IDs
+            data[label] = data[label].map(label_id_maps[label]).astype(
+                small_id_dtype
+            )
+
+        data = data.rename(columns={
+            'entry_prefix': 'entry_prefix_id',
+            'item_label': 'item_label_id',
+            'link_type': 'link_type_id'
+        })
+
+        entry_prefix_id_map = label_id_maps['entry_prefix']
+        item_label_id_map = label_id_maps['item_label']
         # Mutate link_types into a series whose index is integer IDs and
         # whose values are string-valued link types
+        link_types = label_id_maps['link_type']
         link_types = pd.Series(link_types.index, index=link_types)
 
+        dtypes = {
+            'string': pd.StringDtype(),
+            'node_type': pd.StringDtype(),
+            'node_tags': pd.StringDtype()
+        }
+
+        data = data.astype(dtypes)
+        data.index = data.index.astype(big_id_dtype)
+
         '''******************************************************
         data is currently a DataFrame with these columns:
             ['csv_row', 'csv_col', 'entry_prefix_id', 'item_label_id',
              'string', 'node_type', 'link_type_id', 'node_tags']
         ******************************************************'''
 
-        # Split items that have list delimiters in the entry syntax
-        data = data.groupby(
-            by=['entry_prefix_id', 'item_label_id'],
-            dropna=False,
-            group_keys=False
-        )
-        data = data.apply(
-            _expand_shorthand_items,
+        # Split items that have list delimiters in the entry syntax.
+        # Entry strings have null item label IDs and self-descriptive
+        # entries have prefixes that are not in the entry syntax, so
+        # neither has a row in the delimiter table.
+        delimiters = bg.entry_parsing.get_delimiter_table(
             entry_syntax,
             entry_prefix_id_map,
-            item_label_id_map
+            item_label_id_map,
+            small_id_dtype
         )
-
-        # Locate items that do not have a list delimiter
-        item_delimited = data['string'].map(
-            pd.api.types.is_list_like
+        delimiters = data[['entry_prefix_id', 'item_label_id']].merge(
+            delimiters,
+            how='left',
+            on=['entry_prefix_id', 'item_label_id']
         )
-        item_not_delimited = data.loc[~item_delimited].index
-
-        # Explode the delimited strings
-        data = data.explode('string')
 
-        # Make a copy of the index, drop values that do not refer to
-        # delimited items, then groupby the remaining index values and
-        # do a cumulative count to get the position of each element in
-        # each item that has a list delimiter
-        itm_list_pos = data.index
-        itm_list_pos = pd.Series(
-            itm_list_pos.array,
-            index=itm_list_pos,
-            dtype=small_id_dtype
+        # Explode the delimited strings and get the position of each
+        # element in each item that has a list delimiter
+        data = bg.entry_parsing.explode_delimited_items(
+            data,
+            delimiters['list_delimiter'],
+            list_position_base,
+            small_id_dtype
         )
-
-        itm_list_pos.loc[itm_list_pos.isin(item_not_delimited)] = pd.NA
-        itm_list_pos = itm_list_pos.dropna().groupby(itm_list_pos.dropna())
-        itm_list_pos = itm_list_pos.cumcount()
-        # Shift the values by the list position base
-        itm_list_pos = itm_list_pos + list_position_base
-
-        itm_list_pos = itm_list_pos.astype(small_id_dtype)
-
-        # Store the item list positions and reset the index
-        itm_list_pos = itm_list_pos.array
-        data.loc[item_delimited, 'item_list_position'] = itm_list_pos
         data = data.reset_index(drop=True)
+        del delimiters
 
         '''**********************************************************
         data is currently a DataFrame with these columns:
@@ -1076,12 +2607,10 @@ class Shorthand:
         # If the entry syntax indicated that there should be links
         # between an item and the string that contains it, get the
         # string ID of the entry
-        links = data[columns_required_for_links].groupby(
-            by=['csv_row', 'csv_col'],
-            group_keys=False
+        links = _get_item_link_source_IDs(
+            data[columns_required_for_links],
+            ['csv_row', 'csv_col']
         )
-        links = links.apply(_get_item_link_source_IDs)
-        links.index = data.index.copy()
 
         # A shorthand link is a relation between four entities
         # represented by integer IDs:
@@ -1129,6 +2658,33 @@ class Shorthand:
         entry_links = bg.util.normalize_types(entry_links, links)
         links = pd.concat([links, entry_links])
 
+        # Intermediate frames are released as soon as they're used so
+        # they don't add to the peak memory used by the parse
+        del has_link, entry_tgt_ids, entry_links
+
+        if seen_entries is not None:
+
+            # Entries parsed from earlier chunks of the same input
+            # already have links to their items and to the input text,
+            # so locate their string IDs and drop those links
+            entry_csv_index = pd.MultiIndex.from_frame(
+                data[['csv_row', 'csv_col']].astype(int)
+            )
+            is_seen_entry = entry_csv_index.isin(entry_was_seen)
+            is_seen_entry = is_seen_entry & data['item_label_id'].isna()
+            seen_string_ids = data.loc[is_seen_entry, 'string_id']
+
+            is_entry_link = links['link_type_id'].isin(
+                [link_types.loc[link_types == 'entry'].index[0]]
+            )
+            src_is_seen = links['src_string_id'].isin(seen_string_ids)
+            tgt_is_seen = links['tgt_string_id'].isin(seen_string_ids)
+
+            links = links.loc[~src_is_seen & ~(is_entry_link & tgt_is_seen)]
+            links = links.reset_index(drop=True)
+            del entry_csv_index, is_seen_entry
+            del is_entry_link, src_is_seen, tgt_is_seen
+
         # If the caller gave a link syntax, parse it
         if 'link_syntax' in dir(self):
 
@@ -1236,90 +2792,27 @@ class Shorthand:
             # link syntax
             prefix_pairs = left_prefixes.merge(right_prefixes)
 
+            # Compile the link syntax into join plans for links whose
+            # sources and targets are matched one-to-one and links
+            # whose sources and targets are in lists
+            join_plans = _compile_link_join_plans(link_syntax)
+
             # Get string IDs for links whose sources and targets are
             # matched one-to-one according to the link syntax
-            link_has_no_list = link_syntax['list_mode'].isna()
-            link_is_one_to_one = (link_syntax['list_mode'] == '1:1')
-            list_mode_subset = link_has_no_list | link_is_one_to_one
-
-            sources = _get_link_component_string_ids(
-                prefix_pairs,
-                data,
-                link_syntax,
-                'src_',
-                subset=list_mode_subset,
-                columns=['entry_csv_row', 'string_id', 'link_type_id']
-            )
-            targets = _get_link_component_string_ids(
-                prefix_pairs,
-                data,
-                link_syntax,
-                'tgt_',
-                subset=list_mode_subset,
-                columns=['string_id', 'item_list_position']
-            )
-            references = _get_link_component_string_ids(
+            one_to_one_links = _get_links_from_join_plan(
+                join_plans['one_to_one'],
                 prefix_pairs,
                 data,
-                link_syntax,
-                'ref_',
-                subset=list_mode_subset,
-                columns=['entry_csv_row', 'string_id']
-            )
-
-            one_to_one_links = pd.concat([sources, targets], axis='columns')
-            one_to_one_links = one_to_one_links.merge(
-                references,
-                on='entry_csv_row',
-                how='left'
+                pair_list_positions=True
             )
 
             # Get string IDs for links whose sources and targets are not
             # matched one-to-one
-            list_mode_subset = link_syntax['list_mode'].isin(
-                ['1:m', 'm:1', 'm:m']
-            )
-
-            sources = _get_link_component_string_ids(
-                prefix_pairs,
-                data,
-                link_syntax,
-                'src_',
-                subset=list_mode_subset,
-                columns=['entry_csv_row', 'string_id', 'link_type_id']
-            )
-            hashed_srcs = pd.util.hash_pandas_object(sources, index=False)
-            sources = sources.loc[~hashed_srcs.duplicated()]
-
-            targets = _get_link_component_string_ids(
+            other_links = _get_links_from_join_plan(
+                join_plans['list'],
                 prefix_pairs,
                 data,
-                link_syntax,
-                'tgt_',
-                subset=list_mode_subset,
-                columns=['entry_csv_row', 'string_id', 'item_list_position']
-            )
-            hashed_tgts = pd.util.hash_pandas_object(targets, index=False)
-            targets = targets.loc[~hashed_tgts.duplicated()]
-
-            references = _get_link_component_string_ids(
-                prefix_pairs,
-                data,
-                link_syntax,
-                'ref_',
-                subset=list_mode_subset,
-                columns=['entry_csv_row', 'string_id']
-            )
-            hashed_refs = pd.util.hash_pandas_object(references, index=False)
-            references = references.loc[~hashed_refs.duplicated()]
-
-            other_links = sources.merge(targets, on='entry_csv_row')
-            # other_links = other_links.merge(references, on='entry_csv_row')
-            other_links['ref_string_id'] = other_links['entry_csv_row'].map(
-                pd.Series(
-                    references['ref_string_id'].array,
-                    index=references['entry_csv_row'].array
-                )
+                pair_list_positions=False
             )
 
             one_to_one_links = bg.util.normalize_types(
@@ -1333,6 +2826,7 @@ class Shorthand:
                 strict=False
             )
             links = pd.concat([links, one_to_one_links, other_links])
+            del one_to_one_links, other_links
 
             links = links.reset_index(drop=True)
             links = links.astype({
@@ -1350,6 +2844,8 @@ class Shorthand:
             # If we don't have a link syntax, move on.
             pass
 
+        del dplct_entries
+
         # If there were lines with self-descriptive entries and
         # link metadata, and the node types for one or both entries
         # are not in the link syntax, we have to create new links for
@@ -1447,8 +2943,22 @@ class Shorthand:
             data['node_tags'].notna(),
             ['string_id', 'node_tags']
         ]
+
+        # Node tags were the last thing needed from the parsed data
+        del data
+
+        if seen_entries is not None:
+            # Tags on entries from earlier chunks were already processed
+            tags = tags.loc[~tags['string_id'].isin(seen_string_ids)]
         tags = pd.Series(tags['node_tags'].array, index=tags['string_id'])
-        tags = tags.str.split().explode().drop_duplicates()
+        tags = tags.str.split().explode()
+
+        # Every string keeps each of its tags once, so entries that
+        # share a tag are all tagged with it
+        tags = tags.loc[
+            ~pd.DataFrame({'id': tags.index, 'tag': tags.array}).duplicated()
+            .array
+        ]
 
         # tags is now a pandas.Series whose index is string IDs and
         # whose values are individual tag strings
@@ -1456,25 +2966,27 @@ class Shorthand:
         # Tag strings should be added to the strings frame if they are
         # not present in the strings frame OR if they are present and
         # the existing string has a node type that isn't the tag node
-        # type
+        # type. Each distinct tag is inserted once.
         new_strings = bg.util.get_new_typed_values(
-            tags,
+            tags.drop_duplicates(),
             strings,
             'string',
             'node_type_id',
             tag_node_type_id
         )
         new_strings = pd.DataFrame(
-            {'string': new_strings.array, 'node_type_id': tag_node_type_id},
-            index=tags.array
+            {'string': new_strings.array, 'node_type_id': tag_node_type_id}
         )
         new_strings = bg.util.normalize_types(new_strings, strings)
 
         strings = pd.concat([strings, new_strings])
 
         # convert the tag strings to string ID values
+        tag_strings = strings.loc[
+            strings['node_type_id'] == tag_node_type_id
+        ]
         tags = tags.map(
-            pd.Series(new_strings.index, index=new_strings['string'])
+            pd.Series(tag_strings.index, index=tag_strings['string'])
         )
 
         # Add links for the tags. Reference string IDs are null because
@@ -1511,42 +3023,57 @@ class Shorthand:
         except (NameError, AssertionError):
             link_tags = pd.Series(dtype='object')
 
-        # Convert any item list positions into strings and append them
-        # to the link tag strings
-        list_pos = links['list_position'].dropna().astype(str)
-        has_list_pos_and_tags = list_pos.index.intersection(
-            link_tags.index
+        # Split the link tag strings into one row per link and tag
+        link_order = pd.Series(
+            range(len(link_tags)),
+            index=link_tags.index,
+            dtype='int64'
         )
-        list_pos_but_no_tags = list_pos.index.difference(link_tags.index)
-
-        if has_list_pos_and_tags.empty:
-            link_tags = pd.concat([link_tags, list_pos])
-
-        elif list_pos.index.difference(has_list_pos_and_tags).empty:
-            link_tags.loc[list_pos.index] = [
-                ' '.join(pair) for pair in
-                zip(link_tags.loc[list_pos.index], list_pos)
-            ]
+        link_tags = link_tags.str.split().explode()
 
-        else:
-            pairs = zip(
-                link_tags.loc[has_list_pos_and_tags],
-                list_pos.loc[has_list_pos_and_tags]
-            )
-            link_tags.loc[has_list_pos_and_tags] = [
-                ' '.join(pair) for pair in pairs
-            ]
+        # Item list positions are tags of their links. Tags for each
+        # link come before its list position, and list positions of
+        # links without link tags come after all the link tags.
+        list_pos = links['list_position'].dropna()
+        pos_has_tags = list_pos.index.isin(link_order.index)
+        pos_order = pd.Series(
+            range(len(link_order), len(link_order) + len(list_pos)),
+            index=list_pos.index,
+            dtype='int64'
+        )
+        pos_order.loc[pos_has_tags] = link_order.loc[
+            list_pos.index[pos_has_tags]
+        ].array
+
+        # Positions are converted to tag strings once per distinct value.
+        # They can't stay integers in the parsed TextNet because they're
+        # stored as assertion tags, which are strings, and
+        # _build_edge_tags finds positions by their digit tag strings.
+        distinct_pos = list_pos.drop_duplicates()
+        pos_strings = pd.Series(
+            distinct_pos.astype(str).array,
+            index=distinct_pos.array
+        )
 
-            link_tags = pd.concat([
-                link_tags,
-                list_pos.loc[list_pos_but_no_tags]
-            ])
+        link_tags = pd.DataFrame({
+            'tag': pd.concat([
+                pd.Series(link_tags.array, dtype='object'),
+                pd.Series(list_pos.map(pos_strings).array, dtype='object')
+            ]).array,
+            'order': pd.concat([
+                link_tags.index.map(link_order).to_series(),
+                pos_order
+            ]).array,
+            'is_position': [False]*len(link_tags) + [True]*len(list_pos)
+        }, index=link_tags.index.append(list_pos.index))
+        link_tags = link_tags.sort_values(
+            ['order', 'is_position'],
+            kind='stable'
+        )
+        link_tags = link_tags['tag']
 
         links = links.drop('list_position', axis='columns')
 
-        # Convert the space-delimited tag strings to lists of strings
-        link_tags = link_tags.str.split().explode()
-
         # Add the tag strings to the rest of the strings
         new_strings = link_tags.drop_duplicates()
         new_strings = bg.util.get_new_typed_values(
@@ -1676,25 +3203,17 @@ class Shorthand:
         small_id_dtype=pd.Int8Dtype(),
         list_position_base=1,
         s_d_delimiter='_',
-        encoding='utf8'
+        encoding='utf8',
+        chunksize=None,
+        workers=None,
+        entry_cache=None,
+        on_error='raise',
+        memory_budget=None
     ):
         ####################
         # Validate arguments
         ####################
 
-        # We need to use the contents of the input file for parsing but
-        # we also need to access the text after parsing. If we're passed
-        # a buffer then it will be empty after it's passed to
-        # pandas.read_csv, so we write it to a temp file.
-        if 'read' in dir(filepath_or_buffer):
-
-            tempfile_path = tempfile.mkstemp(text=True)[1]
-
-            with open(tempfile_path, 'w') as f:
-                f.write(filepath_or_buffer.read())
-
-            filepath_or_buffer = tempfile_path
-
         if space_char is not None:
             space_char = str(space_char)
 
@@ -1734,13 +3253,41 @@ class Shorthand:
 
         list_position_base = int(list_position_base)
 
+        if chunksize is not None:
+            chunksize = int(chunksize)
+
+            if chunksize < 1:
+                raise ValueError('chunksize must be a positive integer')
+
+        if workers is not None:
+            workers = int(workers)
+
+            if workers < 1:
+                raise ValueError('workers must be a positive integer')
+
+        # Assume anything other than a cache is the cache directory
+        if (
+            entry_cache is not None
+            and not isinstance(entry_cache, bg.entry_parsing.EntryParseCache)
+        ):
+            entry_cache = bg.entry_parsing.EntryParseCache(entry_cache)
+
+        if on_error not in ['raise', 'quarantine']:
+            raise ValueError('on_error must be "raise" or "quarantine"')
+
+        if (on_error == 'quarantine') and (workers is not None):
+            raise ValueError(
+                'on_error="quarantine" cannot be used with workers'
+            )
+
+        if memory_budget is not None:
+            memory_budget = _parse_memory_size(memory_budget)
+
         ###########################
         # Done validating arguments
         ###########################
 
-        # Parse input text
-        parsed = self._apply_syntax(
-            filepath_or_buffer,
+        syntax_args = (
             item_separator,
             default_entry_prefix,
             space_char,
@@ -1748,24 +3295,153 @@ class Shorthand:
             na_node_type,
             input_string,
             input_node_type,
-            skiprows,
-            comment_char,
-            fill_cols,
-            drop_na,
             big_id_dtype,
             small_id_dtype,
             list_position_base,
             s_d_delimiter,
-            encoding
+            entry_cache
+        )
+
+        # We need to use the contents of the input for parsing but we
+        # also need to store the text after parsing, so the input is
+        # read once and both use the same text
+        if isinstance(filepath_or_buffer, _ShorthandInput):
+            shorthand_input = filepath_or_buffer
+        else:
+            shorthand_input = _ShorthandInput(filepath_or_buffer, encoding)
+
+        memory = _MemoryReport()
+        memory.sample('read')
+
+        if memory_budget is not None:
+
+            # Measure the memory allocated while parsing a sample of
+            # rows and parse in chunks small enough that each worker
+            # stays within its share of the budget. Entries in the
+            # sample aren't cached so the measurement doesn't depend
+            # on what was parsed before.
+            sample = next(_read_shorthand(
+                shorthand_input,
+                skiprows,
+                comment_char,
+                fill_cols,
+                drop_na,
+                encoding,
+                _MEMORY_SAMPLE_ROWS
+            ), None)
+
+            # Only the sample is traced, because tracing allocations
+            # slows parsing down several times over
+            try:
+                bytes_per_row = _parse_bytes_per_row(
+                    lambda rows: self._apply_syntax(
+                        rows,
+                        *syntax_args[:-1],
+                        None,
+                        None
+                    ),
+                    sample
+                )
+
+            # If the sample can't be parsed, the error is raised or
+            # quarantined when the whole input is parsed below
+            except Exception:
+                bytes_per_row = None
+
+            memory.sample('measure')
+
+            if bytes_per_row:
+                budget_chunksize = max(
+                    1,
+                    int(memory_budget/(workers or 1)/bytes_per_row)
+                )
+
+                if chunksize is None:
+                    chunksize = budget_chunksize
+                else:
+                    chunksize = min(chunksize, budget_chunksize)
+
+        # Parse in isolated batches so a malformed row only causes
+        # its own batch to be parsed again
+        if (on_error == 'quarantine') and (chunksize is None):
+            chunksize = _QUARANTINE_BATCH_SIZE
+
+        # Read and normalize the input text in chunks of csv rows if
+        # we got a chunksize, otherwise all at once
+        chunks = _read_shorthand(
+            shorthand_input,
+            skiprows,
+            comment_char,
+            fill_cols,
+            drop_na,
+            encoding,
+            chunksize
         )
 
-        # Read input text
-        try:
-            with open(tempfile_path, 'r') as f:
-                full_text_string = f.read()
-        except NameError:
-            with open(filepath_or_buffer, 'r') as f:
-                full_text_string = f.read()
+        # If we're parsing in parallel without a chunksize, split the
+        # input into one block of rows per worker
+        if (workers is not None) and (chunksize is None):
+            chunks = _split_rows(chunks, workers)
+
+        # When parsing in chunks, entries parsed in earlier chunks are
+        # tracked so their items and tags are only stored once. When
+        # quarantining, entries are tracked as rows are parsed.
+        if (workers is None) and (chunksize is None):
+            chunks = ((data, None) for data in chunks)
+        elif on_error == 'raise':
+            chunks = _pair_with_seen_entries(chunks)
+
+        # Parse input text
+        if on_error == 'quarantine':
+            parse_errors = []
+            parsed_chunks = _parse_chunks_quarantining(
+                self._apply_syntax,
+                chunks,
+                syntax_args,
+                parse_errors,
+                big_id_dtype
+            )
+        elif workers is None:
+            parsed_chunks = (
+                self._apply_syntax(data, *syntax_args, seen_entries)
+                for data, seen_entries in chunks
+            )
+        else:
+            parsed_chunks = _parse_in_processes(
+                self._apply_syntax,
+                chunks,
+                syntax_args,
+                workers
+            )
+
+        # Merge parsed chunks in input order so the result doesn't
+        # depend on how the input was split
+        merger = None
+
+        for parsed_chunk in parsed_chunks:
+
+            memory.sample('parse')
+
+            if merger is None:
+                merger = bg.util.ParsedTextNetMerger(parsed_chunk)
+            else:
+                merger.add(parsed_chunk)
+                memory.sample('merge')
+
+        if merger is None:
+            raise ValueError('No shorthand entries found in input')
+
+        parsed = merger.finish()
+        memory.sample('merge')
+
+        # Rows excluded from parsing are stored with the parsed text
+        if on_error == 'quarantine':
+            parsed.parse_errors = pd.concat(
+                parse_errors,
+                ignore_index=True
+            )
+
+        full_text_string = shorthand_input.text
 
         '''
         SWITCHING TO LITERAL NODE TYPE
@@ -1888,8 +3564,418 @@ class Shorthand:
         src_isna = parsed.assertions['src_string_id'].isna()
         parsed.assertions.loc[src_isna, 'src_string_id'] = full_txt_string_id
 
+        # Memory is only measured in this process, so stages run in
+        # worker processes aren't included
+        memory.sample('store text')
+        parsed.memory_report = memory.to_frame()
+
         return parsed
 
+    def parse_text_changes(
+        self,
+        old_text,
+        filepath_or_buffer,
+        item_separator,
+        default_entry_prefix,
+        space_char,
+        na_string_values,
+        na_node_type,
+        input_string,
+        input_node_type,
+        skiprows=0,
+        comment_char='#',
+        fill_cols='left_entry',
+        drop_na='right_entry',
+        big_id_dtype=pd.Int32Dtype(),
+        small_id_dtype=pd.Int8Dtype(),
+        list_position_base=1,
+        s_d_delimiter='_',
+        encoding='utf8'
+    ):
+        '''
+        Parse only the rows of shorthand text that changed since an
+        earlier version of the same text was parsed.
+
+        Only the lines around the edit are read if possible (see
+        _diff_shorthand_texts), and rows of the two versions are
+        compared by value. Removed rows and added rows are parsed
+        separately, treating entries in unchanged rows as if they were
+        parsed from an earlier chunk of the input (see
+        Shorthand._apply_syntax). Assertions parsed from
+        the removed rows are exactly the assertions that parsing the
+        whole old text creates in addition to parsing the unchanged
+        rows, and likewise for the added rows and the new text.
+
+        Parameters
+        ----------
+        old_text : str
+            The text of the earlier version of the input.
+
+        filepath_or_buffer : str, path object, or file-like object
+            The current version of the input.
+
+        Other parameters are the same as for Shorthand.parse_text.
+
+        Returns
+        -------
+        dict
+            'text': the current text of the input
+
+            'removed': TextNet parsed from rows that are only in the
+                old text, or None if there are no such rows
+
+            'added': TextNet parsed from rows that are only in the
+                current text, or None if there are no such rows
+        '''
+        new_text = _ShorthandInput(filepath_or_buffer, encoding).text
+
+        changes = {'text': new_text, 'removed': None, 'added': None}
+
+        if new_text == old_text:
+            return changes
+
+        if not bg.util.iterable_not_string(na_string_values):
+            na_string_values = [na_string_values]
+
+        if not bg.util.iterable_not_string(fill_cols):
+            fill_cols = [] if fill_cols is None else [fill_cols]
+
+        if not bg.util.iterable_not_string(drop_na):
+            if drop_na is None or drop_na is False:
+                drop_na = []
+            else:
+                drop_na = [drop_na]
+
+        # Entries in unchanged rows are parsed whether or not the text
+        # changed, so links between those entries and their items,
+        # tags, or the input text are neither removed nor added
+        removed, added, seen_entries = _diff_shorthand_texts(
+            old_text,
+            new_text,
+            skiprows,
+            str(comment_char),
+            fill_cols,
+            drop_na,
+            encoding
+        )
+
+        syntax_args = (
+            item_separator,
+            default_entry_prefix,
+            space_char,
+            na_string_values,
+            na_node_type,
+            input_string,
+            input_node_type,
+            big_id_dtype,
+            small_id_dtype,
+            int(list_position_base),
+            s_d_delimiter,
+            None
+        )
+
+        for key, data in [('removed', removed), ('added', added)]:
+            if not data.empty:
+                changes[key] = self._apply_syntax(
+                    data,
+                    *syntax_args,
+                    seen_entries
+                )
+
+        return changes
+
+    def parse_syntax_changes(
+        self,
+        entry_syntax,
+        text,
+        item_separator,
+        default_entry_prefix,
+        space_char,
+        na_string_values,
+        na_node_type,
+        input_string,
+        input_node_type,
+        skiprows=0,
+        comment_char='#',
+        fill_cols='left_entry',
+        drop_na='right_entry',
+        big_id_dtype=pd.Int32Dtype(),
+        small_id_dtype=pd.Int8Dtype(),
+        list_position_base=1,
+        s_d_delimiter='_',
+        encoding='utf8'
+    ):
+        '''
+        Parse only the rows of shorthand text whose entries are parsed
+        differently by a new entry syntax.
+
+        The compiled entry syntaxes are compared (see
+        bg.entry_parsing.CompiledEntrySyntax.diff) to find the entry
+        prefixes with changed items. Rows with an entry that has one of
+        those prefixes under either syntax are parsed with the current
+        syntax and again with the new one, treating every other entry
+        as if it was parsed from an earlier chunk of the input (see
+        Shorthand._apply_syntax). Only links from the affected entries
+        to their items and tags and links between entries in the
+        affected rows are parsed, and these are the only assertions
+        that differ between parsing the whole text with each syntax.
+
+        Parameters
+        ----------
+        entry_syntax : str, path object, or file-like object
+            The new entry syntax. The link syntax of this Shorthand is
+            used with the new entry syntax.
+
+        text : str
+            The shorthand text.
+
+        Other parameters are the same as for Shorthand.parse_text.
+
+        Returns
+        -------
+        dict
+            'shorthand': a Shorthand with the new entry syntax
+
+            'diff': pandas.DataFrame of changed items generated by
+                CompiledEntrySyntax.diff
+
+            'removed': TextNet parsed from the affected rows with the
+                current syntax, or None if no rows are affected
+
+            'added': TextNet parsed from the affected rows with the
+                new syntax, or None if no rows are affected
+        '''
+        try:
+            link_syntax = io.StringIO(self.link_syntax)
+        except AttributeError:
+            link_syntax = None
+
+        new_shorthand = Shorthand(
+            entry_syntax=entry_syntax,
+            link_syntax=link_syntax,
+            syntax_case_sensitive=self.syntax_case_sensitive,
+            allow_redundant_items=self.allow_redundant_items
+        )
+
+        old_syntax = self._compile_entry_syntax(item_separator)
+        new_syntax = new_shorthand._compile_entry_syntax(item_separator)
+        diff = old_syntax.diff(new_syntax)
+
+        changes = {
+            'shorthand': new_shorthand,
+            'diff': diff,
+            'removed': None,
+            'added': None
+        }
+
+        if diff.empty:
+            return changes
+
+        if not bg.util.iterable_not_string(na_string_values):
+            na_string_values = [na_string_values]
+
+        if not bg.util.iterable_not_string(fill_cols):
+            fill_cols = [] if fill_cols is None else [fill_cols]
+
+        if not bg.util.iterable_not_string(drop_na):
+            if drop_na is None or drop_na is False:
+                drop_na = []
+            else:
+                drop_na = [drop_na]
+
+        data = next(_read_shorthand(
+            io.StringIO(text),
+            skiprows,
+            str(comment_char),
+            fill_cols,
+            drop_na,
+            encoding
+        ))
+
+        # An entry is affected if it has a changed prefix under either
+        # syntax, since adding or removing a prefix changes which
+        # entries are read with the default prefix
+        entry_cols = ['left_entry', 'right_entry', 'reference']
+        raw_entries = data[entry_cols].stack().dropna()
+        entries = raw_entries.str.strip()
+        changed_prefixes = diff['entry_prefix'].unique()
+
+        is_affected = pd.Series(False, index=entries.index)
+        for compiled_syntax in [old_syntax, new_syntax]:
+            prefixes = entries.str.extract(compiled_syntax.prefixes_regex)[0]
+            prefixes = prefixes.fillna(default_entry_prefix)
+            is_affected = is_affected | prefixes.isin(changed_prefixes)
+
+        affected_rows = entries.index.get_level_values(0)[is_affected.array]
+        is_affected_row = data.index.isin(affected_rows)
+
+        if not is_affected_row.any():
+            return changes
+
+        # Unaffected entries are split into the same items by both
+        # syntaxes, so links to their items aren't parsed again
+        seen_entries = frozenset(raw_entries.loc[~is_affected.array])
+
+        syntax_args = (
+            item_separator,
+            default_entry_prefix,
+            space_char,
+            na_string_values,
+            na_node_type,
+            input_string,
+            input_node_type,
+            big_id_dtype,
+            small_id_dtype,
+            int(list_position_base),
+            s_d_delimiter,
+            None
+        )
+
+        data = data.loc[is_affected_row]
+
+        changes['removed'] = self._apply_syntax(
+            data.copy(),
+            *syntax_args,
+            seen_entries
+        )
+        changes['added'] = new_shorthand._apply_syntax(
+            data,
+            *syntax_args,
+            seen_entries
+        )
+
+        return changes
+
+    def lint(
+        self,
+        filepath_or_buffer,
+        item_separator='__',
+        default_entry_prefix='wrk',
+        skiprows=0,
+        comment_char='#',
+        fill_cols='left_entry',
+        drop_na='right_entry',
+        s_d_delimiter='_',
+        encoding='utf8',
+        chunksize=_QUARANTINE_BATCH_SIZE
+    ):
+        '''
+        Check that shorthand text can be parsed without parsing it.
+
+        The input is read in chunks of csv rows and checked for quoted
+        values that are never closed, comments inside quoted values
+        that span lines, values ending with a dangling escape character,
+        entries with more items than the entry syntax defines for their
+        prefix, entries beginning with an item separator, which the
+        parser can't split yet, self-descriptive entries that use
+        syntactic entry prefixes or malformed items, and pairs of entry
+        prefixes that have no rules in the link syntax. Entries are not
+        split into items and no strings or assertions are created.
+
+        Parameters
+        ----------
+        filepath_or_buffer : str, path object, or file-like object
+            The shorthand input.
+
+        chunksize : int, default 10000
+            Number of csv rows checked at a time.
+
+        Other parameters are the same as for Shorthand.parse_text.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per problem with columns csv_row, csv_col, string,
+            error_type, and message, in the same format as the
+            parse_errors of a quarantining parse. Empty if no problems
+            were found.
+        '''
+        if not bg.util.iterable_not_string(fill_cols):
+            fill_cols = [] if fill_cols is None else [fill_cols]
+
+        if not bg.util.iterable_not_string(drop_na):
+            if drop_na is None or drop_na is False:
+                drop_na = []
+            else:
+                drop_na = [drop_na]
+
+        chunksize = int(chunksize)
+        if chunksize < 1:
+            raise ValueError('chunksize must be a positive integer')
+
+        compiled_syntax = self._compile_entry_syntax(item_separator)
+
+        if default_entry_prefix not in compiled_syntax.tokenizers:
+            raise ValueError(
+                'default_entry_prefix "{}" is not an entry prefix in the '
+                'entry syntax'.format(default_entry_prefix)
+            )
+
+        try:
+            link_syntax = bg.syntax_parsing.validate_link_syntax(
+                self.link_syntax,
+                self.entry_syntax,
+                case_sensitive=self.syntax_case_sensitive
+            )
+            link_prefix_pairs = set(zip(
+                link_syntax['left_entry_prefix'],
+                link_syntax['right_entry_prefix']
+            ))
+
+        except AttributeError:
+            link_prefix_pairs = None
+
+        comment_char = str(comment_char)
+        problems = []
+
+        chunks = _read_shorthand(
+            filepath_or_buffer,
+            skiprows,
+            comment_char,
+            fill_cols,
+            drop_na,
+            encoding,
+            chunksize,
+            scan_lines=lambda lines: _lint_shorthand_lines(
+                lines,
+                skiprows,
+                comment_char,
+                problems
+            )
+        )
+
+        # Values forward filled across chunks are carried from the last
+        # row of the previous chunk
+        previous_row = None
+
+        try:
+            for data in chunks:
+                problems.extend(_lint_shorthand_entries(
+                    data,
+                    compiled_syntax,
+                    default_entry_prefix,
+                    s_d_delimiter,
+                    link_prefix_pairs,
+                    _locate_carried_values(data, fill_cols, previous_row)
+                ))
+                previous_row = data.reindex(columns=fill_cols).iloc[-1]
+
+        # If the csv tokenizer can't read the rest of the input, any
+        # unclosed quote responsible was found while reading lines
+        except pd.errors.ParserError as error:
+            if not any(problem[3] == 'quote' for problem in problems):
+                problems.append((pd.NA, pd.NA, pd.NA, 'csv', str(error)))
+
+        lint = _empty_parse_errors()
+        problems = pd.DataFrame(problems, columns=lint.columns)
+        problems = problems.astype(lint.dtypes.to_dict())
+
+        return problems.sort_values(
+            'csv_row',
+            kind='stable',
+            ignore_index=True
+        )
+
     def parse_items(
         self,
         data,
@@ -1905,11 +3991,49 @@ class Shorthand:
         big_id_dtype=pd.Int32Dtype(),
         small_id_dtype=pd.Int8Dtype(),
         comma_separated=True,
-        list_position_base=1
+        list_position_base=1,
+        on_error='raise',
+        batch_entry_writer=None
     ):
 
         data = data.reset_index(drop=True)
 
+        if on_error not in ['raise', 'quarantine']:
+            raise ValueError('on_error must be "raise" or "quarantine"')
+
+        if on_error == 'quarantine':
+
+            # Rows that can't be parsed are excluded and stored with
+            # the rows that were parsed
+            parsed, parse_errors = _parse_quarantining_errors(
+                lambda rows: self.parse_items(
+                    rows,
+                    input_string,
+                    input_node_type,
+                    space_char,
+                    na_string_values,
+                    na_node_type,
+                    item_separator=item_separator,
+                    entry_writer=entry_writer,
+                    entry_node_type=entry_node_type,
+                    entry_prefix=entry_prefix,
+                    big_id_dtype=big_id_dtype,
+                    small_id_dtype=small_id_dtype,
+                    comma_separated=comma_separated,
+                    list_position_base=list_position_base,
+                    batch_entry_writer=batch_entry_writer
+                ),
+                data,
+                big_id_dtype
+            )
+
+            if parsed is None:
+                raise ValueError('No items could be parsed from input')
+
+            parsed.parse_errors = parse_errors
+
+            return parsed
+
         entry_syntax = bg.syntax_parsing.validate_entry_syntax(
             self.entry_syntax,
             case_sensitive=self.syntax_case_sensitive,
@@ -1978,7 +4102,17 @@ class Shorthand:
         ]
         item_types = item_types.loc[common_labels]
 
-        if entry_writer is None:
+        if entry_writer is not None:
+
+            entries = data.apply(entry_writer, axis='columns')
+
+        elif batch_entry_writer is not None:
+
+            # A batch writer gets every row at once and returns one
+            # entry string per row
+            entries = pd.Series(batch_entry_writer(data), index=data.index)
+
+        else:
 
             if comma_separated:
                 item_separator = ', '
@@ -1989,18 +4123,13 @@ class Shorthand:
                     'argument.'
                 )
 
-            entries = data.fillna(na_string_values[0])
-            entries = entries.apply(
-                lambda x: item_separator.join(map(str, x)),
-                axis=1
+            entries = _join_columns(
+                data.fillna(na_string_values[0]),
+                item_separator
             )
 
             if comma_separated:
-                entries = entries.apply(lambda x: '"' + x + '"')
-
-        else:
-
-            entries = data.apply(entry_writer, axis='columns')
+                entries = '"' + entries + '"'
 
         # drop data columns not mentioned in the syntax
         data = data[common_labels]
@@ -2030,8 +4159,8 @@ class Shorthand:
 
             # Split the prefixes off of the stacked items and expand
             # into a dataframe
-            disagged = disagged.groupby(level=1).apply(
-                bg.entry_parsing._item_prefix_splitter,
+            disagged = bg.entry_parsing.split_item_prefixes(
+                disagged,
                 prefixed_items
             )
 
@@ -2170,50 +4299,26 @@ class Shorthand:
         '''
 
         # Make a map from item label IDs and list delimiters
-        delimiters = pd.Series(
-            entry_syntax['list_delimiter'].array,
-            index=entry_syntax['item_label'].map(item_label_id_map)
+        delimiters = bg.entry_parsing.get_delimiter_table(
+            entry_syntax,
+            None,
+            item_label_id_map,
+            small_id_dtype
         )
-
-        # Split items by delimiter
-        data = data.groupby(by='item_label_id', dropna=False, group_keys=False)
-        data = data.apply(bg.entry_parsing._expand_csv_items, delimiters)
-
-        data = data.reset_index(drop=True)
-
-        # Locate items that do not have a list delimiter
-        item_is_delimited = data['string'].map(
-            pd.api.types.is_list_like
+        delimiters = pd.Series(
+            delimiters['list_delimiter'].array,
+            index=delimiters['item_label_id']
         )
-        item_not_delimited = data.loc[~item_is_delimited].index
-
-        # Explode the delimited strings
-        data = data.explode('string').reset_index()
 
-        # Make a copy of the index, drop values that do not refer to
-        # delimited items, then groupby the remaining index values and
-        # do a cumulative count to get the position of each element in
-        # each item that has a list delimiter
-        item_list_pos = data['index'].copy()
-        # item_list_pos = pd.Series(
-        #     item_list_pos.array,
-        #     index=item_list_pos
-        # )
-
-        item_list_pos.loc[item_list_pos.isin(item_not_delimited)] = pd.NA
-        item_list_pos = item_list_pos.dropna().groupby(item_list_pos.dropna())
-        item_list_pos = item_list_pos.cumcount()
-
-        # Shift the values by the list position base
-        item_list_pos = item_list_pos + list_position_base
-
-        item_list_pos = item_list_pos.astype(small_id_dtype)
-        # Store the item list positions and reset the index
-        data = data.drop('index', axis='columns')
-        data = pd.concat(
-            [data, item_list_pos.rename('item_list_position')],
-            axis=1
+        # Split items by delimiter, explode the delimited strings, and
+        # get the position of each element in each delimited item
+        data = bg.entry_parsing.explode_delimited_items(
+            data,
+            data['item_label_id'].map(delimiters),
+            list_position_base,
+            small_id_dtype
         )
+        data = data.reset_index(drop=True)
 
         '''
         data is currently a DataFrame with these columns:
@@ -2285,23 +4390,17 @@ class Shorthand:
         all are integer-valued
         '''
 
-        data = data.sort_values('csv_row')
+        # Keep the items of each entry in input order whatever else is
+        # in the batch
+        data = data.sort_values('csv_row', kind='stable')
 
         # If the entry syntax indicated that there should be links
         # between an item and the string that contains it, get the
         # string ID of the entry
-        if len(data['csv_row'].unique()) > 1:
-            links = data[['csv_row', 'string_id', 'link_type_id']].groupby(
-                by='csv_row',
-                group_keys=False
-            )
-            links = links.apply(_get_item_link_source_IDs)
-        else:
-            link_type_is_na = data['link_type_id'].isna()
-            entry_string_id = data.loc[link_type_is_na, 'string_id'].squeeze()
-            links = pd.Series([entry_string_id]*len(data))
-
-        links.index = data.index.copy()
+        links = _get_item_link_source_IDs(
+            data[['csv_row', 'string_id', 'link_type_id']],
+            ['csv_row']
+        )
 
         # A shorthand link is a relation between four entities
         # represented by integer IDs:
@@ -2536,11 +4635,17 @@ class Shorthand:
         )
         items_csv = tn.strings.loc[items_csv['tgt_string_id'], 'string']
         items_csv = '\n'.join(items_csv)
-        items_csv_string_id = tn.insert_string(
-            items_csv,
-            '_literal_csv',
-            add_node_type=True
-        )
+
+        # The text of an input with a single entry is its entry string,
+        # which is already stored
+        if items_csv in tn.strings['string'].array:
+            items_csv_string_id = tn.id_lookup('strings', items_csv)
+        else:
+            items_csv_string_id = tn.insert_string(
+                items_csv,
+                '_literal_csv',
+                add_node_type=True
+            )
 
         # create a link between the input string and the items csv
         items_csv_link_type_id = tn.insert_link_type('items_csv')
@@ -2556,7 +4661,8 @@ class Shorthand:
         # input string
         entry_syntax_string_id = tn.insert_string(
             self.entry_syntax,
-            '_literal_csv'
+            '_literal_csv',
+            add_node_type=True
         )
         shorthand_entry_syntax_link_id = tn.insert_link_type(
             'shorthand_entry_syntax'
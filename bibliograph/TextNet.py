@@ -1,5 +1,6 @@
 from ast import literal_eval
 import bibliograph as bg
+import json
 import pandas as pd
 
 
@@ -714,7 +715,8 @@ class TextNet():
         self.small_id_dtype = small_id_dtype
 
         self._string_side_tables = [
-            'strings', 'assertions', 'link_types', 'assertion_tags'
+            'strings', 'assertions', 'link_types', 'assertion_tags',
+            'provenance'
         ]
         self._node_side_tables = [
             'nodes', 'edges', 'node_types', 'edge_tags'
@@ -784,6 +786,23 @@ class TextNet():
         }
         self._edge_tags_index_dtype = self.big_id_dtype
 
+        # Provenance records of function call strings, indexed by the
+        # IDs of the strings they describe
+        self._provenance_dtypes = {
+            'function': pd.StringDtype(),
+            'arguments': pd.StringDtype(),
+            'content_hashes': pd.StringDtype()
+        }
+        self._provenance_index_dtype = self.big_id_dtype
+
+        self.provenance = pd.DataFrame(
+            {
+                k: pd.Series(dtype=v)
+                for k, v in self._provenance_dtypes.items()
+            },
+            index=pd.Index([], dtype=self._provenance_index_dtype)
+        )
+
         self._illegal_link_types = ['all', 'self']
 
     def __getattr__(self, attr):
@@ -794,13 +813,27 @@ class TextNet():
 
         except AttributeError as error:
 
-            if attr in self._string_side_tables:
+            tables = (
+                self.__dict__.get('_string_side_tables', [])
+                + self.__dict__.get('_node_side_tables', [])
+            )
+
+            # Tables of a TextNet opened with from_sqlite(lazy=True) are
+            # read the first time they're used
+            if attr in tables and '_sqlite_path' in self.__dict__:
+                table = bg.core._read_textnet_sqlite_rows(self, attr)
+                self.__setattr__(attr, table)
+                return table
+
+            # Look up table names in the instance dictionary because it
+            # is empty while a pickled TextNet is being restored
+            if attr in self.__dict__.get('_string_side_tables', []):
                 raise AssertionsNotFoundError(
                     'assertions and strings not initialized for '
                     'this TextNet'
                 )
 
-            elif attr in self._node_side_tables:
+            elif attr in self.__dict__.get('_node_side_tables', []):
                 raise NodesNotFoundError(
                     'nodes and edges not initialized for '
                     'this TextNet'
@@ -845,6 +878,60 @@ class TextNet():
 
             return new_row.index[0]
 
+    def _table_on_disk(self, table_name):
+        '''
+        True if the table belongs to a TextNet opened with
+        from_sqlite(lazy=True) and hasn't been read yet
+        '''
+        return (
+            '_sqlite_path' in self.__dict__
+            and table_name not in self.__dict__
+        )
+
+    def _select_rows(self, table_name, columns=None, where=None):
+        '''
+        Get the rows of a table with one of the given values in every
+        column of where. If the table is still on disk, only these
+        rows and columns are read from the database.
+
+        Parameters
+        ----------
+        table_name : str
+
+        columns : list or None, default None
+            Columns to return. If None, return every column.
+
+        where : dict or None, default None
+            Maps column names to lists of values. The key 'index'
+            selects by index.
+
+        Returns
+        -------
+        pandas.DataFrame
+        '''
+
+        if self._table_on_disk(table_name):
+            return bg.core._read_textnet_sqlite_rows(
+                self,
+                table_name,
+                columns,
+                where
+            )
+
+        table = self.__getattr__(table_name)
+
+        if columns is None:
+            columns = table.columns
+
+        selection = pd.Series(True, index=table.index)
+        for column, values in (where or {}).items():
+            if column == 'index':
+                selection &= table.index.isin(values)
+            else:
+                selection &= table[column].isin(values)
+
+        return table.loc[selection.array, columns]
+
     def _get_null_type_ids(self, table_name):
         table = self.__getattr__(table_name)
         return table.loc[table['null_type']].index
@@ -1072,6 +1159,12 @@ class TextNet():
         if not bg.util.iterable_not_string(link_type_id):
             link_type_id = [link_type_id]
 
+        if subset is None and self._table_on_disk('assertions'):
+            return self._select_rows(
+                'assertions',
+                where={'link_type_id': link_type_id}
+            )
+
         if subset is None:
             return self.assertions.query('link_type_id.isin(@link_type_id)')
 
@@ -1095,7 +1188,9 @@ class TextNet():
             )
 
         except IdLookupError:
-            if allow_missing_type:
+            if allow_missing_type and self._table_on_disk('assertions'):
+                return self._select_rows('assertions', where={'index': []})
+            elif allow_missing_type:
                 return pd.DataFrame(columns=self.assertions.columns)
             else:
                 raise
@@ -1121,6 +1216,23 @@ class TextNet():
         if component is None:
             component = ['inp', 'src', 'tgt', 'ref']
 
+        if (
+            subset is None
+            and output_mode is None
+            and self._table_on_disk('assertions')
+        ):
+
+            def select(c):
+                return self._select_rows(
+                    'assertions',
+                    where={'{}_string_id'.format(c): string_ids}
+                )
+
+            if bg.util.iterable_not_string(component):
+                return {c: select(c) for c in component}
+            else:
+                return select(component)
+
         if bg.util.iterable_not_string(component):
 
             component_masks = {
@@ -1491,6 +1603,135 @@ class TextNet():
 
         return literal_eval(parameter)
 
+    def get_provenance(self, string_id):
+        '''
+        Get the provenance record of a function call string, like the
+        input string of a slurp function.
+
+        Parameters
+        ----------
+        string_id : int
+
+        Returns
+        -------
+        dict
+            With keys 'function' (the qualified function name),
+            'arguments' (a dict of the arguments of the call), and
+            'content_hashes' (a dict mapping names of file, buffer, and
+            DataFrame arguments to SHA-256 digests of their contents).
+        '''
+
+        record = self.provenance.loc[string_id]
+
+        return {
+            'function': record['function'],
+            'arguments': json.loads(record['arguments']),
+            'content_hashes': json.loads(record['content_hashes'])
+        }
+
+    def _literal_string_ids(self):
+        '''
+        IDs of strings with node type '_literal_csv'
+        '''
+        node_types = self.map_string_id_to_node_type(
+            pd.Series(self.strings.index, index=self.strings.index)
+        )
+        return self.strings.index[(node_types == '_literal_csv').array]
+
+    def store_literals(self, blobs=None):
+        '''
+        Move the text of every string with node type '_literal_csv'
+        (input texts, syntaxes, link constraints, and alias tables)
+        into a BlobStore. The strings keep only the handles of their
+        texts, so resolving assertions doesn't copy the texts, and
+        identical texts stored by different TextNets in the same
+        directory store are stored once. Use get_literal_text to read a
+        text back. The store is kept as the blobs attribute and is
+        saved with the TextNet by to_sqlite and save.
+
+        Parameters
+        ----------
+        blobs : BlobStore or None, default None
+            Store for the texts. If None, use the store the TextNet
+            already has, or a new store in memory.
+
+        Returns
+        -------
+        BlobStore
+        '''
+
+        if blobs is None:
+            blobs = self.__dict__.get('blobs')
+        if blobs is None:
+            blobs = bg.BlobStore()
+
+        # Texts stored in an earlier store are copied to the new one
+        previous = self.__dict__.get('blobs')
+        if (previous is not None) and (previous is not blobs):
+            blobs.update(previous)
+
+        literal_ids = self._literal_string_ids()
+        strings = self.strings.loc[literal_ids, 'string']
+        strings = strings.loc[~strings.map(blobs.__contains__).array]
+
+        self.strings.loc[strings.index, 'string'] = [
+            blobs.put(s) for s in strings
+        ]
+        self.blobs = blobs
+
+        return blobs
+
+    def load_literals(self):
+        '''
+        Put the texts moved into a BlobStore by store_literals back in
+        the strings and detach the store from the TextNet.
+
+        Returns
+        -------
+        BlobStore or None
+            The store the texts were read from
+        '''
+
+        blobs = self.__dict__.pop('blobs', None)
+
+        if blobs is not None:
+            literal_ids = self._literal_string_ids()
+            strings = self.strings.loc[literal_ids, 'string']
+            strings = strings.loc[strings.map(blobs.__contains__).array]
+            self.strings.loc[strings.index, 'string'] = [
+                blobs.get(s) for s in strings
+            ]
+
+        return blobs
+
+    def get_literal_text(self, string_id):
+        '''
+        Get the value of a string, reading it from the BlobStore of the
+        TextNet if the string holds the handle of a stored text.
+
+        Parameters
+        ----------
+        string_id : int
+
+        Returns
+        -------
+        str
+        '''
+
+        string = self.strings.loc[string_id, 'string']
+        blobs = self.__dict__.get('blobs')
+
+        if blobs is None:
+            return string
+
+        # Strings that aren't handles of stored texts are their own
+        # values. Reading the text directly avoids a separate check
+        # that it's stored.
+        try:
+            return blobs.get(string)
+        except KeyError:
+            return string
+
     def get_null_link_type_ids(self):
         return self._get_null_type_ids('link_types')
 
@@ -1702,6 +1943,14 @@ class TextNet():
         if not bg.util.iterable_not_string(node_id):
             node_id = [node_id]
 
+        if self._table_on_disk('strings'):
+            strings = self._select_rows(
+                'strings',
+                columns=[] if string_ids_only else None,
+                where={'node_id': node_id}
+            )
+            return strings.index if string_ids_only else strings
+
         if string_ids_only:
             return self.strings.index[
                 self.strings['node_id'].isin(node_id)
@@ -1729,6 +1978,19 @@ class TextNet():
             node_type_id = self.node_types.query('node_type.isin(@node_type)')
             node_type_id = node_type_id.index
 
+        if self._table_on_disk('nodes') or self._table_on_disk('strings'):
+            node_ids = self._select_rows(
+                'nodes',
+                columns=[],
+                where={'node_type_id': node_type_id}
+            )
+            output = self._select_rows(
+                'strings',
+                columns=[] if string_ids_only else None,
+                where={'node_id': node_ids.index}
+            )
+            return output.index if string_ids_only else output
+
         try:
             node_ids = self.nodes.query('node_type_id.isin(@node_type_id)')
             node_ids = node_ids.index
@@ -2027,8 +2289,6 @@ class TextNet():
             ParsedShorthand.strings is the only DataFrame available.
         '''
 
-        attribute = self.__getattr__(attr)
-
         default_columns = {
             'strings': 'string',
             'node_types': 'node_type',
@@ -2040,6 +2300,20 @@ class TextNet():
 
         string = pd.Series(string)
 
+        if column_label is None:
+            column_label = default_columns.get(attr)
+
+        # Tables that are still on disk only have the rows with the
+        # looked up values read
+        if self._table_on_disk(attr) and column_label is not None:
+            attribute = self._select_rows(
+                attr,
+                columns=[column_label],
+                where={column_label: string}
+            )
+        else:
+            attribute = self.__getattr__(attr)
+
         try:
             # If this assertion passes, assume attribute is a Series
             assert attribute.str
@@ -2113,6 +2387,126 @@ class TextNet():
                 output = output.map(self.nodes['node_type_id'])
                 return output.map(self.node_types['node_type'])
 
+    def refresh_input(self, inp_string_id, filepath_or_buffer):
+        '''
+        Update the TextNet after the shorthand text of one of its inputs
+        was edited. Only rows of the text that changed are parsed, so
+        the time this takes depends on the size of the edit rather than
+        the size of the text. See bg.core.refresh_textnet_input.
+
+        Parameters
+        ----------
+        inp_string_id : int
+            ID of the string representing the input to refresh.
+
+        filepath_or_buffer : str, path object, or file-like object
+            The edited shorthand text.
+        '''
+        bg.core.refresh_textnet_input(self, inp_string_id, filepath_or_buffer)
+
+    def refresh_entry_syntax(self, inp_string_id, entry_syntax):
+        '''
+        Update the TextNet after the entry syntax of one of its inputs
+        was edited. Only rows with entries whose prefixes have changed
+        items are parsed again, so the time this takes depends on how
+        much of the text the edit affects. See
+        bg.core.refresh_textnet_entry_syntax.
+
+        Parameters
+        ----------
+        inp_string_id : int
+            ID of the string representing the input to refresh.
+
+        entry_syntax : str, path object, or file-like object
+            The edited entry syntax.
+        '''
+        bg.core.refresh_textnet_entry_syntax(self, inp_string_id, entry_syntax)
+
+    def to_sqlite(
+        self,
+        path,
+        if_exists='fail',
+        links_excluded_from_edges=None
+    ):
+        '''
+        Store the TextNet in a SQLite database in a single transaction.
+        See bg.core.textnet_to_sqlite.
+
+        Parameters
+        ----------
+        path : str or path object
+            Path to the database file.
+
+        if_exists : str, default 'fail'
+            'fail', 'replace', or 'append'. With 'append', the inputs
+            of this TextNet are merged into the stored one, usually by
+            inserting only the rows that aren't stored.
+
+        links_excluded_from_edges : list or None, default None
+            Link types of assertions that don't become edges when
+            appending.
+        '''
+        bg.core.textnet_to_sqlite(
+            self,
+            path,
+            if_exists=if_exists,
+            links_excluded_from_edges=links_excluded_from_edges
+        )
+
+    @staticmethod
+    def from_sqlite(path, lazy=False):
+        '''
+        Read a TextNet stored with TextNet.to_sqlite. See
+        bg.core.textnet_from_sqlite.
+
+        Parameters
+        ----------
+        path : str or path object
+            Path to the database file.
+
+        lazy : bool, default False
+            If True, tables stay in the database until they're used,
+            and some methods read only the rows and columns they need.
+
+        Returns
+        -------
+        TextNet
+        '''
+        return bg.core.textnet_from_sqlite(path, lazy=lazy)
+
+    def save(self, directory):
+        '''
+        Write the TextNet to a directory of column files that
+        TextNet.load can memory-map. See bg.core.save_textnet.
+
+        Parameters
+        ----------
+        directory : str or path object
+            Directory for the snapshot.
+        '''
+        bg.core.save_textnet(self, directory)
+
+    @staticmethod
+    def load(directory, mmap=True):
+        '''
+        Read a TextNet written by TextNet.save. See
+        bg.core.load_textnet.
+
+        Parameters
+        ----------
+        directory : str or path object
+            Directory of the snapshot.
+
+        mmap : bool, default True
+            If True, integer and boolean columns are memory-mapped
+            instead of read into memory.
+
+        Returns
+        -------
+        TextNet
+        '''
+        return bg.core.load_textnet(directory, mmap=mmap)
+
     def reset_assertions_dtypes(self):
         self._reset_table_dtypes('assertions')
 
@@ -2145,6 +2539,9 @@ class TextNet():
     def reset_edge_tags_dtypes(self):
         self._reset_table_dtypes('edge_tags')
 
+    def reset_provenance_dtypes(self):
+        self._reset_table_dtypes('provenance')
+
     def resolve_assertions(
         self,
         include_node_types=True,
@@ -2171,6 +2568,14 @@ class TextNet():
         pandas.DataFrame
         '''
 
+        if self._table_on_disk('assertions'):
+            return self._resolve_assertions_on_disk(
+                include_node_types,
+                tags,
+                subset,
+                link_type
+            )
+
         assertions = self.assertions
         string_map = self.strings['string']
         lt_map = self.link_types['link_type']
@@ -2221,17 +2626,96 @@ class TextNet():
             )
 
         if tags is True:
-            # Resolve link tags as space-delimited lists
-            tags = self.assertion_tags.groupby('assertion_id')
-            tags = tags.apply(
-                lambda x:
-                ' '.join(self.strings.loc[x['tag_string_id'], 'string'])
+            # Resolve link tags as space-delimited lists. Only tags for
+            # the selected assertions are resolved.
+            tags = self.assertion_tags.loc[
+                self.assertion_tags['assertion_id'].isin(resolved.index)
+            ]
+            tags = pd.Series(
+                tags['tag_string_id'].map(string_map).array,
+                index=tags['assertion_id'].array
             )
+            tags = tags.groupby(level=0, sort=True).agg(' '.join)
 
             resolved = resolved.join(tags.rename('tags'))
 
         return resolved.fillna(pd.NA)
 
+    def _resolve_assertions_on_disk(
+        self,
+        include_node_types,
+        tags,
+        subset,
+        link_type
+    ):
+        '''
+        Resolve assertions of a TextNet opened with
+        from_sqlite(lazy=True) by reading the selected assertions and
+        only the strings, nodes, and tags they refer to into a
+        separate TextNet and resolving its assertions.
+        '''
+
+        where = {}
+
+        if subset is not None:
+
+            if not bg.util.iterable_not_string(subset):
+                subset = [subset]
+
+            # Boolean masks that aren't labelled with assertion IDs
+            # select by position, which needs every assertion ID
+            if pd.api.types.infer_dtype(subset) == 'boolean':
+                if isinstance(subset, pd.Series):
+                    subset = subset.index[subset.array]
+                else:
+                    subset = self.assertions.index[subset]
+
+            where['index'] = subset
+
+        if link_type is not None:
+            where['link_type_id'] = self.id_lookup(
+                'link_types',
+                link_type,
+                return_scalar=False
+            )
+
+        part = bg.TextNet(
+            big_id_dtype=self.big_id_dtype,
+            small_id_dtype=self.small_id_dtype
+        )
+        part.assertions = self._select_rows('assertions', where=where)
+        part.assertion_tags = self._select_rows(
+            'assertion_tags',
+            where={'assertion_id': part.assertions.index}
+        )
+
+        string_ids = pd.concat(
+            [
+                part.assertions[c] for c in [
+                    'inp_string_id',
+                    'src_string_id',
+                    'tgt_string_id',
+                    'ref_string_id'
+                ]
+            ]
+            + [part.assertion_tags['tag_string_id']]
+        )
+        part.strings = self._select_rows(
+            'strings',
+            where={'index': string_ids.dropna().unique()}
+        )
+        part.nodes = self._select_rows(
+            'nodes',
+            where={'index': part.strings['node_id'].unique()}
+        )
+        part.node_types = self.node_types
+        part.link_types = self.link_types
+
+        return part.resolve_assertions(
+            include_node_types=include_node_types,
+            tags=tags
+        )
+
     def resolve_edges(
         self,
         string_type='name',
@@ -1,11 +1,16 @@
+from bibliograph.BlobStore import BlobStore
 from bibliograph.ParsedShorthand import ParsedShorthand
 from bibliograph.Shorthand import Shorthand
 from bibliograph.TextNet import TextNet
+from bibliograph.core import load_textnet
 from bibliograph.core import slurp_bibtex
 from bibliograph.core import slurp_columnar_items
+from bibliograph.core import slurp_jsonl
+from bibliograph.core import slurp_many
 from bibliograph.core import slurp_shorthand
 from bibliograph.core import slurp_single_column
 from bibliograph.core import textnet_from_parsed_shorthand
+from bibliograph.core import textnet_from_sqlite
 import bibliograph.alias_generators as alias_generators
 import bibliograph.entry_parsing as entry_parsing
 import bibliograph.syntax_parsing as syntax_parsing
@@ -1,14 +1,23 @@
 from ast import literal_eval
 import bibliograph as bg
 import pandas as pd
+import hashlib
 import inspect
-from bibtexparser import dumps as _dump_bibtex_string
-from bibtexparser.bibdatabase import BibDatabase as _bibtex_db
+import json
+import numpy as np
+import sqlite3
+from bibtexparser.bibdatabase import BibDatabase
 from bibtexparser.bparser import BibTexParser as _bibtexparser
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from io import StringIO
 from pathlib import Path
 
+from bibliograph.Shorthand import (
+    _MemoryReport,
+    _ShorthandInput,
+    _normalize_skiprows
+)
 from bibliograph.TextNet import IdLookupError
 
 
@@ -16,6 +25,208 @@ def time_string():
     return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
 
+def _is_file_path(value):
+    '''
+    True if value is a path object or a single-line string naming an
+    existing file. Multi-line strings are text, not paths, and strings
+    the OS rejects as paths (too long, say) aren't files.
+    '''
+
+    if isinstance(value, str) and ('\n' in value):
+        return False
+
+    if not isinstance(value, (str, Path)):
+        return False
+
+    try:
+        return Path(value).is_file()
+    except (OSError, ValueError):
+        return False
+
+
+def _content_hash(value):
+    '''
+    SHA-256 hex digest of the content of a file path, text buffer,
+    pandas object, or text, or None if value has no content to hash.
+    '''
+
+    digest = hashlib.sha256()
+
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        if isinstance(value, pd.DataFrame):
+            labels = list(value.columns)
+        else:
+            labels = [value.name]
+        digest.update(json.dumps([str(c) for c in labels]).encode('utf8'))
+        digest.update(
+            pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes()
+        )
+
+    elif _is_file_path(value):
+        with open(value, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+
+    elif isinstance(value, str):
+        digest.update(value.encode('utf8'))
+
+    elif 'getvalue' in dir(value):
+        data = value.getvalue()
+        digest.update(data.encode('utf8') if isinstance(data, str) else data)
+
+    else:
+        return None
+
+    return digest.hexdigest()
+
+
+def _add_content_hash(content_hashes, name, value):
+    '''
+    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
+
+    Add the content hash of value to content_hashes under name unless
+    a hash is already stored under name or value has no content.
+    '''
+
+    if name in content_hashes:
+        return
+
+    content_hash = _content_hash(value)
+    if content_hash is not None:
+        content_hashes[name] = content_hash
+
+
+def _provenance_argument(name, value, content_hashes):
+    '''
+    Convert an argument of a slurp function to a value that can be
+    written as JSON. Scalars are kept. The contents of files, buffers,
+    pandas objects, and texts with line breaks are replaced by their
+    types or paths and their hashes are added to content_hashes under
+    the argument's name, unless content_hashes already has a hash for
+    the argument. Functions are replaced by their qualified names.
+    '''
+
+    if isinstance(value, np.generic):
+        value = value.item()
+
+    if isinstance(value, str) and ('\n' not in value):
+        if _is_file_path(value):
+            _add_content_hash(content_hashes, name, value)
+        return value
+
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+
+    if isinstance(value, Path):
+        _add_content_hash(content_hashes, name, value)
+        return str(value)
+
+    if isinstance(value, dict):
+        return {
+            str(k): _provenance_argument(
+                '{}.{}'.format(name, k),
+                v,
+                content_hashes
+            )
+            for k, v in value.items()
+        }
+
+    if isinstance(value, (list, tuple)):
+        return [
+            _provenance_argument('{}.{}'.format(name, i), v, content_hashes)
+            for i, v in enumerate(value)
+        ]
+
+    if callable(value) and hasattr(value, '__qualname__'):
+        return '{}.{}'.format(
+            getattr(value, '__module__', None),
+            value.__qualname__
+        )
+
+    _add_content_hash(content_hashes, name, value)
+
+    return '<{}>'.format(type(value).__name__)
+
+
+def _provenance_record(function, args, content_hashes=None):
+    '''
+    Make the input string and provenance record of a function call.
+
+    The record has the function name, a canonical JSON of the
+    arguments (see _provenance_argument), and a canonical JSON of
+    content hashes of file, buffer, and DataFrame arguments. The input
+    string names the function and the SHA-256 digest of the record, so
+    its length doesn't depend on the arguments and the same call with
+    the same input contents always gives the same string.
+
+    Parameters
+    ----------
+    function : str
+        Qualified name of the function
+
+    args : dict
+        Arguments of the call. TextNet arguments are left out.
+
+    content_hashes : dict or None, default None
+        Content hashes of arguments that were already read, by
+        argument name. These arguments aren't read again to hash them.
+
+    Returns
+    -------
+    tuple
+        (input string, dict with the provenance table columns)
+    '''
+
+    content_hashes = dict(content_hashes or {})
+    arguments = {
+        k: _provenance_argument(k, v, content_hashes)
+        for k, v in args.items()
+        if not isinstance(v, bg.TextNet)
+    }
+
+    record = {
+        'function': function,
+        'arguments': json.dumps(
+            arguments,
+            sort_keys=True,
+            separators=(',', ':')
+        ),
+        'content_hashes': json.dumps(
+            content_hashes,
+            sort_keys=True,
+            separators=(',', ':')
+        )
+    }
+
+    digest = hashlib.sha256(
+        json.dumps(record, sort_keys=True).encode('utf8')
+    ).hexdigest()
+
+    return '{}(sha256={})'.format(function, digest), record
+
+
+def _insert_provenance(tn, string, record):
+    '''
+    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
+
+    Store the provenance record of a function call string in
+    tn.provenance under the ID of the string. Records of strings that
+    are no longer in the TextNet are dropped.
+    '''
+
+    string_id = tn.id_lookup('strings', string)
+
+    provenance = tn.provenance.loc[
+        tn.provenance.index.isin(tn.strings.index)
+        & (tn.provenance.index != string_id)
+    ]
+    tn.provenance = pd.concat([
+        provenance,
+        pd.DataFrame(record, index=[string_id])
+    ])
+    tn.reset_provenance_dtypes()
+
+
 def _insert_alias_assertions(
     tn,
     aliases_dict,
@@ -99,8 +310,13 @@ def _insert_alias_assertions(
         :
     ]
 
-    # Insert the new strings in tn.strings
-    new_strings = bg.util.normalize_types(new_strings, tn.strings)
+    # Insert the new strings in tn.strings. The concatenated frames have
+    # overlapping indexes, which would map to overlapping string IDs if
+    # there are gaps in the existing string IDs.
+    new_strings = bg.util.normalize_types(
+        new_strings.reset_index(drop=True),
+        tn.strings
+    )
     tn.strings = pd.concat([tn.strings, new_strings])
 
     # make maps between string values and integer IDs relevant to each
@@ -223,23 +439,35 @@ def _insert_alias_assertions(
             ['bibliograph', current_module, current_function]
         )
 
+        # The input is recorded by its string instead of its ID, which
+        # changes when TextNets are merged
         ref_args = {
-            'tn': tn,
             'aliases_dict': aliases_dict,
             'aliases_case_sensitive': aliases_case_sensitive,
-            'inp_string_id': inp_string_id,
+            'inp_string': tn.strings.loc[inp_string_id, 'string'],
             'generators': generators
         }
-        ref_string = ('{}(**{})'.format(current_function, ref_args))
-
-        ref_string_id = tn.insert_string(
-            ref_string,
-            '_python_function_call',
-            add_node_type=True
+        ref_string, ref_provenance = _provenance_record(
+            current_function,
+            ref_args
         )
 
+        # The same call always gives the same string, which is already
+        # stored if the aliases of this input were generated before
+        try:
+            ref_string_id = tn.id_lookup('strings', ref_string)
+
+        except IdLookupError:
+            ref_string_id = tn.insert_string(
+                ref_string,
+                '_python_function_call',
+                add_node_type=True
+            )
+
         tn.assertions.loc[new_assrtn_ids, 'ref_string_id'] = ref_string_id
 
+        _insert_provenance(tn, ref_string, ref_provenance)
+
 
 def _read_file_from_path_or_read_str_as_buffer(
     filepath_or_string_data,
@@ -658,14 +886,15 @@ def build_textnet_assertions(
     return tn
 
 
-def complete_textnet_from_assertions(
-    tn,
-    aliases_case_sensitive,
-    current_inp_string_id,
-    link_constraints_string_id,
-    links_excluded_from_edges,
-    apply_link_constraints=True
-):
+def _build_nodes(tn):
+    '''
+    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
+
+    Build the nodes of a TextNet from its strings, which must have node
+    types, and store the node ID of each string. Strings linked by
+    alias assertions share a node. Nodes are named by their longest
+    string and abbreviated by their shortest.
+    '''
 
     # If there are alias links in the assertions table, map them to the
     # same node IDs
@@ -903,6 +1132,169 @@ def complete_textnet_from_assertions(
     tn.nodes.loc[names['node_id'], 'name_string_id'] = names.index
     tn.nodes.loc[abbrs['node_id'], 'abbr_string_id'] = abbrs.index
 
+
+def _select_edge_assertions(tn, assertions, links_excluded_from_edges):
+    '''
+    Get the assertions in a subset of the assertions of a TextNet whose
+    link types aren't excluded from edges.
+    '''
+
+    if links_excluded_from_edges is None:
+        return assertions
+
+    excluded_link_type_ids = [
+        tn.id_lookup('link_types', t) for t in links_excluded_from_edges
+        if t in tn.link_types['link_type'].array
+    ]
+
+    return assertions.loc[
+        ~assertions['link_type_id'].isin(excluded_link_type_ids)
+    ]
+
+
+def _build_edges(tn, assertions):
+    '''
+    Get the distinct edges between the nodes of the strings in a subset
+    of the assertions of a TextNet whose strings have node IDs. Edges
+    are indexed from zero.
+    '''
+
+    def map_assert_str_id_to_node_id(label):
+        return assertions[label].map(tn.strings['node_id'])
+
+    edges = pd.DataFrame({
+        'src_node_id': map_assert_str_id_to_node_id('src_string_id').array,
+        'tgt_node_id': map_assert_str_id_to_node_id('tgt_string_id').array,
+        'ref_node_id': map_assert_str_id_to_node_id('ref_string_id').array,
+        'link_type_id': assertions['link_type_id'].array
+    })
+    edges = edges.drop_duplicates().reset_index(drop=True)
+    edges = edges.astype({c: tn._edges_dtypes[c] for c in edges.columns})
+
+    # If an edge source node has links of the same type to a null node
+    # and a non-null node, the edge(s) with a null target should be
+    # dropped
+    hashed_srclnk_pairs = pd.util.hash_pandas_object(
+        edges[['src_node_id', 'link_type_id']],
+        index=False
+    )
+    edges['srclnk'] = hashed_srclnk_pairs.array
+    nodes_with_null_types = tn.get_nodes_with_null_types().index
+    srclnks_with_null_targets = edges.loc[
+        edges['tgt_node_id'].isin(nodes_with_null_types),
+        'srclnk'
+    ]
+    q = '({})'.format(') & ('.join([
+        'srclnk.isin(@srclnks_with_null_targets)',
+        '~tgt_node_id.isin(@nodes_with_null_types)'
+    ]))
+    srclnks_with_null_and_non_null_targets = edges.query(q)['srclnk']
+    q = '({})'.format(') & ('.join([
+        'srclnk.isin(@srclnks_with_null_and_non_null_targets)',
+        'tgt_node_id.isin(@nodes_with_null_types)'
+    ]))
+    edges_to_drop = edges.query(q)
+    edges = edges.drop(edges_to_drop.index).reset_index(drop=True)
+    edges = edges.drop('srclnk', axis='columns')
+
+    return edges
+
+
+def _build_edge_tags(tn, assertions, edges):
+    '''
+    Get edge tags for a subset of the assertions of a TextNet and the
+    edges built from them.
+
+    Assertion tags that are digits should be the positions of links in
+    listed items (as in first author, second author, etc.) so those
+    are copied as edge tags. Tags of assertions whose edges were
+    dropped have null edge IDs.
+    '''
+
+    assertion_tags = tn.assertion_tags.loc[
+        tn.assertion_tags['assertion_id'].isin(assertions.index)
+    ]
+
+    tag_strings = tn.strings.loc[
+        assertion_tags['tag_string_id'],
+        'string'
+    ]
+    digit_tag_strings = tag_strings.loc[tag_strings.str.isdigit()]
+    digit_tagged_assertions = assertion_tags.loc[
+        assertion_tags['tag_string_id'].isin(digit_tag_strings.index),
+        'assertion_id'
+    ]
+    digit_tagged_assertions = assertions.loc[digit_tagged_assertions]
+
+    string_columns = ['src_string_id', 'tgt_string_id', 'ref_string_id']
+    digit_tagged_edges = digit_tagged_assertions[string_columns].apply(
+        lambda x: x.map(tn.strings['node_id'])
+    )
+    digit_tagged_edges.columns = ['src_node_id', 'tgt_node_id', 'ref_node_id']
+    link_type_ids = assertions.loc[
+        digit_tagged_edges.index,
+        'link_type_id'
+    ]
+    digit_tagged_edges['link_type_id'] = link_type_ids.array
+
+    tagged_edges_hsh = pd.util.hash_pandas_object(
+        digit_tagged_edges,
+        index=False
+    )
+    edges_hsh = pd.util.hash_pandas_object(edges, index=False)
+
+    hash_to_edge_id_map = edges_hsh.loc[edges_hsh.isin(tagged_edges_hsh)]
+    hash_to_edge_id_map = pd.Series(
+        hash_to_edge_id_map.index,
+        index=hash_to_edge_id_map.array
+    )
+
+    assertion_id_to_hash_map = pd.Series(
+        tagged_edges_hsh.array,
+        index=digit_tagged_edges.index
+    )
+
+    assertion_id_to_edge_id_map = assertion_id_to_hash_map.map(
+        hash_to_edge_id_map
+    )
+    tags = assertion_tags.query(
+        'tag_string_id.isin(@digit_tag_strings.index)'
+    )
+    edge_ids = tags['assertion_id'].map(assertion_id_to_edge_id_map)
+    tag_node_ids = tags['tag_string_id'].map(tn.strings['node_id'])
+
+    return pd.DataFrame({
+        'edge_id': edge_ids,
+        'tag_node_id': tag_node_ids
+    })
+
+
+def complete_textnet_from_assertions(
+    tn,
+    aliases_case_sensitive,
+    current_inp_string_id,
+    link_constraints_string_id,
+    links_excluded_from_edges,
+    apply_link_constraints=True,
+    link_constraint_inputs=None
+):
+    '''
+    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
+
+    Build nodes, edges, and edge tags from the strings and assertions
+    of a TextNet. Strings linked by alias assertions share a node.
+
+    Link constraints are applied for the inputs in
+    link_constraint_inputs, a list of input string IDs. If it's None,
+    the constraints of current_inp_string_id are applied if
+    link_constraints_string_id is not None. Alias assertions made by
+    the constraints have the input string of the input whose
+    constraints made them and its link constraints string as their
+    reference string.
+    '''
+
+    _build_nodes(tn)
+
     '''
     SWITCHING TO LITERAL NODE TYPE
     assert_input_op_requirements = tn.get_assertions_by_link_type('requires')
@@ -940,8 +1332,19 @@ def complete_textnet_from_assertions(
         allow_missing_type=True
     )
 
-    has_link_constraints = (link_constraints_string_id is not None)
-    if has_link_constraints and not link_constraint_assertions.empty:
+    if link_constraint_inputs is None:
+        if link_constraints_string_id is None:
+            link_constraint_inputs = []
+        else:
+            link_constraint_inputs = [current_inp_string_id]
+
+    link_constraint_assertions = link_constraint_assertions.loc[
+        link_constraint_assertions['inp_string_id'].isin(
+            link_constraint_inputs
+        )
+    ]
+
+    if not link_constraint_assertions.empty:
 
         link_constraint_assertions = link_constraint_assertions.sort_values(
             by='inp_string_id'
@@ -980,25 +1383,28 @@ def complete_textnet_from_assertions(
                 inp_string_id=inp_string_id
             )
 
-        node_id_map = {
-            inp_string_id: apply_link_constraints(inp_string_id, id_pair)
-            for inp_string_id, id_pair in
+        alias_link_type_id = tn.insert_link_type('alias')
+
+        new_assertions = []
+
+        for inp_string_id, id_pair in (
             constraint_and_syntax_string_id_by_inp_string_id.iterrows()
-        }
-        node_id_map = pd.concat(node_id_map.values())
+        ):
 
-        alias_link_type_id = tn.insert_link_type('alias')
+            node_id_map = apply_link_constraints(inp_string_id, id_pair)
 
-        src_string_ids = tn.nodes.loc[node_id_map.index, 'name_string_id']
-        tgt_string_ids = tn.nodes.loc[node_id_map, 'name_string_id']
+            src_string_ids = tn.nodes.loc[node_id_map.index, 'name_string_id']
+            tgt_string_ids = tn.nodes.loc[node_id_map, 'name_string_id']
 
-        new_assertions = pd.DataFrame({
-            'inp_string_id': current_inp_string_id,
-            'src_string_id': src_string_ids.array,
-            'tgt_string_id': tgt_string_ids.array,
-            'ref_string_id': link_constraints_string_id,
-            'link_type_id': alias_link_type_id
-        })
+            new_assertions.append(pd.DataFrame({
+                'inp_string_id': inp_string_id,
+                'src_string_id': src_string_ids.array,
+                'tgt_string_id': tgt_string_ids.array,
+                'ref_string_id': id_pair['link_constraint_string_id'],
+                'link_type_id': alias_link_type_id
+            }))
+
+        new_assertions = pd.concat(new_assertions, ignore_index=True)
         new_assertions = bg.util.normalize_types(new_assertions, tn.assertions)
         tn.assertions = pd.concat([tn.assertions, new_assertions])
 
@@ -1016,169 +1422,53 @@ def complete_textnet_from_assertions(
             current_inp_string_id=current_inp_string_id,
             link_constraints_string_id=None,
             links_excluded_from_edges=links_excluded_from_edges,
-            apply_link_constraints=False
+            apply_link_constraints=False,
+            link_constraint_inputs=[]
         )
 
     tn.reset_nodes_dtypes()
 
-    if links_excluded_from_edges is not None:
-
-        excluded_link_type_ids = [
-            tn.id_lookup('link_types', t) for t in links_excluded_from_edges
-            if t in tn.link_types['link_type'].array
-        ]
-        assertion_selection = tn.assertions.loc[
-            ~tn.assertions['link_type_id'].isin(excluded_link_type_ids)
-        ]
+    assertion_selection = _select_edge_assertions(
+        tn,
+        tn.assertions,
+        links_excluded_from_edges
+    )
 
-    else:
+    tn.edges = _build_edges(tn, assertion_selection)
+    tn.reset_edges_dtypes()
 
-        assertion_selection = tn.assertions
+    tn.edge_tags = _build_edge_tags(tn, tn.assertions, tn.edges)
+    tn.reset_edge_tags_dtypes()
 
-    def map_assert_str_id_to_node_id(label):
-        return assertion_selection[label].map(tn.strings['node_id'])
+    date_inserted = time_string()
 
-    tn.edges = pd.DataFrame({
-        'src_node_id': map_assert_str_id_to_node_id('src_string_id').array,
-        'tgt_node_id': map_assert_str_id_to_node_id('tgt_string_id').array,
-        'ref_node_id': map_assert_str_id_to_node_id('ref_string_id').array,
-        'link_type_id': assertion_selection['link_type_id'].array
-    })
-    tn.edges = tn.edges.drop_duplicates().reset_index(drop=True)
+    for attr in ['assertions', 'strings', 'nodes', 'edges']:
+        table = tn.__getattr__(attr)
+        table['date_inserted'] = date_inserted
+        table['date_modified'] = pd.NA
 
+    tn.reset_assertions_dtypes()
+    tn.reset_strings_dtypes()
+    tn.reset_nodes_dtypes()
     tn.reset_edges_dtypes()
 
-    # If an edge source node has links of the same type to a null node
-    # and a non-null node, the edge(s) with a null target should be
-    # dropped
-    hashed_srclnk_pairs = pd.util.hash_pandas_object(
-        tn.edges[['src_node_id', 'link_type_id']],
-        index=False
-    )
-    tn.edges['srclnk'] = hashed_srclnk_pairs.array
-    nodes_with_null_types = tn.get_nodes_with_null_types().index
-    srclnks_with_null_targets = tn.edges.loc[
-        tn.edges['tgt_node_id'].isin(nodes_with_null_types),
-        'srclnk'
-    ]
-    q = '({})'.format(') & ('.join([
-        'srclnk.isin(@srclnks_with_null_targets)',
-        '~tgt_node_id.isin(@nodes_with_null_types)'
-    ]))
-    srclnks_with_null_and_non_null_targets = tn.edges.query(q)['srclnk']
-    q = '({})'.format(') & ('.join([
-        'srclnk.isin(@srclnks_with_null_and_non_null_targets)',
-        'tgt_node_id.isin(@nodes_with_null_types)'
-    ]))
-    edges_to_drop = tn.edges.query(q)
-    tn.edges = tn.edges.drop(edges_to_drop.index).reset_index(drop=True)
-    tn.edges = tn.edges.drop('srclnk', axis='columns')
+    return tn
 
-    # Assertion tags that are digits should be the positions of links
-    # in listed items (as in first author, second author, etc.) so
-    # those should get copied as edge tags
 
-    tag_strings = tn.strings.loc[
-        tn.assertion_tags['tag_string_id'],
-        'string'
-    ]
-    digit_tag_strings = tag_strings.loc[tag_strings.str.isdigit()]
-    digit_tagged_assertions = tn.assertion_tags.loc[
-        tn.assertion_tags['tag_string_id'].isin(digit_tag_strings.index),
-        'assertion_id'
-    ]
-    digit_tagged_assertions = tn.assertions.loc[digit_tagged_assertions]
+def _insert_input_aliases(
+    tn,
+    inp_string_id,
+    aliases_dict,
+    aliases_case_sensitive,
+    automatic_aliasing
+):
+    '''
+    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
 
-    string_columns = ['src_string_id', 'tgt_string_id', 'ref_string_id']
-    digit_tagged_edges = digit_tagged_assertions[string_columns].apply(
-        lambda x: x.map(tn.strings['node_id'])
-    )
-    digit_tagged_edges.columns = ['src_node_id', 'tgt_node_id', 'ref_node_id']
-    link_type_ids = tn.assertions.loc[
-        digit_tagged_edges.index,
-        'link_type_id'
-    ]
-    digit_tagged_edges['link_type_id'] = link_type_ids.array
-
-    tagged_edges_hsh = pd.util.hash_pandas_object(
-        digit_tagged_edges,
-        index=False
-    )
-    edges_hsh = pd.util.hash_pandas_object(tn.edges, index=False)
-
-    hash_to_edge_id_map = edges_hsh.loc[edges_hsh.isin(tagged_edges_hsh)]
-    hash_to_edge_id_map = pd.Series(
-        tn.edges.iloc[hash_to_edge_id_map.index].index,
-        index=hash_to_edge_id_map.array
-    )
-
-    assertion_id_to_hash_map = pd.Series(
-        tagged_edges_hsh.array,
-        index=digit_tagged_edges.index
-    )
-
-    assertion_id_to_edge_id_map = assertion_id_to_hash_map.map(
-        hash_to_edge_id_map
-    )
-    tags = tn.assertion_tags.query(
-        'tag_string_id.isin(@digit_tag_strings.index)'
-    )
-    edge_ids = tags['assertion_id'].map(assertion_id_to_edge_id_map)
-    tag_node_ids = tags['tag_string_id'].map(tn.strings['node_id'])
-
-    tn.edge_tags = pd.DataFrame({
-        'edge_id': edge_ids,
-        'tag_node_id': tag_node_ids
-    })
-
-    tn.reset_edge_tags_dtypes()
-
-    date_inserted = time_string()
-
-    for attr in ['assertions', 'strings', 'nodes', 'edges']:
-        table = tn.__getattr__(attr)
-        table['date_inserted'] = date_inserted
-        table['date_modified'] = pd.NA
-
-    tn.reset_assertions_dtypes()
-    tn.reset_strings_dtypes()
-    tn.reset_nodes_dtypes()
-    tn.reset_edges_dtypes()
-
-    return tn
-
-
-def textnet_from_parsed_shorthand(
-    parsed,
-    inp_string,
-    aliases_dict=None,
-    aliases_case_sensitive=True,
-    automatic_aliasing=False,
-    link_constraints_fname=None,
-    links_excluded_from_edges=None,
-    textnet_build_parameters=None
-):
-
-    linking_parameters = {
-        'aliases_dict': aliases_dict,
-        'aliases_case_sensitive': aliases_case_sensitive,
-        'automatic_aliasing': automatic_aliasing,
-        'links_excluded_from_edges': links_excluded_from_edges
-    }
-
-    if textnet_build_parameters is not None:
-        textnet_build_parameters.update(linking_parameters)
-    else:
-        textnet_build_parameters = linking_parameters
-
-    tn = build_textnet_assertions(
-        parsed,
-        inp_string,
-        textnet_build_parameters
-    )
-
-    inp_string_id = tn.id_lookup('strings', inp_string)
-    #alias_link_type_id = tn.insert_link_type('alias')
+    Insert alias assertions for an input from user-supplied alias
+    tables and, if automatic_aliasing is True, from aliases generated
+    for actor and identifier strings.
+    '''
 
     if aliases_dict is not None:
 
@@ -1208,7 +1498,7 @@ def textnet_from_parsed_shorthand(
         aliases = {
             k: pd.DataFrame({
                 'string': v['string'].array,
-                'alias': aliases[k].array
+                'alias': aliases[k].loc[v.index].array
             })
             for k, v in strings.items()
         }
@@ -1227,6 +1517,93 @@ def textnet_from_parsed_shorthand(
             generators=alias_generators
         )
 
+
+def _get_redundant_item_assertion_ids(
+    tn,
+    entry_syntax,
+    na_string_value,
+    subset=None
+):
+    '''
+    Get the IDs of assertions linking entries to missing items whose
+    node and link types are shared with other items in the entry
+    syntax. Only assertions in subset are considered if subset is not
+    None.
+    '''
+
+    assertions = tn.assertions
+
+    if subset is not None:
+        assertions = assertions.loc[subset]
+
+    try:
+        default_na_string_id = tn.id_lookup('strings', na_string_value)
+    except IdLookupError:
+        return assertions.index[:0]
+
+    assertion_subset = assertions.query(
+        'tgt_string_id == @default_na_string_id'
+    )
+
+    duplicate_link_types = entry_syntax['item_link_type'].loc[
+        entry_syntax[['item_node_type', 'item_link_type']].duplicated()
+    ]
+    duplicate_link_type_ids = tn.link_types.index[
+        tn.link_types['link_type'].isin(duplicate_link_types)
+    ]
+    assertion_subset = assertion_subset.query(
+        'link_type_id.isin(@duplicate_link_type_ids)'
+    )
+
+    column_subset = ['src_string_id', 'tgt_string_id', 'link_type_id']
+    assertions_to_keep = assertion_subset[column_subset].duplicated(
+        keep='first'
+    )
+
+    return assertion_subset.loc[~assertions_to_keep].index
+
+
+def textnet_from_parsed_shorthand(
+    parsed,
+    inp_string,
+    aliases_dict=None,
+    aliases_case_sensitive=True,
+    automatic_aliasing=False,
+    link_constraints_fname=None,
+    links_excluded_from_edges=None,
+    textnet_build_parameters=None,
+    build_nodes=True
+):
+
+    linking_parameters = {
+        'aliases_dict': aliases_dict,
+        'aliases_case_sensitive': aliases_case_sensitive,
+        'automatic_aliasing': automatic_aliasing,
+        'links_excluded_from_edges': links_excluded_from_edges
+    }
+
+    if textnet_build_parameters is not None:
+        textnet_build_parameters.update(linking_parameters)
+    else:
+        textnet_build_parameters = linking_parameters
+
+    tn = build_textnet_assertions(
+        parsed,
+        inp_string,
+        textnet_build_parameters
+    )
+
+    inp_string_id = tn.id_lookup('strings', inp_string)
+    #alias_link_type_id = tn.insert_link_type('alias')
+
+    _insert_input_aliases(
+        tn,
+        inp_string_id,
+        aliases_dict,
+        aliases_case_sensitive,
+        automatic_aliasing
+    )
+
     if link_constraints_fname is not None:
 
         with open(link_constraints_fname, 'r', encoding='utf8') as f:
@@ -1291,31 +1668,19 @@ def textnet_from_parsed_shorthand(
             allow_redundant_items=input_metadata['allow_redundant_items']
         )
 
-        default_na_string_value = input_metadata['na_string_values'][0]
-        default_na_string_id = tn.id_lookup('strings', default_na_string_value)
-        assertion_subset = tn.assertions.query(
-            'tgt_string_id == @default_na_string_id'
-        )
-
-        duplicate_link_types = entry_syntax['item_link_type'].loc[
-            entry_syntax[['item_node_type', 'item_link_type']].duplicated()
-        ]
-        duplicate_link_type_ids = [
-            tn.id_lookup('link_types', lt) for lt in duplicate_link_types
-        ]
-        assertion_subset = assertion_subset.query(
-            'link_type_id.isin(@duplicate_link_type_ids)'
-        )
-
-        column_subset = ['src_string_id', 'tgt_string_id', 'link_type_id']
-        assertions_to_keep = assertion_subset[column_subset].duplicated(
-            keep='first'
+        drop_assertion_ids = _get_redundant_item_assertion_ids(
+            tn,
+            entry_syntax,
+            input_metadata['na_string_values'][0]
         )
 
-        drop_assertion_ids = assertion_subset.loc[~assertions_to_keep].index
-
         tn.assertions = tn.assertions.drop(drop_assertion_ids)
 
+    # Aliases and link constraints are stored as assertions, so nodes
+    # can be built later, like when many inputs are merged first
+    if not build_nodes:
+        return tn
+
     tn = complete_textnet_from_assertions(
         tn,
         aliases_case_sensitive,
@@ -1327,347 +1692,3553 @@ def textnet_from_parsed_shorthand(
     return tn
 
 
-def slurp_bibtex(
-    bibtex_fname,
-    entry_syntax_fname,
-    syntax_case_sensitive=True,
-    allow_redundant_items=False,
-    aliases_dict=None,
-    aliases_case_sensitive=True,
-    automatic_aliasing=False,
-    link_constraints_fname=None,
-    links_excluded_from_edges=None,
-    encoding='utf8',
-    **kwargs
-):
+def _assertion_value_keys(assertions, assertion_tags):
+    '''
+    Hash the string IDs, link type ID, and tags of each assertion so
+    assertions from different sources can be compared by value.
+    '''
+    columns = [
+        'src_string_id', 'tgt_string_id', 'ref_string_id', 'link_type_id'
+    ]
 
-    # make a string value representing the current function call
-    frame = inspect.currentframe()
-    current_module = inspect.getframeinfo(frame).filename
-    current_module = Path(current_module).stem.split('.')[0]
-    current_function = inspect.getframeinfo(frame).function
-    current_function = '.'.join(
-        ['bibliograph', current_module, current_function]
+    tags = assertion_tags.loc[
+        assertion_tags['assertion_id'].isin(assertions.index)
+    ]
+    tags = tags.sort_values(by=['assertion_id', 'tag_string_id'])
+    tags = pd.Series(
+        tags['tag_string_id'].astype(str).array,
+        index=tags['assertion_id'].array
     )
+    tags = tags.groupby(level=0).agg(' '.join)
 
-    excluded_locals = [
-        'frame',
-        'current_module',
-        'current_function',
-        'excluded_locals',
-        'kwargs'
-    ]
-    args = {k: v for k, v in locals().items() if k not in excluded_locals}
-    args.update(kwargs)
+    values = assertions[columns].astype(pd.Int64Dtype())
+    values['tags'] = pd.Series(assertions.index).map(tags).fillna('').array
 
-    inp_string = '{}(**{})'.format(current_function, args)
+    return pd.util.hash_pandas_object(values, index=False)
 
-    # initialize bibtex and shorthand parsers
-    bibtex_parser = _bibtexparser(common_strings=True)
-    s = bg.Shorthand(
-        entry_syntax=entry_syntax_fname,
-        syntax_case_sensitive=syntax_case_sensitive,
-        allow_redundant_items=allow_redundant_items
-    )
 
-    # if a function to write entry strings was not provided, use
-    # functions from bibtexparser
-    if 'entry_writer' in kwargs.keys():
+def refresh_textnet_input(tn, inp_string_id, filepath_or_buffer):
+    '''
+    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
+
+    Update a TextNet after the shorthand text of one of its inputs was
+    edited, parsing only the rows that changed.
+
+    The shorthand text stored for the input is compared row by row with
+    the edited text (see Shorthand.parse_text_changes). Assertions that
+    came from removed or changed rows are retracted and assertions from
+    new rows are inserted. Alias assertions for the input are then
+    regenerated if strings of aliased node types were inserted or
+    dropped, and only the nodes and edges of changed strings and
+    assertions are rebuilt (see _update_nodes_and_edges). Strings and
+    assertions that weren't affected by the edit keep their IDs and
+    insertion dates. Inputs with link constraints have all of their
+    nodes and edges rebuilt.
+
+    Entry prefixes and item labels found in new rows are added to the
+    lists stored for the input, but values that only appeared in
+    removed rows are not dropped from the lists.
+
+    Parameters
+    ----------
+    tn : TextNet
+        A TextNet generated by slurp_shorthand or slurp_single_column.
+
+    inp_string_id : int
+        ID of the string representing the input to refresh.
+
+    filepath_or_buffer : str, path object, or file-like object
+        The edited shorthand text.
+
+    Returns
+    -------
+    TextNet
+        The TextNet passed as tn.
+    '''
+    return _refresh_textnet_input(
+        tn,
+        inp_string_id,
+        filepath_or_buffer=filepath_or_buffer
+    )
 
-        entry_writer = kwargs['entry_writer']
 
-    else:
+def refresh_textnet_entry_syntax(tn, inp_string_id, entry_syntax):
+    '''
+    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
+
+    Update a TextNet after the entry syntax of one of its inputs was
+    edited, parsing only the entries whose prefixes have changed items.
+
+    The compiled entry syntax stored for the input is compared with the
+    edited syntax (see Shorthand.parse_syntax_changes). Assertions that
+    came from rows with affected entries are retracted and the same
+    rows are parsed again with the edited syntax. Alias assertions,
+    nodes, and edges are then updated as in refresh_textnet_input, and
+    the edited syntax is stored for the input. Strings and assertions
+    that weren't affected keep their IDs and insertion dates.
+
+    Parameters
+    ----------
+    tn : TextNet
+        A TextNet generated by slurp_shorthand or slurp_single_column.
+
+    inp_string_id : int
+        ID of the string representing the input to refresh.
+
+    entry_syntax : str, path object, or file-like object
+        The edited entry syntax. The link syntax stored for the input
+        must be valid for the edited entry syntax.
+
+    Returns
+    -------
+    TextNet
+        The TextNet passed as tn.
+    '''
+    return _refresh_textnet_input(
+        tn,
+        inp_string_id,
+        entry_syntax=entry_syntax
+    )
 
-        def btwriter(entry_series):
-            db = _bibtex_db()
-            db.entries = [dict(entry_series.dropna().map(str))]
-            return _dump_bibtex_string(db)
 
-        entry_writer = btwriter
+def _replace_input_literal(tn, inp_string_id, link_type, string):
+    '''
+    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
 
-    # drop 'entry_writer' from the input args so we can pass it directly
-    # to Shorthand.parse_items
-    kwargs = {k: v for k, v in kwargs.items() if k != 'entry_writer'}
+    Give the literal string linked to an input by assertions of
+    link_type (like the input's entry syntax) a new value. The string is
+    edited in place unless it is shared with other inputs or another
+    string already has the new value, in which case the input's
+    assertion is pointed at a different string.
 
-    # parse input
-    with open(bibtex_fname, encoding=encoding) as f:
-        parsed = s.parse_items(
-            pd.DataFrame(bibtex_parser.parse_file(f).entries),
-            entry_writer=entry_writer,
-            input_string=inp_string,
-            input_node_type='_python_function_call',
-            **kwargs
-        )
+    Strings must have a node_type_id column.
 
-    textnet_build_parameters = kwargs
-    textnet_build_parameters['syntax_case_sensitive'] = syntax_case_sensitive
-    textnet_build_parameters['allow_redundant_items'] = allow_redundant_items
+    Returns
+    -------
+    int
+        ID of the string with the new value.
+    '''
+    assertions = tn.assertions
+    is_input_literal = (
+        (assertions['link_type_id'] == tn.id_lookup('link_types', link_type))
+        & (assertions['inp_string_id'] == inp_string_id)
+    )
+    old_id = assertions.loc[is_input_literal, 'tgt_string_id'].iloc[0]
+    node_type_id = tn.strings.loc[old_id, 'node_type_id']
 
-    tn = textnet_from_parsed_shorthand(
-        parsed,
-        inp_string,
-        aliases_dict,
-        aliases_case_sensitive,
-        automatic_aliasing,
-        link_constraints_fname,
-        links_excluded_from_edges,
-        textnet_build_parameters
+    string_columns = [
+        'inp_string_id', 'src_string_id', 'tgt_string_id', 'ref_string_id'
+    ]
+    other_references = pd.concat(
+        [assertions.loc[~is_input_literal, c] for c in string_columns]
+        + [tn.assertion_tags['tag_string_id']]
     )
 
-    return tn
+    existing = tn.strings.index[
+        (tn.strings['string'] == string).array
+        & (tn.strings['node_type_id'] == node_type_id).array
+    ]
 
+    if not existing.empty:
+        new_id = existing[0]
 
-def slurp_columnar_items(
-    data,
-    entry_syntax_fname,
-    syntax_case_sensitive=True,
-    allow_redundant_items=False,
-    aliases_dict=None,
-    aliases_case_sensitive=True,
-    automatic_aliasing=False,
-    link_constraints_fname=None,
-    links_excluded_from_edges=None,
-    skiprows=0,
-    encoding='utf8',
-    **kwargs
-):
+    elif not other_references.isin([old_id]).any():
+        tn.strings.loc[old_id, 'string'] = string
+        return old_id
 
-    # read in data
-    if isinstance(data, str):
-        data = pd.read_csv(
-            data,
-            skiprows=skiprows,
-            skipinitialspace=True,
-            encoding=encoding
-        )
-        add_read_csv_params = True
     else:
-        data = pd.DataFrame(data)
-        add_read_csv_params = False
+        new_string = pd.DataFrame(
+            {'string': [string], 'node_type_id': [node_type_id]}
+        )
+        new_string = bg.util.normalize_types(
+            new_string,
+            tn.strings,
+            strict=False
+        )
+        tn.strings = pd.concat([tn.strings, new_string])
+        new_id = new_string.index[0]
 
-    data = data.applymap(lambda x: pd.NA if pd.isna(x) else str(x))
+    tn.assertions.loc[is_input_literal, 'tgt_string_id'] = new_id
 
-    # make a shorthand
-    s = bg.Shorthand(
-        entry_syntax=entry_syntax_fname,
-        syntax_case_sensitive=syntax_case_sensitive,
-        allow_redundant_items=allow_redundant_items
+    if not other_references.isin([old_id]).any():
+        tn.strings = tn.strings.drop(old_id)
+
+    return new_id
+
+
+def _restore_string_ids(tn, dropped_strings, kept_string_ids):
+    '''
+    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
+
+    Give strings inserted into a TextNet after some of its strings were
+    dropped the IDs of dropped strings with the same values and node
+    types, so strings that are parsed again keep their IDs. Inserted
+    strings that have the ID of a restored string are given new IDs.
+
+    dropped_strings is a frame of the dropped strings with string and
+    node_type_id columns, and kept_string_ids are the IDs of the strings
+    that weren't dropped. Strings must have a node_type_id column.
+
+    Returns
+    -------
+    pandas.Index
+        The restored string IDs.
+    '''
+
+    inserted = tn.strings.loc[~tn.strings.index.isin(kept_string_ids)]
+
+    if inserted.empty or dropped_strings.empty:
+        return inserted.index[:0]
+
+    def keys(strings):
+        keys = pd.DataFrame({
+            'string': strings['string'].astype(str).array,
+            'node_type_id': strings['node_type_id'].astype('int64').array
+        })
+        return pd.Series(
+            pd.util.hash_pandas_object(keys, index=False).array,
+            index=strings.index
+        )
+
+    dropped_keys = keys(dropped_strings)
+    dropped_keys = dropped_keys.loc[~dropped_keys.duplicated()]
+    dropped_ids = pd.Series(dropped_keys.index, index=dropped_keys.array)
+
+    id_map = keys(inserted).map(dropped_ids).dropna().astype('int64')
+
+    # Dropped IDs can only have been reused by inserted strings
+    displaced = inserted.index[
+        inserted.index.isin(id_map.array)
+        & ~inserted.index.isin(id_map.index)
+    ]
+    next_id = max(tn.strings.index.max(), id_map.max()) + 1
+    id_map = pd.concat([
+        id_map,
+        pd.Series(range(next_id, next_id + len(displaced)), index=displaced)
+    ])
+    id_map = id_map.loc[id_map.index != id_map.array]
+
+    if id_map.empty:
+        return id_map.index[:0]
+
+    def restore(ids):
+        return ids.map(id_map).fillna(ids).astype(ids.dtype)
+
+    # Only assertions and tags inserted with the strings can reference
+    # them
+    string_columns = [
+        'inp_string_id', 'src_string_id', 'tgt_string_id', 'ref_string_id'
+    ]
+    for column in string_columns:
+        references = tn.assertions[column].isin(id_map.index)
+        if references.any():
+            tn.assertions.loc[references, column] = restore(
+                tn.assertions.loc[references, column]
+            )
+
+    references = tn.assertion_tags['tag_string_id'].isin(id_map.index)
+    if references.any():
+        tn.assertion_tags.loc[references, 'tag_string_id'] = restore(
+            tn.assertion_tags.loc[references, 'tag_string_id']
+        )
+
+    tn.strings = tn.strings.rename(index=id_map.to_dict())
+    tn.provenance = tn.provenance.rename(index=id_map.to_dict())
+
+    return pd.Index(id_map.loc[~id_map.index.isin(displaced)].array)
+
+
+def _update_nodes_and_edges(
+    tn,
+    nodes,
+    edges,
+    edge_tags,
+    old_node_ids,
+    new_string_ids,
+    dropped_string_ids,
+    realiased_string_ids,
+    changed_links,
+    links_excluded_from_edges
+):
+    '''
+    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
+
+    Update the nodes, edges, and edge tags of a TextNet after some of
+    its strings and assertions changed. Only the nodes of changed
+    strings and of the strings aliased to them are rebuilt, and only
+    the edges of the links of changed assertions and of assertions
+    with rebuilt strings.
+
+    Parameters
+    ----------
+    tn : bibliograph.TextNet
+        TextNet with updated strings, assertions, and assertion tags.
+        Strings must have a node_type_id column and no node_id column.
+
+    nodes, edges, edge_tags : pandas.DataFrame
+        The tables from before the change.
+
+    old_node_ids : pandas.Series
+        Node IDs of the strings from before the change.
+
+    new_string_ids, dropped_string_ids : pandas.Index
+        IDs of inserted and dropped strings. IDs of dropped strings can
+        be reused by inserted strings.
+
+    realiased_string_ids : pandas.Index
+        IDs of strings in alias assertions that were inserted or
+        dropped.
+
+    changed_links : pandas.DataFrame
+        Source string IDs and link type IDs of assertions that were
+        inserted or dropped.
+
+    links_excluded_from_edges : list-like or None
+        Link types that aren't added to the edges.
+    '''
+
+    date_inserted = time_string()
+
+    # Node IDs of strings that were kept
+    kept_node_ids = old_node_ids.loc[
+        old_node_ids.index.isin(tn.strings.index)
+        & ~old_node_ids.index.isin(new_string_ids)
+    ]
+
+    rebuilt_node_ids = old_node_ids.loc[
+        old_node_ids.index.isin(dropped_string_ids)
+        | old_node_ids.index.isin(realiased_string_ids)
+    ]
+    rebuilt_node_ids = pd.Index(rebuilt_node_ids.unique())
+
+    string_ids = new_string_ids.union(
+        realiased_string_ids.intersection(tn.strings.index)
     )
 
-    # make a string value representing the current function call
-    frame = inspect.currentframe()
-    current_module = inspect.getframeinfo(frame).filename
-    current_module = Path(current_module).stem.split('.')[0]
-    current_function = inspect.getframeinfo(frame).function
-    current_function = '.'.join(
-        ['bibliograph', current_module, current_function]
+    # Strings which share a node must be rebuilt together, so add the
+    # strings of rebuilt nodes, strings aliased to rebuilt strings, and
+    # aliased strings with the same casefolded values until none are
+    # left
+    alias_assertions = tn.get_assertions_by_link_type('alias')
+    aliases = alias_assertions[['src_string_id', 'tgt_string_id']]
+    aliased_string_ids = pd.Index(
+        pd.concat([aliases['src_string_id'], aliases['tgt_string_id']])
+        .unique()
     )
+    casefolds = None
 
-    excluded_locals = [
-        'frame',
-        'current_module',
-        'current_function',
-        'excluded_locals',
-        'kwargs'
-    ]
-    args = {k: v for k, v in locals().items() if k not in excluded_locals}
-    args.update(kwargs)
+    while True:
+
+        rebuilt_node_ids = rebuilt_node_ids.union(
+            kept_node_ids.loc[kept_node_ids.index.isin(string_ids)].unique()
+        )
+        grown = string_ids.union(
+            kept_node_ids.index[kept_node_ids.isin(rebuilt_node_ids).array]
+        )
 
-    inp_string = '{}(**{})'.format(current_function, args)
+        is_touching = (
+            aliases['src_string_id'].isin(grown)
+            | aliases['tgt_string_id'].isin(grown)
+        )
+        touching = aliases.loc[is_touching]
+        grown = grown.union(touching['src_string_id'].unique())
+        grown = grown.union(touching['tgt_string_id'].unique())
 
-    # parse the data, gather textnet build parameters, return a textnet
-    parsed = s.parse_items(
-        data,
-        input_string=inp_string,
-        input_node_type='_python_function_call',
-        **kwargs
+        aliased = grown.intersection(aliased_string_ids)
+
+        if not aliased.empty:
+            if casefolds is None:
+                casefolds = tn.strings.loc[aliased_string_ids, 'string']
+                casefolds = casefolds.str.casefold()
+            grown = grown.union(casefolds.index[
+                casefolds.isin(casefolds.loc[aliased]).array
+            ])
+
+        if len(grown) == len(string_ids):
+            break
+
+        string_ids = grown
+
+    next_node_id = nodes.index.max() + 1 if not nodes.empty else 0
+    new_nodes = nodes.iloc[:0]
+    node_id_map = pd.Series([], dtype='int64')
+
+    if not string_ids.empty:
+
+        # Build nodes for the rebuilt strings in a TextNet with only
+        # those strings and the assertions that alias them
+        sensitivity = tn.get_assertions_by_link_type('aliases_case_sensitive')
+
+        sub = bg.TextNet(tn.big_id_dtype, tn.small_id_dtype)
+        sub.node_types = tn.node_types
+        sub.link_types = tn.link_types
+        sub.strings = tn.strings.loc[
+            string_ids.union(sensitivity['tgt_string_id'].unique()),
+            ['string', 'node_type_id']
+        ]
+        sub.assertions = pd.concat([
+            alias_assertions.loc[
+                alias_assertions['src_string_id'].isin(string_ids)
+            ],
+            sensitivity
+        ])
+        sub.assertion_tags = tn.assertion_tags.iloc[:0]
+
+        _build_nodes(sub)
+
+        sub_node_ids = sub.strings.loc[string_ids, 'node_id']
+        node_id_map = sub_node_ids.unique()
+        node_id_map = pd.Series(
+            range(next_node_id, next_node_id + len(node_id_map)),
+            index=node_id_map
         )
 
-    textnet_build_parameters = kwargs
-    textnet_build_parameters.update({
-        'syntax_case_sensitive': syntax_case_sensitive,
-        'allow_redundant_items': allow_redundant_items
+        new_nodes = sub.nodes.loc[node_id_map.index]
+        new_nodes.index = pd.Index(node_id_map.array)
+        new_nodes['date_inserted'] = date_inserted
+        new_nodes['date_modified'] = pd.NA
+
+        node_id_map = sub_node_ids.map(node_id_map)
+
+    tn.nodes = pd.concat([nodes.drop(rebuilt_node_ids), new_nodes])
+    tn.reset_nodes_dtypes()
+
+    tn.strings['node_id'] = kept_node_ids
+    tn.strings.loc[node_id_map.index, 'node_id'] = node_id_map.array
+    tn.reset_strings_dtypes()
+
+    node_ids = tn.strings['node_id']
+
+    # Find the links whose edges may have changed: links of changed
+    # assertions and of assertions that target, reference, or are
+    # tagged with rebuilt strings
+    assertions = tn.assertions
+    tagged_ids = tn.assertion_tags.loc[
+        tn.assertion_tags['tag_string_id'].isin(string_ids),
+        'assertion_id'
+    ]
+    touching = assertions.loc[
+        assertions['tgt_string_id'].isin(string_ids)
+        | assertions['ref_string_id'].isin(string_ids)
+        | assertions.index.isin(tagged_ids)
+    ]
+    links = pd.concat([
+        changed_links[['src_string_id', 'link_type_id']],
+        touching[['src_string_id', 'link_type_id']]
+    ])
+    links = pd.DataFrame({
+        'src_node_id': links['src_string_id'].map(node_ids).array,
+        'link_type_id': links['link_type_id'].array
     })
-    if add_read_csv_params:
-        textnet_build_parameters.update({
-            'skiprows': skiprows,
-            'encoding': encoding
+    links = links.dropna().drop_duplicates()
+
+    def link_keys(src_node_ids, link_type_ids):
+        keys = pd.DataFrame({
+            'src_node_id': src_node_ids.astype('int64').array,
+            'link_type_id': link_type_ids.astype('int64').array
         })
+        return pd.util.hash_pandas_object(keys, index=False).array
+
+    changed_keys = link_keys(links['src_node_id'], links['link_type_id'])
+
+    # Drop the edges of rebuilt nodes and changed links
+    is_dropped = edges['src_node_id'].isin(rebuilt_node_ids)
+    is_candidate = edges['src_node_id'].isin(links['src_node_id'])
+    candidates = edges.loc[is_candidate]
+    is_dropped.loc[is_candidate] |= pd.Series(
+        link_keys(candidates['src_node_id'], candidates['link_type_id']),
+        index=candidates.index
+    ).isin(changed_keys)
+    dropped_edge_ids = edges.index[is_dropped.array]
+
+    # Build edges again from every assertion with a rebuilt source node
+    # or a changed link
+    src_node_ids = assertions['src_string_id'].map(node_ids)
+    is_rebuilt = src_node_ids.isin(new_nodes.index)
+    is_candidate = src_node_ids.isin(links['src_node_id'])
+    is_rebuilt.loc[is_candidate] |= pd.Series(
+        link_keys(
+            src_node_ids.loc[is_candidate],
+            assertions.loc[is_candidate, 'link_type_id']
+        ),
+        index=is_candidate.index[is_candidate.array]
+    ).isin(changed_keys)
+    rebuilt = assertions.loc[is_rebuilt.array]
 
-    tn = textnet_from_parsed_shorthand(
-        parsed,
-        inp_string,
-        aliases_dict,
-        aliases_case_sensitive,
-        automatic_aliasing,
-        link_constraints_fname,
-        links_excluded_from_edges,
-        textnet_build_parameters
+    new_edges = _build_edges(
+        tn,
+        _select_edge_assertions(tn, rebuilt, links_excluded_from_edges)
     )
+    next_edge_id = edges.index.max() + 1 if not edges.empty else 0
+    new_edges.index = new_edges.index + next_edge_id
 
-    return tn
+    # Edge tags are indexed by assertion tag IDs, so tags of dropped
+    # edges and of assertions that were dropped or built again are
+    # replaced
+    new_edge_tags = _build_edge_tags(tn, rebuilt, new_edges)
 
+    new_edges['date_inserted'] = date_inserted
+    new_edges['date_modified'] = pd.NA
 
-def slurp_shorthand(
-    shorthand_fname,
-    entry_syntax_fname,
-    link_syntax_fname=None,
-    syntax_case_sensitive=True,
-    allow_redundant_items=False,
-    aliases_dict=None,
-    aliases_case_sensitive=True,
-    automatic_aliasing=False,
-    link_constraints_fname=None,
-    links_excluded_from_edges=None,
-    item_separator='__',
-    space_char='|',
-    skiprows=0,
-    na_string_values='!',
-    na_node_type='missing',
-    default_entry_prefix='wrk',
-    comment_char='#',
-    encoding='utf8'
-):
+    tn.edges = pd.concat([edges.drop(dropped_edge_ids), new_edges])
+    tn.reset_edges_dtypes()
 
-    # make a string value representing the current function call
-    frame = inspect.currentframe()
-    current_module = inspect.getframeinfo(frame).filename
-    current_module = Path(current_module).stem.split('.')[0]
-    current_function = inspect.getframeinfo(frame).function
-    current_function = '.'.join(
-        ['bibliograph', current_module, current_function]
+    rebuilt_tag_ids = tn.assertion_tags.index[
+        tn.assertion_tags['assertion_id'].isin(rebuilt.index).array
+    ]
+    is_kept = (
+        ~edge_tags['edge_id'].isin(dropped_edge_ids)
+        & edge_tags.index.isin(tn.assertion_tags.index)
+        & ~edge_tags.index.isin(rebuilt_tag_ids)
     )
+    tn.edge_tags = pd.concat([edge_tags.loc[is_kept.array], new_edge_tags])
+    tn.reset_edge_tags_dtypes()
 
-    excluded_locals = [
-        'frame',
-        'current_module',
-        'current_function',
-        'excluded_locals',
-        'kwargs'
-    ]
-    args = {k: v for k, v in locals().items() if k not in excluded_locals}
 
-    inp_string = '{}(**{})'.format(current_function, args)
+def _refresh_textnet_input(
+    tn,
+    inp_string_id,
+    filepath_or_buffer=None,
+    entry_syntax=None
+):
+    '''
+    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
 
-    s = bg.Shorthand(
-        entry_syntax=entry_syntax_fname,
-        link_syntax=link_syntax_fname,
-        syntax_case_sensitive=syntax_case_sensitive,
-        allow_redundant_items=allow_redundant_items
-    )
+    Update a TextNet after the shorthand text or the entry syntax of one
+    of its inputs was edited. See refresh_textnet_input and
+    refresh_textnet_entry_syntax.
+    '''
 
-    textnet_build_parameters = {
-        'item_separator': item_separator,
-        'space_char': space_char,
-        'na_string_values': na_string_values,
-        'na_node_type': na_node_type,
-        'default_entry_prefix': default_entry_prefix,
-        'comment_char': comment_char,
-        'skiprows': skiprows,
-        'encoding': encoding
-    }
+    # Texts moved to a BlobStore are put back in the strings while the
+    # input is parsed again and moved back once it's refreshed
+    blobs = tn.load_literals()
 
-    parsed = s.parse_text(
-        shorthand_fname,
-        input_string=inp_string,
-        input_node_type='_python_function_call',
-        **textnet_build_parameters
-    )
+    if blobs is not None:
+        try:
+            return _refresh_textnet_input(
+                tn,
+                inp_string_id,
+                filepath_or_buffer=filepath_or_buffer,
+                entry_syntax=entry_syntax
+            )
+        finally:
+            tn.store_literals(blobs)
 
-    textnet_build_parameters['syntax_case_sensitive'] = syntax_case_sensitive
-    textnet_build_parameters['allow_redundant_items'] = allow_redundant_items
+    new_entry_syntax = entry_syntax
 
-    tn = textnet_from_parsed_shorthand(
-        parsed,
-        inp_string,
-        aliases_dict,
-        aliases_case_sensitive,
-        automatic_aliasing,
-        link_constraints_fname,
-        links_excluded_from_edges,
-        textnet_build_parameters
-    )
+    inp_string_id = int(inp_string_id)
+    inp_string = tn.strings.loc[inp_string_id, 'string']
 
-    return tn
+    def get_input_string_id(link_type):
+        assertions = tn.get_assertions_by_link_type(link_type)
+        assertions = assertions.loc[
+            assertions['inp_string_id'] == inp_string_id
+        ]
 
+        if assertions.empty:
+            return None
 
-def slurp_single_column(
-    shorthand_fname,
-    entry_syntax_fname,
-    syntax_case_sensitive=True,
-    allow_redundant_items=False,
-    aliases_dict=None,
-    aliases_case_sensitive=True,
-    automatic_aliasing=False,
-    link_constraints_fname=None,
-    links_excluded_from_edges=None,
-    item_separator='__',
-    space_char='|',
-    skiprows=0,
-    na_string_values='!',
-    na_node_type='missing',
-    default_entry_prefix='wrk',
-    comment_char='#',
-    encoding='utf8'
-):
+        return assertions['tgt_string_id'].iloc[0]
 
-    # make a string value representing the current function call
-    frame = inspect.currentframe()
-    current_module = inspect.getframeinfo(frame).filename
-    current_module = Path(current_module).stem.split('.')[0]
-    current_function = inspect.getframeinfo(frame).function
-    current_function = '.'.join(
-        ['bibliograph', current_module, current_function]
-    )
+    def get_parameter(link_type):
+        return tn.get_literal_input_parameter(link_type, inp_string_id)
 
-    excluded_locals = [
-        'frame',
-        'current_module',
-        'current_function',
-        'excluded_locals',
-        'kwargs'
+    text_string_id = get_input_string_id('shorthand_data')
+
+    if text_string_id is None:
+        raise ValueError(
+            'String {} is not the input string of a shorthand text'
+            .format(inp_string_id)
+        )
+
+    old_text = tn.strings.loc[text_string_id, 'string']
+
+    syntax_case_sensitive = get_parameter('syntax_case_sensitive')
+    allow_redundant_items = get_parameter('allow_redundant_items')
+    na_string_values = get_parameter('na_string_values')
+    aliases_case_sensitive = get_parameter('aliases_case_sensitive')
+
+    if not bg.util.iterable_not_string(na_string_values):
+        na_string_values = [na_string_values]
+
+    entry_syntax = tn.strings.loc[
+        get_input_string_id('shorthand_entry_syntax'),
+        'string'
     ]
-    args = {k: v for k, v in locals().items() if k not in excluded_locals}
+    link_syntax_string_id = get_input_string_id('shorthand_link_syntax')
 
-    inp_string = '{}(**{})'.format(current_function, args)
+    if link_syntax_string_id is None:
+        link_syntax = None
+    else:
+        link_syntax = StringIO(tn.strings.loc[link_syntax_string_id, 'string'])
 
     s = bg.Shorthand(
-        entry_syntax=entry_syntax_fname,
+        entry_syntax=StringIO(entry_syntax),
+        link_syntax=link_syntax,
         syntax_case_sensitive=syntax_case_sensitive,
         allow_redundant_items=allow_redundant_items
     )
 
-    textnet_build_parameters = {
-        'item_separator': item_separator,
-        'space_char': space_char,
-        'na_string_values': na_string_values,
-        'na_node_type': na_node_type,
-        'default_entry_prefix': default_entry_prefix,
-        'comment_char': comment_char,
-        'skiprows': skiprows,
-        'encoding': encoding
-    }
+    # Strings need node types to be parsed and merged, which are only
+    # stored in the nodes frame once a TextNet is complete
+    tn.strings['node_type_id'] = tn.strings['node_id'].map(
+        tn.nodes['node_type_id']
+    )
+    input_node_type = tn.node_types.loc[
+        tn.strings.loc[inp_string_id, 'node_type_id'],
+        'node_type'
+    ]
 
-    parsed = s.parse_text(
-        shorthand_fname,
+    # Single column shorthand is parsed without dropping rows that
+    # have no right entry
+    if inp_string.startswith('bibliograph.core.slurp_single_column('):
+        drop_na = []
+    else:
+        drop_na = 'right_entry'
+
+    parse_parameters = dict(
+        item_separator=get_parameter('item_separator'),
+        default_entry_prefix=get_parameter('default_entry_prefix'),
+        space_char=get_parameter('space_char'),
+        na_string_values=na_string_values,
+        na_node_type=get_parameter('na_node_type'),
         input_string=inp_string,
-        input_node_type='_python_function_call',
-        drop_na=[],
-        **textnet_build_parameters
+        input_node_type=input_node_type,
+        skiprows=get_parameter('skiprows'),
+        comment_char=get_parameter('comment_char'),
+        drop_na=drop_na,
+        big_id_dtype=tn.big_id_dtype,
+        small_id_dtype=tn.small_id_dtype,
+        encoding=get_parameter('encoding')
     )
 
-    textnet_build_parameters['syntax_case_sensitive'] = syntax_case_sensitive
-    textnet_build_parameters['allow_redundant_items'] = allow_redundant_items
+    if new_entry_syntax is None:
+        changes = s.parse_text_changes(
+            old_text,
+            filepath_or_buffer,
+            **parse_parameters
+        )
+        added_entry_syntax = entry_syntax
 
-    tn = textnet_from_parsed_shorthand(
-        parsed,
-        inp_string,
-        aliases_dict,
+    else:
+        changes = s.parse_syntax_changes(
+            new_entry_syntax,
+            old_text,
+            **parse_parameters
+        )
+        changes['text'] = old_text
+        added_entry_syntax = changes['shorthand'].entry_syntax
+
+    no_changed_rows = (
+        (changes['removed'] is None) and (changes['added'] is None)
+    )
+
+    if no_changed_rows and (added_entry_syntax == entry_syntax):
+
+        # Edits outside of the shorthand data (such as comments) only
+        # change the stored text
+        tn.strings = tn.strings.drop('node_type_id', axis='columns')
+
+        if changes['text'] != old_text:
+            tn.strings.loc[text_string_id, 'string'] = changes['text']
+            tn.strings.loc[text_string_id, 'date_modified'] = time_string()
+
+        return tn
+
+    # Redundant items are found with the syntax each change was parsed
+    # with
+    if allow_redundant_items:
+        removed_entry_syntax, added_entry_syntax = [
+            bg.syntax_parsing.validate_entry_syntax(
+                syntax,
+                case_sensitive=syntax_case_sensitive,
+                allow_redundant_items=allow_redundant_items
+            )
+            for syntax in [entry_syntax, added_entry_syntax]
+        ]
+
+    link_constraints_string_id = get_input_string_id('link_constraints')
+    links_excluded_from_edges = get_parameter('links_excluded_from_edges')
+
+    # Insertion dates are restored once the TextNet is updated, and the
+    # partial tables have to match freshly parsed tables until then
+    date_columns = ['date_inserted', 'date_modified']
+    assertion_dates = tn.assertions[date_columns]
+    string_dates = tn.strings[date_columns]
+
+    tn.assertions = tn.assertions.drop(columns=date_columns, errors='ignore')
+    tn.strings = tn.strings.drop(columns=date_columns, errors='ignore')
+
+    # Nodes and edges are updated once the strings, assertions, and
+    # assertion tags are up to date
+    nodes = tn.nodes
+    edges = tn.edges
+    edge_tags = tn.edge_tags
+    old_node_ids = tn.strings['node_id'].copy()
+
+    del tn.nodes
+    del tn.edges
+    del tn.edge_tags
+    tn.reset_strings_dtypes()
+
+    string_columns = [
+        'inp_string_id', 'src_string_id', 'tgt_string_id', 'ref_string_id'
+    ]
+
+    # Retract assertions parsed from removed rows. Assertions are
+    # matched by value, and each removed assertion retracts one copy
+    # of a matching assertion from the input.
+    retracted_ids = pd.Index([])
+
+    if changes['removed'] is not None:
+
+        removed = changes['removed']
+
+        metadata_link_types = [
+            'shorthand_entry_prefixes',
+            'shorthand_item_labels'
+        ]
+        removed_link_types = removed.assertions['link_type_id'].map(
+            removed.link_types['link_type']
+        )
+        removed_assertions = removed.assertions.loc[
+            ~removed_link_types.isin(metadata_link_types)
+        ]
+
+        if allow_redundant_items:
+            removed_assertions = removed_assertions.drop(
+                _get_redundant_item_assertion_ids(
+                    removed,
+                    removed_entry_syntax,
+                    na_string_values[0],
+                    subset=removed_assertions.index
+                )
+            )
+
+        # Map IDs in the removed assertions to IDs in the TextNet
+        tag_node_type_id = tn.id_lookup('node_types', 'tag')
+        string_id_map = pd.Series(
+            tn.strings.index,
+            index=bg.util.typed_string_keys(tn.strings, tag_node_type_id).array
+        )
+        string_id_map = string_id_map.loc[
+            ~string_id_map.index.duplicated()
+        ]
+        string_id_map = bg.util.typed_string_keys(
+            removed.strings,
+            removed.id_lookup('node_types', 'tag')
+        ).map(string_id_map)
+
+        link_type_id_map = removed.link_types['link_type'].map(
+            pd.Series(tn.link_types.index, index=tn.link_types['link_type'])
+        )
+
+        mapped = pd.DataFrame(
+            {
+                c: removed_assertions[c].map(string_id_map)
+                for c in ['src_string_id', 'tgt_string_id', 'ref_string_id']
+            },
+            index=removed_assertions.index
+        )
+        for column in ['src_string_id', 'ref_string_id']:
+            mapped[column] = mapped[column].where(
+                removed_assertions[column].notna(),
+                text_string_id
+            )
+        mapped['link_type_id'] = removed_assertions['link_type_id'].map(
+            link_type_id_map
+        )
+
+        mapped_tags = pd.DataFrame({
+            'assertion_id': removed.assertion_tags['assertion_id'],
+            'tag_string_id': removed.assertion_tags['tag_string_id'].map(
+                string_id_map
+            )
+        })
+
+        removed_keys = _assertion_value_keys(mapped, mapped_tags)
+        removed_counts = removed_keys.value_counts()
+
+        # Only assertions of the input with the targets of removed
+        # assertions can match them
+        candidates = tn.assertions.loc[
+            (tn.assertions['inp_string_id'] == inp_string_id)
+            & tn.assertions['tgt_string_id'].isin(mapped['tgt_string_id'])
+        ]
+        candidate_keys = _assertion_value_keys(candidates, tn.assertion_tags)
+
+        rank = candidate_keys.groupby(candidate_keys).cumcount()
+        is_retracted = rank < candidate_keys.map(removed_counts).fillna(0)
+        retracted_ids = candidate_keys.index[is_retracted.array]
+
+    # Alias assertions generated from alias tables or by automatic
+    # aliasing are regenerated from scratch. Aliases parsed from the
+    # shorthand text reference the text and were handled above.
+    alias_assertions = tn.get_assertions_by_link_type('alias')
+    alias_assertions = alias_assertions.loc[
+        (alias_assertions['inp_string_id'] == inp_string_id)
+        & (alias_assertions['ref_string_id'] != text_string_id)
+    ]
+
+    try:
+        aliases_dict = get_parameter('aliases_dict')
+
+    except (ValueError, SyntaxError):
+        # Alias tables that aren't literal values (like buffers) are
+        # recovered from the references of existing alias assertions
+        alias_tables = alias_assertions.loc[
+            alias_assertions['ref_string_id'] != link_constraints_string_id
+        ]
+        alias_tables = alias_tables.drop_duplicates(subset='ref_string_id')
+        alias_tables = alias_tables.loc[
+            tn.strings.loc[alias_tables['ref_string_id'], 'node_type_id'].map(
+                tn.node_types['node_type']
+            ).eq('_literal_csv').array
+        ]
+        aliases_dict = {
+            tn.node_types.loc[
+                tn.strings.loc[src_id, 'node_type_id'],
+                'node_type'
+            ]: StringIO(tn.strings.loc[ref_id, 'string'])
+            for src_id, ref_id in zip(
+                alias_tables['src_string_id'],
+                alias_tables['ref_string_id']
+            )
+        }
+        aliases_dict = aliases_dict or None
+
+    automatic_aliasing = get_parameter('automatic_aliasing')
+
+    # Strings that would still be referenced without the retracted
+    # assertions and the input's generated aliases
+    is_referencing = ~tn.assertions.index.isin(
+        retracted_ids.union(alias_assertions.index)
+    )
+    referenced = pd.concat(
+        [tn.assertions.loc[is_referencing, c] for c in string_columns]
+        + [tn.assertion_tags.loc[
+            ~tn.assertion_tags['assertion_id'].isin(retracted_ids),
+            'tag_string_id'
+        ]]
+    )
+
+    retracted_tags = tn.assertion_tags['assertion_id'].isin(retracted_ids)
+    orphans = pd.concat(
+        [tn.assertions.loc[retracted_ids, c] for c in string_columns]
+        + [tn.assertion_tags.loc[retracted_tags, 'tag_string_id']]
+    )
+    orphans = orphans.loc[~orphans.isin(referenced)]
+
+    # Generated aliases depend on every string of the aliased node
+    # types, so they're only generated again if strings of those types
+    # were dropped or inserted. Link constraints are applied to the
+    # whole TextNet, so inputs with link constraints are rebuilt.
+    aliased_node_types = list(aliases_dict or [])
+    if automatic_aliasing:
+        aliased_node_types += ['actor', 'identifier']
+
+    def aliased_string_keys(strings, node_types):
+        node_type = strings['node_type_id'].map(node_types['node_type'])
+        is_aliased = node_type.isin(aliased_node_types).array
+        keys = pd.DataFrame({
+            'string': strings.loc[is_aliased, 'string'].astype(str).array,
+            'node_type': node_type.loc[is_aliased].astype(str).array
+        })
+        return pd.util.hash_pandas_object(keys, index=False)
+
+    rebuild = link_constraints_string_id is not None
+    regenerate_aliases = rebuild
+
+    if aliased_node_types and not regenerate_aliases:
+        regenerate_aliases = not aliased_string_keys(
+            tn.strings.loc[orphans.unique()],
+            tn.node_types
+        ).empty
+
+    if aliased_node_types and not regenerate_aliases:
+        if changes['added'] is not None:
+            added_keys = aliased_string_keys(
+                changes['added'].strings,
+                changes['added'].node_types
+            )
+            regenerate_aliases = not added_keys.isin(
+                aliased_string_keys(tn.strings, tn.node_types)
+            ).all()
+
+    dropped_ids = retracted_ids
+    if regenerate_aliases:
+        dropped_ids = dropped_ids.union(alias_assertions.index)
+
+        alias_tags = tn.assertion_tags['assertion_id'].isin(
+            alias_assertions.index
+        )
+        alias_orphans = pd.concat(
+            [alias_assertions[c] for c in string_columns]
+            + [tn.assertion_tags.loc[alias_tags, 'tag_string_id']]
+        )
+        orphans = pd.concat([
+            orphans,
+            alias_orphans.loc[~alias_orphans.isin(referenced)]
+        ])
+
+    else:
+        # Strings in kept aliases aren't orphans
+        orphans = orphans.loc[~orphans.isin(pd.concat(
+            [alias_assertions[c] for c in string_columns]
+        ))]
+
+    dropped_tags = tn.assertion_tags['assertion_id'].isin(dropped_ids)
+    dropped_assertions = tn.assertions.loc[dropped_ids]
+    dropped_assertion_tags = tn.assertion_tags.loc[dropped_tags]
+
+    tn.assertions = tn.assertions.drop(dropped_ids)
+    tn.assertion_tags = tn.assertion_tags.loc[~dropped_tags]
+
+    # Drop strings that only appeared in dropped assertions
+    orphans = pd.Index(orphans.unique())
+    dropped_strings = tn.strings.loc[orphans, ['string', 'node_type_id']]
+    tn.strings = tn.strings.drop(orphans)
+
+    kept_string_ids = tn.strings.index
+    kept_assertion_ids = tn.assertions.index
+
+    # Insert assertions parsed from new rows. This happens after
+    # retracted strings are dropped so that values which now appear
+    # with a different node type aren't merged into the old strings.
+    if changes['added'] is not None:
+
+        existing_ids = tn.assertions.index
+        bg.util.merge_parsed_textnets(tn, changes['added'])
+        new_ids = tn.assertions.index.difference(existing_ids)
+
+        # Assertions whose source or reference string ID is missing
+        # should have the input text as their source or reference
+        for column in ['src_string_id', 'ref_string_id']:
+            is_na = tn.assertions.loc[new_ids, column].isna()
+            tn.assertions.loc[is_na.loc[is_na].index, column] = text_string_id
+
+        if allow_redundant_items:
+            tn.assertions = tn.assertions.drop(
+                _get_redundant_item_assertion_ids(
+                    tn,
+                    added_entry_syntax,
+                    na_string_values[0],
+                    subset=new_ids
+                )
+            )
+
+    if regenerate_aliases:
+        _insert_input_aliases(
+            tn,
+            inp_string_id,
+            aliases_dict,
+            aliases_case_sensitive,
+            automatic_aliasing
+        )
+
+    restored_ids = _restore_string_ids(tn, dropped_strings, kept_string_ids)
+
+    tn.strings.loc[text_string_id, 'string'] = changes['text']
+
+    # Assertions of the input pointed at a different entry syntax
+    relinked_ids = pd.Index([])
+
+    if new_entry_syntax is not None:
+        entry_syntax_string_id = get_input_string_id('shorthand_entry_syntax')
+        syntax_link_type_id = tn.id_lookup(
+            'link_types',
+            'shorthand_entry_syntax'
+        )
+        syntax_assertion_ids = tn.assertions.index[
+            (tn.assertions['inp_string_id'] == inp_string_id).array
+            & (tn.assertions['link_type_id'] == syntax_link_type_id).array
+        ]
+        old_syntax_assertions = tn.assertions.loc[syntax_assertion_ids]
+
+        new_syntax_string_id = _replace_input_literal(
+            tn,
+            inp_string_id,
+            'shorthand_entry_syntax',
+            changes['shorthand'].entry_syntax
+        )
+
+        if new_syntax_string_id != entry_syntax_string_id:
+            relinked_ids = syntax_assertion_ids
+            dropped_assertions = pd.concat([
+                dropped_assertions,
+                old_syntax_assertions
+            ])
+            if entry_syntax_string_id not in tn.strings.index:
+                orphans = orphans.append(pd.Index([entry_syntax_string_id]))
+
+    tn.reset_strings_dtypes()
+    tn.reset_assertions_dtypes()
+    tn.reset_assertion_tags_dtypes()
+
+    new_assertion_ids = tn.assertions.index.difference(kept_assertion_ids)
+    new_assertion_ids = new_assertion_ids.union(relinked_ids)
+
+    # Assertions that were dropped and inserted again with the same
+    # values keep their insertion dates and aren't changes
+    new_assertions = tn.assertions.loc[new_assertion_ids]
+    new_keys = _assertion_value_keys(new_assertions, tn.assertion_tags)
+    dropped_keys = _assertion_value_keys(
+        dropped_assertions,
+        dropped_assertion_tags
+    )
+    new_rank = new_keys.groupby(new_keys).cumcount()
+    dropped_rank = dropped_keys.groupby(dropped_keys).cumcount()
+
+    def rank_keys(keys, rank):
+        return pd.Series(
+            keys.index,
+            index=pd.MultiIndex.from_arrays([keys.array, rank.array])
+        )
+
+    matches = pd.concat(
+        [
+            rank_keys(new_keys, new_rank).rename('new_id'),
+            rank_keys(dropped_keys, dropped_rank).rename('dropped_id')
+        ],
+        axis='columns',
+        join='inner'
+    )
+
+    # Tagged assertions are treated as changed since edge tags are
+    # indexed by the IDs of their assertion tags
+    matches = matches.loc[
+        ~matches['new_id'].isin(tn.assertion_tags['assertion_id']).array
+    ]
+
+    changed_assertions = pd.concat([
+        new_assertions.drop(matches['new_id']),
+        dropped_assertions.drop(matches['dropped_id'])
+    ])
+
+    alias_link_type_id = tn.link_types.index[
+        tn.link_types['link_type'] == 'alias'
+    ]
+    changed_aliases = changed_assertions.loc[
+        changed_assertions['link_type_id'].isin(alias_link_type_id)
+    ]
+
+    new_string_ids = tn.strings.index.difference(kept_string_ids)
+    new_string_ids = new_string_ids.difference(restored_ids)
+
+    dropped_string_ids = orphans.difference(restored_ids)
+    dropped_string_ids = dropped_string_ids[
+        ~dropped_string_ids.isin(tn.strings.index)
+        | dropped_string_ids.isin(new_string_ids)
+    ]
+
+    if rebuild:
+
+        tn = complete_textnet_from_assertions(
+            tn,
+            aliases_case_sensitive,
+            inp_string_id,
+            link_constraints_string_id=link_constraints_string_id,
+            links_excluded_from_edges=links_excluded_from_edges
+        )
+
+    else:
+
+        _update_nodes_and_edges(
+            tn,
+            nodes,
+            edges,
+            edge_tags,
+            old_node_ids,
+            new_string_ids,
+            dropped_string_ids,
+            pd.Index(pd.concat([
+                changed_aliases['src_string_id'],
+                changed_aliases['tgt_string_id']
+            ]).unique()),
+            changed_assertions,
+            links_excluded_from_edges
+        )
+
+    # Restore insertion dates for strings and assertions that weren't
+    # changed, and record the modification date of changed strings
+    date_inserted = time_string()
+
+    dates = pd.concat([
+        assertion_dates.loc[kept_assertion_ids.difference(new_assertion_ids)],
+        pd.DataFrame(
+            assertion_dates.loc[matches['dropped_id']].to_numpy(),
+            index=matches['new_id'].array,
+            columns=date_columns
+        )
+    ])
+    dates = dates.reindex(tn.assertions.index)
+    dates['date_inserted'] = dates['date_inserted'].fillna(date_inserted)
+    tn.assertions[date_columns] = dates
+
+    dates = string_dates.loc[
+        kept_string_ids.union(restored_ids).intersection(tn.strings.index)
+    ]
+    dates = dates.reindex(tn.strings.index)
+    dates['date_inserted'] = dates['date_inserted'].fillna(date_inserted)
+    tn.strings[date_columns] = dates
+
+    if changes['text'] != old_text:
+        tn.strings.loc[text_string_id, 'date_modified'] = date_inserted
+
+    # An entry syntax edited in place keeps its insertion date and
+    # records when it was modified
+    if (
+        (new_entry_syntax is not None)
+        and (new_syntax_string_id == entry_syntax_string_id)
+    ):
+        tn.strings.loc[entry_syntax_string_id, 'date_modified'] = (
+            date_inserted
+        )
+
+    tn.reset_assertions_dtypes()
+    tn.reset_strings_dtypes()
+
+    return tn
+
+
+def _iter_bibtex_entries(lines, bibtex_parser, blocks_per_parse):
+    '''
+    Read a BibTeX file one line at a time and yield a dict for every
+    entry, parsing blocks_per_parse blocks at a time. A block is
+    anything starting with an @ outside of braces.
+
+    The same parser reads every block, so @string macros defined in
+    earlier blocks (and the common month strings if the parser was
+    created with common_strings=True) are resolved in later blocks.
+    The parser gets a new database after each parse that only keeps
+    the string definitions, so memory use depends on blocks_per_parse
+    rather than the size of the file.
+
+    Parameters
+    ----------
+    lines : iterable of str
+        Lines of BibTeX text, e.g. an open file.
+    bibtex_parser : bibtexparser.bparser.BibTexParser
+    blocks_per_parse : int
+        Maximum number of blocks parsed at once.
+
+    Yields
+    ------
+    dict
+        Entries like those in bibtex_parser.parse_file(f).entries
+    '''
+
+    # the parser warns when it's called more than once unless told
+    # to expect it
+    bibtex_parser.expect_multiple_parse = True
+
+    def parse_buffered(buffered):
+        database = bibtex_parser.parse(''.join(buffered))
+
+        # Keep string definitions but forget everything else
+        bibtex_parser.bib_database = BibDatabase()
+        bibtex_parser.bib_database.strings = database.strings
+
+        return database.entries
+
+    buffered = []
+    num_blocks = 0
+    brace_depth = 0
+
+    for line in lines:
+
+        if (brace_depth == 0) and line.lstrip().startswith('@'):
+
+            if num_blocks == blocks_per_parse:
+                yield from parse_buffered(buffered)
+                buffered = []
+                num_blocks = 0
+
+            num_blocks += 1
+
+        buffered.append(line)
+        brace_depth += line.count('{') - line.count('}')
+        brace_depth = max(brace_depth, 0)
+
+    if buffered:
+        yield from parse_buffered(buffered)
+
+
+def _batch_records(records, batch_size, columns=None):
+    '''
+    Collect (row, record) pairs into DataFrames of batch_size records
+    whose index is the row of each record. The last batch can be
+    smaller.
+
+    Parameters
+    ----------
+    records : iterable of tuple
+        (row, dict) pairs
+    batch_size : int
+        Number of records in each batch
+    columns : list-like or None, default None
+        Columns of every batch. Records missing a column have null
+        values in it. If None, the columns of a batch are the keys of
+        its records.
+
+    Yields
+    ------
+    pandas.DataFrame
+    '''
+
+    batch = []
+
+    for record in records:
+
+        batch.append(record)
+
+        if len(batch) == batch_size:
+            yield _records_frame(batch, columns)
+            batch = []
+
+    if batch:
+        yield _records_frame(batch, columns)
+
+
+def _records_frame(records, columns=None):
+    rows, records = zip(*records)
+    return pd.DataFrame(list(records), index=list(rows), columns=columns)
+
+
+def _record_keys(records):
+    '''
+    Get the keys of (row, dict) pairs in the order they first appear.
+    These are the columns of a DataFrame made from all of the records
+    at once.
+    '''
+    return list(dict.fromkeys(
+        key for row, record in records for key in record
+    ))
+
+
+def _parse_item_batches(shorthand, batches, on_error, **kwargs):
+    '''
+    Parse DataFrames of items with Shorthand.parse_items and merge the
+    results into one TextNet. The text of each batch is stored as its
+    own items csv string and is the reference string of the batch's
+    assertions. Rows of quarantined items are reported with the index
+    of their batch, so batches should be indexed by their position in
+    the whole input.
+
+    Parameters
+    ----------
+    shorthand : bibliograph.Shorthand
+    batches : iterable of pandas.DataFrame
+    on_error : str
+        "raise" or "quarantine"
+    **kwargs
+        Passed to Shorthand.parse_items
+
+    Returns
+    -------
+    bibliograph.TextNet
+    '''
+
+    merger = None
+    num_batches = 0
+    parse_errors = []
+
+    for items in batches:
+
+        chunk = shorthand.parse_items(items, on_error=on_error, **kwargs)
+
+        if on_error == 'quarantine':
+            errors = chunk.parse_errors
+            rows = errors['csv_row'].to_numpy(dtype='int64')
+            errors['csv_row'] = pd.array(
+                items.index[rows],
+                dtype=errors['csv_row'].dtype
+            )
+            parse_errors.append(errors)
+
+        if merger is None:
+            merger = bg.util.ParsedTextNetMerger(chunk)
+        else:
+            merger.add(chunk)
+
+        num_batches += 1
+
+    if merger is None:
+        raise ValueError('No items found in input')
+
+    parsed = merger.finish()
+
+    if num_batches > 1:
+        _drop_repeated_batch_links(parsed)
+
+    if on_error == 'quarantine':
+        parsed.parse_errors = pd.concat(parse_errors, ignore_index=True)
+
+    return parsed
+
+
+def _jsonl_entry_strings(items):
+    '''
+    Batch entry writer for items read by _iter_jsonl_items. The entry
+    string of each row is the text of its JSON record.
+    '''
+    return items['_jsonl_record']
+
+
+def _drop_repeated_batch_links(parsed):
+    '''
+    THIS FUNCTION MUTATES ITS ARGUMENT
+
+    Shorthand.parse_items stores the text of every entry in its input
+    as one items csv string and links the input string to it and to
+    the entry syntax. When batches of items are parsed and merged,
+    each batch keeps its own items csv string, so the text of the
+    input is never held as one string, but the link to the entry
+    syntax is repeated for every batch. Drop the repeated links.
+    '''
+
+    link_type_id = parsed.id_lookup('link_types', 'items_csv')
+    csv_assertions = parsed.get_assertions_by_link_type_id(link_type_id)
+
+    # Drop repeated links from the input string
+    input_string_id = csv_assertions['src_string_id'].iloc[0]
+    repeated = parsed.assertions.duplicated(subset=[
+        'inp_string_id',
+        'src_string_id',
+        'tgt_string_id',
+        'ref_string_id',
+        'link_type_id'
+    ])
+    repeated = repeated & (
+        parsed.assertions['src_string_id'] == input_string_id
+    )
+    parsed.assertions = parsed.assertions.loc[~repeated]
+
+
+def _bibtex_entry_strings(entries):
+    '''
+    Write a BibTeX string for every row of a dataframe of bibtexparser
+    entries. Each string is the same as the output of
+
+        db = bibtexparser.bibdatabase.BibDatabase()
+        db.entries = [dict(row.dropna().map(str))]
+        bibtexparser.dumps(db)
+
+    but fields are written a column at a time for all entries instead
+    of building and writing a database for every row.
+
+    Parameters
+    ----------
+    entries : pandas.DataFrame
+        One row per entry with 'ENTRYTYPE' and 'ID' columns and one
+        column per field. Null values are left out of the entry.
+
+    Returns
+    -------
+    pandas.Series
+        Entry strings with the same index as entries.
+    '''
+
+    # Every entry needs a type and a key. Raise the same error as
+    # bibtexparser's writer for rows missing either
+    for required in ['ENTRYTYPE', 'ID']:
+        if required not in entries.columns:
+            raise KeyError(required)
+        if entries[required].isna().any():
+            raise KeyError(required)
+
+    bibtex = '@' + entries['ENTRYTYPE'].astype(str) + '{' + \
+        entries['ID'].astype(str)
+
+    # bibtexparser writes fields in alphabetical order, one per line
+    # with a single space of indentation
+    fields = sorted(
+        c for c in entries.columns if c not in ['ENTRYTYPE', 'ID']
+    )
+    for field in fields:
+        values = entries[field]
+        has_value = values.notna()
+        lines = ',\n ' + field + ' = {' + values[has_value].astype(str) + '}'
+        bibtex = bibtex + lines.reindex(entries.index, fill_value='')
+
+    return bibtex + '\n}\n'
+
+
+def slurp_bibtex(
+    bibtex_fname,
+    entry_syntax_fname,
+    syntax_case_sensitive=True,
+    allow_redundant_items=False,
+    aliases_dict=None,
+    aliases_case_sensitive=True,
+    automatic_aliasing=False,
+    link_constraints_fname=None,
+    links_excluded_from_edges=None,
+    encoding='utf8',
+    on_error='raise',
+    chunksize=None,
+    build_nodes=True,
+    **kwargs
+):
+
+    # make a string value representing the current function call
+    frame = inspect.currentframe()
+    current_module = inspect.getframeinfo(frame).filename
+    current_module = Path(current_module).stem.split('.')[0]
+    current_function = inspect.getframeinfo(frame).function
+    current_function = '.'.join(
+        ['bibliograph', current_module, current_function]
+    )
+
+    excluded_locals = [
+        'frame',
+        'current_module',
+        'current_function',
+        'excluded_locals',
+        'kwargs',
+        'build_nodes'
+    ]
+    args = {k: v for k, v in locals().items() if k not in excluded_locals}
+    args.update(kwargs)
+
+    inp_string, provenance = _provenance_record(current_function, args)
+
+    if chunksize is not None:
+        chunksize = int(chunksize)
+
+        if chunksize < 1:
+            raise ValueError('chunksize must be a positive integer')
+
+    # initialize bibtex and shorthand parsers
+    bibtex_parser = _bibtexparser(common_strings=True)
+    s = bg.Shorthand(
+        entry_syntax=entry_syntax_fname,
+        syntax_case_sensitive=syntax_case_sensitive,
+        allow_redundant_items=allow_redundant_items
+    )
+
+    # if a function to write entry strings was not provided, write
+    # every entry at once in the format of bibtexparser's writer
+    if 'entry_writer' in kwargs.keys():
+
+        entry_writer = kwargs['entry_writer']
+        batch_entry_writer = None
+
+    else:
+
+        entry_writer = None
+        batch_entry_writer = _bibtex_entry_strings
+
+    # drop 'entry_writer' from the input args so we can pass it directly
+    # to Shorthand.parse_items
+    kwargs = {k: v for k, v in kwargs.items() if k != 'entry_writer'}
+
+    # parse input all at once if we didn't get a chunksize, otherwise
+    # stream batches of entries from the file and merge them as they
+    # are parsed
+    with open(bibtex_fname, encoding=encoding) as f:
+
+        if chunksize is None:
+            batches = [pd.DataFrame(bibtex_parser.parse_file(f).entries)]
+        else:
+            # Entries get null items for fields that other entries in
+            # the file have, as they do when the file is parsed all at
+            # once, so read the fields of every entry first
+            fields = _record_keys(enumerate(_iter_bibtex_entries(
+                f,
+                _bibtexparser(common_strings=True),
+                chunksize
+            )))
+            f.seek(0)
+
+            entries = _iter_bibtex_entries(f, bibtex_parser, chunksize)
+            batches = _batch_records(enumerate(entries), chunksize, fields)
+
+        parsed = _parse_item_batches(
+            s,
+            batches,
+            on_error,
+            entry_writer=entry_writer,
+            batch_entry_writer=batch_entry_writer,
+            input_string=inp_string,
+            input_node_type='_python_function_call',
+            **kwargs
+        )
+
+    textnet_build_parameters = kwargs
+    textnet_build_parameters['syntax_case_sensitive'] = syntax_case_sensitive
+    textnet_build_parameters['allow_redundant_items'] = allow_redundant_items
+
+    tn = textnet_from_parsed_shorthand(
+        parsed,
+        inp_string,
+        aliases_dict,
+        aliases_case_sensitive,
+        automatic_aliasing,
+        link_constraints_fname,
+        links_excluded_from_edges,
+        textnet_build_parameters,
+        build_nodes
+    )
+
+    _insert_provenance(tn, inp_string, provenance)
+
+    return tn
+
+
+def slurp_columnar_items(
+    data,
+    entry_syntax_fname,
+    syntax_case_sensitive=True,
+    allow_redundant_items=False,
+    aliases_dict=None,
+    aliases_case_sensitive=True,
+    automatic_aliasing=False,
+    link_constraints_fname=None,
+    links_excluded_from_edges=None,
+    skiprows=0,
+    encoding='utf8',
+    on_error='raise',
+    build_nodes=True,
+    **kwargs
+):
+
+    # read in data
+    if isinstance(data, str):
+        data = pd.read_csv(
+            data,
+            skiprows=skiprows,
+            skipinitialspace=True,
+            encoding=encoding
+        )
+        add_read_csv_params = True
+    else:
+        data = pd.DataFrame(data)
+        add_read_csv_params = False
+
+    # Convert every non-null value to a string a column at a time
+    data = data.astype(str).where(data.notna(), pd.NA)
+
+    # make a shorthand
+    s = bg.Shorthand(
+        entry_syntax=entry_syntax_fname,
+        syntax_case_sensitive=syntax_case_sensitive,
+        allow_redundant_items=allow_redundant_items
+    )
+
+    # make a string value representing the current function call
+    frame = inspect.currentframe()
+    current_module = inspect.getframeinfo(frame).filename
+    current_module = Path(current_module).stem.split('.')[0]
+    current_function = inspect.getframeinfo(frame).function
+    current_function = '.'.join(
+        ['bibliograph', current_module, current_function]
+    )
+
+    excluded_locals = [
+        'frame',
+        'current_module',
+        'current_function',
+        'excluded_locals',
+        'kwargs',
+        'build_nodes'
+    ]
+    args = {k: v for k, v in locals().items() if k not in excluded_locals}
+    args.update(kwargs)
+
+    inp_string, provenance = _provenance_record(current_function, args)
+
+    # parse the data, gather textnet build parameters, return a textnet
+    parsed = s.parse_items(
+        data,
+        input_string=inp_string,
+        input_node_type='_python_function_call',
+        on_error=on_error,
+        **kwargs
+        )
+
+    textnet_build_parameters = kwargs
+    textnet_build_parameters.update({
+        'syntax_case_sensitive': syntax_case_sensitive,
+        'allow_redundant_items': allow_redundant_items
+    })
+    if add_read_csv_params:
+        textnet_build_parameters.update({
+            'skiprows': skiprows,
+            'encoding': encoding
+        })
+
+    tn = textnet_from_parsed_shorthand(
+        parsed,
+        inp_string,
+        aliases_dict,
+        aliases_case_sensitive,
+        automatic_aliasing,
+        link_constraints_fname,
+        links_excluded_from_edges,
+        textnet_build_parameters,
+        build_nodes
+    )
+
+    _insert_provenance(tn, inp_string, provenance)
+
+    return tn
+
+
+def _json_path_value(value, keys):
+    '''
+    Follow a list of keys into a decoded JSON value. Integer keys
+    index lists. A '*' key follows the rest of the keys into every
+    element of a list and returns a flat list of the values found.
+    Returns None if any key is missing.
+    '''
+
+    for position, key in enumerate(keys):
+
+        if key == '*':
+
+            if not isinstance(value, list):
+                return None
+
+            values = []
+            for element in value:
+                element = _json_path_value(element, keys[position + 1:])
+                if isinstance(element, list):
+                    values += element
+                elif element is not None:
+                    values.append(element)
+
+            return values
+
+        if isinstance(value, dict):
+            value = value.get(key)
+
+        elif isinstance(value, list):
+            try:
+                value = value[int(key)]
+            except (ValueError, IndexError):
+                return None
+
+        else:
+            return None
+
+        if value is None:
+            return None
+
+    return value
+
+
+def _json_item_string(value, delimiter):
+    '''
+    Convert a value found in a JSON record to an item string. Lists
+    are joined with the list delimiter of the item, or reduced to
+    their first element if the item has no list delimiter. Objects are
+    written as JSON text.
+    '''
+
+    if isinstance(value, list):
+
+        value = [_json_item_string(v, None) for v in value]
+        value = [v for v in value if not pd.isna(v)]
+
+        if not value:
+            return pd.NA
+
+        if pd.isna(delimiter):
+            return value[0]
+
+        return delimiter.join(value)
+
+    if isinstance(value, dict):
+        return json.dumps(value)
+
+    if value is None:
+        return pd.NA
+
+    return str(value)
+
+
+def _iter_jsonl_items(lines, item_paths, delimiters, errors):
+    '''
+    THIS FUNCTION MUTATES ITS errors ARGUMENT
+
+    Yield (row, items) pairs from lines of JSON text, one JSON record
+    per line. items maps item labels to item strings and also has the
+    text of the record under the _jsonl_record key. Rows count
+    non-blank lines from zero.
+
+    Parameters
+    ----------
+    lines : iterable of str
+    item_paths : dict or None
+        Map from item labels to JSON paths or to functions that take a
+        decoded record and return a value. A path is a string of keys
+        separated by dots. If None, top-level keys are item labels.
+    delimiters : pandas.Series
+        List delimiters indexed by item label
+    errors : list or None
+        If a list, a dict describing each line that isn't valid JSON
+        is appended to it and the line is skipped. If None, invalid
+        lines raise an exception.
+    '''
+
+    if item_paths is not None:
+        item_paths = {
+            label: path if callable(path) else str(path).split('.')
+            for label, path in item_paths.items()
+        }
+
+    row = 0
+
+    for line in lines:
+
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            record = json.loads(line)
+
+        except json.JSONDecodeError as error:
+            if errors is None:
+                raise
+            errors.append({
+                'csv_row': row,
+                'csv_col': pd.NA,
+                'string': line,
+                'error_type': type(error).__name__,
+                'message': str(error)
+            })
+            row += 1
+            continue
+
+        if item_paths is None:
+            values = record.items() if isinstance(record, dict) else []
+        else:
+            values = [
+                (label, path(record) if callable(path)
+                 else _json_path_value(record, path))
+                for label, path in item_paths.items()
+            ]
+
+        items = {
+            label: _json_item_string(value, delimiters.get(label))
+            for label, value in values
+        }
+        items['_jsonl_record'] = line
+
+        yield row, items
+
+        row += 1
+
+
+def slurp_jsonl(
+    jsonl_fname,
+    entry_syntax_fname,
+    item_paths=None,
+    syntax_case_sensitive=True,
+    allow_redundant_items=False,
+    aliases_dict=None,
+    aliases_case_sensitive=True,
+    automatic_aliasing=False,
+    link_constraints_fname=None,
+    links_excluded_from_edges=None,
+    encoding='utf8',
+    on_error='raise',
+    chunksize=10000,
+    build_nodes=True,
+    **kwargs
+):
+    '''
+    Read a JSON-lines file of bibliographic records into a TextNet
+    without loading the whole file. Records are read one line at a
+    time, converted to items, and parsed chunksize records at a time.
+    The text of each record is its entry string.
+
+    Parameters
+    ----------
+    jsonl_fname : str or path-like
+    entry_syntax_fname : str
+    item_paths : dict or None, default None
+        Map from item labels in the entry syntax to paths of values in
+        each record. A path is a string of keys separated by dots,
+        e.g. 'container-title.0' or 'author.*.family'. Integer keys
+        index lists and a '*' key gets a value from every element of a
+        list. A function that takes the decoded record and returns a
+        value can be given instead of a path. Lists are joined with
+        the list delimiter of their item label in the entry syntax or,
+        if it has none, reduced to their first element. If None, the
+        top-level keys of each record are used as item labels.
+    chunksize : int, default 10000
+        Number of records parsed at once
+    on_error : str, default 'raise'
+        If 'quarantine', lines that aren't valid JSON and records that
+        can't be parsed are left out and listed in the parse_errors
+        attribute of the TextNet. csv_row counts non-blank lines.
+    build_nodes : bool, default True
+        If False, the TextNet has strings and assertions but no nodes
+        or edges. slurp_many builds them once for all of its inputs.
+
+    Other parameters are the same as for slurp_columnar_items. An
+    entry_writer in kwargs is applied to each row of items, which
+    includes the record text in a '_jsonl_record' column.
+
+    Returns
+    -------
+    bibliograph.TextNet
+    '''
+
+    # make a string value representing the current function call
+    frame = inspect.currentframe()
+    current_module = inspect.getframeinfo(frame).filename
+    current_module = Path(current_module).stem.split('.')[0]
+    current_function = inspect.getframeinfo(frame).function
+    current_function = '.'.join(
+        ['bibliograph', current_module, current_function]
+    )
+
+    excluded_locals = [
+        'frame',
+        'current_module',
+        'current_function',
+        'excluded_locals',
+        'kwargs',
+        'build_nodes'
+    ]
+    args = {k: v for k, v in locals().items() if k not in excluded_locals}
+    args.update(kwargs)
+
+    inp_string, provenance = _provenance_record(current_function, args)
+
+    if on_error not in ['raise', 'quarantine']:
+        raise ValueError('on_error must be "raise" or "quarantine"')
+
+    chunksize = int(chunksize)
+    if chunksize < 1:
+        raise ValueError('chunksize must be a positive integer')
+
+    s = bg.Shorthand(
+        entry_syntax=entry_syntax_fname,
+        syntax_case_sensitive=syntax_case_sensitive,
+        allow_redundant_items=allow_redundant_items
+    )
+
+    # get list delimiters so list values can be joined into items
+    # that parse_items splits again
+    entry_syntax = bg.syntax_parsing.validate_entry_syntax(
+        s.entry_syntax,
+        case_sensitive=syntax_case_sensitive,
+        allow_redundant_items=allow_redundant_items
+    )
+    delimiters = entry_syntax.drop_duplicates(subset='item_label')
+    delimiters = pd.Series(
+        delimiters['list_delimiter'].array,
+        index=delimiters['item_label'].array
+    )
+
+    # the text of each record is its entry unless we got a function to
+    # write entry strings
+    if 'entry_writer' in kwargs.keys():
+        entry_writer = kwargs['entry_writer']
+        batch_entry_writer = None
+    else:
+        entry_writer = None
+        batch_entry_writer = _jsonl_entry_strings
+
+    kwargs = {k: v for k, v in kwargs.items() if k != 'entry_writer'}
+
+    json_errors = [] if on_error == 'quarantine' else None
+
+    with open(jsonl_fname, encoding=encoding) as f:
+
+        # Records get null items for item labels that other records in
+        # the file have, however the file is split into batches, so
+        # read the item labels of every record first. Records have
+        # every label in item_paths.
+        if item_paths is None:
+            labels = _record_keys(_iter_jsonl_items(
+                f,
+                None,
+                delimiters,
+                None if json_errors is None else []
+            ))
+            f.seek(0)
+        else:
+            labels = None
+
+        items = _iter_jsonl_items(f, item_paths, delimiters, json_errors)
+
+        parsed = _parse_item_batches(
+            s,
+            _batch_records(items, chunksize, labels),
+            on_error,
+            entry_writer=entry_writer,
+            batch_entry_writer=batch_entry_writer,
+            input_string=inp_string,
+            input_node_type='_python_function_call',
+            **kwargs
+        )
+
+    if on_error == 'quarantine':
+        json_errors = pd.DataFrame(
+            json_errors,
+            columns=parsed.parse_errors.columns
+        )
+        json_errors = json_errors.astype(parsed.parse_errors.dtypes)
+        parsed.parse_errors = pd.concat([json_errors, parsed.parse_errors])
+        parsed.parse_errors = parsed.parse_errors.sort_values(
+            'csv_row',
+            kind='stable'
+        ).reset_index(drop=True)
+
+    textnet_build_parameters = kwargs
+    textnet_build_parameters.update({
+        'syntax_case_sensitive': syntax_case_sensitive,
+        'allow_redundant_items': allow_redundant_items,
+        'encoding': encoding
+    })
+
+    tn = textnet_from_parsed_shorthand(
+        parsed,
+        inp_string,
+        aliases_dict,
+        aliases_case_sensitive,
+        automatic_aliasing,
+        link_constraints_fname,
+        links_excluded_from_edges,
+        textnet_build_parameters,
+        build_nodes
+    )
+
+    _insert_provenance(tn, inp_string, provenance)
+
+    return tn
+
+
+def _record_build_memory(tn):
+    '''
+    Add the memory used after building a TextNet from parsed shorthand
+    text to the memory report made while parsing.
+
+    THIS FUNCTION MUTATES ITS ARGUMENT
+    '''
+    memory = _MemoryReport(tn.memory_report)
+    memory.sample('build')
+    tn.memory_report = memory.to_frame()
+
+
+def slurp_shorthand(
+    shorthand_fname,
+    entry_syntax_fname,
+    link_syntax_fname=None,
+    syntax_case_sensitive=True,
+    allow_redundant_items=False,
+    aliases_dict=None,
+    aliases_case_sensitive=True,
+    automatic_aliasing=False,
+    link_constraints_fname=None,
+    links_excluded_from_edges=None,
+    item_separator='__',
+    space_char='|',
+    skiprows=0,
+    na_string_values='!',
+    na_node_type='missing',
+    default_entry_prefix='wrk',
+    comment_char='#',
+    encoding='utf8',
+    chunksize=None,
+    workers=None,
+    entry_cache=None,
+    on_error='raise',
+    memory_budget=None,
+    build_nodes=True
+):
+
+    # make a string value representing the current function call
+    frame = inspect.currentframe()
+    current_module = inspect.getframeinfo(frame).filename
+    current_module = Path(current_module).stem.split('.')[0]
+    current_function = inspect.getframeinfo(frame).function
+    current_function = '.'.join(
+        ['bibliograph', current_module, current_function]
+    )
+
+    excluded_locals = [
+        'frame',
+        'current_module',
+        'current_function',
+        'excluded_locals',
+        'kwargs',
+        'build_nodes'
+    ]
+    args = {k: v for k, v in locals().items() if k not in excluded_locals}
+
+    # The input is read and hashed once for parsing and provenance. Only
+    # the digest of a file is reused: buffers are hashed from their
+    # whole contents, not from their current position.
+    shorthand_input = _ShorthandInput(shorthand_fname, encoding)
+    content_hashes = {}
+    if _is_file_path(shorthand_fname):
+        content_hashes['shorthand_fname'] = shorthand_input.sha256
+
+    inp_string, provenance = _provenance_record(
+        current_function,
+        args,
+        content_hashes
+    )
+
+    s = bg.Shorthand(
+        entry_syntax=entry_syntax_fname,
+        link_syntax=link_syntax_fname,
+        syntax_case_sensitive=syntax_case_sensitive,
+        allow_redundant_items=allow_redundant_items
+    )
+
+    textnet_build_parameters = {
+        'item_separator': item_separator,
+        'space_char': space_char,
+        'na_string_values': na_string_values,
+        'na_node_type': na_node_type,
+        'default_entry_prefix': default_entry_prefix,
+        'comment_char': comment_char,
+        'skiprows': _normalize_skiprows(skiprows),
+        'encoding': encoding
+    }
+
+    parsed = s.parse_text(
+        shorthand_input,
+        input_string=inp_string,
+        input_node_type='_python_function_call',
+        chunksize=chunksize,
+        workers=workers,
+        entry_cache=entry_cache,
+        on_error=on_error,
+        memory_budget=memory_budget,
+        **textnet_build_parameters
+    )
+
+    textnet_build_parameters['syntax_case_sensitive'] = syntax_case_sensitive
+    textnet_build_parameters['allow_redundant_items'] = allow_redundant_items
+
+    tn = textnet_from_parsed_shorthand(
+        parsed,
+        inp_string,
+        aliases_dict,
         aliases_case_sensitive,
         automatic_aliasing,
         link_constraints_fname,
         links_excluded_from_edges,
-        textnet_build_parameters
+        textnet_build_parameters,
+        build_nodes
+    )
+
+    _record_build_memory(tn)
+
+    _insert_provenance(tn, inp_string, provenance)
+
+    return tn
+
+
+def slurp_single_column(
+    shorthand_fname,
+    entry_syntax_fname,
+    syntax_case_sensitive=True,
+    allow_redundant_items=False,
+    aliases_dict=None,
+    aliases_case_sensitive=True,
+    automatic_aliasing=False,
+    link_constraints_fname=None,
+    links_excluded_from_edges=None,
+    item_separator='__',
+    space_char='|',
+    skiprows=0,
+    na_string_values='!',
+    na_node_type='missing',
+    default_entry_prefix='wrk',
+    comment_char='#',
+    encoding='utf8',
+    chunksize=None,
+    workers=None,
+    entry_cache=None,
+    on_error='raise',
+    memory_budget=None,
+    build_nodes=True
+):
+
+    # make a string value representing the current function call
+    frame = inspect.currentframe()
+    current_module = inspect.getframeinfo(frame).filename
+    current_module = Path(current_module).stem.split('.')[0]
+    current_function = inspect.getframeinfo(frame).function
+    current_function = '.'.join(
+        ['bibliograph', current_module, current_function]
+    )
+
+    excluded_locals = [
+        'frame',
+        'current_module',
+        'current_function',
+        'excluded_locals',
+        'kwargs',
+        'build_nodes'
+    ]
+    args = {k: v for k, v in locals().items() if k not in excluded_locals}
+
+    # The input is read and hashed once for parsing and provenance. Only
+    # the digest of a file is reused: buffers are hashed from their
+    # whole contents, not from their current position.
+    shorthand_input = _ShorthandInput(shorthand_fname, encoding)
+    content_hashes = {}
+    if _is_file_path(shorthand_fname):
+        content_hashes['shorthand_fname'] = shorthand_input.sha256
+
+    inp_string, provenance = _provenance_record(
+        current_function,
+        args,
+        content_hashes
+    )
+
+
+    s = bg.Shorthand(
+        entry_syntax=entry_syntax_fname,
+        syntax_case_sensitive=syntax_case_sensitive,
+        allow_redundant_items=allow_redundant_items
+    )
+
+    textnet_build_parameters = {
+        'item_separator': item_separator,
+        'space_char': space_char,
+        'na_string_values': na_string_values,
+        'na_node_type': na_node_type,
+        'default_entry_prefix': default_entry_prefix,
+        'comment_char': comment_char,
+        'skiprows': _normalize_skiprows(skiprows),
+        'encoding': encoding
+    }
+
+    parsed = s.parse_text(
+        shorthand_input,
+        input_string=inp_string,
+        input_node_type='_python_function_call',
+        drop_na=[],
+        chunksize=chunksize,
+        workers=workers,
+        entry_cache=entry_cache,
+        on_error=on_error,
+        memory_budget=memory_budget,
+        **textnet_build_parameters
+    )
+
+    textnet_build_parameters['syntax_case_sensitive'] = syntax_case_sensitive
+    textnet_build_parameters['allow_redundant_items'] = allow_redundant_items
+
+    tn = textnet_from_parsed_shorthand(
+        parsed,
+        inp_string,
+        aliases_dict,
+        aliases_case_sensitive,
+        automatic_aliasing,
+        link_constraints_fname,
+        links_excluded_from_edges,
+        textnet_build_parameters,
+        build_nodes
+    )
+
+    _record_build_memory(tn)
+
+    _insert_provenance(tn, inp_string, provenance)
+
+    return tn
+
+
+_SLURP_FUNCTIONS = {
+    'bibtex': slurp_bibtex,
+    'columnar_items': slurp_columnar_items,
+    'jsonl': slurp_jsonl,
+    'shorthand': slurp_shorthand,
+    'single_column': slurp_single_column
+}
+
+
+def _slurp_spec(spec):
+    '''
+    Call the slurp function named in an input spec with the rest of the
+    spec as keyword arguments. The TextNet it returns has strings and
+    assertions but no nodes or edges.
+    '''
+    spec = dict(spec)
+    function = spec.pop('function')
+
+    if isinstance(function, str):
+        function = _SLURP_FUNCTIONS[function]
+
+    return function(build_nodes=False, **spec)
+
+
+def _union_by_value(frames, keys):
+    '''
+    Stack dataframes and keep the first row with each key. Rows of the
+    union are indexed from zero in order of first appearance.
+
+    Parameters
+    ----------
+    frames : list of pandas.DataFrame
+    keys : list of pandas.Series
+        Keys of the rows of each frame
+
+    Returns
+    -------
+    tuple
+        (union dataframe, list with a pandas.Series for each frame
+        mapping its index values to index values of the union)
+    '''
+
+    codes, uniques = pd.factorize(pd.concat(keys, ignore_index=True))
+
+    rows = pd.concat(frames, ignore_index=True)
+    first = ~pd.Series(codes).duplicated().array
+    union = rows.loc[first]
+    union.index = range(len(uniques))
+
+    id_maps = []
+    start = 0
+    for frame in frames:
+        stop = start + len(frame)
+        id_maps.append(pd.Series(codes[start:stop], index=frame.index))
+        start = stop
+
+    return union, id_maps
+
+
+def _union_textnet_assertions(tns):
+    '''
+    Make a TextNet with the strings, assertions, and assertion tags of
+    every TextNet in tns, with or without nodes. Node and link types
+    are matched by value and strings are matched by value and node
+    type, so each distinct string gets one ID. Assertions keep their
+    input strings. Nodes and edges are not built.
+    '''
+
+    node_types, node_type_maps = _union_by_value(
+        [tn.node_types for tn in tns],
+        [tn.node_types['node_type'] for tn in tns]
+    )
+    link_types, link_type_maps = _union_by_value(
+        [tn.link_types for tn in tns],
+        [tn.link_types['link_type'] for tn in tns]
+    )
+
+    def string_node_type_ids(tn):
+        # Completed TextNets store node types of strings in their nodes
+        if 'node_type_id' in tn.strings.columns:
+            return tn.strings['node_type_id']
+        return tn.strings['node_id'].map(tn.nodes['node_type_id'])
+
+    strings = [
+        pd.DataFrame({
+            'string': tn.strings['string'],
+            'node_type_id': string_node_type_ids(tn).map(node_type_map)
+        })
+        for tn, node_type_map in zip(tns, node_type_maps)
+    ]
+
+    # If any TextNet keeps its literals in a BlobStore, every literal is
+    # matched by its handle, so the same text stored by one TextNet and
+    # kept in the strings of another becomes one string
+    blobs = [tn.__dict__.get('blobs') for tn in tns]
+    if any(b is not None for b in blobs):
+
+        # A directory store is shared by design, so the first one is
+        # used for the union instead of copying its texts. Texts of
+        # other stores are added to it.
+        directory_stores = [
+            b for b in blobs if (b is not None) and (b.directory is not None)
+        ]
+        if directory_stores:
+            union_blobs = directory_stores[0]
+        else:
+            union_blobs = bg.BlobStore()
+
+        for tn, b, s in zip(tns, blobs, strings):
+
+            if (b is not None) and (b is not union_blobs) and not (
+                (b.directory is not None)
+                and b.directory.samefile(union_blobs.directory)
+            ):
+                union_blobs.update(b)
+
+            literal_ids = tn._literal_string_ids()
+            literals = s.loc[literal_ids, 'string']
+            literals = literals.loc[
+                ~literals.map(union_blobs.__contains__).array
+            ]
+            s.loc[literals.index, 'string'] = [
+                union_blobs.put(text) for text in literals
+            ]
+
+    else:
+        union_blobs = None
+
+    strings, string_maps = _union_by_value(
+        strings,
+        [pd.util.hash_pandas_object(s, index=False) for s in strings]
+    )
+
+    string_columns = [
+        'inp_string_id', 'src_string_id', 'tgt_string_id', 'ref_string_id'
+    ]
+    assertions = []
+    assertion_tags = []
+    num_assertions = 0
+
+    for tn, string_map, link_type_map in zip(tns, string_maps, link_type_maps):
+
+        new = pd.DataFrame({
+            c: tn.assertions[c].map(string_map) for c in string_columns
+        })
+        new['link_type_id'] = tn.assertions['link_type_id'].map(link_type_map)
+        assertions.append(new)
+
+        assertion_id_map = pd.Series(
+            range(num_assertions, num_assertions + len(new)),
+            index=tn.assertions.index
+        )
+        assertion_tags.append(pd.DataFrame({
+            'assertion_id': tn.assertion_tags['assertion_id'].map(
+                assertion_id_map
+            ),
+            'tag_string_id': tn.assertion_tags['tag_string_id'].map(
+                string_map
+            )
+        }))
+
+        num_assertions += len(new)
+
+    union = bg.TextNet()
+    union.node_types = node_types
+    union.link_types = link_types
+    union.strings = strings
+    union.assertions = pd.concat(assertions, ignore_index=True)
+    union.assertion_tags = pd.concat(assertion_tags, ignore_index=True)
+
+    # Provenance records follow the strings they describe
+    provenance = pd.concat([
+        tn.provenance.set_axis(tn.provenance.index.map(string_map))
+        for tn, string_map in zip(tns, string_maps)
+    ])
+    union.provenance = provenance.loc[
+        ~provenance.index.duplicated() & provenance.index.notna()
+    ]
+
+    if union_blobs is not None:
+        union.blobs = union_blobs
+
+    union.reset_node_types_dtypes()
+    union.reset_link_types_dtypes()
+    union.reset_strings_dtypes()
+    union.reset_assertions_dtypes()
+    union.reset_assertion_tags_dtypes()
+    union.reset_provenance_dtypes()
+
+    return union, string_maps
+
+
+def slurp_many(specs, workers=None, links_excluded_from_edges=None):
+    '''
+    Read many inputs into one TextNet. Each input is parsed into
+    strings and assertions on its own, optionally in a pool of
+    processes, and the parsed inputs are merged before nodes and edges
+    are built once for all of them.
+
+    Assertions keep the input string of the input they came from, so
+    every input's parameters stay recorded as they would be by its
+    slurp function. Alias assertions from alias tables and automatic
+    aliasing are generated for each input while it's parsed. Strings
+    from different inputs with the same value and node type become the
+    same string, so aliases from one input apply to matching strings
+    from the others when nodes are built. Link constraints are applied
+    to the assertions of their own input after aliases from every input
+    have been merged into nodes.
+
+    Parameters
+    ----------
+    specs : iterable of dict
+        One dict per input. The 'function' key names the slurp function
+        to call, either as a function or as one of 'bibtex',
+        'columnar_items', 'jsonl', 'shorthand', or 'single_column'.
+        The other keys are passed as keyword arguments. With workers,
+        arguments must be picklable, so functions passed as arguments
+        must be defined at the top level of a module.
+
+    workers : int or None, default None
+        Number of processes used to parse inputs. If None, inputs are
+        parsed one at a time in this process.
+
+    links_excluded_from_edges : list or None, default None
+        Link types of assertions that don't become edges
+
+    Returns
+    -------
+    TextNet
+        If any input was read with on_error='quarantine', the
+        parse_errors attribute has the excluded rows of every input
+        with an inp_string_id column.
+    '''
+
+    specs = list(specs)
+
+    if not specs:
+        raise ValueError('Provide at least one input spec')
+
+    for spec in specs:
+
+        function = spec.get('function')
+
+        if isinstance(function, str) and function not in _SLURP_FUNCTIONS:
+            raise ValueError(
+                'Unknown slurp function "{}". Use one of {}.'
+                .format(function, list(_SLURP_FUNCTIONS.keys()))
+            )
+
+        elif not (isinstance(function, str) or callable(function)):
+            raise ValueError(
+                'Every input spec needs a slurp function under the '
+                '"function" key'
+            )
+
+    if workers is None:
+        tns = [_slurp_spec(spec) for spec in specs]
+
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tns = list(executor.map(_slurp_spec, specs))
+
+    # Every input must have its own input string, otherwise the
+    # assertions of identical inputs would be merged
+    inp_string_ids = [tn.assertions['inp_string_id'].unique() for tn in tns]
+    inp_strings = pd.Series([
+        s for tn, ids in zip(tns, inp_string_ids)
+        for s in tn.strings.loc[ids, 'string']
+    ])
+    if inp_strings.duplicated().any():
+        raise ValueError(
+            'Input specs must be distinct. These inputs were given more '
+            'than once: {}'.format(
+                list(inp_strings.loc[inp_strings.duplicated()])
+            )
+        )
+
+    tn, string_maps = _union_textnet_assertions(tns)
+
+    parse_errors = []
+    for parsed, ids, string_map in zip(tns, inp_string_ids, string_maps):
+        try:
+            errors = parsed.parse_errors.copy()
+        except AttributeError:
+            continue
+        errors.insert(0, 'inp_string_id', string_map.loc[ids[0]])
+        parse_errors.append(errors)
+
+    tn = complete_textnet_from_assertions(
+        tn,
+        aliases_case_sensitive=True,
+        current_inp_string_id=None,
+        link_constraints_string_id=None,
+        links_excluded_from_edges=links_excluded_from_edges,
+        link_constraint_inputs=tn.assertions['inp_string_id'].unique()
+    )
+
+    if parse_errors:
+        tn.parse_errors = pd.concat(parse_errors, ignore_index=True)
+
+    return tn
+
+
+# The TextNet tables stored by textnet_to_sqlite and save_textnet. Node
+# tables come before string tables so the strings of a completed
+# TextNet get their node_id column when their dtypes are reset.
+_TEXTNET_TABLES = [
+    'node_types',
+    'link_types',
+    'nodes',
+    'strings',
+    'assertions',
+    'edges',
+    'assertion_tags',
+    'edge_tags',
+    'provenance'
+]
+
+
+def _sqlite_schema():
+    '''
+    Read the statements in resources/schema_script.sql.
+
+    Returns
+    -------
+    tuple
+        (dict mapping table names to lists of their column names, with
+        the index column first; list of CREATE TABLE statements; list
+        of CREATE INDEX statements)
+    '''
+
+    schema = Path(__file__).parent / 'resources' / 'schema_script.sql'
+    with open(schema, encoding='utf8') as f:
+        lines = f.read().splitlines()
+
+    # Drop the pandas dtype comments because they would end up inside
+    # the statements once the lines are joined
+    lines = [line.split('--')[0].rstrip() for line in lines]
+    statements = [
+        s.strip() for s in '\n'.join(lines).split(';') if s.strip()
+    ]
+
+    columns = {}
+    for statement in statements:
+        if statement.startswith('CREATE TABLE'):
+            header, *column_lines = statement.splitlines()
+            table_name = header.split()[2].split('(')[0]
+            columns[table_name] = [
+                line.split()[0] for line in column_lines
+                if not line.startswith(')')
+            ]
+
+    create_tables = [s for s in statements if s.startswith('CREATE TABLE')]
+    create_indexes = [s for s in statements if s.startswith('CREATE INDEX')]
+
+    return columns, create_tables, create_indexes
+
+
+def _insert_sqlite_rows(con, table_name, table):
+    '''
+    Insert the rows of a dataframe indexed by the index column of a
+    schema table with one executemany.
+    '''
+
+    index_column, *table_columns = _sqlite_schema()[0][table_name]
+
+    # Missing optional columns like date_modified are stored as NULL.
+    # Values are converted to python objects because sqlite3 can't bind
+    # numpy scalars.
+    values = [table.index.to_numpy(dtype=object, na_value=None)]
+    for c in table_columns:
+        if c in table.columns:
+            values.append(table[c].to_numpy(dtype=object, na_value=None))
+        else:
+            values.append([None]*len(table))
+
+    con.executemany(
+        'INSERT INTO {} ({}) VALUES ({})'.format(
+            table_name,
+            ', '.join([index_column] + table_columns),
+            ', '.join(['?']*(len(table_columns) + 1))
+        ),
+        zip(*values)
+    )
+
+
+def _write_sqlite_tables(con, tn, kept_blobs=False):
+    '''
+    Create the schema tables in an open transaction, insert the tables
+    of tn with one executemany per table, and index the foreign key
+    columns once the rows are in. If kept_blobs is True, the texts the
+    BlobStore of tn reads from this database are in the temporary
+    table kept_blobs.
+    '''
+
+    _, create_tables, create_indexes = _sqlite_schema()
+
+    for statement in create_tables:
+        con.execute(statement)
+
+    con.executemany(
+        'INSERT INTO textnet_dtypes VALUES (?, ?)',
+        [
+            ('big_id_dtype', str(tn.big_id_dtype)),
+            ('small_id_dtype', str(tn.small_id_dtype))
+        ]
+    )
+
+    for table_name in _TEXTNET_TABLES:
+        _insert_sqlite_rows(con, table_name, tn.__getattr__(table_name))
+
+    # Texts moved to a BlobStore are stored as they are in the store.
+    # Texts a store reads from this database were copied to a
+    # temporary table before its tables were dropped.
+    blobs = tn.__dict__.get('blobs')
+    if blobs is not None:
+
+        handles = blobs
+        if kept_blobs:
+            con.execute(
+                'INSERT INTO blobs (handle, compressed, data) '
+                'SELECT handle, compressed, data FROM temp.kept_blobs'
+            )
+            con.execute('DROP TABLE temp.kept_blobs')
+            handles = list(blobs._blobs.keys())
+
+        con.executemany(
+            'INSERT OR IGNORE INTO blobs (handle, compressed, data) '
+            'VALUES (?, ?, ?)',
+            ((h, *blobs._get_raw(h)) for h in handles)
+        )
+
+    for statement in create_indexes:
+        con.execute(statement)
+
+
+def _read_sqlite_table(con, tn, table_name, columns=None, where=None):
+    '''
+    Read rows of one schema table from an open sqlite3 connection.
+
+    Parameters
+    ----------
+    con : sqlite3.Connection
+
+    tn : TextNet
+        TextNet whose dtypes the columns get
+
+    table_name : str
+
+    columns : list or None, default None
+        Columns to read besides the index. If None, read every column.
+
+    where : dict or None, default None
+        Maps column names to lists of values. Only rows with one of
+        the listed values in every column are read. The key 'index'
+        selects by the index column.
+
+    Returns
+    -------
+    pandas.DataFrame
+    '''
+
+    index_column, *table_columns = _sqlite_schema()[0][table_name]
+
+    if columns is None:
+        columns = table_columns
+
+    # Each list of values is passed as a single JSON parameter, so
+    # there's no limit on how many values a predicate can have
+    conditions = []
+    parameters = []
+    for column, values in (where or {}).items():
+        conditions.append(
+            '{} IN (SELECT value FROM json_each(?))'.format(
+                index_column if column == 'index' else column
+            )
+        )
+        # numpy scalars aren't JSON serializable
+        parameters.append(json.dumps([
+            v.item() if hasattr(v, 'item') else v
+            for v in values if pd.notna(v)
+        ]))
+
+    query = 'SELECT {} FROM {}'.format(
+        ', '.join([index_column] + list(columns)),
+        table_name
+    )
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+
+    # Index columns are declared INT, not INTEGER, so they aren't
+    # aliases of the rowid and rows come back in the order they were
+    # written
+    query += ' ORDER BY rowid'
+
+    table = pd.read_sql_query(
+        query,
+        con,
+        index_col=index_column,
+        params=parameters
+    )
+    table.index.name = None
+
+    dtypes = tn.__getattr__('_{}_dtypes'.format(table_name))
+    table = table.astype({c: dtypes[c] for c in columns})
+    table.index = table.index.astype(
+        tn.__getattr__('_{}_index_dtype'.format(table_name))
+    )
+
+    return table.fillna(pd.NA)
+
+
+def _read_sqlite_textnet(con, lazy=False):
+    '''
+    Make a TextNet with the ID dtypes stored in an open sqlite3
+    connection and read its tables unless lazy is True.
+    '''
+
+    dtypes = dict(
+        con.execute('SELECT dtype_name, dtype FROM textnet_dtypes')
+    )
+    tn = bg.TextNet(
+        big_id_dtype=pd.api.types.pandas_dtype(dtypes['big_id_dtype']),
+        small_id_dtype=pd.api.types.pandas_dtype(dtypes['small_id_dtype'])
+    )
+
+    if lazy:
+        # Drop the empty provenance table of the new TextNet so the
+        # stored one is read when it's used
+        del tn.provenance
+
+    else:
+        for table_name in _TEXTNET_TABLES:
+            tn.__setattr__(
+                table_name,
+                _read_sqlite_table(con, tn, table_name)
+            )
+
+    # Stored texts are read from the database when they're requested
+    if con.execute('SELECT 1 FROM blobs LIMIT 1').fetchone() is not None:
+        database = con.execute('PRAGMA database_list').fetchone()[2]
+        tn.blobs = bg.BlobStore(database=database)
+
+    return tn
+
+
+def _read_textnet_sqlite_rows(tn, table_name, columns=None, where=None):
+    '''
+    Read rows of a table of a TextNet opened with
+    textnet_from_sqlite(lazy=True). See _read_sqlite_table.
+    '''
+
+    path = Path(tn._sqlite_path).resolve()
+    con = sqlite3.connect(path.as_uri() + '?mode=ro', uri=True)
+
+    try:
+        return _read_sqlite_table(con, tn, table_name, columns, where)
+
+    finally:
+        con.close()
+
+
+def _sqlite_tables_exist(con):
+    columns, _, _ = _sqlite_schema()
+    existing = con.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'"
+    )
+    return bool(set(columns.keys()) & {row[0] for row in existing})
+
+
+def _match_stored_ids(new, stored, start):
+    '''
+    Map rows of a dataframe to the IDs of stored rows with the same
+    values. Rows with values that aren't stored get IDs counting up
+    from start in order of first appearance.
+
+    Parameters
+    ----------
+    new : pandas.DataFrame
+        Key columns of the new rows
+
+    stored : pandas.DataFrame
+        The same key columns of stored rows, indexed by their IDs
+
+    start : int
+        First ID for values that aren't stored
+
+    Returns
+    -------
+    tuple
+        (pandas.Series mapping the index of new to IDs, boolean array
+        that is True for the first row of each value that isn't stored)
+    '''
+
+    keys = list(new.columns)
+    stored = stored.loc[~stored.duplicated(keys).array]
+    matched = new.merge(
+        stored.rename_axis('_id').reset_index(),
+        how='left',
+        on=keys
+    )
+
+    ids = pd.Series(matched['_id'].array, index=new.index, dtype=object)
+    missing = ids.isna().to_numpy()
+
+    codes = new.loc[missing].groupby(keys, sort=False, dropna=False).ngroup()
+    ids.loc[missing] = (codes + start).array
+    is_first = missing & ~new.duplicated().to_numpy()
+
+    return ids.astype('int64'), is_first
+
+
+def _next_sqlite_id(con, table_name):
+    index_column = _sqlite_schema()[0][table_name][0]
+    return con.execute(
+        'SELECT COALESCE(MAX({}) + 1, 0) FROM {}'.format(
+            index_column,
+            table_name
+        )
+    ).fetchone()[0]
+
+
+def _appends_sqlite_rows(stored, tn):
+    '''
+    True if the rows of tn can be added to a stored TextNet without
+    changing its nodes. Alias assertions can merge stored nodes, and
+    literals kept in a BlobStore turn stored literals into handles,
+    so those appends build the whole TextNet again.
+    '''
+
+    aliases = tn.get_assertions_by_link_type('alias', allow_missing_type=True)
+    blobs = tn.__dict__.get('blobs')
+
+    return aliases.empty and (
+        (blobs is None) or (stored.__dict__.get('blobs') is not None)
+    )
+
+
+def _append_sqlite_rows(con, stored, tn, links_excluded_from_edges):
+    '''
+    Add the inputs of tn to the TextNet stored in an open transaction
+    without reading or rewriting its tables. Node and link types are
+    matched by value and strings by value and node type, as in
+    _union_textnet_assertions. Strings that aren't stored get nodes of
+    their own. Edges of the new assertions that aren't stored are
+    added, and stored edges to null nodes are deleted with their tags
+    when a new edge of the same type from the same node has a non-null
+    target.
+
+    Parameters
+    ----------
+    con : sqlite3.Connection
+
+    stored : TextNet
+        The stored TextNet read with _read_sqlite_textnet(lazy=True)
+
+    tn : TextNet
+        A TextNet with nodes and edges and no alias assertions
+
+    links_excluded_from_edges : list or None
+    '''
+
+    date_inserted = time_string()
+
+    def read(table_name, columns=None, where=None):
+        return _read_sqlite_table(con, stored, table_name, columns, where)
+
+    # Types are few, so they're read whole
+    node_types = read('node_types')
+    node_type_map, new_node_types = _match_stored_ids(
+        tn.node_types[['node_type']].astype(
+            node_types[['node_type']].dtypes
+        ),
+        node_types[['node_type']],
+        _next_sqlite_id(con, 'node_types')
+    )
+    new_node_types = tn.node_types.loc[new_node_types]
+    new_node_types.index = node_type_map.loc[new_node_types.index].array
+    node_types = pd.concat([node_types, new_node_types])
+
+    link_types = read('link_types')
+    link_type_map, new_link_types = _match_stored_ids(
+        tn.link_types[['link_type']].astype(
+            link_types[['link_type']].dtypes
+        ),
+        link_types[['link_type']],
+        _next_sqlite_id(con, 'link_types')
+    )
+    new_link_types = tn.link_types.loc[new_link_types]
+    new_link_types.index = link_type_map.loc[new_link_types.index].array
+
+    strings = pd.DataFrame({
+        'string': tn.strings['string'],
+        'node_type_id': tn.strings['node_id'].map(
+            tn.nodes['node_type_id']
+        ).map(node_type_map)
+    })
+
+    # A database with stored texts keeps every literal in the blobs
+    # table, so literals of tn become handles
+    blobs = tn.__dict__.get('blobs')
+    stored_blobs = stored.__dict__.get('blobs')
+    raw_blobs = {}
+    if stored_blobs is not None:
+
+        literals = strings.loc[tn._literal_string_ids(), 'string']
+        for string_id, text in literals.items():
+            if (blobs is not None) and (text in blobs):
+                raw_blobs[text] = blobs._get_raw(text)
+            else:
+                handle = bg.BlobStore.handle(text)
+                raw_blobs[handle] = (False, text.encode('utf8'))
+                strings.loc[string_id, 'string'] = handle
+
+        stored_handles = con.execute(
+            'SELECT handle FROM blobs '
+            'WHERE handle IN (SELECT value FROM json_each(?))',
+            (json.dumps(list(raw_blobs.keys())),)
+        )
+        for row in stored_handles:
+            del raw_blobs[row[0]]
+
+    # Only stored strings with the values of new strings are read
+    stored_strings = read(
+        'strings',
+        columns=['node_id', 'string'],
+        where={'string': strings['string'].unique()}
+    )
+    stored_strings['node_type_id'] = stored_strings['node_id'].map(
+        read(
+            'nodes',
+            columns=['node_type_id'],
+            where={'index': stored_strings['node_id'].unique()}
+        )['node_type_id']
+    )
+
+    strings = strings.astype(stored_strings[strings.columns].dtypes)
+    string_map, is_new_string = _match_stored_ids(
+        strings,
+        stored_strings[strings.columns],
+        _next_sqlite_id(con, 'strings')
+    )
+
+    new_inputs = string_map.loc[tn.assertions['inp_string_id'].unique()]
+    duplicates = read(
+        'assertions',
+        columns=['inp_string_id'],
+        where={'inp_string_id': new_inputs.unique()}
+    )
+    if not duplicates.empty:
+        duplicates = new_inputs.loc[
+            new_inputs.isin(duplicates['inp_string_id'].array).array
+        ]
+        raise ValueError(
+            'These inputs are already stored in the database: {}'.format(
+                list(tn.strings.loc[duplicates.index, 'string'])
+            )
+        )
+
+    # Each new string gets its own node
+    new_strings = strings.loc[is_new_string].copy()
+    new_strings.index = string_map.loc[new_strings.index].array
+    new_strings['node_id'] = range(
+        _next_sqlite_id(con, 'nodes'),
+        _next_sqlite_id(con, 'nodes') + len(new_strings)
+    )
+    new_strings['date_inserted'] = date_inserted
+
+    new_nodes = pd.DataFrame(
+        {
+            'node_type_id': new_strings['node_type_id'].array,
+            'name_string_id': new_strings.index,
+            'abbr_string_id': new_strings.index,
+            'date_inserted': date_inserted
+        },
+        index=new_strings['node_id'].array
+    )
+
+    node_map = string_map.map(
+        pd.concat([stored_strings['node_id'], new_strings['node_id']])
+    )
+
+    string_columns = [
+        'inp_string_id', 'src_string_id', 'tgt_string_id', 'ref_string_id'
+    ]
+    new_assertions = pd.DataFrame({
+        c: tn.assertions[c].map(string_map) for c in string_columns
+    })
+    new_assertions['link_type_id'] = tn.assertions['link_type_id'].map(
+        link_type_map
+    )
+    new_assertions['date_inserted'] = date_inserted
+    assertion_map = pd.Series(
+        range(
+            _next_sqlite_id(con, 'assertions'),
+            _next_sqlite_id(con, 'assertions') + len(new_assertions)
+        ),
+        index=tn.assertions.index
+    )
+    new_assertions.index = assertion_map.array
+
+    new_assertion_tags = pd.DataFrame({
+        'assertion_id': tn.assertion_tags['assertion_id'].map(
+            assertion_map
+        ).array,
+        'tag_string_id': tn.assertion_tags['tag_string_id'].map(
+            string_map
+        ).array
+    })
+    new_assertion_tags.index = range(
+        _next_sqlite_id(con, 'assertion_tags'),
+        _next_sqlite_id(con, 'assertion_tags') + len(new_assertion_tags)
+    )
+
+    # Edges are keyed by the nodes of the strings of the assertions
+    edge_columns = [
+        'src_node_id', 'tgt_node_id', 'ref_node_id', 'link_type_id'
+    ]
+    assertion_edges = pd.DataFrame({
+        'src_node_id': tn.assertions['src_string_id'].map(node_map),
+        'tgt_node_id': tn.assertions['tgt_string_id'].map(node_map),
+        'ref_node_id': tn.assertions['ref_string_id'].map(node_map),
+        'link_type_id': new_assertions['link_type_id'].array
+    })
+    assertion_edges = assertion_edges.astype(
+        {c: stored._edges_dtypes[c] for c in edge_columns}
+    )
+
+    stored_edges = read(
+        'edges',
+        columns=edge_columns,
+        where={'src_node_id': assertion_edges['src_node_id'].unique()}
+    )
+
+    candidates = assertion_edges.loc[
+        _select_edge_assertions(
+            tn,
+            tn.assertions,
+            links_excluded_from_edges
+        ).index
+    ].drop_duplicates()
+    candidates = candidates.merge(stored_edges, how='left', indicator=True)
+    new_edges = candidates.loc[
+        candidates['_merge'] == 'left_only',
+        edge_columns
+    ].copy()
+    new_edges.index = range(
+        _next_sqlite_id(con, 'edges'),
+        _next_sqlite_id(con, 'edges') + len(new_edges)
+    )
+    edges = pd.concat([stored_edges, new_edges])
+
+    # If an edge source node has links of the same type to a null node
+    # and a non-null node, the edge(s) with a null target are dropped,
+    # as in _build_edges
+    target_types = pd.concat([
+        read(
+            'nodes',
+            columns=['node_type_id'],
+            where={'index': stored_edges['tgt_node_id'].unique()}
+        )['node_type_id'],
+        new_nodes['node_type_id']
+    ])
+    null_targets = edges['tgt_node_id'].map(target_types).map(
+        node_types['null_type']
     )
+    null_targets = null_targets.eq(True).to_numpy()
+
+    srclnk = pd.util.hash_pandas_object(
+        edges[['src_node_id', 'link_type_id']],
+        index=False
+    )
+    dropped = null_targets & srclnk.isin(srclnk.loc[~null_targets]).to_numpy()
+    dropped = edges.index[dropped]
+
+    dropped_stored = json.dumps(
+        [int(i) for i in dropped.intersection(stored_edges.index)]
+    )
+    for table_name in ['edge_tags', 'edges']:
+        con.execute(
+            'DELETE FROM {} '
+            'WHERE edge_id IN (SELECT value FROM json_each(?))'
+            .format(table_name),
+            (dropped_stored,)
+        )
+
+    edges = edges.drop(dropped)
+    new_edges = new_edges.drop(dropped.intersection(new_edges.index))
+    new_edges['date_inserted'] = date_inserted
+
+    # Digit tags are the positions of links in listed items, so they're
+    # copied as tags of the edges of their assertions, as in
+    # _build_edge_tags
+    tag_strings = tn.assertion_tags['tag_string_id'].map(tn.strings['string'])
+    digit_tags = tn.assertion_tags.loc[tag_strings.str.isdigit().array]
+    tagged_edges = assertion_edges.loc[digit_tags['assertion_id']]
+    tagged_edges = tagged_edges.merge(
+        edges.rename_axis('edge_id').reset_index(),
+        how='left',
+        on=edge_columns
+    )
+    new_edge_tags = pd.DataFrame({
+        'edge_id': tagged_edges['edge_id'].array,
+        'tag_node_id': digit_tags['tag_string_id'].map(node_map).array
+    })
+    new_edge_tags = new_edge_tags.dropna()
+    new_edge_tags.index = range(
+        _next_sqlite_id(con, 'edge_tags'),
+        _next_sqlite_id(con, 'edge_tags') + len(new_edge_tags)
+    )
+
+    # Provenance records follow the strings they describe
+    new_provenance = tn.provenance.set_axis(
+        tn.provenance.index.map(string_map)
+    )
+    stored_provenance = read(
+        'provenance',
+        columns=[],
+        where={'index': new_provenance.index}
+    )
+    new_provenance = new_provenance.loc[
+        ~new_provenance.index.isin(stored_provenance.index)
+    ]
+
+    for table_name, table in [
+        ('node_types', new_node_types),
+        ('link_types', new_link_types),
+        ('nodes', new_nodes),
+        ('strings', new_strings),
+        ('assertions', new_assertions),
+        ('edges', new_edges),
+        ('assertion_tags', new_assertion_tags),
+        ('edge_tags', new_edge_tags),
+        ('provenance', new_provenance)
+    ]:
+        _insert_sqlite_rows(con, table_name, table)
+
+    con.executemany(
+        'INSERT INTO blobs (handle, compressed, data) VALUES (?, ?, ?)',
+        ((h, *raw) for h, raw in raw_blobs.items())
+    )
+
+
+def textnet_to_sqlite(
+    tn,
+    path,
+    if_exists='fail',
+    links_excluded_from_edges=None
+):
+    '''
+    Store the tables of a completed TextNet in a SQLite database with
+    the schema in resources/schema_script.sql. Every table is written
+    with executemany in a single transaction, so a failed write leaves
+    the database as it was. Foreign key columns are indexed after
+    their rows are inserted.
+
+    Parameters
+    ----------
+    tn : TextNet
+        A TextNet with nodes and edges.
+
+    path : str or path object
+        Path to the database file. It is created if it doesn't exist.
+
+    if_exists : str, default 'fail'
+        What to do if the database already has TextNet tables.
+            'fail': raise ValueError
+            'replace': drop the stored tables and write tn
+            'append': merge the inputs of tn into the stored TextNet
+                as slurp_many merges inputs. Node and link types are
+                matched by value and strings by value and node type,
+                and only rows that aren't stored are inserted with IDs
+                that follow the stored ones. Strings that aren't
+                stored get nodes of their own, so stored rows keep
+                their IDs, except stored edges to null nodes that a
+                new edge makes redundant, which are deleted. If tn has
+                alias assertions, which can merge stored nodes, or
+                keeps literals in a BlobStore while the database
+                doesn't, nodes and edges are built again for the
+                merged assertions and every table is rewritten. The
+                inputs of tn must not already be stored.
+
+    links_excluded_from_edges : list or None, default None
+        Link types of assertions that don't become edges for
+        if_exists='append'. Stored edges aren't changed unless every
+        table is rewritten.
+    '''
+
+    if if_exists not in ['fail', 'replace', 'append']:
+        raise ValueError(
+            'if_exists must be "fail", "replace", or "append"'
+        )
+
+    # Start transactions explicitly so that the table definitions are
+    # part of the transaction that writes the rows
+    con = sqlite3.connect(path, isolation_level=None)
+
+    try:
+
+        con.execute('BEGIN IMMEDIATE')
+
+        if _sqlite_tables_exist(con):
+
+            if if_exists == 'fail':
+                raise ValueError(
+                    'The database at {} already has TextNet tables. Use '
+                    'if_exists="replace" or if_exists="append".'
+                    .format(path)
+                )
+
+            if if_exists == 'append':
+
+                # Appends that keep the stored nodes only insert rows
+                stored = _read_sqlite_textnet(con, lazy=True)
+                if _appends_sqlite_rows(stored, tn):
+                    _append_sqlite_rows(
+                        con,
+                        stored,
+                        tn,
+                        links_excluded_from_edges
+                    )
+                    con.execute('COMMIT')
+                    return
+
+                stored = _read_sqlite_textnet(con)
+
+                new_inputs = tn.strings.loc[
+                    tn.assertions['inp_string_id'].unique(),
+                    'string'
+                ]
+                stored_inputs = stored.strings.loc[
+                    stored.assertions['inp_string_id'].unique(),
+                    'string'
+                ]
+                duplicates = new_inputs.loc[
+                    new_inputs.isin(stored_inputs.array)
+                ]
+                if not duplicates.empty:
+                    raise ValueError(
+                        'These inputs are already stored in the '
+                        'database: {}'.format(list(duplicates))
+                    )
+
+                tn, _ = _union_textnet_assertions([stored, tn])
+                tn = complete_textnet_from_assertions(
+                    tn,
+                    aliases_case_sensitive=True,
+                    current_inp_string_id=None,
+                    link_constraints_string_id=None,
+                    links_excluded_from_edges=links_excluded_from_edges
+                )
+
+            # A BlobStore that reads texts from this database would
+            # lose them when the tables are dropped, so they're copied
+            # within the database first
+            blobs = tn.__dict__.get('blobs')
+            kept_blobs = (blobs is not None) and blobs._reads_database(path)
+            if kept_blobs:
+                con.execute(
+                    'CREATE TEMP TABLE kept_blobs AS '
+                    'SELECT handle, compressed, data FROM blobs'
+                )
+
+            columns, _, _ = _sqlite_schema()
+            for table_name in columns.keys():
+                con.execute('DROP TABLE IF EXISTS {}'.format(table_name))
+
+        else:
+            kept_blobs = False
+
+        _write_sqlite_tables(con, tn, kept_blobs)
+
+        con.execute('COMMIT')
+
+    except BaseException:
+        if con.in_transaction:
+            con.execute('ROLLBACK')
+        raise
+
+    finally:
+        con.close()
+
+
+def textnet_from_sqlite(path, lazy=False):
+    '''
+    Read a TextNet stored with textnet_to_sqlite. Tables get the
+    dtypes of the stored TextNet's big_id_dtype and small_id_dtype.
+    If texts were stored in a BlobStore, the blobs attribute of the
+    TextNet is a store that reads each text from the database when
+    it's requested, so the database must stay in place while they're
+    used.
+
+    Parameters
+    ----------
+    path : str or path object
+        Path to the database file
+
+    lazy : bool, default False
+        If True, no table is read until it's used, so networks bigger
+        than memory can be queried. These TextNet methods read only the
+        rows and columns they need from the database while their
+        tables haven't been read:
+            id_lookup
+            get_assertions_by_link_type_id
+            get_assertions_by_link_type
+            get_assertions_by_string_id (without subset or output_mode)
+            get_strings_by_node_id
+            get_strings_by_node_type
+            resolve_assertions
+        Any other use of a table, including by other methods, reads
+        the whole table into memory and keeps it there. The database
+        must stay in place while the TextNet is used.
+
+    Returns
+    -------
+    TextNet
+    '''
+
+    if not Path(path).exists():
+        raise FileNotFoundError(path)
+
+    con = sqlite3.connect(path)
+
+    try:
+        if not _sqlite_tables_exist(con):
+            raise ValueError(
+                'The database at {} has no TextNet tables'.format(path)
+            )
+        tn = _read_sqlite_textnet(con, lazy=lazy)
+
+    finally:
+        con.close()
+
+    if lazy:
+        tn._sqlite_path = str(path)
+
+    return tn
+
+
+def _replace_file(path, write):
+    '''
+    Write a file next to path and move it into place, so processes
+    that memory-mapped the old file keep reading the old contents.
+    write is called with the temporary path.
+    '''
+    path = Path(path)
+    temporary = path.with_name(path.name + '.tmp')
+    write(temporary)
+    temporary.replace(path)
+
+
+def _is_nullable_integer_dtype(dtype):
+    return (
+        pd.api.types.is_integer_dtype(dtype)
+        and pd.api.types.is_extension_array_dtype(dtype)
+    )
+
+
+def _save_snapshot_column(directory, name, values):
+    '''
+    Write one column or index of a TextNet table. Nullable integers
+    are stored as a .npy file of values and a .npy file of the NA
+    mask, strings as one utf8 text file with a .npy file of character
+    offsets and a mask, and other dtypes as a single .npy file.
+
+    Returns
+    -------
+    str
+        The name of the dtype of values
+    '''
+
+    dtype = values.dtype
+    directory = Path(directory)
+
+    def save_array(suffix, array):
+
+        # np.save adds .npy to paths that don't end with it, so the
+        # temporary file is passed as a file object
+        def write_array(p):
+            with open(p, 'wb') as f:
+                np.save(f, array)
+
+        _replace_file(
+            directory / '{}.{}.npy'.format(name, suffix),
+            write_array
+        )
+
+    if _is_nullable_integer_dtype(dtype):
+        save_array(
+            'values',
+            values.to_numpy(dtype=dtype.numpy_dtype, na_value=0)
+        )
+        save_array('mask', np.asarray(values.isna()))
+
+    elif isinstance(dtype, pd.StringDtype):
+
+        mask = np.asarray(values.isna())
+        strings = np.asarray(values.fillna(''), dtype=object)
+
+        lengths = np.fromiter(
+            map(len, strings),
+            dtype='int64',
+            count=len(strings)
+        )
+        offsets = np.zeros(len(strings) + 1, dtype='int64')
+        np.cumsum(lengths, out=offsets[1:])
+
+        def write_text(p):
+            with open(p, 'w', encoding='utf8', newline='') as f:
+                f.write(''.join(strings))
+
+        _replace_file(directory / '{}.utf8'.format(name), write_text)
+        save_array('offsets', offsets)
+        save_array('mask', mask)
+
+    else:
+        save_array('values', np.asarray(values))
+
+    return str(dtype)
+
+
+def _load_snapshot_column(directory, name, dtype, mmap_mode):
+    '''
+    Read a column or index written by _save_snapshot_column. Integer
+    and boolean columns are backed by the arrays read from disk
+    without copying them.
+    '''
+
+    directory = Path(directory)
+    dtype = pd.api.types.pandas_dtype(dtype)
+
+    def load_array(suffix):
+        return np.load(
+            directory / '{}.{}.npy'.format(name, suffix),
+            mmap_mode=mmap_mode
+        )
+
+    if _is_nullable_integer_dtype(dtype):
+        return dtype.construct_array_type()(
+            load_array('values'),
+            load_array('mask')
+        )
+
+    elif isinstance(dtype, pd.StringDtype):
+
+        with open(
+            directory / '{}.utf8'.format(name),
+            encoding='utf8',
+            newline=''
+        ) as f:
+            text = f.read()
+
+        offsets = load_array('offsets')
+        strings = np.empty(len(offsets) - 1, dtype=object)
+        strings[:] = [
+            text[start:stop]
+            for start, stop in zip(
+                offsets[:-1].tolist(),
+                offsets[1:].tolist()
+            )
+        ]
+        strings[load_array('mask')] = pd.NA
+
+        return pd.arrays.StringArray(strings)
+
+    else:
+        return load_array('values')
+
+
+def save_textnet(tn, directory):
+    '''
+    Write every table of a TextNet to a directory of column files that
+    load_textnet can memory-map. Each table gets a subdirectory with
+    one file per column and one for its index, and metadata.json
+    records the column order and dtypes of every table along with the
+    TextNet's big_id_dtype and small_id_dtype. Files are written next
+    to the files they replace and moved into place, so processes that
+    memory-mapped an earlier snapshot in the same directory keep their
+    data.
+
+    Parameters
+    ----------
+    tn : TextNet
+        A TextNet with nodes and edges
+
+    directory : str or path object
+        Directory for the snapshot. It is created if it doesn't exist.
+    '''
+
+    directory = Path(directory)
+
+    metadata = {
+        'big_id_dtype': str(tn.big_id_dtype),
+        'small_id_dtype': str(tn.small_id_dtype),
+        'tables': {}
+    }
+
+    for table_name in _TEXTNET_TABLES:
+
+        table = tn.__getattr__(table_name)
+        table_directory = directory / table_name
+        table_directory.mkdir(parents=True, exist_ok=True)
+
+        metadata['tables'][table_name] = {
+            'index': _save_snapshot_column(
+                table_directory,
+                'index',
+                table.index.array
+            ),
+            'columns': {
+                c: _save_snapshot_column(table_directory, c, table[c].array)
+                for c in table.columns
+            }
+        }
+
+    # Texts moved to a BlobStore are copied to a directory store in the
+    # snapshot
+    blobs = tn.__dict__.get('blobs')
+    if blobs is not None:
+        bg.BlobStore(directory / 'blobs').update(blobs)
+        metadata['blobs'] = True
+
+    # The metadata is written last so a directory without it was never
+    # completely written
+    def write_metadata(p):
+        with open(p, 'w', encoding='utf8') as f:
+            json.dump(metadata, f, indent=4)
+
+    _replace_file(directory / 'metadata.json', write_metadata)
+
+
+def load_textnet(directory, mmap=True):
+    '''
+    Read a TextNet written by save_textnet.
+
+    Parameters
+    ----------
+    directory : str or path object
+        Directory of the snapshot
+
+    mmap : bool, default True
+        If True, integer and boolean columns are memory-mapped
+        copy-on-write instead of read into memory, so opening a large
+        TextNet takes little time and processes that open the same
+        snapshot share its pages in the OS page cache. Changes to the
+        loaded TextNet are never written to the files. String columns
+        are always read into memory.
+
+    Returns
+    -------
+    TextNet
+    '''
+
+    directory = Path(directory)
+    mmap_mode = 'c' if mmap else None
+
+    with open(directory / 'metadata.json', encoding='utf8') as f:
+        metadata = json.load(f)
+
+    tn = bg.TextNet(
+        big_id_dtype=pd.api.types.pandas_dtype(metadata['big_id_dtype']),
+        small_id_dtype=pd.api.types.pandas_dtype(metadata['small_id_dtype'])
+    )
+
+    for table_name, table_metadata in metadata['tables'].items():
+
+        table_directory = directory / table_name
+
+        # Tables are assigned as they were written instead of having
+        # their dtypes reset, because astype would copy the
+        # memory-mapped columns
+        table = pd.DataFrame(
+            {
+                c: _load_snapshot_column(table_directory, c, dtype, mmap_mode)
+                for c, dtype in table_metadata['columns'].items()
+            },
+            index=pd.Index(_load_snapshot_column(
+                table_directory,
+                'index',
+                table_metadata['index'],
+                mmap_mode
+            )),
+            copy=False
+        )
+        tn.__setattr__(table_name, table)
+
+    # Stored texts are read from the snapshot when they're requested
+    if metadata.get('blobs', False):
+        tn.blobs = bg.BlobStore(directory / 'blobs')
 
     return tn
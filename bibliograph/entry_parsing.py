@@ -1,190 +1,777 @@
 import bibliograph as bg
+import hashlib
+import json
+import numpy as np
 import pandas as pd
+import re
+import sqlite3
+import time
+from pathlib import Path
 
 
-def _item_prefix_splitter(item_grp, prefixed_items):
+# Bump this when the tokenizer output changes so entries cached by an
+# older version of the parser are never reused
+ENTRY_CACHE_VERSION = 2
+
+# Maximum number of entry keys in a single SQL statement. Older
+# versions of SQLite allow at most 999 parameters per statement.
+_CACHE_BATCH_SIZE = 900
+
+# Cached entries read again within this many nanoseconds of their last
+# recorded use aren't marked as used again, so reading from a warm
+# cache doesn't write to it
+_CACHE_TOUCH_INTERVAL = 3600*10**9
+
+
+def split_item_prefixes(items, prefixed_items):
     '''
-    Dear Future Me: This function was refactored to ignore an
-    argument "expected_prefixes" that was previously passed in.
-    If you run into trouble you might have to revisit that.
+    Split item prefixes off of stacked items whose item labels have
+    prefixes in the entry syntax. Items without one of the expected
+    prefixes for their label get the default (first) prefix.
+
+    Every (item label, prefix, separator) combination in the syntax is
+    compiled into a single regular expression that is matched against
+    the stacked items keyed by their labels, so prefixes are assigned
+    with one extract over the data rather than once per item label.
+
+    Parameters
+    ----------
+    items : pandas.Series
+        String-valued items. The last level of the index must be the
+        item label for each item.
+
+    prefixed_items : pandas.DataFrame
+        Rows of a validated entry syntax with non-null values in the
+        'item_prefix_separator' and 'item_prefixes' columns.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Has the same index as items. Column 0 is the prefix for each
+        item and column 1 is the rest of the item string.
     '''
+    prefixed_items = prefixed_items.set_index('item_label')
+    separators = prefixed_items['item_prefix_separator']
+    expected_prefixes = prefixed_items['item_prefixes'].str.split()
+
+    # One alternative in the regular expression for each item label.
+    # Labels are joined to items with an ASCII unit separator, which
+    # can't appear in a label, so each alternative can only match items
+    # with its own label. The lookahead checks for an expected prefix
+    # and the lazy group captures everything up to the first separator.
+    alternatives = []
+    for label, prefixes in expected_prefixes.items():
+
+        prefixes = [bg.util.escape_regex_metachars(p) for p in prefixes]
+        separator = bg.util.escape_regex_metachars(separators[label])
+
+        alternatives.append('{}\x1f(?=(?:{}){})(.*?){}'.format(
+            bg.util.escape_regex_metachars(label),
+            '|'.join(prefixes),
+            separator,
+            separator
+        ))
 
-    # get the labels for the item corresponding to the current
-    item_syntax = prefixed_items.query('item_label == @item_grp.name')
-    item_pfx_separator = bg.util.get_single_value(
-        item_syntax,
-        'item_prefix_separator'
-    )
+    prefixes_regex = '^(?:{})(.*)'.format('|'.join(alternatives))
 
-    # Get the default prefix and the set of possible prefixes
-    # for this item from the entry syntax
-    expected_prefixes = bg.util.get_single_value(
-        item_syntax,
-        'item_prefixes'
+    labels = pd.Series(
+        items.index.get_level_values(-1).astype(str),
+        index=items.index
     )
-    expected_prefixes = expected_prefixes.split()
-    default_pfix = expected_prefixes[0]
-
-    # add the item prefix separator onto the prefixes
-    expected_prefixes = [
-        p + item_pfx_separator for p in expected_prefixes
-    ]
-    default_pfix = default_pfix + item_pfx_separator
-
-    # escape any regex metacharacters in the expected prefixes
-    expected_prefixes = [
-        bg.util.escape_regex_metachars(p) for p in expected_prefixes
-    ]
-
-    # make a regular expression that will match any of the
-    # possible prefixes for this item
-    prefixes_regex = '|'.join([f'^{p}' for p in expected_prefixes])
-    has_no_pfix = ~item_grp.str.contains(prefixes_regex)
-
-    # Add the default prefix onto unprefixed instances of this
-    # item. Copy the group first so we don't mutate a grouped
-    # object during iteration.
-    pfixed = item_grp.copy()
-    pfixed.loc[has_no_pfix] = pfixed.loc[has_no_pfix] \
-                                    .apply(lambda x: default_pfix + x)
-
-    # Split the group on the prefix separator and expand into a
-    # dataframe, then return the dataframe
-    return pfixed.str.split(item_pfx_separator, n=1, expand=True)
-
-
-def _expand_grouped_entries(
-    entry_grp,
-    entry_syntax,
-    item_separator,
-    item_separator_regex,
-    escaped_sep_regex,
-    na_string_values,
-    default_entry_prefix
-):
+
+    split = labels.str.cat(items.astype(object), sep='\x1f')
+    split = split.str.extract(prefixes_regex, flags=re.DOTALL)
+
+    # Only one of the prefix columns can have a value in each row
+    prefix = split.iloc[:, :-1].bfill(axis='columns').iloc[:, 0]
+
+    # Items without an expected prefix get the default prefix and keep
+    # their whole string value
+    prefix = prefix.fillna(labels.map(expected_prefixes.str[0]))
+    rest = split.iloc[:, -1].fillna(items.astype(object))
+
+    split = pd.DataFrame({0: prefix, 1: rest}, index=items.index)
+
+    return split.astype(items.dtype)
+
+
+class _EntryTokenizer:
     '''
-    Takes a pandas.Series of stacked strings representing shorthand
-    entries and expands them into their component items according to
-    rules defined by the entry syntax.
+    Splits entries with one entry prefix into their component items.
 
-    Helper function for parse_entries.
+    Helper class for CompiledEntrySyntax. Everything that depends on the
+    entry syntax is computed when the tokenizer is created, so splitting
+    an entry is a single pass over the entry string.
 
     Parameters
     ----------
-    entry_grp : pandas.Series
-        A group of entries generated by pandas.Series.groupby. This
-        series has a multiindex generated by pandas.DataFrame.stack
-
-    entry_syntax : pandas.DataFrame
-        A dataframe containing item node types and item labels for each
-        type of entry.
+    item_syntax : pandas.DataFrame
+        Rows of a validated entry syntax that have the same entry
+        prefix.
 
     item_separator : str
         A string separating items within an entry string.
 
-    na_string_values : list-like
-        Items within an entry whose values are in na_string_values will be
-        replaced with pandas.NA
+    item_separator_regex : re.Pattern
+        Matches bare item separators.
 
-    Returns
-    -------
-    pandas.DataFrame
-        A DataFrame the same length as the input with columns defined
-        by the item_label column in entry_syntax.
+    escaped_sep_regex : re.Pattern
+        Matches escaped item separators.
     '''
-    # Strip any trailing separators from each entry. This operation
-    # creates a copy of the input group, so we're free to mutate the
-    # copy
-    expanded = entry_grp.str.rstrip(item_separator)
-
-    if not pd.isna(entry_grp.name):
-        grp_prefix = entry_grp.name
-        slice_start = len(grp_prefix + item_separator)
-        expanded = expanded.str.slice(start=slice_start)
-    else:
-        grp_prefix = default_entry_prefix
 
-    # split on bare item separators and expand into a dataframe
-    expanded = expanded.str.split(pat=item_separator_regex, expand=True)
+    def __init__(
+        self,
+        item_syntax,
+        item_separator,
+        item_separator_regex,
+        escaped_sep_regex
+    ):
+
+        self.item_separator = item_separator
+        self.item_separator_regex = item_separator_regex
+        self.escaped_sep_regex = escaped_sep_regex
+
+        item_labels = item_syntax['item_label']
+        numbered_labels = item_labels.loc[item_labels.str.isdigit()]
+
+        # Entries can omit trailing items, so every entry is padded out
+        # to the number of numbered items in the syntax. Otherwise,
+        # whether an omitted item is stored as a null value would
+        # depend on which other entries are parsed at the same time.
+        if numbered_labels.empty:
+            self.num_items = 0
+        else:
+            self.num_items = numbered_labels.astype(int).max() + 1
+
+        # items with no node type in the entry syntax are prefixed to
+        # indicate which node type they correspond to. Map the labels of
+        # prefixed items to their prefix separator, default prefix, and
+        # a regular expression matching any of their prefixes.
+        prefixed_items = item_syntax.loc[item_syntax['item_node_type'].isna()]
+        self.prefixed_items = {}
+
+        for _, item in prefixed_items.iterrows():
+
+            item_pfx_separator = item['item_prefix_separator']
+            expected_prefixes = [
+                p + item_pfx_separator for p in item['item_prefixes'].split()
+            ]
+            prefixes_regex = '|'.join([
+                '^' + bg.util.escape_regex_metachars(p)
+                for p in expected_prefixes
+            ])
+
+            self.prefixed_items[item['item_label']] = (
+                item_pfx_separator,
+                expected_prefixes[0],
+                re.compile(prefixes_regex)
+            )
+
+        # If there are prefixed items then only numbered items in the
+        # syntax are kept, otherwise every item in the entry is kept
+        if self.prefixed_items:
+            self.unprefixed_item_labels = [
+                label for label in numbered_labels
+                if label not in self.prefixed_items
+            ]
+        else:
+            self.unprefixed_item_labels = None
+
+    def __call__(self, entry, prefix_length, na_string_value):
+        '''
+        Split a single entry string into a dictionary whose keys are
+        item labels and whose values are item strings.
+        '''
+
+        # Strip any trailing separators and the entry prefix, then split
+        # on bare item separators
+        entry = entry.rstrip(self.item_separator)[prefix_length:]
+        items = self.item_separator_regex.split(entry)
+
+        if items[0] == '':
+            # entries beginning with an item separator have
+            # self-descriptive syntax
+            raise NotImplementedError(
+                'self-descriptive syntax is not yet implemented.'
+            )
+
+        items += [None]*(self.num_items - len(items))
+
+        # replace escaped item separators with the bare value, and
+        # replace missing items with the first string in
+        # na_string_values
+        items = {
+            str(label): (
+                self.escaped_sep_regex.sub(self.item_separator, item)
+                if item else na_string_value
+            )
+            for label, item in enumerate(items)
+        }
+
+        if self.unprefixed_item_labels is None:
+            return items
+
+        expanded = {
+            label: items[label] for label in self.unprefixed_item_labels
+            if label in items
+        }
+
+        # Split the prefixes off of prefixed items, adding the default
+        # prefix to items that don't have one, and store the items
+        # under their prefixes
+        for label, prefix_data in self.prefixed_items.items():
+
+            item_pfx_separator, default_pfix, prefixes_regex = prefix_data
+            item = items[label]
+
+            if prefixes_regex.search(item) is None:
+                item = default_pfix + item
+
+            item_prefix, item = item.split(item_pfx_separator, 1)
+
+            if item_prefix in expanded:
+                raise ValueError(
+                    'Found multiple items with prefix "{}" in entry {}'
+                    .format(item_prefix, entry)
+                )
+
+            expanded[item_prefix] = item
+
+        return expanded
+
+
+class EntryParseCache:
+    '''
+    An on-disk cache of expanded shorthand entries.
+
+    Entries are stored in a SQLite database in a local directory, keyed
+    by the entry string and a hash of the fingerprint of the compiled
+    entry syntax and the other values that change how an entry is
+    split into items. Items are stored after space placeholders are
+    replaced, so inputs that are parsed repeatedly with few changes
+    only tokenize and replace spaces in new or changed entries.
+
+    When the cached items take up more than max_bytes, the least
+    recently used entries are evicted. Entries are marked as used at
+    most once an hour, so eviction order is only that precise.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        Directory containing the cache database. Created if it doesn't
+        exist.
+
+    max_bytes : int, default 2**30
+        Approximate maximum size of the cached items in bytes.
+
+    Attributes
+    ----------
+    hits : int
+        Number of entries found in the cache.
 
-    if (expanded[0] == '').any():
-        # entries beginning with an item separator have self-descriptive
-        # syntax
-        raise NotImplementedError(
-            'self-descriptive syntax is not yet implemented.'
+    misses : int
+        Number of entries that were not in the cache.
+
+    evictions : int
+        Number of entries removed from the cache to keep it under
+        max_bytes.
+
+    Notes
+    -----
+    Counters are kept per process. When shorthand is parsed with
+    worker processes, each worker updates its own copy of the counters
+    but they share the database.
+    '''
+
+    def __init__(self, directory, max_bytes=2**30):
+
+        max_bytes = int(max_bytes)
+        if max_bytes < 1:
+            raise ValueError('max_bytes must be a positive integer')
+
+        self.path = Path(directory) / 'entry_cache.sqlite'
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._connection = None
+
+    def __repr__(self):
+        return 'EntryParseCache({!r}, max_bytes={})'.format(
+            str(self.path.parent),
+            self.max_bytes
         )
 
-    else:
-        # replace escaped item separators with the bare value
-        expanded = expanded.replace(
-            to_replace=escaped_sep_regex,
-            value=item_separator,
-            regex=True
+    def __getstate__(self):
+        # Connections can't be pickled, so worker processes open their
+        # own connection the first time they use the cache
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        return state
+
+    def _connect(self):
+
+        if self._connection is None:
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            connection = sqlite3.connect(str(self.path), timeout=60)
+            connection.execute('PRAGMA journal_mode=WAL')
+
+            # Earlier versions keyed entries by a hash of each entry
+            # string in a table that is never read now
+            connection.execute('DROP TABLE IF EXISTS entries')
+
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS entry_items ('
+                'context BLOB NOT NULL, '
+                'entry TEXT NOT NULL, '
+                'items TEXT NOT NULL, '
+                'size INTEGER NOT NULL, '
+                'last_used INTEGER NOT NULL, '
+                'PRIMARY KEY (context, entry))'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS entry_items_last_used '
+                'ON entry_items (last_used)'
+            )
+            connection.commit()
+
+            self._connection = connection
+
+        return self._connection
+
+    def _get_many(self, context, entries):
+        '''
+        Get a dictionary mapping entry strings to cached items for
+        every entry in entries that's cached with context. Entries whose
+        last recorded use is older than _CACHE_TOUCH_INTERVAL are marked
+        as recently used.
+        '''
+        connection = self._connect()
+        found = {}
+        now = time.time_ns()
+        stale = []
+
+        for i in range(0, len(entries), _CACHE_BATCH_SIZE):
+
+            batch = entries[i:i + _CACHE_BATCH_SIZE]
+
+            rows = connection.execute(
+                'SELECT entry, items, last_used FROM entry_items '
+                'WHERE context = ? AND entry IN ({})'.format(
+                    ','.join('?'*len(batch))
+                ),
+                [context] + batch
+            )
+
+            for entry, items, last_used in rows:
+                found[entry] = items
+                if now - last_used > _CACHE_TOUCH_INTERVAL:
+                    stale.append(entry)
+
+        for i in range(0, len(stale), _CACHE_BATCH_SIZE):
+
+            batch = stale[i:i + _CACHE_BATCH_SIZE]
+
+            connection.execute(
+                'UPDATE entry_items SET last_used = ? '
+                'WHERE context = ? AND entry IN ({})'.format(
+                    ','.join('?'*len(batch))
+                ),
+                [now, context] + batch
+            )
+
+        if stale:
+            connection.commit()
+
+        return found
+
+    def _put_many(self, context, rows):
+        '''
+        Store (entry, items) pairs in the cache with context, then evict
+        the least recently used entries if the cache is larger than
+        max_bytes.
+        '''
+        connection = self._connect()
+        now = time.time_ns()
+
+        connection.executemany(
+            'INSERT OR REPLACE INTO entry_items '
+            '(context, entry, items, size, last_used) '
+            'VALUES (?, ?, ?, ?, ?)',
+            [
+                (context, entry, items, len(entry) + len(items), now)
+                for entry, items in rows
+            ]
         )
 
-    # Replace NA values and empty strings with the first string in
-    # na_string_values
-    expanded = expanded.fillna(na_string_values[0])
-    expanded = expanded.replace('', na_string_values[0])
+        total_size = connection.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM entry_items'
+        ).fetchone()[0]
+
+        if total_size > self.max_bytes:
+
+            # Keep the most recently used entries whose cumulative size
+            # fits in max_bytes
+            evicted = connection.execute(
+                'DELETE FROM entry_items WHERE rowid IN ('
+                'SELECT rowid FROM ('
+                'SELECT rowid, SUM(size) OVER ('
+                'ORDER BY last_used DESC, rowid DESC'
+                ') AS cumulative_size FROM entry_items'
+                ') WHERE cumulative_size > ?)',
+                (self.max_bytes,)
+            )
+            self.evictions += evicted.rowcount
+
+        connection.commit()
+
+    def expand(self, entries, tokenizer, context):
+        '''
+        Split entries into items with tokenizer, using cached items for
+        entries that have already been split with the same context.
+
+        Parameters
+        ----------
+        entries : sequence of str
+            Entry strings.
+
+        tokenizer : callable
+            Takes an entry string and returns a dictionary whose keys
+            are item labels and whose values are item strings.
+
+        context : str
+            Identifies everything other than the entry string that
+            changes the output of tokenizer.
+
+        Returns
+        -------
+        list of dict
+            The output of tokenizer for each entry.
+        '''
+        context = hashlib.sha256(context.encode('utf8')).digest()
+
+        # Only look up each distinct entry once
+        distinct = list(dict.fromkeys(entries))
+        found = self._get_many(context, distinct)
+
+        # Decode every cached entry with a single call
+        items = dict(zip(
+            found.keys(),
+            json.loads('[{}]'.format(','.join(found.values())))
+        ))
+
+        new_rows = []
+
+        for entry in distinct:
+            if entry not in items:
+                items[entry] = tokenizer(entry)
+                new_rows.append((entry, json.dumps(items[entry])))
+
+        self.misses += len(new_rows)
+        self.hits += len(entries) - len(new_rows)
+
+        if new_rows:
+            self._put_many(context, new_rows)
+
+        return [items[entry] for entry in entries]
+
+    def stats(self):
+        '''
+        Get the hit, miss, and eviction counters along with the number
+        of entries and total size of the cached items in bytes.
+        '''
+        num_entries, size = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entry_items'
+        ).fetchone()
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': num_entries,
+            'bytes': size
+        }
+
+    def clear(self):
+        '''
+        Remove every entry from the cache and reset the counters.
+        '''
+        connection = self._connect()
+        connection.execute('DELETE FROM entry_items')
+        connection.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def close(self):
+        '''
+        Close the connection to the cache database. The connection is
+        opened again if the cache is used after it's closed.
+        '''
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class CompiledEntrySyntax:
+    '''
+    A validated entry syntax compiled into one tokenizer per entry
+    prefix.
 
-    # column values were integers after str.split(pat, expand=True)
-    # above but they need to be strings because string-valued item
-    # labels are allowed
-    expanded.columns = [str(c) for c in expanded.columns]
+    Regular expressions and item metadata are built once when the
+    object is created, so the time it takes to expand an entry doesn't
+    depend on the number of rows or entry prefixes in the syntax.
 
-    # group prefixes are required to sort out entry links later, so
-    # add an index level for the group prefix
-    expanded['grp_prefix'] = [grp_prefix]*len(expanded)
-    expanded = expanded.set_index('grp_prefix', append=True)
+    Parameters
+    ----------
+    entry_syntax : pandas.DataFrame
+        A validated entry syntax generated by
+        bg.syntax_parsing.validate_entry_syntax
+
+    item_separator : str
+        A string separating items within an entry string.
+    '''
 
-    # get item labels and node types for this entry prefix
-    item_labels = entry_syntax.query('entry_prefix == @grp_prefix')
+    def __init__(self, entry_syntax, item_separator):
+
+        self.entry_syntax = entry_syntax
+        self.item_separator = item_separator
+
+        # Identifies the syntax and item separator in the keys of
+        # entries stored in an EntryParseCache
+        self.fingerprint = hashlib.sha256(
+            '{}\x1f{}\x1f{}'.format(
+                ENTRY_CACHE_VERSION,
+                item_separator,
+                entry_syntax.to_csv(index=False)
+            ).encode('utf8')
+        ).hexdigest()
+
+        # escape any regex metacharacters in the item separator so we
+        # can use it in regular expressions
+        self.regex_item_separator = bg.util.escape_regex_metachars(
+            item_separator
+        )
+        bracketed_separator = ']['.join(self.regex_item_separator)
 
-    # items with no node type in the entry syntax are prefixed to
-    # indicate which node type they correspond to
-    item_is_prefixed = item_labels['item_node_type'].isna()
+        # Tags are separated from entries by an item separator followed
+        # by a space.
+        self.tag_sep_regex = r"(?<!\\)[{}][ ]".format(bracketed_separator)
 
-    if item_is_prefixed.any():
+        # Match entry prefixes (null if no prefix)
+        prefixes = [
+            bg.util.escape_regex_metachars(p) for p in
+            entry_syntax['entry_prefix'].dropna().drop_duplicates()
+        ]
+        prefixes = prefixes + [self.regex_item_separator]
+        self.prefixes_regex = '^({})(?={})'.format(
+            '|'.join(prefixes),
+            self.regex_item_separator
+        )
 
-        prefixed_items = item_labels.loc[item_is_prefixed]
-        labels_of_prefixed_items = prefixed_items['item_label'].array
+        # regular expressions to match bare and escaped item separators
+        item_separator_regex = re.compile(
+            r"(?<!\\)[{}]".format(bracketed_separator)
+        )
+        escaped_sep_regex = re.compile(
+            fr"(\\{self.regex_item_separator})"
+        )
 
-        # stack the prefixed items into a series
-        disagged = expanded[labels_of_prefixed_items].stack()
+        self.tokenizers = {
+            entry_prefix: _EntryTokenizer(
+                item_syntax,
+                item_separator,
+                item_separator_regex,
+                escaped_sep_regex
+            )
+            for entry_prefix, item_syntax
+            in entry_syntax.groupby('entry_prefix', sort=False)
+        }
+
+        # Entries whose prefixes aren't in the syntax (self-descriptive
+        # entries) are split without reference to the syntax
+        self.unknown_prefix_tokenizer = _EntryTokenizer(
+            entry_syntax.iloc[0:0],
+            item_separator,
+            item_separator_regex,
+            escaped_sep_regex
+        )
 
-        # Split the prefixes off of the stacked items and expand into a
-        # dataframe
-        disagged = disagged.groupby(level=3, group_keys=False).apply(
-            _item_prefix_splitter,
-            prefixed_items
+        # Create a map from entry prefixes and item labels to item node
+        # types and item link types
+        item_label_idx = pd.MultiIndex.from_arrays(
+            (entry_syntax['entry_prefix'], entry_syntax['item_label'])
+        )
+        self.item_types = pd.DataFrame(
+            {'node_type': entry_syntax['item_node_type'].array,
+             'link_type': entry_syntax['item_link_type'].array},
+            index=item_label_idx
         )
 
-        # drop the item labels from the multiindex so the disaggregated
-        # items align with the index of the entry group
-        disagged.index = disagged.index.droplevel(3)
-
-        # pivot the disaggregated items to create a dataframe with
-        # columns for each item prefix
-        disagged = disagged.pivot(columns=0)
-        disagged.columns = disagged.columns.get_level_values(1)
-
-        # get labels of items that are not prefixed and present in this
-        # dataset
-        unprefixed_item_labels = [
-            label for label in item_labels['item_label']
-            if label.isdigit()
-            and label in expanded.columns
-            and label not in labels_of_prefixed_items
+        # Make a map between entry prefixes and node types
+        node_type_map = entry_syntax.loc[
+            :,
+            ['entry_prefix', 'entry_node_type']
         ]
+        node_type_map = node_type_map.drop_duplicates()
+        self.node_type_map = pd.Series(
+            node_type_map['entry_node_type'].array,
+            index=node_type_map['entry_prefix'].array
+        )
 
-        # select only the unprefixed item labels
-        expanded = expanded[unprefixed_item_labels]
-        # concatenate the unprefixed and prefixed items and return
-        return pd.concat([expanded, disagged], axis='columns')
+    def diff(self, other):
+        '''
+        Find the items whose definitions differ between this entry
+        syntax and another one. Entries whose prefixes have no changed
+        items are parsed the same way by both syntaxes.
+
+        Parameters
+        ----------
+        other : CompiledEntrySyntax
+            The syntax to compare with this one.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per changed item with columns entry_prefix,
+            item_label, and change. change is 'added' for items only in
+            other, 'removed' for items only in this syntax, and
+            'changed' for items defined differently by each syntax.
+        '''
+        columns = list(self.entry_syntax.columns)
+        key = ['entry_prefix', 'item_label']
+
+        # Items defined identically in both syntaxes merge as 'both'
+        merged = self.entry_syntax.merge(
+            other.entry_syntax[columns],
+            how='outer',
+            on=columns,
+            indicator=True
+        )
+        merged = merged.loc[merged['_merge'] != 'both', key + ['_merge']]
 
-    else:
-        # there were no prefixed items, so return the expanded items
-        return expanded
+        in_both = merged.duplicated(subset=key, keep=False)
+        change = merged['_merge'].map({
+            'left_only': 'removed',
+            'right_only': 'added'
+        }).astype(object)
+        change.loc[in_both] = 'changed'
+
+        diff = merged[key].assign(change=change.array)
+        diff = diff.drop_duplicates(subset=key)
+
+        return diff.reset_index(drop=True).astype(pd.StringDtype())
+
+    def expand(
+        self,
+        entry_grp,
+        default_entry_prefix,
+        na_string_values,
+        space_char,
+        entry_cache=None
+    ):
+        '''
+        Takes a pandas.Series of stacked strings representing shorthand
+        entries with the same prefix and expands them into their
+        component items. Space placeholders in the items are replaced
+        with spaces, and escaped placeholders with bare ones.
+
+        Parameters
+        ----------
+        entry_grp : pandas.Series
+            A group of entries generated by pandas.Series.groupby. This
+            series has a multiindex generated by pandas.DataFrame.stack
+
+        default_entry_prefix : str
+            Entries with no prefix will be interpreted as having the
+            default prefix.
+
+        na_string_values : list-like
+            Missing items are replaced with the first string in
+            na_string_values
+
+        space_char : str
+            A string value that should be replaced with a single space
+            unless escaped with a backslash.
+
+        entry_cache : EntryParseCache or None, default None
+            If not None, only entries that aren't in the cache are
+            split into items.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A DataFrame the same length as the input with columns
+            defined by the item_label column in entry_syntax and an
+            additional index level for the entry prefix.
+        '''
+
+        if pd.isna(entry_grp.name):
+            grp_prefix = default_entry_prefix
+            prefix_length = 0
+        else:
+            grp_prefix = entry_grp.name
+            prefix_length = len(grp_prefix + self.item_separator)
+
+        tokenizer = self.tokenizers.get(
+            grp_prefix,
+            self.unknown_prefix_tokenizer
+        )
+
+        # Regular expressions to match bare and escaped space
+        # placeholders
+        regex_space_char = bg.util.escape_regex_metachars(space_char)
+        space_plchldr_regex = re.compile(
+            r"(?<!\\)({})".format(regex_space_char)
+        )
+        escaped_space_plchldr_regex = re.compile(
+            fr"(\\{regex_space_char})"
+        )
+
+        def split_entry(entry):
+
+            items = tokenizer(entry, prefix_length, na_string_values[0])
+
+            # Replace space placeholders with spaces, then escaped
+            # placeholders with bare placeholders. Both contain the
+            # placeholder, so most items are returned untouched.
+            for label, item in items.items():
+                if space_char in item:
+                    item = space_plchldr_regex.sub(' ', item)
+                    items[label] = escaped_space_plchldr_regex.sub(
+                        regex_space_char,
+                        item
+                    )
+
+            return items
+
+        if entry_cache is None:
+            expanded = [split_entry(entry) for entry in entry_grp.array]
+
+        else:
+            context = '\x1f'.join([
+                self.fingerprint,
+                grp_prefix,
+                str(prefix_length),
+                na_string_values[0],
+                space_char
+            ])
+            expanded = entry_cache.expand(
+                entry_grp.array,
+                split_entry,
+                context
+            )
+
+        expanded = pd.DataFrame(expanded, index=entry_grp.index)
+
+        # group prefixes are required to sort out entry links later, so
+        # add an index level for the group prefix
+        expanded['grp_prefix'] = [grp_prefix]*len(expanded)
+
+        return expanded.set_index('grp_prefix', append=True)
 
 
 def parse_entries(
@@ -194,7 +781,8 @@ def parse_entries(
     default_entry_prefix,
     space_char,
     na_string_values,
-    s_d_delimiter
+    s_d_delimiter,
+    entry_cache=None
 ):
     '''
     Take a stacked pandas.Series of shorthand entry strings and expands
@@ -215,9 +803,9 @@ def parse_entries(
         multiindex with the row and column index of each entry in a csv
         file.
 
-    entry_syntax : pandas.DataFrame
+    entry_syntax : pandas.DataFrame or CompiledEntrySyntax
         A dataframe containing item node types and item labels for each
-        type of entry.
+        type of entry, or the same syntax compiled for item_separator.
 
     item_separator : str
         A string separating items within an entry string.
@@ -238,6 +826,10 @@ def parse_entries(
         A string-valued delimiter separating elements in a
         self-descriptive shorthand entry
 
+    entry_cache : EntryParseCache or None, default None
+        An on-disk cache of expanded entries. If not None, only entries
+        that aren't in the cache are split into items.
+
     Returns
     -------
     pandas.DataFrame
@@ -247,15 +839,26 @@ def parse_entries(
     if entries.empty:
         raise ValueError('entries cannot be empty')
 
-    # escape any regex metacharacters in the item separator so we can
-    # use it in regular expressions
-    regex_item_separator = bg.util.escape_regex_metachars(item_separator)
+    # Compile the entry syntax unless we were given a compiled syntax
+    # for this item separator
+    if (
+        isinstance(entry_syntax, CompiledEntrySyntax)
+        and entry_syntax.item_separator == item_separator
+    ):
+        compiled_syntax = entry_syntax
+    else:
+        if isinstance(entry_syntax, CompiledEntrySyntax):
+            entry_syntax = entry_syntax.entry_syntax
+        compiled_syntax = CompiledEntrySyntax(entry_syntax, item_separator)
 
-    # Use a regular expression to split tags off the input strings. Tags
-    # are separated from entries by an item separator followed by a
-    # space.
-    tag_sep_regex = r"(?<!\\)[{}][ ]".format(']['.join(regex_item_separator))
-    entries = entries.str.split(pat=tag_sep_regex, expand=True)
+    entry_syntax = compiled_syntax.entry_syntax
+    regex_item_separator = compiled_syntax.regex_item_separator
+
+    # Use a regular expression to split tags off the input strings.
+    entries = entries.str.split(
+        pat=compiled_syntax.tag_sep_regex,
+        expand=True
+    )
 
     if len(entries.columns) == 1:
         entries = entries.rename(columns={0: 'string'})
@@ -265,24 +868,10 @@ def parse_entries(
 
     # Use a regular expression to get entry prefixes
     # (null if no prefix)
-    prefixes = [
-        bg.util.escape_regex_metachars(p) for p in
-        entry_syntax['entry_prefix'].dropna().drop_duplicates()
-    ]
-    prefixes = prefixes + [regex_item_separator]
-    prefixes_regex = '|'.join(prefixes)
-    prefixes_regex = '^({})(?={})'.format(prefixes_regex, regex_item_separator)
-
-    entries['entry_prefix'] = entries['string'].str.extract(prefixes_regex)
-
-    # regular expressions to match bare and escaped item separators
-    item_separator_regex = r"(?<!\\)[{}]".format(
-        ']['.join(regex_item_separator)
+    entries['entry_prefix'] = entries['string'].str.extract(
+        compiled_syntax.prefixes_regex
     )
-    escaped_sep_regex = fr"(\\{regex_item_separator})"
 
-    # no_prefix = entries['entry_prefix'].isna()
-    # entries.loc[no_prefix, 'entry_prefix'] = default_entry_prefix
     # Group entries by prefix and expand them
     expanded = entries['string'].groupby(
         by=entries['entry_prefix'],
@@ -290,38 +879,20 @@ def parse_entries(
         group_keys=False
     )
     expanded = expanded.apply(
-        _expand_grouped_entries,
-        entry_syntax,
-        item_separator,
-        item_separator_regex,
-        escaped_sep_regex,
+        compiled_syntax.expand,
+        default_entry_prefix,
         na_string_values,
-        default_entry_prefix
+        space_char,
+        entry_cache
     )
 
     # expanded has a multiindex whose levels correspond to csv rows,
     # csv columns, and entry prefixes
 
-    # Replace any empty strings with null values
+    # Replace any empty strings with null values. Space placeholders
+    # were replaced when the entries were expanded.
     expanded = expanded.mask(expanded == '', pd.NA)
 
-    # Regular expressions to match bare and escaped space placeholders
-    regex_space_char = bg.util.escape_regex_metachars(space_char)
-    space_plchldr_regex = r"(?<!\\)({})".format(regex_space_char)
-    escaped_space_plchldr_regex = fr"(\\{regex_space_char})"
-
-    # Replace space placeholders with spaces in the expanded items
-    expanded = expanded.replace(
-        to_replace=space_plchldr_regex,
-        value=' ',
-        regex=True
-    )
-    # Replace escaped space placeholders with bare placeholders
-    expanded = expanded.replace(
-        to_replace=escaped_space_plchldr_regex,
-        value=regex_space_char,
-        regex=True
-    )
     # Stack the expanded items. Stacking creates a series whose values
     # are the string values of every item in the input entries and
     # whose index levels are
@@ -450,16 +1021,9 @@ def parse_entries(
     # columns
     # expanded = pd.DataFrame(expanded, columns=['string'])
 
-    # Create a map from entry prefixes and item labels to item node
-    # types and item link types
-    item_label_idx = pd.MultiIndex.from_arrays(
-        (entry_syntax['entry_prefix'], entry_syntax['item_label'])
-    )
-    item_types = pd.DataFrame(
-        {'node_type': entry_syntax['item_node_type'].array,
-         'link_type': entry_syntax['item_link_type'].array},
-        index=item_label_idx
-    )
+    # Get the map from entry prefixes and item labels to item node types
+    # and item link types
+    item_types = compiled_syntax.item_types
 
     # Add self-descriptive item types if they exist
     if s_d_items_exist:
@@ -482,14 +1046,9 @@ def parse_entries(
     entries.loc[where_tags, 'string'] = entries.loc[where_tags, 'string'] \
         + item_separator + ' ' + entries.loc[where_tags, 'node_tags']
 
-    # Make a map between entry prefixes and node types
-    node_type_map = entry_syntax.loc[:, ['entry_prefix', 'entry_node_type']]
-    node_type_map = node_type_map.drop_duplicates()
-    node_type_map = pd.Series(
-        node_type_map['entry_node_type'].array,
-        index=node_type_map['entry_prefix'].array
-    )
-    # Add a row in the node type map for entries with no prefix
+    # Copy the map between entry prefixes and node types and add a row
+    # for entries with no prefix
+    node_type_map = compiled_syntax.node_type_map.copy()
     default_entry_type = bg.util.get_single_value(
         entry_syntax.query('entry_prefix == @default_entry_prefix'),
         'entry_node_type'
@@ -532,24 +1091,121 @@ def parse_entries(
     return entries
 
 
-def _expand_csv_items(group, delimiters):
+def get_delimiter_table(
+    entry_syntax,
+    entry_prefix_id_map,
+    item_label_id_map,
+    dtype
+):
     '''
-    THIS FUNCTION MUTATES ITS FIRST ARGUMENT
+    Make a table of list delimiters for items in the entry syntax whose
+    entry prefixes and item labels are in the given ID maps.
+
+    Parameters
+    ----------
+    entry_syntax : pandas.DataFrame
+        A validated entry syntax
+
+    entry_prefix_id_map : pandas.Series or None
+        Map from string-valued entry prefixes to integer IDs. If None,
+        the table only has item label IDs.
 
-    Takes item strings grouped by item label and splits the strings if
-    given a list delimiter for the group.
+    item_label_id_map : pandas.Series
+        Map from string-valued item labels to integer IDs
+
+    dtype : type
+        dtype for the integer ID columns
+
+    Returns
+    -------
+    pandas.DataFrame
+        Has columns ['entry_prefix_id', 'item_label_id',
+        'list_delimiter'] or ['item_label_id', 'list_delimiter']
     '''
+    delimiters = entry_syntax.loc[entry_syntax['list_delimiter'].notna()]
 
-    item_label_id = group.name
+    table = {}
+    if entry_prefix_id_map is not None:
+        table['entry_prefix_id'] = delimiters['entry_prefix'].map(
+            entry_prefix_id_map
+        )
+    table['item_label_id'] = delimiters['item_label'].map(item_label_id_map)
 
-    if pd.isna(item_label_id):
-        return group
+    table = pd.DataFrame(table).dropna()
+    table = table.astype(dtype)
+    table['list_delimiter'] = delimiters.loc[table.index, 'list_delimiter']
 
-    delimiter = delimiters.loc[item_label_id]
+    return table.reset_index(drop=True)
 
-    if pd.isna(delimiter):
-        return group
 
-    else:
-        group.loc[:, 'string'] = group['string'].str.split(delimiter)
-        return group
+def explode_delimited_items(
+    data,
+    delimiters,
+    list_position_base,
+    position_dtype
+):
+    '''
+    Split values in data['string'] on list delimiters and explode the
+    lists so each list element has its own row. Rows are split in bulk
+    for each distinct delimiter, and list positions are computed from
+    the lengths of the lists rather than by grouping.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Must have a column labeled 'string'
+
+    delimiters : list-like
+        The list delimiter for each row of data, or a null value for
+        items that are not delimited
+
+    list_position_base : int
+        Index value to be assigned to the first element in each list
+
+    position_dtype : type
+        dtype for list positions
+
+    Returns
+    -------
+    pandas.DataFrame
+        data with one row for each list element and a column labeled
+        'item_list_position', which is null for items that were not
+        delimited. Index values are repeated for rows exploded out of
+        the same item.
+    '''
+    delimiters = pd.Series(delimiters, dtype=object).reset_index(drop=True)
+    delimiters = delimiters.where(delimiters.notna(), None)
+
+    strings = data['string'].astype(object).reset_index(drop=True)
+    is_delimited = np.zeros(len(data), dtype=bool)
+
+    # Split every item that has the same delimiter at once
+    for delimiter in delimiters.dropna().unique():
+
+        has_delimiter = (delimiters == delimiter).to_numpy()
+        split_strings = strings.loc[has_delimiter].str.split(delimiter)
+
+        strings.loc[has_delimiter] = split_strings
+        is_delimited[has_delimiter] = split_strings.notna().to_numpy()
+
+    # The number of rows each item will explode into
+    num_elements = np.ones(len(data), dtype=np.int64)
+    num_elements[is_delimited] = strings.loc[is_delimited].map(len)
+
+    data = data.copy()
+    data['string'] = strings.array
+    data = data.explode('string')
+
+    # List positions count up from the first row exploded out of each
+    # item
+    first_rows = np.cumsum(num_elements) - num_elements
+    positions = np.arange(num_elements.sum()) - np.repeat(
+        first_rows,
+        num_elements
+    )
+    positions = pd.array(positions + list_position_base, dtype=position_dtype)
+    positions[~np.repeat(is_delimited, num_elements)] = pd.NA
+
+    data['item_list_position'] = positions
+
+    return data
@@ -1,79 +1,99 @@
-CREATE TABLE sources(
-    source_id INT PRIMARY KEY, --pdDtype: Int32
-    comment_id INT REFERENCES comments(comment_id), --pdDtype: Int32
-    source VARCHAR(255) NOT NULL, --pdDtype: object
-    date_inserted DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, --pdDtype: object
-    date_modified DATETIME, --pdDtype: object
-    FOREIGN KEY (comment_id) REFERENCES comments(comment_id)
+CREATE TABLE textnet_dtypes(
+    dtype_name VARCHAR(50) PRIMARY KEY, --pdDtype: string
+    dtype VARCHAR(50) NOT NULL --pdDtype: string
 );
 
 CREATE TABLE assertions(
-    assertion_id INT PRIMARY KEY, --pdDtype: Int32
-    source_id INT NOT NULL REFERENCES sources(source_id), --pdDtype: Int32
-    src_string_id INT NOT NULL REFERENCES strings(string_id), --pdDtype: Int32
-    tgt_string_id INT NOT NULL REFERENCES strings(string_id), --pdDtype: Int32
-    link_type_id INT NOT NULL REFERENCES link_types(link_type_id), --pdDtype: Int32
-    comment_id INT REFERENCES comments(comment_id), --pdDtype: Int32
-    date_inserted DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, --pdDtype: object
-    date_modified DATETIME --pdDtype: object
+    assertion_id INT PRIMARY KEY, --pdDtype: big_id_dtype
+    inp_string_id INT NOT NULL REFERENCES strings(string_id), --pdDtype: big_id_dtype
+    src_string_id INT NOT NULL REFERENCES strings(string_id), --pdDtype: big_id_dtype
+    tgt_string_id INT NOT NULL REFERENCES strings(string_id), --pdDtype: big_id_dtype
+    ref_string_id INT REFERENCES strings(string_id), --pdDtype: big_id_dtype
+    link_type_id INT NOT NULL REFERENCES link_types(link_type_id), --pdDtype: small_id_dtype
+    date_inserted DATETIME, --pdDtype: string
+    date_modified DATETIME --pdDtype: string
 );
 
 CREATE TABLE strings(
-    string_id INT PRIMARY KEY, --pdDtype: Int32
-    node_id INT NOT NULL REFERENCES nodes(node_id), --pdDtype: Int32
-    string TEXT NOT NULL, --pdDtype: object
-    date_inserted DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, --pdDtype: object
-    date_modified DATETIME --pdDtype: object
+    string_id INT PRIMARY KEY, --pdDtype: big_id_dtype
+    node_id INT NOT NULL REFERENCES nodes(node_id), --pdDtype: big_id_dtype
+    string TEXT NOT NULL, --pdDtype: string
+    date_inserted DATETIME, --pdDtype: string
+    date_modified DATETIME --pdDtype: string
 );
 
 CREATE TABLE nodes(
-    node_id INT PRIMARY KEY, --pdDtype: Int32
-    node_type_id INT NOT NULL REFERENCES node_types(node_type_id), --pdDtype: Int32
-    name_string_id INT REFERENCES strings(string_id), --pdDtype: Int32
-    abbr_string_id INT REFERENCES strings(string_id), --pdDtype: Int32
-    comment_id INT REFERENCES comments(comment_id), --pdDtype: Int32
-    date_inserted DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, --pdDtype: object
-    date_modified DATETIME, --pdDtype: object
-    CONSTRAINT node_alt_pk UNIQUE (node_id, node_type_id)
+    node_id INT PRIMARY KEY, --pdDtype: big_id_dtype
+    node_type_id INT NOT NULL REFERENCES node_types(node_type_id), --pdDtype: small_id_dtype
+    name_string_id INT REFERENCES strings(string_id), --pdDtype: big_id_dtype
+    abbr_string_id INT REFERENCES strings(string_id), --pdDtype: big_id_dtype
+    date_inserted DATETIME, --pdDtype: string
+    date_modified DATETIME --pdDtype: string
+);
+
+CREATE TABLE edges(
+    edge_id INT PRIMARY KEY, --pdDtype: big_id_dtype
+    src_node_id INT NOT NULL REFERENCES nodes(node_id), --pdDtype: big_id_dtype
+    tgt_node_id INT NOT NULL REFERENCES nodes(node_id), --pdDtype: big_id_dtype
+    ref_node_id INT REFERENCES nodes(node_id), --pdDtype: big_id_dtype
+    link_type_id INT NOT NULL REFERENCES link_types(link_type_id), --pdDtype: small_id_dtype
+    date_inserted DATETIME, --pdDtype: string
+    date_modified DATETIME --pdDtype: string
 );
 
 CREATE TABLE node_types(
-    node_type_id INT PRIMARY KEY, --pdDtype: Int32
-    comment_id INT REFERENCES comments(comment_id), --pdDtype: Int32
-    node_type VARCHAR(50) --pdDtype: object
+    node_type_id INT PRIMARY KEY, --pdDtype: small_id_dtype
+    node_type VARCHAR(50) NOT NULL, --pdDtype: string
+    description TEXT, --pdDtype: string
+    null_type BOOLEAN NOT NULL --pdDtype: bool
+);
+
+CREATE TABLE link_types(
+    link_type_id INT PRIMARY KEY, --pdDtype: small_id_dtype
+    link_type VARCHAR(50) NOT NULL, --pdDtype: string
+    description TEXT, --pdDtype: string
+    null_type BOOLEAN NOT NULL --pdDtype: bool
 );
 
-CREATE TABLE comments(
-    comment_id INT PRIMARY KEY, --pdDtype: Int32
-    comment TEXT, --pdDtype: object
-    date_inserted DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, --pdDtype: object
-    date_modified DATETIME --pdDtype: object
+CREATE TABLE assertion_tags(
+    assertion_tag_id INT PRIMARY KEY, --pdDtype: big_id_dtype
+    assertion_id INT NOT NULL REFERENCES assertions(assertion_id), --pdDtype: big_id_dtype
+    tag_string_id INT NOT NULL REFERENCES strings(string_id) --pdDtype: big_id_dtype
 );
 
-CREATE TABLE edges(
-    edge_id INT PRIMARY KEY, --pdDtype: Int32
-    src_node_id INT NOT NULL REFERENCES nodes(node_id), --pdDtype: Int32
-    tgt_node_id INT NOT NULL REFERENCES nodes(node_id), --pdDtype: Int32
-    link_type_id INT NOT NULL REFERENCES link_types(link_type_id), --pdDtype: Int32
-    comment_id INT REFERENCES comments(comment_id), --pdDtype: Int32
-    date_inserted DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, --pdDtype: object
-    date_modified DATETIME --pdDtype: object
+CREATE TABLE edge_tags(
+    edge_tag_id INT PRIMARY KEY, --pdDtype: big_id_dtype
+    edge_id INT NOT NULL REFERENCES edges(edge_id), --pdDtype: big_id_dtype
+    tag_node_id INT NOT NULL REFERENCES nodes(node_id) --pdDtype: big_id_dtype
 );
 
-CREATE TABLE link_types(
-    link_type_id INT PRIMARY KEY, --pdDtype: Int32
-    comment_id INT REFERENCES comments(comment_id), --pdDtype: Int32
-    link_type VARCHAR(50) NOT NULL, --pdDtype: object
-    is_directed BOOLEAN NOT NULL --pdDtype: bool
+CREATE TABLE provenance(
+    string_id INT PRIMARY KEY REFERENCES strings(string_id), --pdDtype: big_id_dtype
+    function VARCHAR(255) NOT NULL, --pdDtype: string
+    arguments TEXT NOT NULL, --pdDtype: string
+    content_hashes TEXT NOT NULL --pdDtype: string
 );
 
-CREATE TABLE node_tags(
-    node_id INT NOT NULL REFERENCES nodes(node_id), --pdDtype: Int32
-    tag_id INT NOT NULL REFERENCES tags(tag_id) --pdDtype: Int32
+CREATE TABLE blobs(
+    handle VARCHAR(80) PRIMARY KEY, --pdDtype: string
+    compressed BOOLEAN NOT NULL, --pdDtype: bool
+    data BLOB NOT NULL --pdDtype: bytes
 );
 
-CREATE TABLE tags(
-    tag_id INT PRIMARY KEY, --pdDtype: Int32
-    comment_id INT REFERENCES comments(comment_id), --pdDtype: Int32
-    tag VARCHAR(50) NOT NULL --pdDtype: object
-);
\ No newline at end of file
+CREATE INDEX assertions_inp_string_id ON assertions(inp_string_id);
+CREATE INDEX assertions_src_string_id ON assertions(src_string_id);
+CREATE INDEX assertions_tgt_string_id ON assertions(tgt_string_id);
+CREATE INDEX assertions_ref_string_id ON assertions(ref_string_id);
+CREATE INDEX assertions_link_type_id ON assertions(link_type_id);
+CREATE INDEX strings_node_id ON strings(node_id);
+CREATE INDEX nodes_node_type_id ON nodes(node_type_id);
+CREATE INDEX nodes_name_string_id ON nodes(name_string_id);
+CREATE INDEX nodes_abbr_string_id ON nodes(abbr_string_id);
+CREATE INDEX edges_src_node_id ON edges(src_node_id);
+CREATE INDEX edges_tgt_node_id ON edges(tgt_node_id);
+CREATE INDEX edges_ref_node_id ON edges(ref_node_id);
+CREATE INDEX edges_link_type_id ON edges(link_type_id);
+CREATE INDEX assertion_tags_assertion_id ON assertion_tags(assertion_id);
+CREATE INDEX assertion_tags_tag_string_id ON assertion_tags(tag_string_id);
+CREATE INDEX edge_tags_edge_id ON edge_tags(edge_id);
+CREATE INDEX edge_tags_tag_node_id ON edge_tags(tag_node_id);
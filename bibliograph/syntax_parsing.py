@@ -1,9 +1,132 @@
 import bibliograph as bg
+import hashlib
 import pandas as pd
+from collections import OrderedDict
 from io import StringIO
 from pathlib import Path
 
 
+# Maximum number of validated syntaxes kept in the process-wide cache
+SYNTAX_CACHE_SIZE = 128
+
+# Validated syntax frames keyed by a hash of the syntax text and the
+# arguments used to validate it. Least recently used syntaxes are
+# evicted first.
+_syntax_cache = OrderedDict()
+
+# Syntaxes in bibliograph/resources, with the values of
+# allow_redundant_items they're usually validated with. These are
+# validated and cached the first time the cache is used.
+_default_entry_syntaxes = {
+    'default_entry_syntax.csv': False,
+    'default_bibtex_syntax.csv': True,
+    'bibtex_item_syntax_w_supertitles.csv': True
+}
+_default_link_syntaxes = {
+    'default_link_syntax.csv': 'default_entry_syntax.csv'
+}
+_defaults_preloaded = False
+
+
+def _read_syntax_text(syntax, syntax_name):
+    '''
+    Take a string representing a file path or the contents of a csv
+    file and return the contents of the csv file.
+    '''
+    try:
+        # if there's a casefold method then the syntax is a string
+        assert syntax.casefold
+
+    except AttributeError:
+        raise ValueError(
+            '{} must be a string representing a file path or the '
+            'contents of a csv file. Got {}.'
+            .format(syntax_name, type(syntax))
+        )
+
+    try:
+        is_path = Path(syntax).exists()
+    except (OSError, ValueError):
+        # The contents of a csv file can be too long or contain
+        # characters that aren't allowed in a file path
+        is_path = False
+
+    if is_path:
+        with open(syntax, 'r', encoding='utf-8-sig') as f:
+            return f.read()
+
+    return syntax
+
+
+def _hash_syntax_text(syntax_text):
+    return hashlib.sha256(syntax_text.encode('utf8')).hexdigest()
+
+
+def _preload_default_syntaxes():
+    '''
+    Validate the syntaxes in bibliograph/resources with and without
+    case sensitivity and store them in the syntax cache.
+    '''
+    global _defaults_preloaded
+
+    if _defaults_preloaded:
+        return
+
+    _defaults_preloaded = True
+
+    resources = Path(__file__).parent / 'resources'
+
+    for case_sensitive in [True, False]:
+
+        for fname, allow_redundant_items in _default_entry_syntaxes.items():
+            validate_entry_syntax(
+                str(resources / fname),
+                case_sensitive,
+                allow_redundant_items=allow_redundant_items
+            )
+
+        for fname, entry_fname in _default_link_syntaxes.items():
+            validate_link_syntax(
+                str(resources / fname),
+                str(resources / entry_fname),
+                case_sensitive
+            )
+
+
+def _get_cached_syntax(key, validate, *args):
+    '''
+    Get a copy of a validated syntax from the cache, calling
+    validate(*args) and caching the result if key isn't in the cache.
+    Copies are returned so callers can't mutate the cached frames.
+    '''
+    _preload_default_syntaxes()
+
+    try:
+        syntax = _syntax_cache[key]
+        _syntax_cache.move_to_end(key)
+
+    except KeyError:
+        syntax = validate(*args)
+        _syntax_cache[key] = syntax
+
+        while len(_syntax_cache) > SYNTAX_CACHE_SIZE:
+            _syntax_cache.popitem(last=False)
+
+    return syntax.copy()
+
+
+def clear_syntax_cache():
+    '''
+    Remove all validated syntaxes from the process-wide syntax cache.
+    The default syntaxes are validated again the next time the cache is
+    used.
+    '''
+    global _defaults_preloaded
+
+    _syntax_cache.clear()
+    _defaults_preloaded = False
+
+
 def _extend_id_map(
     domain,
     existing_domain,
@@ -208,25 +331,55 @@ def validate_entry_syntax(
     case_sensitive,
     allow_redundant_items=False
 ):
+    '''
+    Read and validate an entry syntax. Validated syntaxes are cached,
+    keyed by a hash of the syntax text and the values of case_sensitive
+    and allow_redundant_items.
 
-    try:
-        assert entry_syntax.casefold
-        # if there's a casefold method then the entry syntax is a string
+    Parameters
+    ----------
+    entry_syntax : str
+        A path to a csv file or the contents of a csv file
 
-        if Path(entry_syntax).exists():
-            # assume it's a csv file and read it
-            entry_syntax = pd.read_csv(entry_syntax)
-        else:
-            # assume it's the string-valued contents of a csv
-            # file and convert it to a pandas DataFrame
-            with StringIO(entry_syntax) as stream:
-                entry_syntax = pd.read_csv(stream)
+    case_sensitive : bool
+        If False, casefold all values in the syntax
 
-    except AttributeError:
-        raise ValueError(
-            'entry_syntax must be a string representing a file path or the '
-            'contents of a csv file. Got {}.'.format(type(entry_syntax))
-        )
+    allow_redundant_items : bool, default False
+        If True, items within an entry prefix can have the same node
+        type and link type
+
+    Returns
+    -------
+    pandas.DataFrame
+    '''
+    entry_syntax = _read_syntax_text(entry_syntax, 'entry_syntax')
+
+    key = (
+        'entry',
+        _hash_syntax_text(entry_syntax),
+        bool(case_sensitive),
+        bool(allow_redundant_items)
+    )
+
+    return _get_cached_syntax(
+        key,
+        _validate_entry_syntax,
+        entry_syntax,
+        case_sensitive,
+        allow_redundant_items
+    )
+
+
+def _validate_entry_syntax(
+    entry_syntax,
+    case_sensitive,
+    allow_redundant_items
+):
+
+    # convert the string-valued contents of a csv file to a pandas
+    # DataFrame
+    with StringIO(entry_syntax) as stream:
+        entry_syntax = pd.read_csv(stream)
 
     entry_syntax = bg.util.set_string_dtype(entry_syntax)
 
@@ -285,26 +438,53 @@ class LinkSyntaxError(ValueError):
     pass
 
 
-def _validate_link_syntax(link_syntax, entry_syntax, case_sensitive):
+def validate_link_syntax(link_syntax, entry_syntax, case_sensitive):
+    '''
+    Read and validate a link syntax against an entry syntax. Validated
+    syntaxes are cached, keyed by hashes of the link and entry syntax
+    text and the value of case_sensitive.
 
-    try:
-        # assume link_syntax is a string if it has a casefold method
-        assert link_syntax.casefold
+    Parameters
+    ----------
+    link_syntax : str
+        A path to a csv file or the contents of a csv file
 
-        if Path(link_syntax).exists():
-            # assume it's a csv file and read it
-            link_syntax = pd.read_csv(link_syntax)
-        else:
-            # assume it's the string-valued contents of a csv
-            # file and convert it to a pandas DataFrame
-            with StringIO(link_syntax) as stream:
-                link_syntax = pd.read_csv(stream)
+    entry_syntax : str
+        A path to a csv file or the contents of a csv file
 
-    except AttributeError:
-        raise ValueError(
-            'link_syntax must be a string representing a file path or the '
-            'contents of a csv file. Got {}.'.format(type(link_syntax))
+    case_sensitive : bool
+        If False, casefold all values in the syntaxes
+
+    Returns
+    -------
+    pandas.DataFrame
+    '''
+    link_syntax = _read_syntax_text(link_syntax, 'link_syntax')
+    entry_syntax = _read_syntax_text(entry_syntax, 'entry_syntax')
+
+    key = (
+        'link',
+        _hash_syntax_text(link_syntax),
+        _hash_syntax_text(entry_syntax),
+        bool(case_sensitive)
+    )
+
+    return _get_cached_syntax(
+        key,
+        lambda: _validate_link_syntax(
+            link_syntax,
+            validate_entry_syntax(entry_syntax, case_sensitive),
+            case_sensitive
         )
+    )
+
+
+def _validate_link_syntax(link_syntax, entry_syntax, case_sensitive):
+
+    # convert the string-valued contents of a csv file to a pandas
+    # DataFrame
+    with StringIO(_read_syntax_text(link_syntax, 'link_syntax')) as stream:
+        link_syntax = pd.read_csv(stream)
 
     # pandas converts numbers to numeric types with read_csv, but
     # we're treating everything as strings, so convert all values to str
@@ -406,9 +586,9 @@ def parse_link_syntax(
     case_sensitive=True
 ):
 
-    link_syntax = _validate_link_syntax(
+    link_syntax = validate_link_syntax(
         filepath_or_text,
-        validate_entry_syntax(entry_syntax, case_sensitive),
+        entry_syntax,
         case_sensitive
     )
 
@@ -1,6 +1,11 @@
 import bibliograph as bg
+import numpy as np
 import pandas as pd
+import pytest
+from bibtexparser import dumps
+from bibtexparser.bibdatabase import BibDatabase
 from io import StringIO
+from pathlib import Path
 
 
 def test_manual_annotation_nodes_column_nan_states():
@@ -1396,6 +1401,174 @@ def test_bibliograph_to_shorthand_conversion():
     assert (synthesized == expected_values).all()
 
 
+def test_batched_bibtex_entries_match_bibtexparser_writer():
+
+    def write_with_bibtexparser(entry_series):
+        db = BibDatabase()
+        db.entries = [dict(entry_series.dropna().map(str))]
+        return dumps(db)
+
+    kwargs = {
+        'entry_syntax_fname': "bibliograph/resources/default_bibtex_syntax.csv",
+        'allow_redundant_items': True,
+        'syntax_case_sensitive': False,
+        'space_char': '|',
+        'na_string_values': '!',
+        'na_node_type': 'missing'
+    }
+
+    batched = bg.slurp_bibtex(
+        "bibliograph/test_data/bibtex_test_data_short.bib",
+        **kwargs
+    )
+    by_row = bg.slurp_bibtex(
+        "bibliograph/test_data/bibtex_test_data_short.bib",
+        entry_writer=write_with_bibtexparser,
+        **kwargs
+    )
+
+    # the input strings record different function calls
+    batched = batched.strings['string']
+    batched = set(batched.loc[~batched.str.startswith('bibliograph.')])
+    by_row = by_row.strings['string']
+    by_row = set(by_row.loc[~by_row.str.startswith('bibliograph.')])
+
+    assert batched == by_row
+    assert any(s.startswith('@article{') for s in batched)
+
+
+def test_streamed_bibtex_batches_resolve_string_macros(tmp_path):
+
+    with open("bibliograph/test_data/bibtex_test_data_short.bib") as f:
+        bibtex = f.read()
+
+    # define a macro before the first entry and use it in the last one
+    bibtex = (
+        '@string{nat = {Nature Magazine}}\n\n' + bibtex + '\n'
+        '@article{doe_1999,\n'
+        '\tjournal = nat,\n'
+        '\tauthor = {Doe, J.},\n'
+        '\tyear = {1999}\n'
+        '}\n'
+    )
+    bibtex_fname = tmp_path / 'macros.bib'
+    bibtex_fname.write_text(bibtex, encoding='utf8')
+
+    kwargs = {
+        'entry_syntax_fname': "bibliograph/resources/default_bibtex_syntax.csv",
+        'allow_redundant_items': True,
+        'syntax_case_sensitive': False,
+        'space_char': '|',
+        'na_string_values': '!',
+        'na_node_type': 'missing'
+    }
+
+    def entries(tn):
+        entry_links = tn.get_assertions_by_link_type('entry')
+        return set(tn.strings.loc[entry_links['tgt_string_id'], 'string'])
+
+    def items_csv(tn):
+        string_ids = tn.get_assertions_by_link_type('items_csv')
+        string_ids = string_ids['tgt_string_id']
+        return list(tn.strings.loc[string_ids, 'string'])
+
+    def resolved_assertions(tn):
+        assertions = tn.resolve_assertions()
+        # The input string records the chunksize, so mask it
+        inp_string = assertions['inp_string'].iloc[0]
+
+        # Each batch is the reference of its own assertions and the
+        # source of its entry links, so leave out links to and from
+        # the text of the input
+        assertions = assertions.loc[
+            ~assertions['link_type'].isin(['entry', 'items_csv'])
+        ]
+        assertions = assertions[
+            ['src_string', 'tgt_string', 'link_type', 'tags']
+        ]
+        assertions = assertions.astype(str)
+        assertions = assertions.mask(assertions == inp_string, 'input')
+        assertions = assertions.agg('|'.join, axis=1)
+
+        return assertions.sort_values().array
+
+    whole = bg.slurp_bibtex(bibtex_fname, **kwargs)
+
+    # Batches of one entry store their entry strings as their text, and
+    # entries missing fields that other batches have get null items
+    for chunksize in [1, 3]:
+
+        streamed = bg.slurp_bibtex(
+            bibtex_fname,
+            chunksize=chunksize,
+            **kwargs
+        )
+
+        assert 'Nature Magazine' in streamed.strings['string'].array
+        assert entries(streamed) == entries(whole)
+        assert len(entries(streamed)) == 12
+
+        # The text of each batch is stored on its own
+        assert len(items_csv(streamed)) == 12 // chunksize
+        assert '\n'.join(items_csv(streamed)) == items_csv(whole)[0]
+
+        assert (
+            resolved_assertions(streamed) == resolved_assertions(whole)
+        ).all()
+
+
+def test_jsonl_records_stream_into_items(tmp_path):
+
+    records = [
+        '{"DOI": "10.1/a", "title": ["First"], "author": '
+        '[{"given": "Ann", "family": "Smith"}, '
+        '{"given": "Bob", "family": "Jones"}], '
+        '"issued": {"date-parts": [[1999, 5]]}}',
+        '',
+        '{"DOI": "10.1/b", "title": ["Second"], "author": '
+        '[{"given": "Cy", "family": "Lee"}], '
+        '"issued": {"date-parts": [[2001]]}}',
+        'not json',
+        '{"DOI": "10.1/c", "title": ["Third"], "author": '
+        '[{"given": "Ann", "family": "Smith"}], '
+        '"issued": {"date-parts": [[2003]]}}'
+    ]
+    jsonl_fname = tmp_path / 'records.jsonl'
+    jsonl_fname.write_text('\n'.join(records), encoding='utf8')
+
+    tn = bg.slurp_jsonl(
+        jsonl_fname,
+        "bibliograph/resources/default_bibtex_syntax.csv",
+        item_paths={
+            'doi': 'DOI',
+            'title': 'title.0',
+            'author': 'author.*.family',
+            'year': 'issued.date-parts.0.0'
+        },
+        syntax_case_sensitive=False,
+        allow_redundant_items=True,
+        space_char='|',
+        na_string_values='!',
+        na_node_type='missing',
+        chunksize=2,
+        on_error='quarantine'
+    )
+
+    assert tn.parse_errors['csv_row'].tolist() == [2]
+    assert tn.parse_errors['error_type'].tolist() == ['JSONDecodeError']
+
+    assertions = tn.resolve_assertions()
+    authors = assertions.query('link_type == "author"')
+    authors = authors.groupby('src_string')['tgt_string'].apply(list)
+
+    assert authors[records[0]] == ['Smith', 'Jones']
+    assert authors[records[4]] == ['Smith']
+
+    # strings are shared between batches
+    assert (tn.strings['string'] == 'Smith').sum() == 1
+    assert set(tn.strings['string']).issuperset(['1999', '2001', '2003'])
+
+
 def test_columnar_get_nodes_having_doi_as_supertitle():
 
     items = pd.DataFrame({
@@ -1492,3 +1665,1357 @@ def test_auto_aliasing_get_nodes_equal_get_assertions():
     node_strings = node_strings.sort_values().array
 
     assert (assertion_strings == node_strings).all()
+
+
+def _manual_annotation_parse(
+    shorthand_fname='bibliograph/test_data/manual_annotation.shnd',
+    **kwargs
+):
+    '''
+    Slurp the manual annotation test data, or other shorthand written
+    the same way, with keyword arguments that change how it's parsed.
+    Return the TextNet and its sorted resolved assertions.
+    '''
+
+    tn = bg.slurp_shorthand(
+        shorthand_fname,
+        "bibliograph/resources/default_entry_syntax.csv",
+        link_syntax_fname="bibliograph/resources/default_link_syntax.csv",
+        syntax_case_sensitive=False,
+        item_separator='__',
+        default_entry_prefix='wrk',
+        space_char='|',
+        na_string_values=['!', 'x'],
+        na_node_type='missing',
+        comment_char='#',
+        **{'skiprows': 2, **kwargs}
+    )
+
+    assertions = tn.resolve_assertions()
+    # The input string records the keyword arguments, so mask it
+    inp_string = assertions['inp_string'].iloc[0]
+
+    assertions = assertions[
+        ['src_string', 'tgt_string', 'ref_string', 'link_type', 'tags']
+    ]
+    assertions = assertions.astype(str)
+    assertions = assertions.mask(assertions == inp_string, 'input')
+    assertions = assertions.agg('|'.join, axis=1)
+
+    return tn, assertions.sort_values().array
+
+
+@pytest.mark.parametrize(
+    'parse_kwargs',
+    [
+        {'chunksize': 1},
+        {'chunksize': 3},
+        # A budget this small parses the input a few rows at a time
+        {'memory_budget': '64KB'},
+        {'workers': 2}
+    ]
+)
+def test_manual_annotation_split_parse_matches_serial_parse(parse_kwargs):
+
+    serial_tn, serial = _manual_annotation_parse()
+    split_tn, split = _manual_annotation_parse(**parse_kwargs)
+
+    assert (serial == split).all()
+    assert len(serial_tn.nodes) == len(split_tn.nodes)
+    assert len(serial_tn.edges) == len(split_tn.edges)
+
+
+def test_split_parse_tags_every_entry_that_shares_a_tag(tmp_path):
+
+    shnd = tmp_path / 'shared_tags.shnd'
+    shnd.write_text(
+        'left_entry,right_entry,link_tags_or_override,reference\n'
+        'asmith_bwu__1999__bams__101__803__xxx,\n'
+        ',not__first note__ shared tags\n'
+        ',not__second note__ shared other\n'
+        'bjones__1975__jats__90__1__yyy,\n'
+        ',not__third note__ shared tags\n'
+        ',not__first note__ shared tags\n'
+    )
+
+    serial_tn, serial = _manual_annotation_parse(shnd, skiprows=0)
+
+    # Every note entry is tagged with each of its tags once
+    tagged = serial_tn.get_assertions_by_link_type('tagged')
+    tagged = tagged[['src_string_id', 'tgt_string_id']].apply(
+        lambda x: x.map(serial_tn.strings['string'])
+    )
+    assert sorted(tagged.itertuples(index=False, name=None)) == [
+        ('not__first note__ shared tags', 'shared'),
+        ('not__first note__ shared tags', 'tags'),
+        ('not__second note__ shared other', 'other'),
+        ('not__second note__ shared other', 'shared'),
+        ('not__third note__ shared tags', 'shared'),
+        ('not__third note__ shared tags', 'tags')
+    ]
+
+    for parse_kwargs in [{'chunksize': 1}, {'chunksize': 2}, {'workers': 2}]:
+
+        split_tn, split = _manual_annotation_parse(
+            shnd,
+            skiprows=0,
+            **parse_kwargs
+        )
+
+        assert (serial == split).all()
+        assert len(serial_tn.edges) == len(split_tn.edges)
+
+
+@pytest.mark.parametrize('skiprows', [[0, 1], {1, 0}, range(2)])
+def test_list_like_skiprows_parse_like_int(skiprows):
+
+    def without_skiprows(assertions):
+        # The input records the value of skiprows it was parsed with
+        return [a for a in assertions if '|skiprows|' not in a]
+
+    _, int_skiprows = _manual_annotation_parse()
+    _, parsed = _manual_annotation_parse(skiprows=skiprows)
+
+    assert without_skiprows(parsed) == without_skiprows(int_skiprows)
+
+    # Lines skipped after the header aren't linted or counted as rows
+    s = bg.Shorthand(
+        entry_syntax="bibliograph/resources/default_entry_syntax.csv",
+        link_syntax="bibliograph/resources/default_link_syntax.csv",
+        syntax_case_sensitive=False
+    )
+    shnd = (
+        'left_entry,right_entry,link_tags_or_override,reference\n'
+        'asmith__1999__bams__101__803__xxx,\n'
+        ',"qte__a quote that never ends # here\n'
+        ',bjones__1975__jats__90__1__x\\\n'
+    )
+    problems = s.lint(StringIO(shnd), skiprows=[2])
+    assert list(problems['csv_row']) == [1]
+    assert list(problems['error_type']) == ['escape']
+
+    # skiprows is stored with the input, so callables are rejected
+    for unsupported in [lambda i: i < 2, 1.5]:
+        with pytest.raises(TypeError):
+            _manual_annotation_parse(skiprows=unsupported)
+
+
+def test_slurp_many_merges_inputs_into_one_textnet():
+
+    shorthand_spec = {
+        'function': 'shorthand',
+        'shorthand_fname': 'bibliograph/test_data/shorthand_with_aliases.shnd',
+        'entry_syntax_fname': "bibliograph/resources/default_entry_syntax.csv",
+        'link_syntax_fname': "bibliograph/resources/default_link_syntax.csv",
+        'syntax_case_sensitive': False,
+        'aliases_dict': {'actor': 'bibliograph/test_data/aliases_actor.csv'},
+        'item_separator': '__',
+        'space_char': '|',
+        'na_string_values': '!',
+        'na_node_type': 'missing',
+        'default_entry_prefix': 'wrk',
+        'skiprows': 2,
+        'comment_char': '#'
+    }
+    bibtex_spec = {
+        'function': bg.slurp_bibtex,
+        'bibtex_fname': "bibliograph/test_data/bibtex_test_data_short.bib",
+        'entry_syntax_fname': "bibliograph/resources/default_bibtex_syntax.csv",
+        'allow_redundant_items': True,
+        'syntax_case_sensitive': False,
+        'space_char': '|',
+        'na_string_values': '!',
+        'na_node_type': 'missing'
+    }
+
+    def resolved_assertions(tn):
+        assertions = tn.resolve_assertions()
+        assertions = assertions[[
+            'inp_string', 'src_string', 'tgt_string', 'ref_string',
+            'link_type', 'tags'
+        ]]
+        return assertions.astype(str).agg('|'.join, axis=1)
+
+    separate = [
+        bg.slurp_shorthand(**{
+            k: v for k, v in shorthand_spec.items() if k != 'function'
+        }),
+        bg.slurp_bibtex(**{
+            k: v for k, v in bibtex_spec.items() if k != 'function'
+        })
+    ]
+    merged = bg.slurp_many([shorthand_spec, bibtex_spec], workers=2)
+
+    separate_assertions = pd.concat(
+        [resolved_assertions(tn) for tn in separate]
+    )
+
+    assert merged.assertions['inp_string_id'].nunique() == 2
+    assert (
+        resolved_assertions(merged).sort_values().array
+        == separate_assertions.sort_values().array
+    ).all()
+
+    # strings found in both inputs are stored once
+    strings = merged.strings[['string']].assign(
+        node_type=merged.strings['node_id'].map(merged.nodes['node_type_id'])
+    )
+    assert not strings.duplicated().any()
+    assert len(merged.nodes) < sum(len(tn.nodes) for tn in separate)
+
+    # inputs are parsed into strings and assertions, and nodes and
+    # edges are only built for the merged inputs
+    parsed = bg.slurp_bibtex(
+        build_nodes=False,
+        **{k: v for k, v in bibtex_spec.items() if k != 'function'}
+    )
+    assert 'node_type_id' in parsed.strings.columns
+    with pytest.raises(AttributeError):
+        parsed.nodes
+    assert (
+        resolved_assertions(parsed).sort_values().array
+        == resolved_assertions(separate[1]).sort_values().array
+    ).all()
+
+    with pytest.raises(ValueError):
+        bg.slurp_many([bibtex_spec, bibtex_spec])
+
+
+def test_compiled_entry_syntax_parses_same_entries_as_syntax_frame():
+
+    with open("bibliograph/resources/default_entry_syntax.csv") as f:
+        entry_syntax = bg.syntax_parsing.validate_entry_syntax(
+            f.read(),
+            case_sensitive=False
+        )
+
+    entries = pd.Series(
+        [
+            'asmith_bwu__1999__bams__101__803__xxx',
+            'bwu__1989__t_long|title__x__80',
+            'fun__nasa__NASA|grant|12345-6789',
+            'not__an escaped\\__item separator'
+        ],
+        index=pd.MultiIndex.from_tuples([(0, 0), (0, 1), (1, 1), (2, 1)])
+    )
+
+    parse_args = ('__', 'wrk', '|', ['!'], '_')
+
+    from_frame = bg.entry_parsing.parse_entries(
+        entries,
+        entry_syntax,
+        *parse_args
+    )
+
+    compiled_syntax = bg.entry_parsing.CompiledEntrySyntax(entry_syntax, '__')
+    from_compiled = bg.entry_parsing.parse_entries(
+        entries,
+        compiled_syntax,
+        *parse_args
+    )
+
+    # Items as the syntax frame was expanded before syntaxes were
+    # compiled: (row, column, item label, string, node type, link type)
+    expected_items = [
+        (0, 0, '0', 'asmith_bwu', 'actor', 'author'),
+        (0, 0, '1', '1999', 'date', 'published'),
+        (0, 0, '3', '101', 'work', 'volume'),
+        (0, 0, '4', '803', 'work', 'page'),
+        (0, 0, '5', 'xxx', 'identifier', 'doi'),
+        (0, 0, 's', 'bams', 'work', 'supertitle'),
+        (0, 1, '0', 'bwu', 'actor', 'author'),
+        (0, 1, '1', '1989', 'date', 'published'),
+        (0, 1, '3', 'x', 'work', 'volume'),
+        (0, 1, '4', '80', 'work', 'page'),
+        (0, 1, '5', '!', 'identifier', 'doi'),
+        (0, 1, 't', 'long title', 'work', 'title'),
+        (1, 1, '0', 'nasa', 'actor', 'contains'),
+        (1, 1, '1', 'NASA grant 12345-6789', 'agreement', 'contains'),
+        (2, 1, '0', 'an escaped__item separator', 'note', 'alias')
+    ]
+
+    for parsed in [from_frame, from_compiled]:
+
+        items = parsed.loc[parsed.index.get_level_values(3).notna()]
+        items = zip(
+            items.index.get_level_values(0),
+            items.index.get_level_values(1),
+            items.index.get_level_values(3),
+            items['string'],
+            items['node_type'],
+            items['link_type']
+        )
+        assert list(items) == expected_items
+
+        # Each entry keeps its unsplit string with its entry node type
+        entries_parsed = parsed.loc[
+            parsed.index.get_level_values(3).isna(),
+            ['string', 'node_type']
+        ]
+        assert list(entries_parsed['string']) == list(entries)
+        assert list(entries_parsed['node_type']) == [
+            'work', 'work', 'acknowledgement', 'note'
+        ]
+
+
+def test_cached_entry_syntax_is_not_mutated_by_callers():
+
+    syntax_fname = "bibliograph/resources/default_entry_syntax.csv"
+    with open(syntax_fname) as f:
+        syntax_text = f.read()
+
+    from_path = bg.syntax_parsing.validate_entry_syntax(syntax_fname, False)
+    from_path['item_label'] = 'x'
+
+    from_text = bg.syntax_parsing.validate_entry_syntax(syntax_text, False)
+
+    assert (from_text['item_label'] != 'x').all()
+    assert bg.syntax_parsing._syntax_cache
+
+
+def test_delimited_items_explode_with_list_positions():
+
+    data = pd.DataFrame(
+        {
+            'string': pd.array(
+                ['asmith_bwu_cjones', 'title_text', 'x y', pd.NA, 'dlee'],
+                dtype=pd.StringDtype()
+            ),
+            'csv_row': [0, 0, 1, 1, 2]
+        },
+        index=[5, 6, 7, 8, 9]
+    )
+    delimiters = ['_', None, ' ', '_', '_']
+
+    exploded = bg.entry_parsing.explode_delimited_items(
+        data,
+        delimiters,
+        1,
+        pd.Int8Dtype()
+    )
+
+    assert list(exploded.index) == [5, 5, 5, 6, 7, 7, 8, 9]
+    assert list(exploded['string'].fillna('<NA>')) == [
+        'asmith', 'bwu', 'cjones', 'title_text', 'x', 'y', '<NA>', 'dlee'
+    ]
+    assert list(exploded['item_list_position'].fillna(0)) == [
+        1, 2, 3, 0, 1, 2, 0, 1
+    ]
+
+
+def test_comments_are_stripped_from_shorthand_lines():
+
+    shorthand = StringIO(
+        'left_entry, right_entry, link_tags_or_override, reference\n'
+        'asmith__2000__bams__1__1__xxx, bwu__1999__t_Title \\# 1__x__x\n'
+        '# a comment line, with, extra, commas, in, it\n'
+        '    , cjones__1998__bams__2__2__yyy  # an inline, comment\n'
+    )
+
+    tn = bg.slurp_shorthand(
+        shorthand,
+        "bibliograph/resources/default_entry_syntax.csv",
+        link_syntax_fname="bibliograph/resources/default_link_syntax.csv",
+        syntax_case_sensitive=False,
+        space_char='|',
+        na_string_values='x'
+    )
+
+    strings = tn.strings['string'].array
+
+    assert 'Title # 1' in strings
+    assert 'cjones__1998__bams__2__2__yyy' in strings
+    assert not any(s.startswith('# a comment') for s in strings)
+
+
+def test_item_prefixes_split_with_default_prefix():
+
+    prefixed_items = pd.DataFrame({
+        'item_label': ['2', 'ids'],
+        'item_prefix_separator': ['_', '::'],
+        'item_prefixes': ['s t', 'doi arxiv']
+    })
+
+    items = pd.DataFrame(
+        {
+            '2': ['s_Nature', 't_A title_with sep', 'No prefix', 'st_x'],
+            'ids': ['arxiv::1234', '10.1/abc', 'doi::x::y', 's_Nature']
+        },
+        dtype=pd.StringDtype()
+    )
+    items = items.stack()
+
+    split = bg.entry_parsing.split_item_prefixes(items, prefixed_items)
+
+    assert split.index.equals(items.index)
+    assert list(split[0]) == [
+        's', 'arxiv', 't', 'doi', 's', 'doi', 's', 'doi'
+    ]
+    assert list(split[1]) == [
+        'Nature', '1234', 'A title_with sep', '10.1/abc', 'No prefix',
+        'x::y', 'st_x', 's_Nature'
+    ]
+
+
+def test_link_syntax_links_each_list_element_once():
+
+    shorthand = StringIO(
+        'left_entry, right_entry, link_tags_or_override, reference\n'
+        'asmith_bwu__2000__bams__1__1__xxx, fun__nasa_nsf__grant1\n'
+    )
+
+    tn = bg.slurp_shorthand(
+        shorthand,
+        "bibliograph/resources/default_entry_syntax.csv",
+        link_syntax_fname="bibliograph/resources/default_link_syntax.csv",
+        syntax_case_sensitive=False,
+        space_char='|',
+        na_string_values='!'
+    )
+
+    strings = tn.strings['string']
+    link_types = tn.link_types['link_type']
+    links = pd.DataFrame({
+        'src': tn.assertions['src_string_id'].map(strings),
+        'tgt': tn.assertions['tgt_string_id'].map(strings),
+        'link_type': tn.assertions['link_type_id'].map(link_types)
+    })
+
+    work = 'asmith_bwu__2000__bams__1__1__xxx'
+
+    funded = links.query('link_type == "funded"')
+    funded = set(zip(funded['src'], funded['tgt']))
+    assert funded == {
+        ('nasa', work), ('nsf', work), ('grant1', work),
+        ('nasa', 'asmith'), ('nasa', 'bwu'), ('nsf', 'asmith'),
+        ('nsf', 'bwu'), ('grant1', 'asmith'), ('grant1', 'bwu')
+    }
+    assert len(links.query('link_type == "funded"')) == len(funded)
+
+    acknowledged = links.query('link_type == "acknowledged"')
+    assert sorted(acknowledged['tgt']) == ['nasa', 'nsf']
+    assert (acknowledged['src'] == work).all()
+
+
+def test_entry_parse_cache_reuses_expanded_entries(tmp_path):
+
+    cache = bg.entry_parsing.EntryParseCache(tmp_path)
+
+    def slurp():
+        return bg.slurp_shorthand(
+            'bibliograph/test_data/manual_annotation.shnd',
+            "bibliograph/resources/default_entry_syntax.csv",
+            link_syntax_fname="bibliograph/resources/default_link_syntax.csv",
+            syntax_case_sensitive=False,
+            space_char='|',
+            na_string_values=['!', 'x'],
+            skiprows=2,
+            entry_cache=cache
+        )
+
+    first = slurp()
+    assert cache.hits == 0
+    assert cache.misses > 0
+
+    # Reading entries that were just cached doesn't write to the cache
+    misses = cache.misses
+    changes = cache._connect().total_changes
+    second = slurp()
+    assert cache.misses == misses
+    assert cache.hits >= misses
+    assert cache._connect().total_changes == changes
+
+    dates = ['date_inserted', 'date_modified']
+    assert first.strings.drop(columns=dates).equals(
+        second.strings.drop(columns=dates)
+    )
+    assert first.assertions.drop(columns=dates).equals(
+        second.assertions.drop(columns=dates)
+    )
+
+    # Evict everything by shrinking the cache
+    cache.max_bytes = 1
+    cache.clear()
+    slurp()
+    assert cache.evictions > 0
+    assert cache.stats()['bytes'] <= 1
+
+
+def test_refresh_input_matches_full_slurp(tmp_path):
+
+    fname = 'bibliograph/test_data/shorthand_with_aliases.shnd'
+
+    def slurp(path):
+        return bg.slurp_shorthand(
+            path,
+            "bibliograph/resources/default_entry_syntax.csv",
+            link_syntax_fname="bibliograph/resources/default_link_syntax.csv",
+            syntax_case_sensitive=False,
+            aliases_dict={
+                'actor': 'bibliograph/test_data/aliases_actor.csv',
+                'work': 'bibliograph/test_data/aliases_work.csv'
+            },
+            aliases_case_sensitive=False,
+            space_char='|',
+            na_string_values='!',
+            skiprows=2
+        )
+
+    with open(fname, newline='') as f:
+        lines = f.read().split('\n')
+
+    # Change one row, delete another, and duplicate a third
+    body = [i for i, line in enumerate(lines) if line.startswith('    ,')]
+    lines[body[0]] = lines[body[0]].replace('1', '7', 1)
+    lines.insert(body[2], lines[body[2]])
+    del lines[body[1]]
+
+    edited = tmp_path / 'edited.shnd'
+    with open(edited, 'w', newline='') as f:
+        f.write('\n'.join(lines))
+
+    tn = slurp(fname)
+    inp_string_id = tn.get_assertions_by_link_type('shorthand_data')
+    inp_string_id = inp_string_id['inp_string_id'].iloc[0]
+    unchanged_id = tn.assertions.index[0]
+    date_inserted = tn.assertions.loc[unchanged_id, 'date_inserted']
+
+    tn.refresh_input(inp_string_id, edited)
+    full = slurp(edited)
+
+    def resolved(tn):
+        text = tn.get_assertions_by_link_type('shorthand_data')
+        text = tn.strings.loc[text['tgt_string_id'].iloc[0], 'string']
+        columns = ['src_string', 'tgt_string', 'ref_string', 'link_type']
+        assertions = tn.resolve_assertions()[columns]
+        assertions = assertions.replace(text, '<text>')
+
+        # The input strings are calls that include the file name
+        for c in columns:
+            is_call = assertions[c].str.startswith('bibliograph.core.')
+            assertions[c] = assertions[c].mask(is_call, '<call>')
+
+        return assertions.sort_values(columns).reset_index(drop=True)
+
+    assert resolved(tn).equals(resolved(full))
+    assert len(tn.nodes) == len(full.nodes)
+    assert len(tn.edges) == len(full.edges)
+    assert tn.assertions.loc[unchanged_id, 'date_inserted'] == date_inserted
+
+
+def test_refresh_input_keeps_nodes_and_edges_the_edit_does_not_touch(
+    tmp_path
+):
+
+    fname = 'bibliograph/test_data/shorthand_with_aliases.shnd'
+
+    def slurp(path):
+        return bg.slurp_shorthand(
+            path,
+            "bibliograph/resources/default_entry_syntax.csv",
+            link_syntax_fname="bibliograph/resources/default_link_syntax.csv",
+            syntax_case_sensitive=False,
+            aliases_dict={
+                'actor': 'bibliograph/test_data/aliases_actor.csv',
+                'work': 'bibliograph/test_data/aliases_work.csv'
+            },
+            aliases_case_sensitive=False,
+            space_char='|',
+            na_string_values='!',
+            skiprows=2
+        )
+
+    with open(fname, newline='') as f:
+        lines = f.read().split('\n')
+
+    # Cite a new work with a new actor, which generates aliases again
+    body = [i for i, line in enumerate(lines) if line.startswith('    ,')]
+    lines.insert(body[-1] + 1, '    , Jane Doe__2001__New Journal')
+
+    edited = tmp_path / 'edited.shnd'
+    with open(edited, 'w', newline='') as f:
+        f.write('\n'.join(lines))
+
+    tn = slurp(fname)
+    inp_string_id = tn.get_assertions_by_link_type('shorthand_data')
+    inp_string_id = inp_string_id['inp_string_id'].iloc[0]
+
+    nodes = tn.nodes.copy()
+    edges = tn.edges.copy()
+
+    # The text lists its entries and the first entry cites the new work
+    text_string_id = tn.get_assertions_by_link_type('shorthand_data')
+    text_string_id = text_string_id['tgt_string_id'].iloc[0]
+    citing_string_id = tn.id_lookup(
+        'strings',
+        'asmith_bwu__1999__bams__101__803__xxx'
+    )
+    source_node_ids = tn.strings.loc[
+        [text_string_id, citing_string_id],
+        'node_id'
+    ]
+
+    tn.refresh_input(inp_string_id, edited)
+    full = slurp(edited)
+
+    assert len(tn.nodes) == len(full.nodes)
+    assert len(tn.edges) == len(full.edges)
+    assert len(tn.edge_tags) == len(full.edge_tags)
+
+    # Only edges from the text and the citing entry are built again
+    assert tn.nodes.loc[nodes.index].equals(nodes)
+    untouched = edges.loc[~edges['src_node_id'].isin(source_node_ids)]
+    assert tn.edges.loc[untouched.index].equals(untouched)
+
+    new_nodes = tn.nodes.index.difference(nodes.index)
+    new_strings = tn.strings.loc[tn.strings['node_id'].isin(new_nodes)]
+    assert set(new_strings['string']) == {
+        'Jane Doe', 'Jane Doe__2001__New Journal', 'New Journal', '2001'
+    }
+
+
+def test_shorthand_buffer_input_stores_text_without_temp_files(monkeypatch):
+
+    import tempfile
+
+    def no_temp_files(*args, **kwargs):
+        raise AssertionError('parse_text created a temp file')
+
+    monkeypatch.setattr(tempfile, 'mkstemp', no_temp_files)
+
+    fname = 'bibliograph/test_data/manual_annotation.shnd'
+
+    def slurp(filepath_or_buffer):
+        return bg.slurp_shorthand(
+            filepath_or_buffer,
+            "bibliograph/resources/default_entry_syntax.csv",
+            link_syntax_fname="bibliograph/resources/default_link_syntax.csv",
+            syntax_case_sensitive=False,
+            space_char='|',
+            na_string_values=['!', 'x'],
+            skiprows=2
+        )
+
+    def stored_text(tn):
+        text_id = tn.get_assertions_by_link_type('shorthand_data')
+        return tn.strings.loc[text_id['tgt_string_id'].iloc[0], 'string']
+
+    with open(fname, newline='') as f:
+        text = f.read()
+
+    from_path = slurp(fname)
+    from_buffer = slurp(StringIO(text.replace('\n', '\r\n')))
+
+    assert stored_text(from_path) == text
+    assert stored_text(from_buffer) == text
+    assert from_path.assertions.drop(columns=['date_inserted']).equals(
+        from_buffer.assertions.drop(columns=['date_inserted'])
+    )
+
+
+def test_quarantined_rows_are_excluded_and_reported():
+
+    with open('bibliograph/test_data/manual_annotation.shnd') as f:
+        lines = f.read().split('\n')
+
+    # Entries with self-descriptive syntax raise NotImplementedError
+    bad_line = '    , __work__author_actor_x'
+    bad_lines = lines[:6] + [bad_line] + lines[6:]
+
+    def slurp(text, **kwargs):
+        return bg.slurp_shorthand(
+            StringIO('\n'.join(text)),
+            "bibliograph/resources/default_entry_syntax.csv",
+            link_syntax_fname="bibliograph/resources/default_link_syntax.csv",
+            syntax_case_sensitive=False,
+            space_char='|',
+            na_string_values=['!', 'x'],
+            skiprows=2,
+            **kwargs
+        )
+
+    with pytest.raises(NotImplementedError):
+        slurp(bad_lines)
+
+    clean = slurp(lines)
+
+    for chunksize in [None, 4]:
+
+        quarantined = slurp(
+            bad_lines,
+            on_error='quarantine',
+            chunksize=chunksize
+        )
+
+        errors = quarantined.parse_errors
+        assert len(errors) == 1
+        assert errors.loc[0, 'csv_row'] == 3
+        assert errors.loc[0, 'csv_col'] == 'right_entry'
+        assert errors.loc[0, 'string'] == '__work__author_actor_x'
+        assert errors.loc[0, 'error_type'] == 'NotImplementedError'
+
+        assert len(quarantined.assertions) == len(clean.assertions)
+        assert len(quarantined.strings) == len(clean.strings)
+        assert len(quarantined.edges) == len(clean.edges)
+
+
+def test_link_tags_and_list_positions():
+
+    text = (
+        'left_entry, right_entry, link_tags_or_override, reference\n'
+        'smitha_jonesb__2000__t_x__x__x, lee__2001__t_y__x__x, '
+        'lt__cited t1 t2,\n'
+    )
+
+    tn = bg.slurp_shorthand(
+        StringIO(text),
+        "bibliograph/resources/default_entry_syntax.csv",
+        link_syntax_fname="bibliograph/resources/default_link_syntax.csv",
+        syntax_case_sensitive=False
+    )
+
+    tagged = tn.resolve_assertions()
+    tagged = tagged.loc[tagged['tags'].notna()]
+    tags = dict(zip(
+        zip(tagged['tgt_string'], tagged['link_type']),
+        tagged['tags']
+    ))
+
+    assert tags[('smitha', 'author')] == '1'
+    assert tags[('jonesb', 'author')] == '2'
+    assert tags[('lee', 'author')] == '1'
+    assert tags[('lee__2001__t_y__x__x', 'cited')] == 't1 t2'
+
+    tag_strings = tagged['tags'].str.split().explode().unique()
+    assert sorted(tag_strings) == ['1', '2', 't1', 't2']
+
+
+def test_memory_budget_parse_reports_memory_per_stage():
+
+    unbudgeted, _ = _manual_annotation_parse()
+    budgeted, _ = _manual_annotation_parse(memory_budget='64KB')
+
+    report = budgeted.memory_report.set_index('stage')
+    assert list(report.index)[0] == 'read'
+    assert {'measure', 'parse', 'merge', 'build'}.issubset(report.index)
+    assert 'measure' not in list(unbudgeted.memory_report['stage'])
+
+    # Every stage has its peak resident memory, with or without a
+    # budget, and no stage peaks below its own resident memory
+    for r in [budgeted.memory_report, unbudgeted.memory_report]:
+        assert (r['peak_rss'] > 0).all()
+        assert (r['peak_rss'] >= r['rss']).all()
+
+    with pytest.raises(ValueError):
+        _manual_annotation_parse(memory_budget='lots')
+
+
+def test_lint_reports_problems_without_parsing():
+
+    s = bg.Shorthand(
+        entry_syntax="bibliograph/resources/default_entry_syntax.csv",
+        link_syntax="bibliograph/resources/default_link_syntax.csv",
+        syntax_case_sensitive=False
+    )
+
+    problems = s.lint(
+        'bibliograph/test_data/manual_annotation.shnd',
+        skiprows=2
+    )
+    assert problems.empty
+    assert list(problems.columns) == [
+        'csv_row', 'csv_col', 'string', 'error_type', 'message'
+    ]
+
+    shnd = StringIO(
+        'left_entry,right_entry,link_tags_or_override,reference\n'
+        'asmith__1999__bams__101__803__xxx__extra,\n'
+        ',bjones__1975__jats__90__1__x\\\n'
+        ',aff__nasa\n'
+        'aff__nasa,bjones__1975__jats__90__1__yyy\n'
+        'asmith__1999__bams__101__803__xxx,__work__author_actor_x\n'
+        ',____wrk__cites_work_x\n'
+        'bjones__1975__jats__90__1__yyy,aff__nasa\n'
+        ',"qte__a quote that\n'
+        '# never ends\n'
+    )
+    problems = s.lint(shnd, chunksize=2)
+
+    found = problems[['csv_row', 'csv_col', 'error_type']]
+    found = list(found.astype(object).itertuples(index=False, name=None))
+
+    # The first row has no right entry, so its left entry is checked
+    # with the next row
+    assert found == [
+        (1, 'right_entry', 'escape'),
+        (1, 'left_entry', 'item_count'),
+        (3, 'right_entry', 'link_syntax'),
+        (4, 'right_entry', 'self_descriptive'),
+        (5, 'right_entry', 'entry_prefix'),
+        (7, pd.NA, 'comment'),
+        (7, pd.NA, 'quote')
+    ]
+
+    # The parser rejects the entry lint reports as self-descriptive
+    with pytest.raises(NotImplementedError):
+        bg.slurp_shorthand(
+            StringIO(
+                'left_entry,right_entry,link_tags_or_override,reference\n'
+                'asmith__1999__bams__101__803__xxx,__work__author_actor_x\n'
+            ),
+            "bibliograph/resources/default_entry_syntax.csv",
+            link_syntax_fname="bibliograph/resources/default_link_syntax.csv",
+            syntax_case_sensitive=False
+        )
+
+
+def test_lint_reports_entry_problems_at_every_row_written():
+
+    s = bg.Shorthand(
+        entry_syntax="bibliograph/resources/default_entry_syntax.csv",
+        link_syntax="bibliograph/resources/default_link_syntax.csv",
+        syntax_case_sensitive=False
+    )
+
+    # The malformed right entry is written on two separate rows. The
+    # malformed left entry is written once and carried down a row, and
+    # across the chunk boundary when chunksize is 2.
+    shnd = (
+        'left_entry,right_entry,link_tags_or_override,reference\n'
+        'asmith__1999__bams__101__803__xxx,bad__1__2__3__4__5__6__7__8\n'
+        'bjones__1975__jats__90__1__yyy__extra,aff__nasa\n'
+        ',bad__1__2__3__4__5__6__7__8\n'
+    )
+
+    for chunksize in [1, 2, 10]:
+        problems = s.lint(StringIO(shnd), chunksize=chunksize)
+
+        found = problems[['csv_row', 'csv_col', 'error_type']]
+        found = list(found.astype(object).itertuples(index=False, name=None))
+
+        assert found == [
+            (0, 'right_entry', 'item_count'),
+            (1, 'left_entry', 'item_count'),
+            (2, 'right_entry', 'item_count')
+        ]
+
+def test_refresh_entry_syntax_matches_full_slurp():
+
+    with open("bibliograph/resources/default_entry_syntax.csv") as f:
+        entry_syntax = f.read()
+
+    # Change the list delimiters of one wrk item and one aff item
+    edited_syntax = entry_syntax.replace(
+        'wrk,__,wrk,work,4,work,page,_,,',
+        'wrk,__,wrk,work,4,work,page,,,'
+    ).replace(
+        'wrk,__,aff,affiliation,0,actor,contains,_,,',
+        'wrk,__,aff,affiliation,0,actor,contains,;,,'
+    )
+
+    def slurp(syntax):
+        return bg.slurp_shorthand(
+            'bibliograph/test_data/manual_annotation.shnd',
+            StringIO(syntax),
+            link_syntax_fname="bibliograph/resources/default_link_syntax.csv",
+            syntax_case_sensitive=False,
+            na_string_values=['!', 'x'],
+            skiprows=2
+        )
+
+    s = bg.Shorthand(StringIO(entry_syntax))
+    diff = s._compile_entry_syntax('__').diff(
+        bg.Shorthand(StringIO(edited_syntax))._compile_entry_syntax('__')
+    )
+    assert set(zip(diff['entry_prefix'], diff['item_label'])) == {
+        ('wrk', '4'), ('aff', '0')
+    }
+
+    tn = slurp(entry_syntax)
+    inp_string_id = tn.get_assertions_by_link_type('shorthand_data')
+    inp_string_id = inp_string_id['inp_string_id'].iloc[0]
+
+    # Assertions from rows with only fun entries aren't parsed again
+    fun_id = tn.strings.index[tn.strings['string'] == 'nasa'][0]
+    unchanged_id = tn.assertions.index[
+        tn.assertions['tgt_string_id'] == fun_id
+    ][0]
+    date_inserted = tn.assertions.loc[unchanged_id, 'date_inserted']
+
+    tn.refresh_entry_syntax(inp_string_id, StringIO(edited_syntax))
+    full = slurp(edited_syntax)
+
+    def resolved(tn):
+        columns = ['src_string', 'tgt_string', 'ref_string', 'link_type']
+        assertions = tn.resolve_assertions()[columns]
+
+        # The input strings are calls that include the syntax buffer
+        for c in columns:
+            is_call = assertions[c].str.startswith('bibliograph.core.')
+            assertions[c] = assertions[c].mask(is_call, '<call>')
+
+        return assertions.sort_values(columns).reset_index(drop=True)
+
+    assert resolved(tn).equals(resolved(full))
+    assert len(tn.nodes) == len(full.nodes)
+    assert len(tn.edges) == len(full.edges)
+    assert tn.assertions.loc[unchanged_id, 'date_inserted'] == date_inserted
+
+    syntax_string_id = tn.get_assertions_by_link_type('shorthand_entry_syntax')
+    syntax_string_id = syntax_string_id['tgt_string_id'].iloc[0]
+    assert tn.strings.loc[syntax_string_id, 'string'] == edited_syntax
+
+
+def test_sqlite_round_trip_and_append(tmp_path):
+
+    shorthand_spec = {
+        'function': 'shorthand',
+        'shorthand_fname': 'bibliograph/test_data/shorthand_with_aliases.shnd',
+        'entry_syntax_fname': "bibliograph/resources/default_entry_syntax.csv",
+        'link_syntax_fname': "bibliograph/resources/default_link_syntax.csv",
+        'syntax_case_sensitive': False,
+        'aliases_dict': {'actor': 'bibliograph/test_data/aliases_actor.csv'},
+        'item_separator': '__',
+        'space_char': '|',
+        'na_string_values': '!',
+        'na_node_type': 'missing',
+        'default_entry_prefix': 'wrk',
+        'skiprows': 2,
+        'comment_char': '#'
+    }
+    bibtex_spec = {
+        'function': 'bibtex',
+        'bibtex_fname': "bibliograph/test_data/bibtex_test_data_short.bib",
+        'entry_syntax_fname': "bibliograph/resources/default_bibtex_syntax.csv",
+        'allow_redundant_items': True,
+        'syntax_case_sensitive': False,
+        'space_char': '|',
+        'na_string_values': '!',
+        'na_node_type': 'missing'
+    }
+
+    def resolved_assertions(tn):
+        assertions = tn.resolve_assertions()
+        assertions = assertions[[
+            'inp_string', 'src_string', 'tgt_string', 'ref_string',
+            'link_type', 'tags'
+        ]]
+        assertions = assertions.astype(str).agg('|'.join, axis=1)
+        return assertions.sort_values().array
+
+    tn = bg.slurp_shorthand(**{
+        k: v for k, v in shorthand_spec.items() if k != 'function'
+    })
+    path = tmp_path / 'textnet.db'
+    tn.to_sqlite(path)
+
+    stored = bg.TextNet.from_sqlite(path)
+    for table_name in [
+        'assertions', 'strings', 'nodes', 'edges', 'node_types',
+        'link_types', 'assertion_tags', 'edge_tags'
+    ]:
+        pd.testing.assert_frame_equal(
+            tn.__getattr__(table_name),
+            stored.__getattr__(table_name)
+        )
+
+    with pytest.raises(ValueError):
+        tn.to_sqlite(path)
+
+    # appending an input gives the same assertions as slurping both
+    # inputs together
+    bg.slurp_bibtex(**{
+        k: v for k, v in bibtex_spec.items() if k != 'function'
+    }).to_sqlite(path, if_exists='append')
+
+    appended = bg.textnet_from_sqlite(path)
+    merged = bg.slurp_many([shorthand_spec, bibtex_spec])
+
+    assert (resolved_assertions(appended) == resolved_assertions(merged)).all()
+    assert len(appended.nodes) == len(merged.nodes)
+    assert len(appended.edges) == len(merged.edges)
+
+    # appended rows follow the stored ones, which keep their IDs
+    for table_name in ['strings', 'nodes', 'assertions']:
+        pd.testing.assert_frame_equal(
+            appended.__getattr__(table_name).loc[
+                tn.__getattr__(table_name).index
+            ],
+            tn.__getattr__(table_name)
+        )
+
+    # a failed append leaves the stored TextNet as it was
+    with pytest.raises(ValueError):
+        tn.to_sqlite(path, if_exists='append')
+    assert len(bg.textnet_from_sqlite(path).assertions) == len(
+        appended.assertions
+    )
+
+
+def test_save_and_load_memory_maps_id_columns(tmp_path):
+
+    tn = bg.slurp_shorthand(
+        'bibliograph/test_data/manual_annotation.shnd',
+        "bibliograph/resources/default_entry_syntax.csv",
+        "bibliograph/resources/default_link_syntax.csv",
+        syntax_case_sensitive=False,
+        item_separator='__',
+        space_char='|',
+        na_string_values='!',
+        na_node_type='missing',
+        default_entry_prefix='wrk',
+        skiprows=2,
+        comment_char='#'
+    )
+    tn.strings.loc[0, 'string'] = 'ünïcode\r\nstring'
+
+    tn.save(tmp_path / 'snapshot')
+    # saving again replaces the files of the first snapshot
+    tn.save(tmp_path / 'snapshot')
+
+    table_names = [
+        'assertions', 'strings', 'nodes', 'edges', 'node_types',
+        'link_types', 'assertion_tags', 'edge_tags'
+    ]
+
+    for mmap in [True, False]:
+        loaded = bg.TextNet.load(tmp_path / 'snapshot', mmap=mmap)
+        for table_name in table_names:
+            pd.testing.assert_frame_equal(
+                tn.__getattr__(table_name),
+                loaded.__getattr__(table_name)
+            )
+        src_string_ids = loaded.assertions['src_string_id'].array
+        assert isinstance(src_string_ids._data, np.memmap) == mmap
+
+    # memory-mapped columns are copy-on-write
+    loaded = bg.load_textnet(tmp_path / 'snapshot')
+    loaded.strings.loc[0, 'node_id'] = loaded.strings['node_id'].max() + 1
+    assert (
+        bg.load_textnet(tmp_path / 'snapshot').strings.loc[0, 'node_id']
+        == tn.strings.loc[0, 'node_id']
+    )
+
+
+def test_lazy_sqlite_textnet_reads_only_selected_rows(tmp_path):
+
+    tn = bg.slurp_shorthand(
+        'bibliograph/test_data/manual_annotation.shnd',
+        "bibliograph/resources/default_entry_syntax.csv",
+        "bibliograph/resources/default_link_syntax.csv",
+        syntax_case_sensitive=False,
+        item_separator='__',
+        space_char='|',
+        na_string_values='!',
+        na_node_type='missing',
+        default_entry_prefix='wrk',
+        skiprows=2,
+        comment_char='#'
+    )
+    path = tmp_path / 'textnet.db'
+    tn.to_sqlite(path)
+
+    lazy = bg.TextNet.from_sqlite(path, lazy=True)
+
+    def read_tables():
+        return [
+            t for t in ['assertions', 'strings', 'nodes', 'edges']
+            if t in lazy.__dict__
+        ]
+
+    pd.testing.assert_frame_equal(
+        lazy.get_assertions_by_link_type('author'),
+        tn.get_assertions_by_link_type('author')
+    )
+    assert lazy.id_lookup('strings', 'asmith') == tn.id_lookup(
+        'strings',
+        'asmith'
+    )
+    pd.testing.assert_frame_equal(
+        lazy.get_assertions_by_string_id([7, 8], component='src'),
+        tn.get_assertions_by_string_id([7, 8], component='src')
+    )
+    pd.testing.assert_frame_equal(
+        lazy.get_strings_by_node_type('actor'),
+        tn.get_strings_by_node_type('actor')
+    )
+    pd.testing.assert_frame_equal(
+        lazy.resolve_assertions(link_type='author'),
+        tn.resolve_assertions(link_type='author')
+    )
+    pd.testing.assert_frame_equal(
+        lazy.resolve_assertions(subset=[3, 4, 70]),
+        tn.resolve_assertions(subset=[3, 4, 70])
+    )
+
+    # none of the queries above read a whole table
+    assert read_tables() == []
+
+    # other uses of a table read all of it
+    pd.testing.assert_frame_equal(lazy.edges, tn.edges)
+    assert read_tables() == ['edges']
+
+
+def test_literals_in_blob_store(tmp_path, monkeypatch):
+
+    def slurp():
+        return bg.slurp_shorthand(
+            'bibliograph/test_data/manual_annotation.shnd',
+            "bibliograph/resources/default_entry_syntax.csv",
+            "bibliograph/resources/default_link_syntax.csv",
+            syntax_case_sensitive=False,
+            item_separator='__',
+            space_char='|',
+            na_string_values='!',
+            na_node_type='missing',
+            default_entry_prefix='wrk',
+            skiprows=2,
+            comment_char='#'
+        )
+
+    def resolved_assertions(tn):
+        assertions = tn.resolve_assertions()
+        assertions = assertions[[
+            'inp_string', 'src_string', 'tgt_string', 'ref_string',
+            'link_type'
+        ]]
+        blobs = tn.__dict__.get('blobs')
+        if blobs is not None:
+            assertions = assertions.applymap(
+                lambda s: blobs.get(s) if s in blobs else s
+            )
+        assertions = assertions.astype(str).agg('|'.join, axis=1)
+        return assertions.sort_values().array
+
+    tn = slurp()
+    inline = slurp()
+    literal_ids = tn._literal_string_ids()
+
+    blobs = bg.BlobStore(tmp_path / 'blobs', compress=True)
+    tn.store_literals(blobs)
+
+    assert tn.strings.loc[literal_ids, 'string'].str.startswith(
+        bg.BlobStore.handle_prefix
+    ).all()
+    for string_id in literal_ids:
+        assert (
+            tn.get_literal_text(string_id)
+            == inline.strings.loc[string_id, 'string']
+        )
+
+    # identical texts from another ingest are stored once
+    slurp().store_literals(blobs)
+    assert len(blobs) == len(literal_ids)
+
+    # refreshing an input reads and stores its text through the store
+    text_id = tn.get_assertions_by_link_type('shorthand_data')
+    inp_string_id = text_id['inp_string_id'].iloc[0]
+    edited = tn.get_literal_text(text_id['tgt_string_id'].iloc[0])
+    edited = edited.replace('asmith', 'asmyth')
+
+    tn.refresh_input(inp_string_id, StringIO(edited))
+    inline.refresh_input(inp_string_id, StringIO(edited))
+
+    text_id = tn.get_assertions_by_link_type('shorthand_data')
+    assert tn.get_literal_text(text_id['tgt_string_id'].iloc[0]) == edited
+    assert (resolved_assertions(tn) == resolved_assertions(inline)).all()
+
+    # stored texts are saved with the TextNet
+    tn.to_sqlite(tmp_path / 'textnet.db')
+    tn.save(tmp_path / 'snapshot')
+    for stored in [
+        bg.TextNet.from_sqlite(tmp_path / 'textnet.db'),
+        bg.TextNet.load(tmp_path / 'snapshot')
+    ]:
+        assert (resolved_assertions(stored) == resolved_assertions(tn)).all()
+
+    # texts stored in a database are read from it when they're used,
+    # and survive replacing the tables they're read from
+    stored = bg.TextNet.from_sqlite(tmp_path / 'textnet.db', lazy=True)
+    assert stored.blobs.database == tmp_path / 'textnet.db'
+    assert (resolved_assertions(stored) == resolved_assertions(tn)).all()
+
+    stored.to_sqlite(tmp_path / 'textnet.db', if_exists='replace')
+    stored = bg.TextNet.from_sqlite(tmp_path / 'textnet.db')
+    assert (resolved_assertions(stored) == resolved_assertions(tn)).all()
+
+    # membership is checked without reading texts
+    def fail(*args, **kwargs):
+        raise AssertionError('text was read')
+
+    monkeypatch.setattr(Path, 'read_bytes', fail)
+    assert all(handle in blobs for handle in blobs)
+    monkeypatch.undo()
+
+    inline.load_literals()
+    tn.load_literals()
+    assert 'blobs' not in tn.__dict__
+    pd.testing.assert_series_equal(
+        tn.strings['string'],
+        inline.strings['string']
+    )
+
+
+def test_provenance_records_replace_call_reprs(tmp_path):
+
+    def slurp():
+        return bg.slurp_shorthand(
+            'bibliograph/test_data/shorthand_for_auto_aliasing.shnd',
+            "bibliograph/resources/default_entry_syntax.csv",
+            "bibliograph/resources/default_link_syntax.csv",
+            aliases_dict={'actor': 'bibliograph/test_data/aliases_actor.csv'},
+            aliases_case_sensitive=False,
+            automatic_aliasing=True,
+            link_constraints_fname=(
+                "bibliograph/resources/default_link_constraints.csv"
+            ),
+            syntax_case_sensitive=False,
+            item_separator='__',
+            space_char='|',
+            na_string_values='!',
+            na_node_type='missing',
+            default_entry_prefix='wrk',
+            comment_char='#'
+        )
+
+    tn = slurp()
+
+    inp_string_ids = tn.assertions['inp_string_id'].unique()
+    call_strings = tn.strings.loc[inp_string_ids, 'string']
+
+    # input strings name the call without repeating its arguments, and
+    # the same call with the same input contents gives the same string
+    assert call_strings.str.fullmatch(
+        r'bibliograph\.core\.\w+\(sha256=[0-9a-f]{64}\)'
+    ).all()
+    assert set(call_strings) == set(
+        slurp().strings.loc[inp_string_ids, 'string']
+    )
+
+    inp_string_id = tn.id_lookup(
+        'strings',
+        call_strings.loc[
+            call_strings.str.startswith('bibliograph.core.slurp_shorthand(')
+        ].iloc[0]
+    )
+    provenance = tn.get_provenance(inp_string_id)
+    assert provenance['function'] == 'bibliograph.core.slurp_shorthand'
+    assert provenance['arguments']['item_separator'] == '__'
+    assert provenance['arguments']['aliases_dict'] == {
+        'actor': 'bibliograph/test_data/aliases_actor.csv'
+    }
+    assert set(provenance['content_hashes']) == {
+        'shorthand_fname',
+        'entry_syntax_fname',
+        'link_syntax_fname',
+        'link_constraints_fname',
+        'aliases_dict.actor'
+    }
+
+    # every input and alias reference call string has a record
+    assert set(inp_string_ids) <= set(tn.provenance.index)
+    ref_string_ids = tn.assertions['ref_string_id'].dropna().unique()
+    ref_strings = tn.strings.loc[ref_string_ids, 'string']
+    alias_ref_strings = ref_strings.loc[
+        ref_strings.str.startswith('bibliograph.core._insert_alias')
+    ]
+    assert len(alias_ref_strings) > 0
+    assert set(alias_ref_strings.index) <= set(tn.provenance.index)
+
+    # records are stored with the TextNet and kept in unions
+    shorthand = bg.slurp_shorthand(
+        'bibliograph/test_data/shorthand_with_aliases.shnd',
+        "bibliograph/resources/default_entry_syntax.csv",
+        link_syntax_fname="bibliograph/resources/default_link_syntax.csv",
+        syntax_case_sensitive=False,
+        aliases_dict={'actor': 'bibliograph/test_data/aliases_actor.csv'},
+        item_separator='__',
+        space_char='|',
+        na_string_values='!',
+        na_node_type='missing',
+        default_entry_prefix='wrk',
+        skiprows=2,
+        comment_char='#'
+    )
+    inp_string_id = shorthand.assertions['inp_string_id'].iloc[0]
+    provenance = shorthand.get_provenance(inp_string_id)
+
+    shorthand.to_sqlite(tmp_path / 'textnet.db')
+    shorthand.save(tmp_path / 'snapshot')
+    for stored in [
+        bg.TextNet.from_sqlite(tmp_path / 'textnet.db'),
+        bg.TextNet.load(tmp_path / 'snapshot')
+    ]:
+        assert stored.get_provenance(inp_string_id) == provenance
+
+    bibtex = bg.slurp_bibtex(
+        "bibliograph/test_data/bibtex_test_data_short.bib",
+        "bibliograph/resources/default_bibtex_syntax.csv",
+        allow_redundant_items=True,
+        syntax_case_sensitive=False,
+        space_char='|',
+        na_string_values='!',
+        na_node_type='missing'
+    )
+    bibtex.to_sqlite(tmp_path / 'textnet.db', if_exists='append')
+    appended = bg.TextNet.from_sqlite(tmp_path / 'textnet.db')
+    inp_strings = appended.strings.loc[
+        appended.assertions['inp_string_id'].unique(),
+        'string'
+    ]
+    functions = [
+        appended.get_provenance(i)['function'] for i in inp_strings.index
+    ]
+    assert 'bibliograph.core.slurp_shorthand' in functions
+    assert 'bibliograph.core.slurp_bibtex' in functions
+
+
+def test_provenance_of_long_generated_alias_tables(tmp_path):
+
+    # the aliases generated for these names are written to a CSV text
+    # longer than the OS allows a file name to be
+    surnames = [
+        'Anderson', 'Brightwater', 'Castellanos', 'Delacroix', 'Eriksson',
+        'Fitzgerald', 'Gallagher', 'Hollingsworth', 'Ivanovich',
+        'Johannsen', 'Kowalczyk', 'Lindqvist', 'Montgomery', 'Nakamura',
+        'Oppenheimer'
+    ]
+    lines = ['left_entry, right_entry, link_tags_or_override, reference', '']
+    for i, surname in enumerate(surnames):
+        lines += [
+            'Alice|{}_Beth|Wu__{}__bams__{}__{}__x{},'.format(
+                surname, 1990 + i, i + 1, i + 10, i
+            ),
+            '    , {}a_wub__{}__jas__{}__{}'.format(
+                surname.lower(), 2000 + i, i + 1, i + 20
+            )
+        ]
+    shorthand_fname = tmp_path / 'long_aliases.shnd'
+    shorthand_fname.write_text('\n'.join(lines) + '\n')
+
+    tn = bg.slurp_shorthand(
+        str(shorthand_fname),
+        "bibliograph/resources/default_entry_syntax.csv",
+        "bibliograph/resources/default_link_syntax.csv",
+        aliases_dict={'actor': 'bibliograph/test_data/aliases_actor.csv'},
+        aliases_case_sensitive=False,
+        automatic_aliasing=True,
+        syntax_case_sensitive=False,
+        item_separator='__',
+        space_char='|',
+        na_string_values='!',
+        na_node_type='missing',
+        default_entry_prefix='wrk',
+        comment_char='#'
+    )
+
+    alias_ref_ids = tn.strings.loc[
+        tn.strings['string'].str.startswith(
+            'bibliograph.core._insert_alias_assertions('
+        )
+    ].index
+    assert len(alias_ref_ids) == 1
+
+    provenance = tn.get_provenance(alias_ref_ids[0])
+    assert provenance['arguments']['aliases_dict']['actor'] == '<str>'
+    assert 'aliases_dict.actor' in provenance['content_hashes']
@@ -1,3 +1,4 @@
+from ast import literal_eval
 import pandas as pd
 
 
@@ -497,7 +498,10 @@ def normalize_types(to_norm, template, strict=True, continue_idx=True):
         template_idx_is_sequential = pd.Series(template.index).diff().iloc[1:]
         template_idx_is_sequential = (template_idx_is_sequential == 1).all()
 
-        if template_idx_is_sequential & template.index.is_monotonic_increasing:
+        if len(template) == 0:
+            index = pd.RangeIndex(len(new_df))
+        elif (template_idx_is_sequential
+              & template.index.is_monotonic_increasing):
             new_index_min = template.index.max() + 1
             index = pd.RangeIndex(new_index_min, new_index_min + len(new_df))
         else:
@@ -872,3 +876,294 @@ def map_assertion_ids(obj, existing_obj):
         existing_obj[columns],
         new_values
     )
+
+
+def typed_string_keys(strings, tag_node_type_id):
+    '''
+    Hash string values along with a flag indicating if each string is a
+    tag. Shorthand parsing drops strings with duplicate values unless
+    one of them is a tag, so these keys identify distinct rows in the
+    strings frame of a parsed shorthand.
+    '''
+    keys = pd.DataFrame({
+        'string': strings['string'].array,
+        'is_tag': (strings['node_type_id'] == tag_node_type_id).array
+    })
+    keys = pd.util.hash_pandas_object(keys, index=False)
+    keys.index = strings.index
+
+    return keys
+
+
+def extend_table_by_value(existing, incoming, existing_keys, incoming_keys):
+    '''
+    Append rows from incoming whose keys are not in existing_keys to the
+    existing dataframe. Index values of appended rows continue the index
+    of the existing dataframe.
+
+    Returns
+    -------
+    tuple
+        (extended dataframe, pandas.Series mapping index values of the
+        incoming dataframe to index values of the extended dataframe)
+    '''
+
+    is_new = ~incoming_keys.isin(existing_keys)
+    new_rows = normalize_types(incoming.loc[is_new], existing)
+
+    id_map = pd.concat([
+        pd.Series(existing.index, index=existing_keys.array),
+        pd.Series(new_rows.index, index=incoming_keys.loc[is_new].array)
+    ])
+    id_map = id_map.loc[~id_map.index.duplicated()]
+
+    id_map = pd.Series(
+        incoming_keys.map(id_map).array,
+        index=incoming.index
+    )
+
+    return pd.concat([existing, new_rows]), id_map
+
+
+class ParsedTextNetMerger:
+    '''
+    THIS CLASS MUTATES THE TEXTNETS IT MERGES
+
+    Merges TextNets generated by Shorthand._apply_syntax or
+    Shorthand.parse_items from chunks of the same input into the first
+    one. Types, strings, assertions, and assertion tags of each chunk
+    are appended to those of the first TextNet. Values are matched
+    between chunks so integer IDs in the first TextNet are unchanged and
+    new IDs continue existing sequences.
+
+    Keys of merged strings are kept in a dict that each chunk extends,
+    and the tables of each chunk are collected and concatenated once by
+    finish, so merging takes time proportional to the size of the input
+    rather than to the number of chunks times the size of the input.
+
+    Parameters
+    ----------
+    parsed : TextNet
+        The first parsed chunk. It holds the merged TextNet after
+        finish is called.
+    '''
+
+    def __init__(self, parsed):
+
+        self.parsed = parsed
+
+        # Entry prefixes and item labels found in later chunks are
+        # added to the lists stored when the first chunk was parsed
+        # rather than storing new lists for every chunk. Parsed items
+        # have neither list.
+        self._lists = {}
+        for link_type in [
+            'shorthand_entry_prefixes',
+            'shorthand_item_labels'
+        ]:
+            if link_type in parsed.link_types['link_type'].array:
+                string_id = parsed.get_assertions_by_link_type(link_type)
+                string_id = string_id['tgt_string_id'].iloc[0]
+                values = literal_eval(parsed.strings.loc[string_id, 'string'])
+                self._lists[link_type] = (string_id, values, set(values))
+
+        self._strings = [parsed.strings]
+        self._assertions = [parsed.assertions]
+        self._assertion_tags = [parsed.assertion_tags]
+
+        # Keys of the strings are hashed once the tag node type is known
+        self._string_ids = None
+
+        def next_id(table):
+            return 0 if table.empty else int(table.index.max()) + 1
+
+        self._next_string_id = next_id(parsed.strings)
+        self._next_assertion_id = next_id(parsed.assertions)
+        self._next_assertion_tag_id = next_id(parsed.assertion_tags)
+
+    def add(self, chunk):
+        '''
+        Merge the tables of a parsed chunk.
+        '''
+
+        parsed = self.parsed
+
+        drop_string_ids = []
+
+        for link_type, (_, values, seen) in self._lists.items():
+
+            chunk_assertion = chunk.get_assertions_by_link_type(link_type)
+            chunk_string_id = chunk_assertion['tgt_string_id'].iloc[0]
+            new_values = literal_eval(
+                chunk.strings.loc[chunk_string_id, 'string']
+            )
+
+            for v in new_values:
+                if v not in seen:
+                    values.append(v)
+                    seen.add(v)
+
+            chunk.assertions = chunk.assertions.drop(chunk_assertion.index)
+            drop_string_ids.append(chunk_string_id)
+
+        chunk_strings = chunk.strings.drop(drop_string_ids)
+
+        # Merge types by value. Type tables are small, so they're
+        # extended in place.
+        node_types, node_type_id_map = extend_table_by_value(
+            parsed.node_types,
+            chunk.node_types,
+            parsed.node_types['node_type'],
+            chunk.node_types['node_type']
+        )
+        parsed.node_types = node_types
+        parsed.reset_node_types_dtypes()
+
+        link_types, link_type_id_map = extend_table_by_value(
+            parsed.link_types,
+            chunk.link_types,
+            parsed.link_types['link_type'],
+            chunk.link_types['link_type']
+        )
+        parsed.link_types = link_types
+        parsed.reset_link_types_dtypes()
+
+        # Merge strings by value and node type
+        chunk_strings = chunk_strings.assign(
+            node_type_id=chunk_strings['node_type_id'].map(node_type_id_map)
+        )
+
+        tag_node_type_id = parsed.id_lookup('node_types', 'tag')
+        if self._string_ids is None:
+            # Values of a completed TextNet can have more than one
+            # string. Chunk strings are matched to the first one.
+            keys = typed_string_keys(parsed.strings, tag_node_type_id)
+            keys = keys.loc[~keys.duplicated().array]
+            self._string_ids = dict(zip(
+                keys.tolist(),
+                keys.index.tolist()
+            ))
+
+        string_ids = self._string_ids
+        keys = typed_string_keys(chunk_strings, tag_node_type_id).tolist()
+        ids = []
+        is_new = []
+        next_string_id = self._next_string_id
+
+        for key in keys:
+            string_id = string_ids.get(key)
+            is_new.append(string_id is None)
+            if string_id is None:
+                string_id = next_string_id
+                string_ids[key] = string_id
+                next_string_id += 1
+            ids.append(string_id)
+
+        string_id_map = pd.Series(ids, index=chunk_strings.index)
+
+        new_strings = normalize_types(
+            chunk_strings.loc[is_new],
+            parsed.strings,
+            continue_idx=False
+        )
+        new_strings.index = pd.Index(
+            range(self._next_string_id, next_string_id),
+            dtype=parsed.strings.index.dtype
+        )
+        self._strings.append(new_strings)
+        self._next_string_id = next_string_id
+
+        # Replace IDs in the chunk assertions and tags with merged IDs
+        assertions = chunk.assertions.copy()
+        string_cols = [
+            c for c in assertions.columns if c.endswith('string_id')
+        ]
+        assertions[string_cols] = assertions[string_cols].apply(
+            lambda x: x.map(string_id_map)
+        )
+        assertions['link_type_id'] = assertions['link_type_id'].map(
+            link_type_id_map
+        )
+        assertions = normalize_types(
+            assertions,
+            parsed.assertions,
+            continue_idx=False
+        )
+        assertions.index = pd.Index(
+            range(
+                self._next_assertion_id,
+                self._next_assertion_id + len(assertions)
+            ),
+            dtype=parsed.assertions.index.dtype
+        )
+        assertion_id_map = pd.Series(
+            assertions.index,
+            index=chunk.assertions.index
+        )
+        self._assertions.append(assertions)
+        self._next_assertion_id += len(assertions)
+
+        tags = pd.DataFrame({
+            'assertion_id': chunk.assertion_tags['assertion_id'].map(
+                assertion_id_map
+            ),
+            'tag_string_id': chunk.assertion_tags['tag_string_id'].map(
+                string_id_map
+            )
+        })
+        tags = normalize_types(
+            tags,
+            parsed.assertion_tags,
+            continue_idx=False
+        )
+        tags.index = pd.Index(
+            range(
+                self._next_assertion_tag_id,
+                self._next_assertion_tag_id + len(tags)
+            ),
+            dtype=parsed.assertion_tags.index.dtype
+        )
+        self._assertion_tags.append(tags)
+        self._next_assertion_tag_id += len(tags)
+
+    def finish(self):
+        '''
+        Concatenate the merged tables into the first TextNet and return
+        it.
+        '''
+
+        parsed = self.parsed
+
+        parsed.strings = pd.concat(self._strings)
+        for string_id, values, _ in self._lists.values():
+            parsed.strings.loc[string_id, 'string'] = str(values)
+        parsed.reset_strings_dtypes()
+
+        parsed.assertions = pd.concat(self._assertions)
+        parsed.reset_assertions_dtypes()
+
+        parsed.assertion_tags = pd.concat(self._assertion_tags)
+        parsed.reset_assertion_tags_dtypes()
+
+        self._strings = [parsed.strings]
+        self._assertions = [parsed.assertions]
+        self._assertion_tags = [parsed.assertion_tags]
+
+        return parsed
+
+
+def merge_parsed_textnets(parsed, chunk):
+    '''
+    THIS FUNCTION MUTATES BOTH ARGUMENTS
+
+    Takes two TextNets generated by Shorthand._apply_syntax or
+    Shorthand.parse_items from chunks of the same input and appends the
+    types, strings, assertions, and assertion tags in the second onto
+    the first. See ParsedTextNetMerger, which merges many chunks
+    without copying the merged tables for each one.
+    '''
+
+    merger = ParsedTextNetMerger(parsed)
+    merger.add(chunk)
+    merger.finish()
+